@@ -0,0 +1,71 @@
+"""create audit_events table partitioned by month
+
+Revision ID: 3b7e2c1a9f04
+Revises:
+Create Date: 2026-10-19 09:12:41.508331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2c1a9f04'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        # Sem particionamento fora do PostgreSQL: tabela simples com os mesmos índices
+        op.create_table(
+            "audit_events",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("timestamp", sa.DateTime(), nullable=False),
+            sa.Column("action", sa.String(length=50), nullable=False),
+            sa.Column("resource_type", sa.String(length=50), nullable=False),
+            sa.Column("resource_id", sa.String(length=100)),
+            sa.Column("user_id", sa.String(length=100)),
+            sa.Column("user_email", sa.String(length=255)),
+            sa.Column("ip_address", sa.String(length=45)),
+            sa.Column("user_agent", sa.String(length=500)),
+            sa.Column("details", sa.JSON()),
+        )
+    else:
+        # Tabela particionada por mês; partições mensais são criadas sob demanda
+        # pelo AuditServiceDB e a partição DEFAULT recebe qualquer excedente.
+        op.execute(
+            """
+            CREATE TABLE audit_events (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+                timestamp TIMESTAMP NOT NULL,
+                action VARCHAR(50) NOT NULL,
+                resource_type VARCHAR(50) NOT NULL,
+                resource_id VARCHAR(100),
+                user_id VARCHAR(100),
+                user_email VARCHAR(255),
+                ip_address VARCHAR(45),
+                user_agent VARCHAR(500),
+                details JSONB,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+            """
+        )
+        op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+
+    # Índices alinhados com os filtros de AuditLogger.get_logs (mais recentes primeiro)
+    op.create_index("ix_audit_events_timestamp", "audit_events", ["timestamp"])
+    op.create_index("ix_audit_events_action_timestamp", "audit_events", ["action", "timestamp"])
+    op.create_index("ix_audit_events_resource_type_timestamp", "audit_events", ["resource_type", "timestamp"])
+    op.create_index("ix_audit_events_user_id_timestamp", "audit_events", ["user_id", "timestamp"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("audit_events")
@@ -0,0 +1,72 @@
+"""add unaccent + pg_trgm trigram indexes for text search
+
+Revision ID: 4c1d8e2f7a15
+Revises: 3b7e2c1a9f04
+Create Date: 2026-10-19 10:03:12.114250
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1d8e2f7a15'
+down_revision: Union[str, Sequence[str], None] = '3b7e2c1a9f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas pesquisáveis de cada tabela
+SEARCH_COLUMNS = {
+    "provinces": ["nome", "capital"],
+    "municipalities": ["nome"],
+    "schools": ["nome", "municipio"],
+    "markets": ["nome", "municipio", "endereco"],
+    "hospitals": ["nome", "municipio", "endereco", "especialidades"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # Extensões e índices de trigramas só existem no PostgreSQL
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() é STABLE; índices de expressão exigem uma função IMMUTABLE
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+        $$ SELECT public.unaccent('public.unaccent', $1) $$
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        """
+    )
+
+    inspector = sa.inspect(bind)
+    for table, columns in SEARCH_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        for column in columns:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm ON {table} "
+                f"USING gin (lower(f_unaccent({column})) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        return
+
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
+
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
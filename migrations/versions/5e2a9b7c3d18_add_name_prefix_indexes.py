@@ -0,0 +1,49 @@
+"""add text_pattern_ops indexes for name autocomplete
+
+Revision ID: 5e2a9b7c3d18
+Revises: 4c1d8e2f7a15
+Create Date: 2026-10-19 11:26:05.730912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9b7c3d18'
+down_revision: Union[str, Sequence[str], None] = '4c1d8e2f7a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AUTOCOMPLETE_TABLES = ["municipalities", "schools", "markets", "hospitals"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        return
+
+    # B-tree com text_pattern_ops: LIKE 'prefixo%' vira uma busca por intervalo
+    inspector = sa.inspect(bind)
+    for table in AUTOCOMPLETE_TABLES:
+        if not inspector.has_table(table):
+            continue
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_nome_prefix ON {table} "
+            f"(lower(f_unaccent(nome)) text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        return
+
+    for table in AUTOCOMPLETE_TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_nome_prefix")
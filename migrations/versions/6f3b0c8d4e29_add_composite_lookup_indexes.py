@@ -0,0 +1,60 @@
+"""add composite indexes for province and municipality lookups
+
+Revision ID: 6f3b0c8d4e29
+Revises: 5e2a9b7c3d18
+Create Date: 2026-10-19 14:02:47.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f3b0c8d4e29'
+down_revision: Union[str, Sequence[str], None] = '5e2a9b7c3d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (provincia_id, nome): get_by_province(...).order_by(nome) and the provincia_id filters
+PROVINCE_TABLES = ["municipalities", "schools", "markets", "hospitals"]
+# (municipio, nome): get_by_municipality(...).order_by(nome) and the dependency counts
+MUNICIPIO_TABLES = ["schools", "markets", "hospitals"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    for table in PROVINCE_TABLES:
+        if not inspector.has_table(table):
+            continue
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_provincia_id_nome ON {table} (provincia_id, nome)")
+        # Superseded by the composite index (provincia_id is its leading column)
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_provincia_id")
+
+    for table in MUNICIPIO_TABLES:
+        if not inspector.has_table(table):
+            continue
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_municipio_nome ON {table} (municipio, nome)")
+
+    for table in PROVINCE_TABLES:
+        if inspector.has_table(table):
+            # Refresh planner statistics so the new indexes are picked up immediately
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    for table in MUNICIPIO_TABLES:
+        if inspector.has_table(table):
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_municipio_nome")
+
+    for table in PROVINCE_TABLES:
+        if not inspector.has_table(table):
+            continue
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_provincia_id ON {table} (provincia_id)")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_provincia_id_nome")
@@ -0,0 +1,65 @@
+"""add municipio_id foreign key to facility tables
+
+Revision ID: 7a4c1e9b5f30
+Revises: 6f3b0c8d4e29
+Create Date: 2026-10-19 15:21:09.482716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4c1e9b5f30'
+down_revision: Union[str, Sequence[str], None] = '6f3b0c8d4e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACILITY_TABLES = ["schools", "markets", "hospitals"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table in FACILITY_TABLES:
+        if not inspector.has_table(table):
+            continue
+
+        if "municipio_id" not in {column["name"] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("municipio_id", sa.Integer(), nullable=True))
+            if bind.dialect.name != "sqlite":
+                op.create_foreign_key(f"fk_{table}_municipio_id", table, "municipalities", ["municipio_id"], ["id"])
+
+        # Backfill from the free-text name; names are only unique within a province
+        op.execute(
+            f"UPDATE {table} SET municipio_id = ("
+            f"SELECT m.id FROM municipalities m "
+            f"WHERE lower(m.nome) = lower({table}.municipio) AND m.provincia_id = {table}.provincia_id) "
+            f"WHERE municipio_id IS NULL AND municipio IS NOT NULL"
+        )
+
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_municipio_id_nome ON {table} (municipio_id, nome)")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_municipio_nome")
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table in FACILITY_TABLES:
+        if not inspector.has_table(table):
+            continue
+
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_municipio_nome ON {table} (municipio, nome)")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_municipio_id_nome")
+        if bind.dialect.name != "sqlite":
+            for foreign_key in inspector.get_foreign_keys(table):
+                if foreign_key["constrained_columns"] == ["municipio_id"] and foreign_key.get("name"):
+                    op.drop_constraint(foreign_key["name"], table, type_="foreignkey")
+        op.drop_column(table, "municipio_id")
@@ -0,0 +1,38 @@
+"""create change_events table for the incremental change feed
+
+Revision ID: 8b5d2f0a6c41
+Revises: 7a4c1e9b5f30
+Create Date: 2026-10-19 16:05:33.920147
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b5d2f0a6c41'
+down_revision: Union[str, Sequence[str], None] = '7a4c1e9b5f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # seq é a chave primária: GET /changes?since= é uma leitura por intervalo no índice da PK
+    op.create_table(
+        "change_events",
+        sa.Column("seq", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(length=10), nullable=False),
+        sa.Column("record", sa.JSON().with_variant(postgresql.JSONB(), "postgresql")),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("change_events")
@@ -0,0 +1,52 @@
+"""add latitude/longitude to facility tables
+
+Revision ID: 9c6e3a1b7d52
+Revises: 8b5d2f0a6c41
+Create Date: 2026-10-19 17:12:48.305961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c6e3a1b7d52'
+down_revision: Union[str, Sequence[str], None] = '8b5d2f0a6c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACILITY_TABLES = ["schools", "markets", "hospitals"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table in FACILITY_TABLES:
+        if not inspector.has_table(table):
+            continue
+
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        for column in ("latitude", "longitude"):
+            if column not in columns:
+                op.add_column(table, sa.Column(column, sa.Float(), nullable=True))
+
+        # Nearby queries read a latitude range and filter longitude within it
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_latitude_longitude ON {table} (latitude, longitude)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table in FACILITY_TABLES:
+        if not inspector.has_table(table):
+            continue
+
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_latitude_longitude")
+        op.drop_column(table, "longitude")
+        op.drop_column(table, "latitude")
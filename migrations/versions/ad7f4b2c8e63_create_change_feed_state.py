@@ -0,0 +1,34 @@
+"""create change_feed_state table (change feed retention low-water mark)
+
+Revision ID: ad7f4b2c8e63
+Revises: 9c6e3a1b7d52
+Create Date: 2026-10-19 18:42:10.513208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ad7f4b2c8e63'
+down_revision: Union[str, Sequence[str], None] = '9c6e3a1b7d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Uma única linha (id=1): maior seq removida pela retenção de change_events
+    op.create_table(
+        "change_feed_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("pruned_through", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), nullable=False),
+        sa.Column("pruned_at", sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("change_feed_state")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Gera data/boundaries.bin (limites de províncias e municípios) para GET /geo/locate.
+
+Lê limites administrativos em GeoJSON (ex: geoBoundaries ou OCHA, níveis ADM1 e
+ADM2), associa cada polígono ao id da província/município pelo nome (ignorando
+acentos e maiúsculas), simplifica os anéis e grava o formato binário compacto
+lido pela API no arranque.
+
+Uso:
+    python scripts/build_boundaries.py --provinces ago_adm1.geojson --municipalities ago_adm2.geojson
+    python scripts/build_boundaries.py --provinces adm1.geojson --municipalities adm2.geojson --tolerance 0.002
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.json_storage import JSONStorage
+from src.utils.boundaries import DEFAULT_BOUNDARIES_PATH, Boundary, simplify_ring, write_boundaries
+from src.utils.search_index import fold
+
+
+def parse_args():
+    """Lê os argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Gera o arquivo de limites para GET /geo/locate")
+    parser.add_argument("--provinces", type=Path, required=True, help="GeoJSON com os limites das províncias")
+    parser.add_argument("--municipalities", type=Path, required=True, help="GeoJSON com os limites dos municípios")
+    parser.add_argument("--name-property", default="shapeName", help="Propriedade com o nome (padrão: shapeName)")
+    parser.add_argument("--tolerance", type=float, default=0.001, help="Tolerância da simplificação, em graus")
+    parser.add_argument("--data-dir", type=Path, default=JSONStorage.DATA_DIR, help="Diretório dos arquivos JSON")
+    parser.add_argument("--output", type=Path, default=DEFAULT_BOUNDARIES_PATH, help="Arquivo de saída")
+    return parser.parse_args()
+
+
+def read_polygons(geometry, tolerance):
+    """Polígonos simplificados de uma geometria Polygon ou MultiPolygon"""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [[simplify_ring(ring, tolerance) for ring in polygon] for polygon in polygons]
+
+
+def read_features(path, name_property, tolerance):
+    """Pares (nome, polígonos) de um FeatureCollection"""
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+    features = []
+    for feature in collection["features"]:
+        polygons = read_polygons(feature["geometry"], tolerance)
+        if polygons:
+            features.append((feature["properties"][name_property], polygons))
+    return features
+
+
+def main():
+    """Gera o arquivo de limites"""
+    args = parse_args()
+
+    with open(args.data_dir / "provinces.json", encoding="utf-8") as f:
+        provinces_by_name = {fold(p["nome"]): p for p in json.load(f)}
+    with open(args.data_dir / "municipalities.json", encoding="utf-8") as f:
+        municipalities = json.load(f)
+
+    boundaries, missing = [], []
+
+    print(f"\n=== Províncias ({args.provinces}) ===\n")
+    for name, polygons in read_features(args.provinces, args.name_property, args.tolerance):
+        province = provinces_by_name.get(fold(name))
+        if province is None:
+            missing.append(name)
+            continue
+        boundaries.append(Boundary("province", province["id"], province["nome"], province["id"], polygons))
+    provinces = [b for b in boundaries if b.kind == "province"]
+    print(f"  ✅ {len(provinces)} províncias")
+
+    print(f"\n=== Municípios ({args.municipalities}) ===\n")
+    by_name = {}
+    for municipality in municipalities:
+        by_name.setdefault(fold(municipality["nome"]), []).append(municipality)
+
+    for name, polygons in read_features(args.municipalities, args.name_property, args.tolerance):
+        candidates = by_name.get(fold(name), [])
+        # Nomes repetidos em províncias diferentes: decide a província que contém o município
+        ring = polygons[0][0]
+        lon = sum(point[0] for point in ring) / len(ring)
+        lat = sum(point[1] for point in ring) / len(ring)
+        containing = {p.id for p in provinces if p.contains(lon, lat)}
+        matches = [m for m in candidates if m["provincia_id"] in containing] or (candidates if len(candidates) == 1 else [])
+        if not matches:
+            missing.append(name)
+            continue
+        municipality = matches[0]
+        boundaries.append(
+            Boundary("municipality", municipality["id"], municipality["nome"], municipality["provincia_id"], polygons)
+        )
+    print(f"  ✅ {len(boundaries) - len(provinces)} municípios")
+
+    if missing:
+        print(f"\n⚠ {len(missing)} limites sem correspondência nos dados: {', '.join(sorted(missing))}")
+
+    write_boundaries(boundaries, args.output)
+    print(f"\n✓ {len(boundaries)} limites gravados em {args.output} ({args.output.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
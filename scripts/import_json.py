@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Importa os arquivos data/*.json para o banco de dados (PostgreSQL ou SQLite).
+
+Lê cada arquivo em streaming, grava em lotes (COPY no PostgreSQL, INSERT
+multi-linha com ON CONFLICT nos outros casos), respeita a ordem das chaves
+estrangeiras e carrega em paralelo as tabelas independentes. Pode ser
+executado várias vezes: os registros são atualizados pelo id.
+
+Uso:
+    python scripts/import_json.py
+    python scripts/import_json.py --tables schools hospitals --batch-size 20000
+    python scripts/import_json.py --database-url sqlite:///data/angodata.db --create-schema
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+from src.database.base import Base
+from src.database.importer import DEFAULT_BATCH_SIZE, IMPORT_STAGES, import_all
+from src.database.json_storage import JSONStorage
+from src.database.pool import engine_options_from_env
+
+TABLES = [name for stage in IMPORT_STAGES for name, _ in stage]
+
+
+def parse_args():
+    """Lê os argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Importa data/*.json para o banco de dados")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="URL do banco (padrão: DATABASE_URL)")
+    parser.add_argument("--data-dir", type=Path, default=JSONStorage.DATA_DIR, help="Diretório dos arquivos JSON")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, help="Importar apenas estas tabelas")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Linhas por lote")
+    parser.add_argument("--workers", type=int, default=4, help="Tabelas carregadas em paralelo")
+    parser.add_argument("--method", choices=["auto", "copy", "insert"], default="auto", help="Forma de carga")
+    parser.add_argument("--create-schema", action="store_true", help="Criar as tabelas que não existirem")
+    return parser.parse_args()
+
+
+def main():
+    """Executa a importação"""
+    load_dotenv()
+    args = parse_args()
+
+    if not args.database_url:
+        print("❌ DATABASE_URL não definido (use --database-url)")
+        return 1
+
+    options = engine_options_from_env() if args.database_url.startswith("postgresql") else {}
+    engine = create_engine(args.database_url, **options)
+
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+
+    print(f"\n=== Importando {args.data_dir} ===\n")
+
+    def report(result):
+        print(
+            f"  ✅ {result.table:<15} {result.rows:>10} linhas  {result.seconds:>7.2f}s  {result.rows_per_second:>10.0f} linhas/s"
+        )
+
+    start = time.perf_counter()
+    try:
+        results = import_all(
+            engine,
+            args.data_dir,
+            tables=args.tables,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            method=args.method,
+            on_result=report,
+        )
+    except Exception as e:
+        print(f"  ❌ Erro na importação: {e}")
+        return 1
+    finally:
+        engine.dispose()
+
+    elapsed = time.perf_counter() - start
+    total = sum(result.rows for result in results)
+    rate = total / elapsed if elapsed > 0 else total
+    print(f"\n✓ {total} linhas em {elapsed:.2f}s ({rate:.0f} linhas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
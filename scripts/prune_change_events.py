@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""
+Script para aplicar a retenção do feed de alterações (modo database).
+Remove de change_events as alterações com mais de CHANGE_LOG_RETENTION_DAYS dias;
+clientes com 'since' anterior recebem 410 e refazem a sincronização completa.
+Uso: python scripts/prune_change_events.py [dias]   (ex: diariamente via cron)
+"""
+
+import sys
+import os
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.base import init_database
+from src.services.db.change_service_db import ChangeServiceDB
+
+
+def prune_change_events():
+    """Remove as alterações fora do período de retenção"""
+    retention_days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    init_database()
+    deleted = ChangeServiceDB.prune(retention_days)
+    print(f"✅ {deleted} alterações removidas de change_events")
+
+
+if __name__ == '__main__':
+    prune_change_events()
@@ -5,14 +5,16 @@ Contém a função factory para criar e configurar a aplicação Flask.
 
 from flask import Flask, jsonify, redirect, url_for
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 
 from src.config.config import config_by_name
 from src.swagger import api, init_swagger
+from src.utils.audit import init_audit
+from src.utils.boundaries import init_boundaries
 from src.utils.cache import init_cache
-from src.utils.security import add_security_headers
+from src.utils.compression import init_compression
+from src.utils.jwt_cache import CachingJWTManager
+from src.utils.rate_limit import limiter
+from src.utils.security import add_security_headers, init_input_scan
 
 
 def create_app(config_name="development"):
@@ -31,32 +33,41 @@ def create_app(config_name="development"):
     # Carregar configurações baseadas no ambiente
     app.config.from_object(config_by_name[config_name])
 
-    # Inicializar database se USE_DATABASE=True
+    # Inicializar database se STORAGE_BACKEND=postgres/sqlite (ou USE_DATABASE=True)
     init_database_if_enabled(app)
 
-    # Carregar dados persistidos (se existirem e USE_DATABASE=False)
+    # Carregar dados persistidos (se existirem e STORAGE_BACKEND=json)
     load_persisted_data()
 
     # Habilitar CORS (Cross-Origin Resource Sharing)
     # Permite que a API seja acessada de diferentes domínios
     CORS(app)
 
-    # Configurar Rate Limiting
-    limiter = Limiter(
-        app=app, key_func=get_remote_address, default_limits=["200 per day", "50 per hour"], storage_uri="memory://"
-    )
-    app.limiter = limiter
+    # Configurar Rate Limiting (Redis partilhado entre workers, ou memória)
+    limiter.init_app(app)
 
-    # Configurar JWT
-    jwt = JWTManager(app)
+    # Configurar JWT (com cache de verificação de tokens)
+    jwt = CachingJWTManager(app)
     configure_jwt_handlers(jwt)
 
     # Inicializar Cache (Redis ou Memory)
     init_cache(app)
 
+    # Inicializar auditoria (fila + writer em background)
+    init_audit(app)
+
+    # Inicializar compressão de respostas (gzip/brotli)
+    init_compression(app)
+
+    # Carregar limites geográficos (geocodificação reversa)
+    init_boundaries(app)
+
     # Inicializar Swagger/OpenAPI
     init_swagger(app)
 
+    # Verificar o corpo JSON das escritas (recusa entradas suspeitas)
+    init_input_scan(app)
+
     # Adicionar security headers a todas as respostas
     app.after_request(add_security_headers)
 
@@ -74,41 +85,45 @@ def create_app(config_name="development"):
 
 def init_database_if_enabled(app):
     """
-    Inicializa conexão com banco de dados PostgreSQL se USE_DATABASE=True.
+    Inicializa conexão com banco de dados (PostgreSQL ou SQLite embutido)
+    se STORAGE_BACKEND=postgres/sqlite (ou USE_DATABASE=True).
 
     Args:
         app (Flask): Instância da aplicação Flask
     """
-    import os
+    from src.database.base import get_storage_backend
 
     # Verificar se deve usar banco de dados
-    use_database = os.getenv("USE_DATABASE", "False").lower() == "true"
+    backend = get_storage_backend()
 
-    if use_database:
-        from src.database.base import close_database, init_database
+    if backend != "json":
+        import atexit
+
+        from src.database.base import close_database, init_database, init_request_session
 
         # Inicializar conexão com database
         init_database()
-        print("✓ Database PostgreSQL inicializado com sucesso")
+        print(f"✓ Database {'SQLite' if backend == 'sqlite' else 'PostgreSQL'} inicializado com sucesso")
+
+        # Uma sessão (e uma transação) por request
+        init_request_session(app)
 
         # Registrar cleanup ao desligar app
-        @app.teardown_appcontext
-        def shutdown_session(exception=None):
-            close_database()
+        atexit.register(close_database)
 
 
 def load_persisted_data():
     """
     Carrega dados persistidos de arquivos JSON.
     Se os arquivos não existirem, usa os dados hardcoded dos models.
-    Somente carrega se USE_DATABASE=False.
+    Somente carrega se STORAGE_BACKEND=json.
     """
-    import os
+    from src.database.base import get_storage_backend
 
     # Não carregar JSON se estiver usando database
-    use_database = os.getenv("USE_DATABASE", "False").lower() == "true"
-    if use_database:
-        print("✓ Usando PostgreSQL Database - dados JSON ignorados")
+    backend = get_storage_backend()
+    if backend != "json":
+        print(f"✓ Usando {'SQLite' if backend == 'sqlite' else 'PostgreSQL'} Database - dados JSON ignorados")
         return
 
     from src.database.json_storage import JSONStorage
@@ -142,6 +157,11 @@ def load_persisted_data():
         user.USERS.clear()
         user.USERS.extend(persisted["users"])
 
+    # Índices em memória devem ser reconstruídos a partir dos novos dados
+    from src.utils.signals import notify_reload
+
+    notify_reload()
+
 
 def register_blueprints(app):
     """
@@ -150,7 +170,20 @@ def register_blueprints(app):
     Args:
         app (Flask): Instância da aplicação Flask
     """
-    from src.routes import auth_bp, hospitals_bp, markets_bp, municipalities_bp, provinces_bp, schools_bp
+    from src.routes import (
+        auth_bp,
+        changes_bp,
+        events_bp,
+        geo_bp,
+        hospitals_bp,
+        markets_bp,
+        metrics_bp,
+        municipalities_bp,
+        provinces_bp,
+        schools_bp,
+        search_bp,
+        snapshot_bp,
+    )
 
     # Registrar cada Blueprint
     app.register_blueprint(provinces_bp)
@@ -159,6 +192,15 @@ def register_blueprints(app):
     app.register_blueprint(markets_bp)
     app.register_blueprint(hospitals_bp)
     app.register_blueprint(auth_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(changes_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(snapshot_bp)
+    app.register_blueprint(geo_bp)
+
+    # Coletas periódicas do Prometheus não contam para o rate limit
+    app.limiter.exempt(metrics_bp)
 
 
 def register_home_route(app):
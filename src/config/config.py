@@ -25,6 +25,23 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.environ.get("JWT_ACCESS_TOKEN_EXPIRES", 86400)))  # 24h default
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=int(os.environ.get("JWT_REFRESH_TOKEN_EXPIRES", 2592000)))  # 30d default
     JWT_ALGORITHM = "HS256"
+    JWT_VERIFY_CACHE_SIZE = int(os.environ.get("JWT_VERIFY_CACHE_SIZE", 1024))  # 0 desativa o cache
+    JWT_VERIFY_CACHE_TTL = int(os.environ.get("JWT_VERIFY_CACHE_TTL", 300))  # segundos (limitado pelo exp)
+
+    # Auditoria (escrita assíncrona em lotes)
+    AUDIT_BACKEND = os.environ.get("AUDIT_BACKEND", "file")  # file ou database (tabela audit_events)
+    AUDIT_LOG_DIR = os.environ.get("AUDIT_LOG_DIR")  # default: <raiz>/logs
+    AUDIT_ASYNC = os.environ.get("AUDIT_ASYNC", "True").lower() == "true"
+    AUDIT_QUEUE_SIZE = int(os.environ.get("AUDIT_QUEUE_SIZE", 10000))
+    AUDIT_QUEUE_POLICY = os.environ.get("AUDIT_QUEUE_POLICY", "block")  # block ou drop
+    AUDIT_ENQUEUE_TIMEOUT = float(os.environ.get("AUDIT_ENQUEUE_TIMEOUT", 0.05))  # segundos (policy=block)
+    AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", 500))
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", 0.5))
+    AUDIT_FSYNC_INTERVAL = float(os.environ.get("AUDIT_FSYNC_INTERVAL", 1.0))
+    AUDIT_FSYNC_BYTES = int(os.environ.get("AUDIT_FSYNC_BYTES", 1024 * 1024))
+    AUDIT_ROTATE_BYTES = int(os.environ.get("AUDIT_ROTATE_BYTES", 10 * 1024 * 1024))
+    AUDIT_ROTATE_SECONDS = int(os.environ.get("AUDIT_ROTATE_SECONDS", 86400))  # 0 desativa
+    AUDIT_MAX_SEGMENTS = int(os.environ.get("AUDIT_MAX_SEGMENTS", 30))  # 0 mantém todos
 
     # Futuro: Configurações de banco de dados
     # SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
@@ -5,10 +5,13 @@ Database configuration and base models for SQLAlchemy.
 import os
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from src.database.pool import engine_options_from_env, instrument_engine
+from src.database.routing import ReplicaRouter, WriteStickiness, choose_read_bind, replica_urls_from_env
+
 # Create declarative base
 Base = declarative_base()
 
@@ -16,31 +19,83 @@ Base = declarative_base()
 engine = None
 SessionLocal = None
 
+# Read replicas (optional, see DATABASE_REPLICA_URLS)
+replica_router = None
+write_stickiness = None
+
+
+def get_storage_backend() -> str:
+    """
+    Get the configured storage backend.
+
+    STORAGE_BACKEND may be 'json', 'postgres' or 'sqlite'; when unset,
+    USE_DATABASE=True selects 'postgres' and anything else 'json'.
+
+    Returns:
+        str: 'json', 'postgres' or 'sqlite'
+    """
+    backend = os.getenv("STORAGE_BACKEND", "").strip().lower()
+    if backend in ("json", "postgres", "sqlite"):
+        return backend
+    if backend == "postgresql":
+        return "postgres"
+    return "postgres" if os.getenv("USE_DATABASE", "False").lower() == "true" else "json"
+
+
+def uses_database() -> bool:
+    """
+    Check whether services are backed by SQLAlchemy (PostgreSQL or SQLite).
+
+    Returns:
+        bool: True unless the JSON backend is selected
+    """
+    return get_storage_backend() != "json"
+
 
 def init_database():
     """
     Initialize database connection and create session factory.
     Must be called before using the database.
     """
-    global engine, SessionLocal
+    global engine, SessionLocal, replica_router, write_stickiness
+
+    from src.database.change_log import track_changes
+
+    if get_storage_backend() == "sqlite":
+        from src.database.sqlite_storage import configure_sqlite_engine, create_and_seed, sqlite_engine_options, sqlite_url
+
+        engine = create_engine(sqlite_url(), **sqlite_engine_options())
+        configure_sqlite_engine(engine)
+        instrument_engine(engine, role="primary")
+        SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+        track_changes(SessionLocal.session_factory)
+        create_and_seed(engine)
+        return engine
 
     database_url = os.getenv("DATABASE_URL")
 
     if not database_url:
         raise ValueError("DATABASE_URL environment variable is not set")
 
-    # Create engine with connection pooling
-    engine = create_engine(
-        database_url,
-        pool_pre_ping=True,  # Verify connections before using
-        pool_size=10,  # Number of connections to maintain
-        max_overflow=20,  # Max additional connections
-        echo=False,  # Set to True for SQL logging during debug
-    )
+    # Create engine with connection pooling (DB_POOL_* settings, see engine_options_from_env)
+    engine = instrument_engine(create_engine(database_url, **engine_options_from_env()), role="primary")
 
     # Create session factory
     SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
 
+    # Mutations are appended to change_events (GET /changes)
+    track_changes(SessionLocal.session_factory)
+
+    # Optional read replicas: read-only request sessions are routed to them
+    replica_urls = replica_urls_from_env()
+    if replica_urls:
+        replicas = [
+            instrument_engine(create_engine(url, **engine_options_from_env()), role=f"replica{i}")
+            for i, url in enumerate(replica_urls)
+        ]
+        replica_router = ReplicaRouter(replicas, retry_interval=float(os.getenv("DATABASE_REPLICA_RETRY_SECONDS", 30)))
+        write_stickiness = WriteStickiness(window=float(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", 5)))
+
     return engine
 
 
@@ -63,19 +118,44 @@ def get_db():
         db.close()
 
 
+# HTTP methods that never change data: their request transaction is READ ONLY
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
 @contextmanager
-def get_db_session():
+def get_db_session(session=None, standalone: bool = False):
     """
     Context manager for database sessions.
-    Automatically commits on success and rolls back on error.
+
+    - An explicit ``session`` is used as-is (the caller owns commit/close).
+    - Inside a request (after init_request_session) the request-scoped session
+      is reused; changes are flushed here and committed once at the end of the request.
+    - Otherwise (scripts, background threads, ``standalone=True``) a new session
+      is opened and automatically committed on success and rolled back on error.
 
     Usage:
         with get_db_session() as session:
             session.add(new_object)
     """
+    if session is not None:
+        yield session
+        return
+
     if SessionLocal is None:
         raise RuntimeError("Database not initialized. Call init_database() first.")
 
+    if not standalone and _request_scope_active():
+        session = get_request_session()
+        try:
+            yield session
+            session.flush()
+        except Exception:
+            # A failed statement invalidates the whole unit of work
+            session.rollback()
+            session.info.pop("written", None)
+            raise
+        return
+
     session = SessionLocal()
     try:
         yield session
@@ -87,6 +167,99 @@ def get_db_session():
         session.close()
 
 
+def _request_scope_active() -> bool:
+    """Check whether a request-scoped unit of work is enabled for the current request."""
+    from flask import current_app, has_request_context
+
+    return has_request_context() and current_app.extensions.get("db_request_session", False)
+
+
+def _set_read_only(session, transaction, connection):
+    """Start every transaction of a read-only request as READ ONLY (PostgreSQL)."""
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def _mark_written(session, flush_context):
+    """Remember that the request flushed changes (only then a COMMIT is needed)."""
+    session.info["written"] = True
+
+
+def get_request_session():
+    """
+    Get (lazily opening) the session of the current request.
+    Safe-method requests (GET/HEAD/OPTIONS) run in READ ONLY transactions,
+    on a read replica when configured.
+
+    Returns:
+        Session: Session shared by every service call of the request
+    """
+    from flask import g, request
+
+    session = g.get("_db_session")
+    if session is None:
+        if request.method in READ_ONLY_METHODS:
+            session = SessionLocal.session_factory(bind=choose_read_bind(replica_router, write_stickiness, engine))
+            event.listen(session, "after_begin", _set_read_only)
+            session.info["read_only"] = True
+        else:
+            session = SessionLocal.session_factory()
+            event.listen(session, "after_flush", _mark_written)
+        g._db_session = session
+    return session
+
+
+def init_request_session(app):
+    """
+    Enable the request-scoped unit of work: one session per request,
+    committed once after a successful write request.
+
+    Args:
+        app: Flask application
+    """
+    from flask import g
+
+    app.extensions["db_request_session"] = True
+
+    @app.after_request
+    def commit_request_session(response):
+        session = g.get("_db_session")
+        if session is None or session.info.get("read_only"):
+            return response
+
+        if response.status_code >= 400 or not session.info.get("written"):
+            session.rollback()
+            return response
+
+        try:
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"Database error committing request: {e}")
+            return _commit_failed_response()
+
+        # Read-your-writes: this client's next reads go to the primary for a short window
+        if write_stickiness is not None:
+            write_stickiness.mark()
+        return response
+
+    @app.teardown_appcontext
+    def close_request_session(exception=None):
+        # Read-only transactions end here without COMMIT; anything uncommitted is rolled back
+        session = g.pop("_db_session", None)
+        if session is not None:
+            session.close()
+        SessionLocal.remove()
+
+
+def _commit_failed_response():
+    from flask import jsonify
+
+    response = jsonify({"success": False, "message": "Erro ao gravar alterações no banco de dados"})
+    response.status_code = 500
+    return response
+
+
 def create_all_tables():
     """
     Create all tables defined in models.
@@ -121,3 +294,7 @@ def close_database():
 
     if engine:
         engine.dispose()
+
+    if replica_router:
+        for replica in replica_router.engines:
+            replica.dispose()
@@ -0,0 +1,150 @@
+"""
+Change feed capture for database mode.
+Every flushed create/update/delete of a reference-data model is appended to
+change_events in the same transaction, so the feed commits (or rolls back)
+together with the change itself. Bulk writes that bypass the ORM (the JSON
+importer) record a per-table 'reset' event instead.
+"""
+
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import event, insert
+
+from src.database.models import ChangeEvent, Hospital, Market, Municipality, Province, School
+from src.utils.signals import notify_recorded
+
+# Models published in the change feed (users and audit events are not)
+TRACKED_MODELS = (Province, Municipality, School, Market, Hospital)
+
+# Arbitrary application-wide key for the change-feed advisory lock
+CHANGE_FEED_LOCK_KEY = 0x616E676F
+
+
+def _tracked(obj) -> bool:
+    return isinstance(obj, TRACKED_MODELS)
+
+
+def _record_changes(session, flush_context):
+    """after_flush listener: append one change_events row per changed tracked object."""
+    now = datetime.utcnow()
+    rows = []
+
+    for obj in session.new:
+        if _tracked(obj):
+            rows.append(("create", obj, obj.to_dict()))
+    for obj in session.dirty:
+        if _tracked(obj) and session.is_modified(obj, include_collections=False):
+            rows.append(("update", obj, obj.to_dict()))
+    for obj in session.deleted:
+        if _tracked(obj):
+            rows.append(("delete", obj, None))
+
+    if not rows:
+        return
+
+    entries = _insert_events(
+        session.connection(),
+        [
+            {
+                "entity": obj.__tablename__,
+                "entity_id": obj.id,
+                "operation": operation,
+                "record": record,
+                "timestamp": now,
+            }
+            for operation, obj, record in rows
+        ],
+    )
+
+    # Published (GET /events) only once the transaction commits
+    session.info.setdefault("recorded_changes", []).extend(entries)
+
+
+def _insert_events(connection, rows: List[dict]) -> List[dict]:
+    """Append rows to change_events and return them as feed entries (with seq)."""
+    if connection.dialect.name == "postgresql":
+        # seq values are taken at insert time but become visible at commit; serialising
+        # the writers of the feed until commit keeps commit order equal to seq order,
+        # so a reader never skips a seq that commits after a higher one it has seen
+        connection.exec_driver_sql(f"SELECT pg_advisory_xact_lock({CHANGE_FEED_LOCK_KEY})")
+
+    table = ChangeEvent.__table__
+    result = connection.execute(insert(table).returning(*table.c, sort_by_parameter_order=True), rows)
+    return [ChangeEvent(**row._mapping).to_dict() for row in result.all()]
+
+
+def record_reset(connection, entity: str) -> dict:
+    """
+    Append a reset event for a whole table written outside the ORM (bulk import).
+
+    COPY and INSERT ... ON CONFLICT bypass the flush listeners, so no per-row events
+    exist for them. The reset entry moves seq forward (export/snapshot versions follow)
+    and tells feed clients to reload that entity from its /all endpoint.
+    Publish the returned entry with notify_recorded once the transaction commits.
+
+    Args:
+        connection: Connection inside the transaction that wrote the table
+        entity: Table name (e.g. 'schools')
+
+    Returns:
+        dict: The recorded feed entry
+    """
+    row = {"entity": entity, "entity_id": 0, "operation": "reset", "record": None, "timestamp": datetime.utcnow()}
+    return _insert_events(connection, [row])[0]
+
+
+def _mark_savepoint(session, transaction):
+    """after_transaction_create listener: remember where a savepoint's entries start."""
+    if transaction.nested:
+        marks = session.info.setdefault("change_marks", {})
+        marks[transaction] = len(session.info.get("recorded_changes", ()))
+
+
+def _publish_changes(session):
+    """after_commit listener: announce the committed feed entries."""
+    # Also fired when a savepoint is released; its entries wait for the root commit
+    if session.in_nested_transaction():
+        return
+    for entry in session.info.pop("recorded_changes", []):
+        notify_recorded(entry)
+
+
+def _discard_changes(session):
+    """after_rollback listener: rolled-back entries never existed."""
+    savepoint = session.get_nested_transaction()
+    if savepoint is None:
+        session.info.pop("recorded_changes", None)
+        return
+    # Only the entries recorded since the savepoint was opened are gone
+    mark = session.info.get("change_marks", {}).get(savepoint, 0)
+    del session.info.get("recorded_changes", [])[mark:]
+
+
+def _end_transaction(session, transaction):
+    """after_transaction_end listener: forget the savepoint mark; drop leftovers at the root."""
+    if transaction.parent is None:
+        # Neither committed nor rolled back (e.g. session.close()): nothing is published
+        session.info.pop("recorded_changes", None)
+        session.info.pop("change_marks", None)
+    else:
+        session.info.get("change_marks", {}).pop(transaction, None)
+
+
+def track_changes(session_factory):
+    """
+    Record changes of the tracked models for every session of a factory.
+
+    Args:
+        session_factory: sessionmaker whose sessions should feed change_events
+    """
+    # Marked on the factory itself: event.contains() looks listeners up by id() and can
+    # report a new factory as tracked when it reuses the id of a garbage-collected one
+    if getattr(session_factory, "_tracks_changes", False):
+        return
+    event.listen(session_factory, "after_flush", _record_changes)
+    event.listen(session_factory, "after_commit", _publish_changes)
+    event.listen(session_factory, "after_rollback", _discard_changes)
+    event.listen(session_factory, "after_transaction_create", _mark_savepoint)
+    event.listen(session_factory, "after_transaction_end", _end_transaction)
+    session_factory._tracks_changes = True
@@ -0,0 +1,332 @@
+"""
+Bulk importer from the data/*.json files into the database.
+Streams each file, upserts in large batches (COPY on PostgreSQL, multi-row
+INSERT ... ON CONFLICT elsewhere) and loads independent tables in parallel.
+"""
+
+import csv
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import inspect, text
+
+from src.database.change_log import TRACKED_MODELS, record_reset
+from src.database.models import Hospital, Market, Municipality, Province, School, User, UserRole
+from src.utils.signals import notify_recorded
+
+# Tables of the same stage only depend on earlier stages (foreign keys)
+IMPORT_STAGES = (
+    (("provinces", Province), ("users", User)),
+    (("municipalities", Municipality),),
+    (("schools", School), ("markets", Market), ("hospitals", Hospital)),
+)
+
+DEFAULT_BATCH_SIZE = 5000
+READ_CHUNK_SIZE = 1 << 16
+
+# Marks NULL in the CSV sent to COPY (an unquoted empty field would be ambiguous with '')
+COPY_NULL = "\\N"
+
+
+@dataclass
+class ImportResult:
+    """Outcome of importing one table."""
+
+    table: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def _decode_element(decoder: json.JSONDecoder, buffer: str, position: int, eof: bool) -> Optional[tuple]:
+    # (element, end), or None when the element may continue in the next chunk
+    try:
+        element, end = decoder.raw_decode(buffer, position)
+    except json.JSONDecodeError:
+        if eof:
+            raise
+        return None
+    # A bare scalar at the end of the buffer may be cut in the middle
+    if end < len(buffer) or eof:
+        return element, end
+    return None
+
+
+def iter_json_array(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Stream the elements of a top-level JSON array without loading the whole file.
+
+    Args:
+        path: JSON file containing an array
+        chunk_size: Characters read per chunk
+
+    Yields:
+        dict: Each array element
+    """
+    decoder = json.JSONDecoder()
+    whitespace = " \t\r\n"
+
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip(whitespace)
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} does not contain a JSON array")
+        position = 1
+        eof = False
+
+        while True:
+            # Skip separators
+            while position < len(buffer) and buffer[position] in whitespace + ",":
+                position += 1
+
+            if position < len(buffer) and buffer[position] == "]":
+                return
+
+            decoded = _decode_element(decoder, buffer, position, eof) if position < len(buffer) else None
+            if decoded is not None:
+                element, position = decoded
+                yield element
+                continue
+
+            if eof:
+                raise ValueError(f"{path}: unterminated JSON array")
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def prepare_row(model, record: dict, columns: Optional[set] = None) -> dict:
+    """
+    Convert a JSON record into a row for a model's table.
+
+    Keeps only the table columns (JSON mode stores denormalised extras such as
+    provincia_nome) and converts datetimes and user roles.
+
+    Args:
+        model: SQLAlchemy model
+        record: JSON record
+        columns: Column names of the model (computed when omitted)
+
+    Returns:
+        dict: Column values
+    """
+    if columns is None:
+        columns = {column.key for column in inspect(model).columns}
+
+    row = {key: value for key, value in record.items() if key in columns}
+    if isinstance(row.get("created_at"), str):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    if model is User:
+        row["role"] = UserRole(row.get("role") or UserRole.user.value)
+    return row
+
+
+def _batches(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _copy_value(value):
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, UserRole):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _copy_upsert(connection, table, columns: List[str], batch: List[dict]):
+    """Load a batch into a temporary staging table with COPY, then upsert it."""
+    staging = f"_import_{table.name}"
+    column_list = ", ".join(columns)
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column != "id")
+
+    connection.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP"
+    )
+    connection.exec_driver_sql(f"TRUNCATE {staging}")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([_copy_value(row.get(column)) for column in columns])
+    buffer.seek(0)
+
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+    connection.exec_driver_sql(
+        f"INSERT INTO {table.name} ({column_list}) SELECT {column_list} FROM {staging} "
+        f"ON CONFLICT (id) DO {'UPDATE SET ' + updates if updates else 'NOTHING'}"
+    )
+
+
+def _insert_upsert(connection, table, columns: List[str], batch: List[dict]):
+    """Upsert a batch with a multi-row INSERT ... ON CONFLICT DO UPDATE."""
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    # Every row needs the same keys for a single multi-row statement
+    rows = [{column: row.get(column) for column in columns} for row in batch]
+    statement = insert(table)
+    updates = {column: statement.excluded[column] for column in columns if column != "id"}
+    statement = (
+        statement.on_conflict_do_update(index_elements=["id"], set_=updates)
+        if updates
+        else statement.on_conflict_do_nothing(index_elements=["id"])
+    )
+    connection.execute(statement, rows)
+
+
+def _resync_sequence(connection, table_name: str):
+    """Move the id sequence past the imported ids (PostgreSQL)."""
+    connection.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence(:table, 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+            f"FROM {table_name}"
+        ),
+        {"table": table_name},
+    )
+
+
+def use_copy(engine, method: str = "auto") -> bool:
+    """
+    Decide whether batches are loaded with COPY.
+
+    Args:
+        engine: Target engine
+        method: 'copy', 'insert' or 'auto' (COPY on PostgreSQL with psycopg2)
+
+    Returns:
+        bool: True to use COPY
+    """
+    supported = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+    if method == "copy" and not supported:
+        raise ValueError("COPY requires PostgreSQL with psycopg2")
+    return supported if method == "auto" else method == "copy"
+
+
+def import_table(
+    engine, name: str, model, path: Path, batch_size: int = DEFAULT_BATCH_SIZE, method: str = "auto"
+) -> ImportResult:
+    """
+    Import one JSON file into its table in a single transaction.
+
+    The upserts bypass the ORM flush that feeds change_events, so a table of the
+    change feed also gets one 'reset' event (see change_log.record_reset): the
+    feed, export and snapshot versions advance and feed clients reload it.
+
+    Args:
+        engine: Target engine
+        name: Entity name (e.g. 'provinces')
+        model: SQLAlchemy model of the table
+        path: JSON file
+        batch_size: Rows per statement
+        method: 'copy', 'insert' or 'auto'
+
+    Returns:
+        ImportResult: Rows imported and elapsed time
+    """
+    table = model.__table__
+    columns = {column.key for column in inspect(model).columns}
+    copy = use_copy(engine, method)
+    start = time.perf_counter()
+    total = 0
+    reset = None
+
+    with engine.begin() as connection:
+        rows = (prepare_row(model, record, columns) for record in iter_json_array(path))
+        for batch in _batches(rows, batch_size):
+            batch_columns = [column.name for column in table.columns if any(column.name in row for row in batch)]
+            if copy:
+                _copy_upsert(connection, table, batch_columns, batch)
+            else:
+                _insert_upsert(connection, table, batch_columns, batch)
+            total += len(batch)
+
+        if connection.dialect.name == "postgresql":
+            _resync_sequence(connection, table.name)
+
+        if total and issubclass(model, TRACKED_MODELS):
+            reset = record_reset(connection, table.name)
+
+    # Published only once the transaction has committed
+    if reset is not None:
+        notify_recorded(reset)
+
+    return ImportResult(name, total, time.perf_counter() - start)
+
+
+def import_all(
+    engine,
+    data_dir: Path,
+    tables: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 4,
+    method: str = "auto",
+    on_result: Optional[Callable[[ImportResult], None]] = None,
+) -> List[ImportResult]:
+    """
+    Import the JSON files of a directory, stage by stage in foreign-key order.
+
+    Tables of the same stage are loaded in parallel (one connection each).
+    Every table is upserted by id, so running the import again is safe.
+
+    Args:
+        engine: Target engine
+        data_dir: Directory with the <table>.json files
+        tables: Restrict to these tables (default: all)
+        batch_size: Rows per statement
+        workers: Maximum tables loaded at the same time
+        method: 'copy', 'insert' or 'auto'
+        on_result: Called with each ImportResult as tables finish
+
+    Returns:
+        List[ImportResult]: One result per imported table
+    """
+    if engine.dialect.name == "sqlite":
+        # A single writer at a time: parallel loads would only wait on the file lock
+        workers = 1
+
+    results: List[ImportResult] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for stage in IMPORT_STAGES:
+            jobs: Dict[str, object] = {}
+            for name, model in stage:
+                path = Path(data_dir) / f"{name}.json"
+                if (tables and name not in tables) or not path.exists():
+                    continue
+                jobs[name] = executor.submit(import_table, engine, name, model, path, batch_size, method)
+
+            # The next stage starts only once its parents are committed
+            for name, job in jobs.items():
+                result = job.result()
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+    return results
@@ -5,9 +5,10 @@ SQLAlchemy models for AngoData API.
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import JSON, BigInteger, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from src.database.base import Base
@@ -85,10 +86,13 @@ class Municipality(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String(100), nullable=False, index=True)
-    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False, index=True)
+    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False)
     area_km2 = Column(Float)
     populacao = Column(Integer)
 
+    # Composite indexes for the filtered, name-ordered lookups (also serve provincia_id alone)
+    __table_args__ = (Index("ix_municipalities_provincia_id_nome", "provincia_id", "nome"),)
+
     # Relationships
     province = relationship("Province", back_populates="municipalities")
 
@@ -113,10 +117,21 @@ class School(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String(200), nullable=False, index=True)
-    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False, index=True)
-    municipio = Column(String(100))
+    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False)
+    municipio_id = Column(Integer, ForeignKey("municipalities.id"))
+    municipio = Column(String(100))  # Denormalised municipality name (kept in sync with municipio_id)
     tipo = Column(String(50))  # primário, secundário, técnico, etc.
     nivel = Column(String(50))  # ensino primário, médio, técnico, etc.
+    latitude = Column(Float)  # WGS84 degrees (optional)
+    longitude = Column(Float)
+
+    # Composite indexes for the filtered, name-ordered lookups (also serve provincia_id alone)
+    __table_args__ = (
+        Index("ix_schools_provincia_id_nome", "provincia_id", "nome"),
+        Index("ix_schools_municipio_id_nome", "municipio_id", "nome"),
+        # Bounding-box range scans for the nearby queries
+        Index("ix_schools_latitude_longitude", "latitude", "longitude"),
+    )
 
     # Relationships
     province = relationship("Province", back_populates="schools")
@@ -127,9 +142,12 @@ class School(Base):
             "id": self.id,
             "nome": self.nome,
             "provincia_id": self.provincia_id,
+            "municipio_id": self.municipio_id,
             "municipio": self.municipio,
             "tipo": self.tipo,
             "nivel": self.nivel,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
         }
 
     def __repr__(self):
@@ -143,10 +161,21 @@ class Market(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String(200), nullable=False, index=True)
-    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False, index=True)
-    municipio = Column(String(100))
+    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False)
+    municipio_id = Column(Integer, ForeignKey("municipalities.id"))
+    municipio = Column(String(100))  # Denormalised municipality name (kept in sync with municipio_id)
     tipo = Column(String(50))  # municipal, informal, grossista, etc.
     endereco = Column(String(255))
+    latitude = Column(Float)  # WGS84 degrees (optional)
+    longitude = Column(Float)
+
+    # Composite indexes for the filtered, name-ordered lookups (also serve provincia_id alone)
+    __table_args__ = (
+        Index("ix_markets_provincia_id_nome", "provincia_id", "nome"),
+        Index("ix_markets_municipio_id_nome", "municipio_id", "nome"),
+        # Bounding-box range scans for the nearby queries
+        Index("ix_markets_latitude_longitude", "latitude", "longitude"),
+    )
 
     # Relationships
     province = relationship("Province", back_populates="markets")
@@ -157,9 +186,12 @@ class Market(Base):
             "id": self.id,
             "nome": self.nome,
             "provincia_id": self.provincia_id,
+            "municipio_id": self.municipio_id,
             "municipio": self.municipio,
             "tipo": self.tipo,
             "endereco": self.endereco,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
         }
 
     def __repr__(self):
@@ -173,11 +205,22 @@ class Hospital(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String(200), nullable=False, index=True)
-    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False, index=True)
-    municipio = Column(String(100))
+    provincia_id = Column(Integer, ForeignKey("provinces.id"), nullable=False)
+    municipio_id = Column(Integer, ForeignKey("municipalities.id"))
+    municipio = Column(String(100))  # Denormalised municipality name (kept in sync with municipio_id)
     tipo = Column(String(50))  # central, provincial, municipal, posto de saúde, etc.
     endereco = Column(String(255))
     especialidades = Column(String(500))  # Comma-separated list
+    latitude = Column(Float)  # WGS84 degrees (optional)
+    longitude = Column(Float)
+
+    # Composite indexes for the filtered, name-ordered lookups (also serve provincia_id alone)
+    __table_args__ = (
+        Index("ix_hospitals_provincia_id_nome", "provincia_id", "nome"),
+        Index("ix_hospitals_municipio_id_nome", "municipio_id", "nome"),
+        # Bounding-box range scans for the nearby queries
+        Index("ix_hospitals_latitude_longitude", "latitude", "longitude"),
+    )
 
     # Relationships
     province = relationship("Province", back_populates="hospitals")
@@ -188,11 +231,108 @@ class Hospital(Base):
             "id": self.id,
             "nome": self.nome,
             "provincia_id": self.provincia_id,
+            "municipio_id": self.municipio_id,
             "municipio": self.municipio,
             "tipo": self.tipo,
             "endereco": self.endereco,
             "especialidades": self.especialidades,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
         }
 
     def __repr__(self):
         return f"<Hospital(id={self.id}, nome='{self.nome}')>"
+
+
+class AuditEvent(Base):
+    """
+    Audit log event.
+
+    In PostgreSQL the table is range-partitioned by month on ``timestamp``
+    (see the Alembic migration); the primary key there is ``(id, timestamp)``.
+    """
+
+    __tablename__ = "audit_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    action = Column(String(50), nullable=False)
+    resource_type = Column(String(50), nullable=False)
+    resource_id = Column(String(100))
+    user_id = Column(String(100))
+    user_email = Column(String(255))
+    ip_address = Column(String(45))
+    user_agent = Column(String(500))
+    details = Column(JSON().with_variant(JSONB, "postgresql"))
+
+    # Indexes matching the AuditLogger.get_logs filters (newest first)
+    __table_args__ = (
+        Index("ix_audit_events_timestamp", "timestamp"),
+        Index("ix_audit_events_action_timestamp", "action", "timestamp"),
+        Index("ix_audit_events_resource_type_timestamp", "resource_type", "timestamp"),
+        Index("ix_audit_events_user_id_timestamp", "user_id", "timestamp"),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary (same shape as the file audit log)."""
+        return {
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "action": self.action,
+            "resource_type": self.resource_type,
+            "resource_id": self.resource_id,
+            "user_id": self.user_id,
+            "user_email": self.user_email,
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+            "details": self.details,
+        }
+
+    def __repr__(self):
+        return f"<AuditEvent(id={self.id}, action='{self.action}', resource_type='{self.resource_type}')>"
+
+
+class ChangeEvent(Base):
+    """
+    Change feed entry: one row per create/update/delete of a reference-data record.
+    ``seq`` is the monotonically increasing position clients sync from.
+    """
+
+    __tablename__ = "change_events"
+
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # create, update, delete
+    record = Column(JSON().with_variant(JSONB, "postgresql"))  # None for deletes (tombstones)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        """Convert model to dictionary (same shape as the JSON-mode change log)."""
+        return {
+            "seq": self.seq,
+            "entity": self.entity,
+            "id": self.entity_id,
+            "operation": self.operation,
+            "record": self.record,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+        }
+
+    def __repr__(self):
+        return f"<ChangeEvent(seq={self.seq}, entity='{self.entity}', operation='{self.operation}')>"
+
+
+class ChangeFeedState(Base):
+    """
+    Single-row bookkeeping for the change feed.
+    ``pruned_through`` is the low-water mark: the highest seq removed by retention.
+    Clients behind it must resync; gaps in seq below the oldest row are not prunes.
+    """
+
+    __tablename__ = "change_feed_state"
+
+    id = Column(Integer, primary_key=True)
+    pruned_through = Column(BigInteger().with_variant(Integer, "sqlite"), nullable=False, default=0)
+    pruned_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ChangeFeedState(pruned_through={self.pruned_through})>"
@@ -0,0 +1,224 @@
+"""
+Connection pool configuration and instrumentation.
+Pool strategy, sizes and session timeouts come from the environment;
+pool activity is exported through the metrics registry.
+"""
+
+import os
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+from src.utils.metrics import registry
+
+CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection (includes opening new ones)"
+)
+CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT (pool exhausted)"
+)
+CHECKOUTS = registry.counter("db_pool_checkouts_total", "Connections checked out of the pool")
+CONNECTIONS_OPENED = registry.counter("db_pool_connections_opened_total", "New DBAPI connections opened")
+INVALIDATIONS = registry.counter("db_pool_invalidations_total", "Connections invalidated (errors or failed pings)")
+PRE_PING_FAILURES = registry.counter("db_pool_pre_ping_failures_total", "Pre-ping checks that found a dead connection")
+IN_USE = registry.gauge("db_pool_connections_in_use", "Connections currently checked out")
+
+# role → engine, read by the callback gauges at scrape time
+_engines: Dict[str, Any] = {}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() == "true"
+
+
+def engine_options_from_env() -> Dict[str, Any]:
+    """
+    Build create_engine() pool options from the environment.
+
+    DB_POOL_MODE=queue (default) keeps a local pool sized by DB_POOL_SIZE /
+    DB_MAX_OVERFLOW; DB_POOL_MODE=null opens a connection per checkout, for use
+    behind PgBouncer in transaction pooling mode.
+
+    Returns:
+        dict: Keyword arguments for create_engine()
+    """
+    mode = os.getenv("DB_POOL_MODE", "queue").lower()
+
+    if mode == "null":
+        # A fresh connection per checkout: nothing to ping, nothing to recycle
+        return {"poolclass": NullPool, "pool_pre_ping": False, "echo": False}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),  # Number of connections to maintain
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),  # Max additional connections
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),  # Seconds to wait for a free connection
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", -1)),  # Seconds before reconnecting (-1 = never)
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),  # Verify connections before using
+        "echo": False,  # Set to True for SQL logging during debug
+    }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection."""
+
+    metrics_role = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            CHECKOUT_TIMEOUTS.inc(role=self.metrics_role)
+            raise
+        finally:
+            CHECKOUT_WAIT.observe(time.perf_counter() - start, role=self.metrics_role)
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep the metrics label
+        pool = super().recreate()
+        pool.metrics_role = self.metrics_role
+        return pool
+
+
+def _timeout_statements(statement_timeout_ms: int, lock_timeout_ms: int, local: bool) -> list:
+    scope = "SET LOCAL" if local else "SET"
+    statements = []
+    if statement_timeout_ms:
+        statements.append(f"{scope} statement_timeout = {int(statement_timeout_ms)}")
+    if lock_timeout_ms:
+        statements.append(f"{scope} lock_timeout = {int(lock_timeout_ms)}")
+    return statements
+
+
+def _run_statements(dbapi_connection, statements: list):
+    cursor = dbapi_connection.cursor()
+    try:
+        for statement in statements:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def _apply_session_timeouts(dbapi_connection, statements: list):
+    """Set PostgreSQL statement/lock timeouts on a new connection (outside any transaction)."""
+    existing_autocommit = dbapi_connection.autocommit
+    dbapi_connection.autocommit = True
+    try:
+        _run_statements(dbapi_connection, statements)
+    finally:
+        dbapi_connection.autocommit = existing_autocommit
+
+
+def _apply_transaction_timeouts(dbapi_connection, statements: list):
+    """Set PostgreSQL statement/lock timeouts for the transaction being started (SET LOCAL)."""
+    _run_statements(dbapi_connection, statements)
+
+
+def _attach_timeouts(engine):
+    """
+    Apply DB_STATEMENT_TIMEOUT_MS / DB_LOCK_TIMEOUT_MS to a PostgreSQL engine.
+
+    With the local QueuePool each connection is ours for its whole life, so a
+    session-level SET on connect is enough. With DB_POOL_MODE=null the app sits
+    behind PgBouncer in transaction pooling mode: a session SET would land on
+    whichever server connection PgBouncer picked, leak to other clients and be
+    missing from the next transaction. There, SET LOCAL is issued at the start of
+    every transaction instead, and expires with it.
+    """
+    statement_timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    lock_timeout_ms = int(os.getenv("DB_LOCK_TIMEOUT_MS", 0))
+    if engine.dialect.name != "postgresql" or not (statement_timeout_ms or lock_timeout_ms):
+        return
+
+    if isinstance(engine.pool, NullPool):
+        statements = _timeout_statements(statement_timeout_ms, lock_timeout_ms, local=True)
+
+        @event.listens_for(engine, "begin")
+        def on_begin(connection):
+            _apply_transaction_timeouts(connection.connection.dbapi_connection, statements)
+
+    else:
+        statements = _timeout_statements(statement_timeout_ms, lock_timeout_ms, local=False)
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            _apply_session_timeouts(dbapi_connection, statements)
+
+
+def _count_failed_pings(engine, role: str):
+    # Count failed pre-pings (the pool reconnects transparently, so they are otherwise invisible)
+    do_ping = engine.dialect.do_ping
+
+    def counting_do_ping(dbapi_connection):
+        try:
+            alive = do_ping(dbapi_connection)
+        except Exception:
+            PRE_PING_FAILURES.inc(role=role)
+            raise
+        if not alive:
+            PRE_PING_FAILURES.inc(role=role)
+        return alive
+
+    engine.dialect.do_ping = counting_do_ping
+
+
+def instrument_engine(engine, role: str = "primary"):
+    """
+    Attach pool metrics and statement/lock timeouts to an engine.
+    Timeouts are a session SET on connect with the queue pool and a per-transaction
+    SET LOCAL with DB_POOL_MODE=null (PgBouncer); see _attach_timeouts.
+
+    Args:
+        engine: SQLAlchemy engine
+        role: Metrics label ('primary', 'replica0', ...)
+
+    Returns:
+        engine: The same engine
+    """
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics_role = role
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        CONNECTIONS_OPENED.inc(role=role)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        CHECKOUTS.inc(role=role)
+        IN_USE.inc(role=role)
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        IN_USE.dec(role=role)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        INVALIDATIONS.inc(role=role)
+
+    _attach_timeouts(engine)
+    _count_failed_pings(engine, role)
+
+    _engines[role] = engine
+    return engine
+
+
+def _pool_gauge(read):
+    def collect():
+        return [
+            ({"role": role}, read(engine.pool))
+            for role, engine in list(_engines.items())
+            if isinstance(engine.pool, QueuePool)
+        ]
+
+    return collect
+
+
+registry.gauge_callback("db_pool_size", "Configured number of pooled connections", _pool_gauge(lambda pool: pool.size()))
+registry.gauge_callback("db_pool_connections_idle", "Connections idle in the pool", _pool_gauge(lambda pool: pool.checkedin()))
+registry.gauge_callback(
+    "db_pool_overflow", "Connections open beyond pool_size", _pool_gauge(lambda pool: max(pool.overflow(), 0))
+)
@@ -0,0 +1,207 @@
+"""
+Read-replica routing for the database layer.
+Read-only request sessions go to a healthy replica (round-robin);
+writes, and reads shortly after a client's own write, go to the primary.
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+
+class ReplicaRouter:
+    """Round-robin selection over replica engines with passive health checks."""
+
+    def __init__(self, engines: List, retry_interval: float = 30):
+        """
+        Args:
+            engines: Replica engines
+            retry_interval: Seconds a failed replica stays out of rotation before being probed again
+        """
+        self.engines = list(engines)
+        self.retry_interval = retry_interval
+        self._cycle = itertools.count()
+        self._down: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # Only connection-level failures take a replica out of rotation
+        if context.is_disconnect and context.engine is not None:
+            self.mark_down(context.engine)
+
+    def mark_down(self, engine):
+        """
+        Take a replica out of rotation for retry_interval seconds.
+
+        Args:
+            engine: Failed replica engine
+        """
+        with self._lock:
+            self._down[id(engine)] = time.monotonic() + self.retry_interval
+
+    def _is_available(self, engine) -> bool:
+        retry_at = self._down.get(id(engine))
+        if retry_at is None:
+            return True
+        if time.monotonic() < retry_at:
+            return False
+
+        # Retry window elapsed: probe before sending traffic again
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("SELECT 1")
+        except Exception:
+            self.mark_down(engine)
+            return False
+
+        with self._lock:
+            self._down.pop(id(engine), None)
+        return True
+
+    def pick(self):
+        """
+        Choose the next healthy replica.
+
+        Returns:
+            Engine or None: Replica engine, or None if every replica is down
+        """
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._cycle) % len(self.engines)]
+            if self._is_available(engine):
+                return engine
+        return None
+
+    def get_stats(self) -> dict:
+        """
+        Get replica health information.
+
+        Returns:
+            dict: Number of replicas and how many are currently out of rotation
+        """
+        now = time.monotonic()
+        down = sum(1 for retry_at in self._down.values() if retry_at > now)
+        return {"replicas": len(self.engines), "down": down}
+
+
+class WriteStickiness:
+    """
+    Remembers clients that wrote recently so their next reads hit the primary.
+    Uses the shared application cache when available (works across processes
+    with Redis) and an in-process dict otherwise.
+    """
+
+    KEY_PREFIX = "db_sticky:"
+
+    def __init__(self, window: float = 5):
+        """
+        Args:
+            window: Seconds after a write during which the client reads from the primary
+        """
+        self.window = window
+        self._local: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _shared_cache():
+        from flask import current_app
+        from flask_caching.backends import NullCache
+
+        from src.utils.cache import cache
+
+        backend = current_app.extensions.get("cache", {}).get(cache)
+        if backend is None or isinstance(backend, NullCache):
+            return None
+        return backend
+
+    @staticmethod
+    def client_key() -> str:
+        """
+        Identify the client of the current request (JWT identity, else IP address).
+
+        Returns:
+            str: Client key
+        """
+        from flask import request
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+
+        return f"user:{identity}" if identity is not None else f"ip:{request.remote_addr}"
+
+    def mark(self):
+        """Record a write by the current client."""
+        if self.window <= 0:
+            return
+
+        key = self.KEY_PREFIX + self.client_key()
+        backend = self._shared_cache()
+        if backend is not None:
+            backend.set(key, 1, timeout=max(1, int(round(self.window))))
+            return
+
+        with self._lock:
+            self._local[key] = time.monotonic() + self.window
+
+    def is_sticky(self) -> bool:
+        """
+        Check whether the current client wrote within the stickiness window.
+
+        Returns:
+            bool: True if the client's reads must go to the primary
+        """
+        if self.window <= 0:
+            return False
+
+        key = self.KEY_PREFIX + self.client_key()
+        backend = self._shared_cache()
+        if backend is not None:
+            return backend.get(key) is not None
+
+        with self._lock:
+            until = self._local.get(key)
+            if until is None:
+                return False
+            if time.monotonic() >= until:
+                del self._local[key]
+                return False
+            return True
+
+
+def replica_urls_from_env() -> List[str]:
+    """
+    Read DATABASE_REPLICA_URLS (comma-separated).
+
+    Returns:
+        List[str]: Replica connection URLs (may be empty)
+    """
+    return [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+
+def choose_read_bind(router: Optional[ReplicaRouter], stickiness: Optional[WriteStickiness], primary):
+    """
+    Choose the engine for a read-only request session.
+
+    Args:
+        router: Replica router (None when no replicas are configured)
+        stickiness: Read-your-writes tracker
+        primary: Primary engine
+
+    Returns:
+        Engine: A healthy replica, or the primary when sticky / no replica is available
+    """
+    if router is None:
+        return primary
+    if stickiness is not None and stickiness.is_sticky():
+        return primary
+    return router.pick() or primary
@@ -0,0 +1,134 @@
+"""
+Embedded SQLite storage backend (STORAGE_BACKEND=sqlite).
+Reuses the SQLAlchemy models and *ServiceDB services against a local file.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy import event
+
+# Default database file, next to the JSON data files
+DEFAULT_SQLITE_PATH = Path(__file__).parent.parent.parent / "data" / "angodata.db"
+
+# PRAGMAs applied to every new connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # Readers never block the writer
+    "PRAGMA synchronous=NORMAL",  # Durable at checkpoints; safe with WAL
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def sqlite_url() -> str:
+    """
+    Build the SQLite URL from SQLITE_PATH.
+
+    Returns:
+        str: sqlite:/// URL
+    """
+    path = Path(os.getenv("SQLITE_PATH", str(DEFAULT_SQLITE_PATH)))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return f"sqlite:///{path}"
+
+
+def sqlite_engine_options() -> Dict[str, Any]:
+    """
+    Build create_engine() options for the SQLite backend.
+
+    A bounded QueuePool: at most SQLITE_POOL_SIZE + SQLITE_MAX_OVERFLOW
+    connections (each with its own page cache and mmap) however many threads the
+    server runs; further checkouts wait up to SQLITE_POOL_TIMEOUT. A connection is
+    used by one thread at a time and returned to the pool with the session.
+    LIFO checkout keeps reusing the warmest connections. SQLite serialises
+    writers itself and busy_timeout makes them wait instead of failing.
+
+    Returns:
+        dict: Keyword arguments for create_engine()
+    """
+    from src.database.pool import InstrumentedQueuePool
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("SQLITE_POOL_SIZE", 8)),
+        "max_overflow": int(os.getenv("SQLITE_MAX_OVERFLOW", 8)),
+        "pool_timeout": float(os.getenv("SQLITE_POOL_TIMEOUT", 30)),
+        "pool_use_lifo": True,
+        # Connections move between threads (never used by two at once)
+        "connect_args": {"check_same_thread": False, "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", 5))},
+        "echo": False,
+    }
+
+
+def configure_sqlite_engine(engine):
+    """
+    Apply WAL and the other PRAGMAs to every new connection, and let SQLAlchemy
+    (not pysqlite) start transactions.
+
+    pysqlite only emits BEGIN before DML, so a SAVEPOINT (Session.begin_nested)
+    would run outside any transaction and its RELEASE would commit. This is the
+    documented fix: disable pysqlite's own transaction handling and emit BEGIN
+    from the "begin" event.
+
+    Args:
+        engine: SQLite engine
+    """
+    cache_size_kb = int(os.getenv("SQLITE_CACHE_SIZE_KB", 16384))
+    mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", 128 * 1024 * 1024))
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.execute(f"PRAGMA cache_size=-{cache_size_kb}")
+            cursor.execute(f"PRAGMA mmap_size={mmap_size}")
+        finally:
+            cursor.close()
+
+        # No implicit BEGIN/COMMIT from pysqlite
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def create_and_seed(engine):
+    """
+    Create the schema and, on an empty database, load the JSON data files.
+
+    Args:
+        engine: SQLite engine
+    """
+    from sqlalchemy.orm import Session
+
+    from src.database.base import Base
+    from src.database.importer import prepare_row
+    from src.database.json_storage import JSONStorage
+    from src.database.models import Hospital, Market, Municipality, Province, School, User
+
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as session:
+        if session.query(Province.id).first() is not None:
+            return
+
+        data = JSONStorage.load_all_entities()
+
+        # Parents first (foreign keys are enforced)
+        for model, records in (
+            (Province, data["provinces"]),
+            (Municipality, data["municipalities"]),
+            (School, data["schools"]),
+            (Market, data["markets"]),
+            (Hospital, data["hospitals"]),
+            (User, data.get("users") or []),
+        ):
+            if records:
+                session.bulk_insert_mappings(model, [prepare_row(model, record) for record in records])
+
+        session.commit()
+        print(f"✓ SQLite inicializado a partir dos arquivos JSON ({len(data['provinces'])} províncias)")
@@ -4,10 +4,29 @@ Exporta todos os Blueprints para registro na aplicação.
 """
 
 from .auth import auth_bp
+from .changes import changes_bp
+from .events import events_bp
+from .geo import geo_bp
 from .hospitals import hospitals_bp
 from .markets import markets_bp
+from .metrics import metrics_bp
 from .municipalities import municipalities_bp
 from .provinces import provinces_bp
 from .schools import schools_bp
+from .search import search_bp
+from .snapshot import snapshot_bp
 
-__all__ = ["provinces_bp", "municipalities_bp", "schools_bp", "markets_bp", "hospitals_bp", "auth_bp"]
+__all__ = [
+    "provinces_bp",
+    "municipalities_bp",
+    "schools_bp",
+    "markets_bp",
+    "hospitals_bp",
+    "auth_bp",
+    "search_bp",
+    "metrics_bp",
+    "changes_bp",
+    "events_bp",
+    "snapshot_bp",
+    "geo_bp",
+]
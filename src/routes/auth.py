@@ -3,14 +3,15 @@ Rotas para autenticação e autorização.
 Blueprint que gerencia registro, login e gestão de usuários.
 """
 
-from flask import Blueprint, current_app, jsonify, request
-from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt, get_jwt_identity, jwt_required
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt_identity, jwt_required
 from marshmallow import ValidationError
 
 from src.schemas.user_schema import UserLoginSchema, UserRegistrationSchema, UserResponseSchema
 from src.services.auth_service import AuthService
 from src.utils.audit import AuditLogger, audit_log
-from src.utils.decorators import admin_required
+from src.utils.decorators import admin_required, get_auth_context
+from src.utils.rate_limit import limiter
 
 # Criação do Blueprint para autenticação
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
@@ -50,15 +51,13 @@ def register():
 
 
 @auth_bp.route("/login", methods=["POST"])
+@limiter.limit("5 per minute")
 def login():
     """
     POST /auth/login
     Autentica um usuário e retorna tokens JWT.
     Rate limit: 5 tentativas por minuto
     """
-    limiter = current_app.limiter
-    limiter.limit("5 per minute")(lambda: None)()
-
     try:
         data = login_schema.load(request.get_json())
 
@@ -138,7 +137,7 @@ def get_current_user():
     Retorna informações do usuário autenticado.
     """
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_auth_context()["user_id"]
         user = AuthService.get_user_by_id(current_user_id)
 
         if user:
@@ -159,8 +158,7 @@ def get_all_users():
     """
     try:
         # Verificar se usuário é admin
-        claims = get_jwt()
-        if claims.get("role") != "admin":
+        if get_auth_context()["role"] != "admin":
             return jsonify({"success": False, "message": "Acesso negado. Permissões insuficientes"}), 403
 
         users = AuthService.get_all_users()
@@ -184,6 +182,8 @@ def get_audit_logs():
         - action: filtrar por tipo de ação
         - resource_type: filtrar por tipo de recurso
         - user_id: filtrar por ID do usuário
+        - since / until: janela de tempo (ISO 8601, inclusive)
+        - cursor: cursor devolvido em next_cursor pela página anterior
     """
     try:
         # Obter parâmetros de query
@@ -192,9 +192,21 @@ def get_audit_logs():
         resource_type = request.args.get("resource_type")
         user_id = request.args.get("user_id")
 
-        # Buscar logs
-        logs = AuditLogger.get_logs(limit=limit, action=action, resource_type=resource_type, user_id=user_id)
+        # Buscar logs (mais recentes primeiro)
+        try:
+            result = AuditLogger.query_logs(
+                limit=limit,
+                action=action,
+                resource_type=resource_type,
+                user_id=user_id,
+                since=request.args.get("since"),
+                until=request.args.get("until"),
+                cursor=request.args.get("cursor"),
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "message": f"Parâmetros inválidos: {str(e)}"}), 400
 
-        return jsonify({"success": True, "total": len(logs), "data": logs}), 200
+        logs = result["data"]
+        return jsonify({"success": True, "total": len(logs), "data": logs, "next_cursor": result["next_cursor"]}), 200
     except Exception as e:
         return jsonify({"success": False, "message": f"Erro ao buscar logs de auditoria: {str(e)}"}), 500
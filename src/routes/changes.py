@@ -0,0 +1,69 @@
+"""Rotas do feed de alterações.
+Blueprint para sincronização incremental: clientes pedem apenas o que mudou.
+"""
+
+from flask import Blueprint, jsonify, request
+
+from src.services.service_factory import ServiceFactory
+
+# Importado aqui para que o registro (modo JSON) acompanhe as escritas desde o arranque
+from src.utils import change_feed  # noqa: F401
+
+# Criação do Blueprint para alterações
+changes_bp = Blueprint("changes", __name__, url_prefix="/changes")
+
+DEFAULT_CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+
+
+@changes_bp.route("", methods=["GET"])
+def get_changes():
+    """
+    GET /changes?since=<seq>&limit=<n>
+    Retorna criações, atualizações e remoções (tombstones, record=null) com sequência maior que 'since'.
+    Para continuar, usar next_since como o próximo 'since'; has_more indica que há mais páginas.
+    Uma importação em massa (modo database) gera uma entrada operation='reset' (id=0, record=null)
+    por tabela: o cliente recarrega essa entidade pelo endpoint /all.
+    Se as alterações posteriores a 'since' já não estiverem disponíveis, retorna 410
+    e o cliente deve refazer a sincronização completa (endpoints /all) a partir de 'latest'.
+    Se o feed não puder ser lido, retorna 503 (o cliente mantém o seu 'since').
+    """
+    since = request.args.get("since", 0, type=int)
+    if since < 0:
+        return jsonify({"success": False, "message": "Parâmetro 'since' deve ser >= 0"}), 400
+
+    limit = min(max(request.args.get("limit", DEFAULT_CHANGES_LIMIT, type=int), 1), MAX_CHANGES_LIMIT)
+
+    ChangeService = ServiceFactory.get_change_service()
+    result = ChangeService.get_changes(since, limit=limit)
+
+    if result.get("error"):
+        return jsonify({"success": False, "message": "Feed de alterações indisponível, tente mais tarde"}), 503
+
+    if result["reset"]:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Alterações desde 'since' não estão mais disponíveis; refaça a sincronização completa",
+                    "latest": result["latest"],
+                }
+            ),
+            410,
+        )
+
+    changes = result["data"]
+    return (
+        jsonify(
+            {
+                "success": True,
+                "since": since,
+                "next_since": changes[-1]["seq"] if changes else max(since, 0),
+                "latest": result["latest"],
+                "has_more": result["has_more"],
+                "total": len(changes),
+                "data": changes,
+            }
+        ),
+        200,
+    )
@@ -0,0 +1,181 @@
+"""Rotas de notificações em tempo real.
+Blueprint com o canal Server-Sent Events de alterações dos dados.
+"""
+
+import json
+import os
+
+from flask import Blueprint, Response, jsonify, request
+
+from src.services.service_factory import ServiceFactory
+from src.utils.events import broadcaster, to_notification
+from src.utils.search_index import SEARCH_ENTITIES
+
+# Criação do Blueprint para eventos
+events_bp = Blueprint("events", __name__, url_prefix="/events")
+
+REPLAY_PAGE_SIZE = 500
+
+
+def _format_event(notification: dict) -> str:
+    return f"id: {notification['version']}\nevent: change\ndata: {json.dumps(notification)}\n\n"
+
+
+def _replay(ChangeService, since: int, entities):
+    """
+    Notificações perdidas desde 'since', lidas do feed de alterações.
+
+    Yields:
+        tuple: ('change', notificação), ('position', última sequência lida)
+               ou ('reset', última sequência)
+    """
+    while True:
+        result = ChangeService.get_changes(since, limit=REPLAY_PAGE_SIZE)
+        if result.get("error"):
+            # Feed indisponível: a próxima releitura (religação, overflow ou intervalo) tenta de novo
+            return
+        if result["reset"]:
+            yield "reset", result["latest"]
+            return
+        for entry in result["data"]:
+            since = entry["seq"]
+            if entities is None or entry["entity"] in entities:
+                yield "change", to_notification(entry)
+        yield "position", since
+        if not result["has_more"]:
+            return
+
+
+def _catch_up(subscription, ChangeService, last: int):
+    """
+    Descarta o buffer da assinatura e relê o feed de alterações a partir de 'last'.
+
+    Yields:
+        tuple: (texto do evento SSE ou None, posição no feed)
+    """
+    subscription.overflowed = False
+    while subscription.get(timeout=0) is not None:
+        pass
+    for kind, value in _replay(ChangeService, last, subscription.entities):
+        if kind == "reset":
+            yield f"event: reset\ndata: {json.dumps({'version': value})}\n\n", value
+        elif kind == "position":
+            yield None, value
+        else:
+            yield _format_event(value), value["version"]
+
+
+def _advance(subscription, last: int) -> int:
+    """Avança a posição sobre as versões seguintes que eram de outras entidades."""
+    while last + 1 in subscription.skipped:
+        subscription.skipped.discard(last + 1)
+        last += 1
+    return last
+
+
+def _forget_skipped(subscription, last: int):
+    # Versões de outras entidades publicadas fora de ordem, já cobertas pela posição
+    subscription.skipped = {version for version in subscription.skipped if version > last}
+
+
+def _stream(subscription, ChangeService, last: int, heartbeat: float):
+    """Gerador do canal SSE: releitura inicial, notificações ao vivo e heartbeats."""
+    try:
+        yield f"retry: {int(heartbeat * 1000)}\n\n"
+
+        pending_replay = True
+        while True:
+            if pending_replay or subscription.overflowed:
+                # Cliente religado, buffer cheio ou notificação fora de ordem: recuperar a partir do feed
+                for chunk, last in _catch_up(subscription, ChangeService, last):
+                    if chunk:
+                        yield chunk
+                _forget_skipped(subscription, last)
+                pending_replay = False
+
+            notification = subscription.get(timeout=heartbeat)
+            last = _advance(subscription, last)
+            if notification is None:
+                _forget_skipped(subscription, last)
+                yield ": heartbeat\n\n"
+                continue
+
+            # Até 'last' tudo já foi enviado (ao vivo ou pela releitura do feed)
+            if notification["version"] <= last:
+                continue
+
+            # A publicação acontece depois do commit e não segue a ordem do feed (a 6 pode
+            # chegar antes da 5): o intervalo é preenchido pelo feed, que já inclui esta
+            if notification["version"] != last + 1:
+                pending_replay = True
+                continue
+
+            last = notification["version"]
+            yield _format_event(notification)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+def _unavailable(message: str):
+    response = jsonify({"success": False, "message": message})
+    response.status_code = 503
+    response.headers["Retry-After"] = "30"
+    return response
+
+
+@events_bp.route("", methods=["GET"])
+def stream_events():
+    """
+    GET /events?types=<entidades>
+    Canal SSE com uma notificação por alteração: {entity, id, op, version}.
+    O id de cada evento é a sequência no feed de alterações; ao religar, o navegador
+    envia Last-Event-ID e as notificações perdidas são reenviadas (GET /changes).
+    Se já não estiverem disponíveis, é enviado um evento 'reset' e o cliente deve recarregar os dados.
+    Comentários ': heartbeat' mantêm a ligação aberta através de proxies.
+    """
+    types = request.args.get("types", "", type=str)
+    entities = [t.strip() for t in types.split(",") if t.strip()] or None
+    invalid = [t for t in entities or [] if t not in SEARCH_ENTITIES]
+    if invalid:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"Tipos inválidos: {', '.join(invalid)}. Use: {', '.join(SEARCH_ENTITIES)}",
+                }
+            ),
+            400,
+        )
+
+    max_clients = int(os.getenv("SSE_MAX_CLIENTS", 100))
+    if broadcaster.client_count >= max_clients:
+        return _unavailable("Limite de ligações em tempo real atingido")
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        since = int(last_event_id) if last_event_id else None
+    except ValueError:
+        since = None
+
+    heartbeat = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+    buffer_size = int(os.getenv("SSE_CLIENT_BUFFER", 256))
+    ChangeService = ServiceFactory.get_change_service()
+
+    # Assinar antes de ler a posição atual: nada publicado entre as duas coisas se perde
+    subscription = broadcaster.subscribe(entities, buffer_size)
+    if since is None:
+        since = ChangeService.get_changes(0, limit=1)["latest"]
+        if since is None:
+            broadcaster.unsubscribe(subscription)
+            return _unavailable("Feed de alterações indisponível, tente mais tarde")
+
+    # Corre fora do contexto do request: as releituras do feed usam sessões próprias
+    # em vez de manter a sessão do request (e uma conexão) aberta durante toda a ligação
+    response = Response(
+        _stream(subscription, ChangeService, since, heartbeat),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Cliente que desliga antes do primeiro byte: o gerador nunca corre o finally
+    response.call_on_close(lambda: broadcaster.unsubscribe(subscription))
+    return response
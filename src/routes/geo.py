@@ -0,0 +1,39 @@
+"""Rotas geográficas.
+Blueprint com a geocodificação reversa (coordenada → província e município).
+"""
+
+from flask import Blueprint, jsonify, request
+
+from src.utils.boundaries import boundary_index
+
+# Criação do Blueprint para consultas geográficas
+geo_bp = Blueprint("geo", __name__, url_prefix="/geo")
+
+
+@geo_bp.route("/locate", methods=["GET"])
+def locate():
+    """
+    GET /geo/locate?lat=<lat>&lon=<lon>
+    Retorna a província e o município que contêm a coordenada.
+    Usa os limites simplificados carregados no arranque (scripts/build_boundaries.py);
+    sem eles retorna 503. Coordenada fora de todos os limites retorna 404.
+    """
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+
+    if lat is None or lon is None:
+        return jsonify({"success": False, "message": "Parâmetros 'lat' e 'lon' são obrigatórios"}), 400
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        return (
+            jsonify({"success": False, "message": "Coordenadas inválidas: lat entre -90 e 90, lon entre -180 e 180"}),
+            400,
+        )
+
+    if not boundary_index.is_loaded:
+        return jsonify({"success": False, "message": "Limites geográficos não disponíveis"}), 503
+
+    location = boundary_index.locate(lat, lon)
+    if location is None:
+        return jsonify({"success": False, "message": "Coordenada fora dos limites conhecidos"}), 404
+
+    return jsonify({"success": True, "data": {"lat": lat, "lon": lon, **location}}), 200
@@ -8,7 +8,10 @@ from marshmallow import ValidationError
 
 from src.schemas.hospital_schema import HospitalSchema
 from src.services.service_factory import ServiceFactory
+from src.utils.columnar import export_response
 from src.utils.decorators import editor_or_admin_required
+from src.utils.geo import get_nearby_params
+from src.utils.pagination import SearchHelper
 
 # Criação do Blueprint para hospitais
 hospitals_bp = Blueprint("hospitals", __name__, url_prefix="/hospitals")
@@ -38,6 +41,49 @@ def get_all_hospitals():
     return jsonify({"success": True, "total": len(hospitals), "data": hospitals}), 200
 
 
+@hospitals_bp.route("/autocomplete", methods=["GET"])
+def autocomplete_hospitals():
+    """
+    GET /hospitals/autocomplete?prefix=<texto>&limit=<n>&provincia_id=<id>
+    Sugere hospitais cujo nome começa pelo prefixo (ignora acentos).
+    """
+    HospitalService = ServiceFactory.get_hospital_service()
+    prefix, limit, provincia_id = SearchHelper.get_autocomplete_params()
+
+    if not prefix:
+        return jsonify({"success": False, "message": "Parâmetro 'prefix' é obrigatório"}), 400
+
+    suggestions = HospitalService.autocomplete(prefix, limit=limit, provincia_id=provincia_id)
+    return jsonify({"success": True, "total": len(suggestions), "data": suggestions}), 200
+
+
+@hospitals_bp.route("/nearby", methods=["GET"])
+def nearby_hospitals():
+    """
+    GET /hospitals/nearby?lat=<lat>&lon=<lon>&radius_km=<km>&limit=<n>
+    Retorna os hospitais mais próximos do ponto, do mais próximo ao mais distante, com 'distancia_km'.
+    Sem radius_km, retorna os 'limit' mais próximos (k vizinhos mais próximos).
+    Apenas registros com latitude/longitude são considerados.
+    """
+    params, error = get_nearby_params()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    HospitalService = ServiceFactory.get_hospital_service()
+    results = HospitalService.get_nearby(**params)
+    return jsonify({"success": True, "total": len(results), "data": results}), 200
+
+
+@hospitals_bp.route("/export", methods=["GET"])
+def export_hospitals():
+    """
+    GET /hospitals/export?format=parquet|arrow
+    Exporta todos os hospitais num arquivo colunar (Parquet ou Arrow IPC) com tipos
+    corretos e colunas categóricas codificadas em dicionário. Requer pyarrow.
+    """
+    return export_response("hospitals")
+
+
 @hospitals_bp.route("/<int:hospital_id>", methods=["GET"])
 def get_hospital_by_id(hospital_id):
     """
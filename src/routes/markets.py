@@ -8,7 +8,10 @@ from marshmallow import ValidationError
 
 from src.schemas.market_schema import MarketSchema
 from src.services.service_factory import ServiceFactory
+from src.utils.columnar import export_response
 from src.utils.decorators import editor_or_admin_required
+from src.utils.geo import get_nearby_params
+from src.utils.pagination import SearchHelper
 
 # Criação do Blueprint para mercados
 markets_bp = Blueprint("markets", __name__, url_prefix="/markets")
@@ -38,6 +41,49 @@ def get_all_markets():
     return jsonify({"success": True, "total": len(markets), "data": markets}), 200
 
 
+@markets_bp.route("/autocomplete", methods=["GET"])
+def autocomplete_markets():
+    """
+    GET /markets/autocomplete?prefix=<texto>&limit=<n>&provincia_id=<id>
+    Sugere mercados cujo nome começa pelo prefixo (ignora acentos).
+    """
+    MarketService = ServiceFactory.get_market_service()
+    prefix, limit, provincia_id = SearchHelper.get_autocomplete_params()
+
+    if not prefix:
+        return jsonify({"success": False, "message": "Parâmetro 'prefix' é obrigatório"}), 400
+
+    suggestions = MarketService.autocomplete(prefix, limit=limit, provincia_id=provincia_id)
+    return jsonify({"success": True, "total": len(suggestions), "data": suggestions}), 200
+
+
+@markets_bp.route("/nearby", methods=["GET"])
+def nearby_markets():
+    """
+    GET /markets/nearby?lat=<lat>&lon=<lon>&radius_km=<km>&limit=<n>
+    Retorna os mercados mais próximos do ponto, do mais próximo ao mais distante, com 'distancia_km'.
+    Sem radius_km, retorna os 'limit' mais próximos (k vizinhos mais próximos).
+    Apenas registros com latitude/longitude são considerados.
+    """
+    params, error = get_nearby_params()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    MarketService = ServiceFactory.get_market_service()
+    results = MarketService.get_nearby(**params)
+    return jsonify({"success": True, "total": len(results), "data": results}), 200
+
+
+@markets_bp.route("/export", methods=["GET"])
+def export_markets():
+    """
+    GET /markets/export?format=parquet|arrow
+    Exporta todos os mercados num arquivo colunar (Parquet ou Arrow IPC) com tipos
+    corretos e colunas categóricas codificadas em dicionário. Requer pyarrow.
+    """
+    return export_response("markets")
+
+
 @markets_bp.route("/<int:market_id>", methods=["GET"])
 def get_market_by_id(market_id):
     """
@@ -0,0 +1,19 @@
+"""Rota de métricas.
+Expõe as métricas da aplicação no formato de texto do Prometheus.
+"""
+
+from flask import Blueprint, Response
+
+from src.utils.metrics import CONTENT_TYPE, registry
+
+# Criação do Blueprint de métricas
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    GET /metrics
+    Retorna as métricas (pool de conexões, etc.) para coleta pelo Prometheus.
+    """
+    return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -8,7 +8,9 @@ from marshmallow import ValidationError
 
 from src.schemas.municipality_schema import MunicipalitySchema
 from src.services.service_factory import ServiceFactory
+from src.utils.columnar import export_response
 from src.utils.decorators import editor_or_admin_required
+from src.utils.pagination import SearchHelper
 
 # Criação do Blueprint para municípios
 municipalities_bp = Blueprint("municipalities", __name__, url_prefix="/municipalities")
@@ -36,6 +38,32 @@ def get_all_municipalities():
     return jsonify({"success": True, "total": len(municipalities), "data": municipalities}), 200
 
 
+@municipalities_bp.route("/autocomplete", methods=["GET"])
+def autocomplete_municipalities():
+    """
+    GET /municipalities/autocomplete?prefix=<texto>&limit=<n>&provincia_id=<id>
+    Sugere municípios cujo nome começa pelo prefixo (ignora acentos).
+    """
+    MunicipalityService = ServiceFactory.get_municipality_service()
+    prefix, limit, provincia_id = SearchHelper.get_autocomplete_params()
+
+    if not prefix:
+        return jsonify({"success": False, "message": "Parâmetro 'prefix' é obrigatório"}), 400
+
+    suggestions = MunicipalityService.autocomplete(prefix, limit=limit, provincia_id=provincia_id)
+    return jsonify({"success": True, "total": len(suggestions), "data": suggestions}), 200
+
+
+@municipalities_bp.route("/export", methods=["GET"])
+def export_municipalities():
+    """
+    GET /municipalities/export?format=parquet|arrow
+    Exporta todos os municípios num arquivo colunar (Parquet ou Arrow IPC) com tipos
+    corretos e colunas categóricas codificadas em dicionário. Requer pyarrow.
+    """
+    return export_response("municipalities")
+
+
 @municipalities_bp.route("/<int:municipality_id>", methods=["GET"])
 def get_municipality_by_id(municipality_id):
     """
@@ -3,8 +3,6 @@ Rotas para operações com Províncias.
 Blueprint que gerencia endpoints relacionados a províncias de Angola.
 """
 
-import os
-
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from marshmallow import ValidationError
@@ -12,7 +10,9 @@ from marshmallow import ValidationError
 from src.schemas.province_schema import ProvinceSchema
 from src.services.service_factory import ServiceFactory
 from src.utils.audit import audit_log
+from src.utils.batch_validation import get_batch_mode, validate_batch
 from src.utils.cache import cached_route, invalidate_entity_cache
+from src.utils.columnar import export_response
 from src.utils.decorators import editor_or_admin_required
 from src.utils.pagination import PaginationHelper, SearchHelper
 
@@ -41,9 +41,8 @@ def get_all_provinces():
 
     # Verificar se deve usar paginação
     use_pagination = request.args.get("paginate", "true").lower() == "true"
-    use_database = os.getenv("USE_DATABASE", "False").lower() == "true"
 
-    if use_pagination and use_database and hasattr(ProvinceService, "get_all_paginated"):
+    if use_pagination and hasattr(ProvinceService, "get_all_paginated"):
         # Obter parâmetros de paginação e busca
         page, per_page = PaginationHelper.get_pagination_params()
         sort_by, order = SearchHelper.get_sort_params()
@@ -59,15 +58,19 @@ def get_all_provinces():
         # Buscar sem paginação (modo legado)
         provinces = ProvinceService.get_all()
 
-        # Se for modo JSON e pediu paginação, aplicar manualmente
-        if use_pagination and not use_database:
-            page, per_page = PaginationHelper.get_pagination_params()
-            result = PaginationHelper.paginate_list(provinces, page, per_page)
-            return jsonify({"success": True, **result}), 200
-
         return jsonify({"success": True, "total": len(provinces), "data": provinces}), 200
 
 
+@provinces_bp.route("/export", methods=["GET"])
+def export_provinces():
+    """
+    GET /provinces/export?format=parquet|arrow
+    Exporta todas as províncias num arquivo colunar (Parquet ou Arrow IPC) com tipos
+    corretos e colunas categóricas codificadas em dicionário. Requer pyarrow.
+    """
+    return export_response("provinces")
+
+
 @provinces_bp.route("/<int:province_id>", methods=["GET"])
 def get_province_by_id(province_id):
     """
@@ -182,56 +185,74 @@ def delete_province(province_id):
 @audit_log("BULK_CREATE", "province")
 def bulk_create_provinces():
     """
-    POST /provinces/bulk
+    POST /provinces/bulk?mode=atomic|partial
     Cria múltiplas províncias de uma vez.
     Requer autenticação e role: admin ou editor
 
     Body: {"provinces": [{...}, {...}]}
+
+    A lista é validada de uma vez e os erros são indicados pela posição (index).
+    - atomic (padrão): qualquer erro rejeita o lote inteiro (422), nada é gravado
+    - partial: grava as províncias válidas e reporta as restantes em 'errors'
     """
     ProvinceService = ServiceFactory.get_province_service()
 
     # Verificar se service suporta bulk operations
     if not hasattr(ProvinceService, "bulk_create"):
         return (
-            jsonify({"success": False, "message": "Bulk operations não disponíveis no modo atual (use USE_DATABASE=True)"}),
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Bulk operations não disponíveis no modo atual (use STORAGE_BACKEND=postgres ou sqlite)",
+                }
+            ),
             400,
         )
 
+    mode, error = get_batch_mode()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
     try:
         data = request.get_json()
         provinces_data = data.get("provinces", [])
 
         if not provinces_data:
             return jsonify({"success": False, "message": "Lista de províncias vazia"}), 400
+        if not isinstance(provinces_data, list):
+            return jsonify({"success": False, "message": "Campo 'provinces' deve ser uma lista"}), 400
 
-        # Validar cada província
-        validated = []
-        for prov_data in provinces_data:
-            try:
-                validated_prov = province_schema.load(prov_data)
-                validated.append(validated_prov)
-            except ValidationError as err:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "message": "Erro de validação em uma das províncias",
-                            "errors": err.messages,
-                            "data": prov_data,
-                        }
-                    ),
-                    422,
-                )
+        # Validar o lote inteiro
+        validation = validate_batch(province_schema, provinces_data)
+        if validation.errors and (mode == "atomic" or not validation.valid):
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "message": f"Erro de validação em {len(validation.errors)} de {len(provinces_data)} províncias",
+                        "errors": validation.error_list,
+                    }
+                ),
+                422,
+            )
 
         # Criar em bulk
-        result = ProvinceService.bulk_create(validated)
+        result = ProvinceService.bulk_create(validation.rows, atomic=mode == "atomic")
+        errors = validation.error_list + validation.payload_errors(result["errors"])
+        failed = len(errors)
 
         # Invalidar cache
         if result["created"] > 0:
             invalidate_entity_cache("provinces")
 
         return jsonify(
-            {"success": True, "message": f"{result['created']} províncias criadas, {result['failed']} falharam", **result}
+            {
+                "success": True,
+                "message": f"{result['created']} províncias criadas, {failed} falharam",
+                **result,
+                "failed": failed,
+                "errors": errors,
+            }
         ), (201 if result["created"] > 0 else 400)
 
     except Exception as e:
@@ -244,29 +265,61 @@ def bulk_create_provinces():
 @audit_log("BULK_UPDATE", "province")
 def bulk_update_provinces():
     """
-    PUT /provinces/bulk
+    PUT /provinces/bulk?mode=atomic|partial
     Atualiza múltiplas províncias de uma vez.
     Requer autenticação e role: admin ou editor
 
     Body: {"updates": [{"id": 1, "nome": "..."}, ...]}
+
+    Os campos são validados como no PUT individual e a existência dos ids é
+    verificada numa única consulta. Modos como em POST /provinces/bulk.
     """
     ProvinceService = ServiceFactory.get_province_service()
 
     if not hasattr(ProvinceService, "bulk_update"):
         return (
-            jsonify({"success": False, "message": "Bulk operations não disponíveis no modo atual (use USE_DATABASE=True)"}),
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Bulk operations não disponíveis no modo atual (use STORAGE_BACKEND=postgres ou sqlite)",
+                }
+            ),
             400,
         )
 
+    mode, error = get_batch_mode()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
     try:
         data = request.get_json()
         updates = data.get("updates", [])
 
         if not updates:
             return jsonify({"success": False, "message": "Lista de atualizações vazia"}), 400
+        if not isinstance(updates, list):
+            return jsonify({"success": False, "message": "Campo 'updates' deve ser uma lista"}), 400
+
+        # Validar o lote inteiro (campos + existência dos ids)
+        validation = validate_batch(
+            province_schema, updates, partial=True, key="id", references={"id": ProvinceService.get_existing_ids}
+        )
+        if validation.errors and (mode == "atomic" or not validation.valid):
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "message": f"Erro de validação em {len(validation.errors)} de {len(updates)} atualizações",
+                        "errors": validation.error_list,
+                    }
+                ),
+                422,
+            )
 
         # Atualizar em bulk
-        result = ProvinceService.bulk_update(updates)
+        result = ProvinceService.bulk_update(validation.rows, atomic=mode == "atomic")
+        errors = validation.error_list + validation.payload_errors(result["errors"])
+        failed = len(errors)
 
         # Invalidar cache
         if result["updated"] > 0:
@@ -276,8 +329,10 @@ def bulk_update_provinces():
             jsonify(
                 {
                     "success": True,
-                    "message": f"{result['updated']} províncias atualizadas, {result['failed']} falharam",
+                    "message": f"{result['updated']} províncias atualizadas, {failed} falharam",
                     **result,
+                    "failed": failed,
+                    "errors": errors,
                 }
             ),
             200,
@@ -303,7 +358,12 @@ def bulk_delete_provinces():
 
     if not hasattr(ProvinceService, "bulk_delete"):
         return (
-            jsonify({"success": False, "message": "Bulk operations não disponíveis no modo atual (use USE_DATABASE=True)"}),
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Bulk operations não disponíveis no modo atual (use STORAGE_BACKEND=postgres ou sqlite)",
+                }
+            ),
             400,
         )
 
@@ -8,7 +8,10 @@ from marshmallow import ValidationError
 
 from src.schemas.school_schema import SchoolSchema
 from src.services.service_factory import ServiceFactory
+from src.utils.columnar import export_response
 from src.utils.decorators import editor_or_admin_required
+from src.utils.geo import get_nearby_params
+from src.utils.pagination import SearchHelper
 
 # Criação do Blueprint para escolas
 schools_bp = Blueprint("schools", __name__, url_prefix="/schools")
@@ -38,6 +41,49 @@ def get_all_schools():
     return jsonify({"success": True, "total": len(schools), "data": schools}), 200
 
 
+@schools_bp.route("/autocomplete", methods=["GET"])
+def autocomplete_schools():
+    """
+    GET /schools/autocomplete?prefix=<texto>&limit=<n>&provincia_id=<id>
+    Sugere escolas cujo nome começa pelo prefixo (ignora acentos).
+    """
+    SchoolService = ServiceFactory.get_school_service()
+    prefix, limit, provincia_id = SearchHelper.get_autocomplete_params()
+
+    if not prefix:
+        return jsonify({"success": False, "message": "Parâmetro 'prefix' é obrigatório"}), 400
+
+    suggestions = SchoolService.autocomplete(prefix, limit=limit, provincia_id=provincia_id)
+    return jsonify({"success": True, "total": len(suggestions), "data": suggestions}), 200
+
+
+@schools_bp.route("/nearby", methods=["GET"])
+def nearby_schools():
+    """
+    GET /schools/nearby?lat=<lat>&lon=<lon>&radius_km=<km>&limit=<n>
+    Retorna as escolas mais próximas do ponto, da mais próxima à mais distante, com 'distancia_km'.
+    Sem radius_km, retorna as 'limit' mais próximas (k vizinhos mais próximos).
+    Apenas registros com latitude/longitude são considerados.
+    """
+    params, error = get_nearby_params()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    SchoolService = ServiceFactory.get_school_service()
+    results = SchoolService.get_nearby(**params)
+    return jsonify({"success": True, "total": len(results), "data": results}), 200
+
+
+@schools_bp.route("/export", methods=["GET"])
+def export_schools():
+    """
+    GET /schools/export?format=parquet|arrow
+    Exporta todas as escolas num arquivo colunar (Parquet ou Arrow IPC) com tipos
+    corretos e colunas categóricas codificadas em dicionário. Requer pyarrow.
+    """
+    return export_response("schools")
+
+
 @schools_bp.route("/<int:school_id>", methods=["GET"])
 def get_school_by_id(school_id):
     """
@@ -0,0 +1,47 @@
+"""Rotas de busca textual.
+Blueprint com a busca unificada entre todas as entidades.
+"""
+
+from flask import Blueprint, jsonify, request
+
+from src.services.service_factory import ServiceFactory
+from src.utils.search_index import SEARCH_ENTITIES
+
+# Criação do Blueprint para busca
+search_bp = Blueprint("search", __name__, url_prefix="/search")
+
+MAX_SEARCH_LIMIT = 100
+
+
+@search_bp.route("", methods=["GET"])
+def search():
+    """
+    GET /search?q=<texto>&types=<entidades>&limit=<n>
+    Busca em províncias, municípios, escolas, mercados e hospitais.
+    Ignora acentos e maiúsculas ('ucua' encontra 'Úcua').
+    types: lista separada por vírgulas (ex: schools,hospitals); padrão: todas
+    """
+    query = request.args.get("q", "", type=str).strip()
+    if not query:
+        return jsonify({"success": False, "message": "Parâmetro 'q' é obrigatório"}), 400
+
+    types = request.args.get("types", "", type=str)
+    entities = [t.strip() for t in types.split(",") if t.strip()] or SEARCH_ENTITIES
+    invalid = [t for t in entities if t not in SEARCH_ENTITIES]
+    if invalid:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"Tipos inválidos: {', '.join(invalid)}. Use: {', '.join(SEARCH_ENTITIES)}",
+                }
+            ),
+            400,
+        )
+
+    limit = min(max(request.args.get("limit", 20, type=int), 1), MAX_SEARCH_LIMIT)
+
+    SearchService = ServiceFactory.get_search_service()
+    results = SearchService.search(query, entities=entities, limit=limit)
+
+    return jsonify({"success": True, "query": query, "total": len(results), "data": results}), 200
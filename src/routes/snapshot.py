@@ -0,0 +1,67 @@
+"""Rotas do snapshot completo.
+Blueprint com o bundle de todas as entidades, versionado pelo hash do conteúdo.
+"""
+
+from flask import Blueprint, Response, jsonify, request, url_for
+
+from src.utils.compression import negotiate_encoding
+from src.utils.snapshot import snapshot_store
+
+# Criação do Blueprint para o snapshot
+snapshot_bp = Blueprint("snapshot", __name__, url_prefix="/snapshot")
+
+# O conteúdo de uma URL /snapshot/<hash> nunca muda
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@snapshot_bp.route("", methods=["GET"])
+def get_snapshot():
+    """
+    GET /snapshot
+    Redireciona para /snapshot/<hash> do snapshot atual.
+    O bundle é reconstruído em segundo plano quando os dados mudam; até existir
+    o primeiro, retorna 503 com Retry-After.
+    """
+    snapshot_store.ensure_started()
+    snapshot = snapshot_store.current
+    if snapshot is None:
+        response = jsonify({"success": False, "message": "Snapshot em preparação, tente novamente em instantes"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+
+    # O pedido seguinte pode ser atendido por outro worker, que lê o bundle do disco
+    snapshot_store.ensure_shared(snapshot)
+    response = Response(status=302)
+    response.headers["Location"] = url_for("snapshot.get_snapshot_bundle", content_hash=snapshot.content_hash)
+    # O redirecionamento muda a cada nova versão; o bundle em si não
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@snapshot_bp.route("/<content_hash>", methods=["GET"])
+def get_snapshot_bundle(content_hash):
+    """
+    GET /snapshot/<hash>
+    Bundle JSON com todas as entidades ({version, entities}), já comprimido (br ou gzip).
+    'version' é a sequência do feed de alterações: GET /changes?since=version
+    traz o que mudou depois. Hashes antigos deixam de existir após novas versões (404).
+    Qualquer worker serve o hash: os bundles são partilhados em SNAPSHOT_DIR.
+    """
+    snapshot_store.ensure_started()
+    snapshot = snapshot_store.get(content_hash)
+    if snapshot is None:
+        return jsonify({"success": False, "message": "Snapshot não encontrado, use GET /snapshot"}), 404
+
+    etag = f'"{snapshot.content_hash}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag in request.headers.get("If-None-Match", ""):
+        return Response(status=304, headers=headers)
+
+    encoding = negotiate_encoding()
+    if encoding not in snapshot.bodies:
+        encoding = "identity"
+    response = Response(snapshot.bodies[encoding], mimetype="application/json", headers=headers)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    return response
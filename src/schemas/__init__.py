@@ -2,10 +2,18 @@
 Schemas de validação usando Marshmallow
 """
 
+from .coordinates_schema import CoordinatesSchema
 from .hospital_schema import HospitalSchema
 from .market_schema import MarketSchema
 from .municipality_schema import MunicipalitySchema
 from .province_schema import ProvinceSchema
 from .school_schema import SchoolSchema
 
-__all__ = ["ProvinceSchema", "MunicipalitySchema", "SchoolSchema", "MarketSchema", "HospitalSchema"]
+__all__ = [
+    "ProvinceSchema",
+    "MunicipalitySchema",
+    "SchoolSchema",
+    "MarketSchema",
+    "HospitalSchema",
+    "CoordinatesSchema",
+]
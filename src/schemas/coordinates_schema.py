@@ -0,0 +1,24 @@
+"""
+Schema base com coordenadas geográficas (opcionais) das instalações
+"""
+
+from marshmallow import Schema, ValidationError, fields, validate, validates_schema
+
+
+class CoordinatesSchema(Schema):
+    """Campos latitude/longitude (WGS84, em graus) partilhados por escolas, mercados e hospitais"""
+
+    latitude = fields.Float(
+        allow_none=True, validate=validate.Range(min=-90, max=90, error="Latitude deve estar entre -90 e 90")
+    )
+    longitude = fields.Float(
+        allow_none=True, validate=validate.Range(min=-180, max=180, error="Longitude deve estar entre -180 e 180")
+    )
+
+    @validates_schema
+    def validate_coordinates(self, data, **kwargs):
+        """Latitude e longitude são indicadas (ou removidas) em conjunto"""
+        if ("latitude" in data) != ("longitude" in data):
+            raise ValidationError("Indique latitude e longitude em conjunto", "latitude")
+        if (data.get("latitude") is None) != (data.get("longitude") is None):
+            raise ValidationError("Latitude e longitude devem ser ambas preenchidas ou ambas nulas", "latitude")
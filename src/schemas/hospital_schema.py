@@ -2,10 +2,12 @@
 Schema de validação para Hospital
 """
 
-from marshmallow import Schema, ValidationError, fields, validates
+from marshmallow import ValidationError, fields, validates
 
+from src.schemas.coordinates_schema import CoordinatesSchema
 
-class HospitalSchema(Schema):
+
+class HospitalSchema(CoordinatesSchema):
     """Schema para validação de dados de hospital"""
 
     id = fields.Int(dump_only=True)
@@ -2,10 +2,12 @@
 Schema de validação para Mercado
 """
 
-from marshmallow import Schema, ValidationError, fields, validates
+from marshmallow import ValidationError, fields, validates
 
+from src.schemas.coordinates_schema import CoordinatesSchema
 
-class MarketSchema(Schema):
+
+class MarketSchema(CoordinatesSchema):
     """Schema para validação de dados de mercado"""
 
     id = fields.Int(dump_only=True)
@@ -2,10 +2,12 @@
 Schema de validação para Escola
 """
 
-from marshmallow import Schema, ValidationError, fields, validates
+from marshmallow import ValidationError, fields, validates
 
+from src.schemas.coordinates_schema import CoordinatesSchema
 
-class SchoolSchema(Schema):
+
+class SchoolSchema(CoordinatesSchema):
     """Schema para validação de dados de escola"""
 
     id = fields.Int(dump_only=True)
@@ -3,10 +3,22 @@ Pacote de serviços de negócio da AngoData API.
 Exporta todos os serviços para uso nas rotas.
 """
 
+from .change_service import ChangeService
+from .export_service import ExportService
 from .hospital_service import HospitalService
 from .market_service import MarketService
 from .municipality_service import MunicipalityService
 from .province_service import ProvinceService
 from .school_service import SchoolService
+from .search_service import SearchService
 
-__all__ = ["ProvinceService", "MunicipalityService", "SchoolService", "MarketService", "HospitalService"]
+__all__ = [
+    "ProvinceService",
+    "MunicipalityService",
+    "SchoolService",
+    "MarketService",
+    "HospitalService",
+    "SearchService",
+    "ChangeService",
+    "ExportService",
+]
@@ -0,0 +1,27 @@
+"""
+Serviço do feed de alterações.
+Usa o registro de alterações em memória com diário persistido (modo JSON).
+"""
+
+from src.utils.change_feed import change_feed
+
+
+class ChangeService:
+    """Serviço para sincronização incremental das entidades."""
+
+    @staticmethod
+    def get_changes(since, limit=100):
+        """
+        Retorna as alterações posteriores a uma sequência.
+
+        Args:
+            since (int): Última sequência conhecida pelo cliente (0 = desde o início)
+            limit (int): Número máximo de alterações
+
+        Returns:
+            dict: data (alterações em ordem), has_more, latest (última sequência)
+                  e reset (True se o cliente precisa de ressincronização completa)
+        """
+        # Pedir uma a mais para saber se há mais páginas
+        entries, reset, latest = change_feed.changes_since(since, limit + 1)
+        return {"data": entries[:limit], "has_more": len(entries) > limit, "latest": latest, "reset": reset}
@@ -5,11 +5,15 @@ These services provide the same interface as JSON services
 but work with PostgreSQL database.
 """
 
+from .audit_service_db import AuditServiceDB
+from .change_service_db import ChangeServiceDB
+from .export_service_db import ExportServiceDB
 from .hospital_service_db import HospitalServiceDB
 from .market_service_db import MarketServiceDB
 from .municipality_service_db import MunicipalityServiceDB
 from .province_service_db import ProvinceServiceDB
 from .school_service_db import SchoolServiceDB
+from .search_service_db import SearchServiceDB
 from .user_service_db import UserServiceDB
 
 __all__ = [
@@ -19,4 +23,8 @@ __all__ = [
     "MarketServiceDB",
     "HospitalServiceDB",
     "UserServiceDB",
+    "AuditServiceDB",
+    "SearchServiceDB",
+    "ChangeServiceDB",
+    "ExportServiceDB",
 ]
@@ -0,0 +1,233 @@
+"""
+Audit event service using SQLAlchemy.
+Stores audit events in the (time-partitioned) audit_events table.
+"""
+
+import base64
+import io
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, insert, or_, text
+from sqlalchemy.exc import IntegrityError, ProgrammingError, SQLAlchemyError
+
+from src.database.base import get_db_session
+from src.database.models import AuditEvent
+
+# unique_violation / duplicate_table: another process created the same partition first
+DUPLICATE_PARTITION_CODES = ("23505", "42P07")
+
+COPY_COLUMNS = (
+    "timestamp",
+    "action",
+    "resource_type",
+    "resource_id",
+    "user_id",
+    "user_email",
+    "ip_address",
+    "user_agent",
+    "details",
+)
+
+
+def _to_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a file-format audit entry into an audit_events row."""
+    timestamp = entry.get("timestamp")
+    return {
+        "timestamp": datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow(),
+        "action": entry.get("action"),
+        "resource_type": entry.get("resource_type"),
+        "resource_id": str(entry["resource_id"]) if entry.get("resource_id") is not None else None,
+        "user_id": str(entry["user_id"]) if entry.get("user_id") is not None else None,
+        "user_email": entry.get("user_email"),
+        "ip_address": entry.get("ip_address"),
+        "user_agent": (entry.get("user_agent") or "")[:500] or None,
+        "details": entry.get("details"),
+    }
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _encode_cursor(timestamp: datetime, event_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{event_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, event_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
+class AuditServiceDB:
+    """Service for storing and querying audit events in PostgreSQL."""
+
+    # Monthly partitions already known to exist (per process)
+    _partitions = set()
+    _partitioned = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _is_partitioned(session) -> bool:
+        """Check (once) whether audit_events is a partitioned PostgreSQL table."""
+        if AuditServiceDB._partitioned is None:
+            if session.bind.dialect.name != "postgresql":
+                AuditServiceDB._partitioned = False
+            else:
+                result = session.execute(
+                    text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_events')")
+                ).first()
+                AuditServiceDB._partitioned = result is not None
+        return AuditServiceDB._partitioned
+
+    @staticmethod
+    def ensure_partitions(session, timestamps: List[datetime]) -> Set[Tuple[int, int]]:
+        """
+        Create the monthly partitions needed for the given timestamps.
+        The months are not remembered here: the caller does it with remember_partitions()
+        once the transaction has committed (a rolled-back CREATE leaves no partition).
+
+        Args:
+            session: Active database session
+            timestamps: Event timestamps about to be inserted
+
+        Returns:
+            Set of (year, month) partitions created or found in this transaction
+        """
+        if not AuditServiceDB._is_partitioned(session):
+            return set()
+
+        months = {(ts.year, ts.month) for ts in timestamps} - AuditServiceDB._partitions
+        for year, month in sorted(months):
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            try:
+                # Savepoint: losing a creation race must not abort the batch transaction
+                with session.begin_nested():
+                    session.execute(
+                        text(
+                            f"CREATE TABLE IF NOT EXISTS audit_events_y{year}m{month:02d} PARTITION OF audit_events "
+                            f"FOR VALUES FROM ('{year}-{month:02d}-01') TO ('{next_year}-{next_month:02d}-01')"
+                        )
+                    )
+            except (IntegrityError, ProgrammingError) as e:
+                if getattr(e.orig, "pgcode", None) not in DUPLICATE_PARTITION_CODES:
+                    raise
+        return months
+
+    @staticmethod
+    def remember_partitions(months: Set[Tuple[int, int]]) -> None:
+        """Record committed partitions so later batches skip the CREATE."""
+        with AuditServiceDB._lock:
+            AuditServiceDB._partitions.update(months)
+
+    @staticmethod
+    def insert_batch(entries: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of audit events.
+        Uses COPY on PostgreSQL (psycopg2) and a multi-row INSERT elsewhere.
+
+        Args:
+            entries: Audit entries in the file log format
+
+        Returns:
+            int: Number of events inserted
+        """
+        if not entries:
+            return 0
+
+        rows = [_to_row(entry) for entry in entries]
+        try:
+            with get_db_session(standalone=True) as session:
+                months = AuditServiceDB.ensure_partitions(session, [row["timestamp"] for row in rows])
+
+                if session.bind.dialect.driver == "psycopg2":
+                    buffer = io.StringIO(
+                        "".join("\t".join(_copy_value(row[col]) for col in COPY_COLUMNS) + "\n" for row in rows)
+                    )
+                    cursor = session.connection().connection.cursor()
+                    cursor.copy_expert(f"COPY audit_events ({', '.join(COPY_COLUMNS)}) FROM STDIN", buffer)
+                else:
+                    session.execute(insert(AuditEvent), rows)
+
+            AuditServiceDB.remember_partitions(months)
+            return len(rows)
+        except SQLAlchemyError as e:
+            print(f"Database error inserting audit events: {e}")
+            return 0
+
+    @staticmethod
+    def query(
+        limit: int = 100,
+        action: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        user_id: Optional[Any] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query audit events newest first, using keyset pagination.
+
+        Args:
+            limit: Maximum number of events
+            action: Filter by action
+            resource_type: Filter by resource type
+            user_id: Filter by user ID
+            since: Minimum ISO timestamp (inclusive)
+            until: Maximum ISO timestamp (inclusive)
+            cursor: Cursor returned by the previous page
+
+        Returns:
+            Dict with 'data' and 'next_cursor'
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        position = _decode_cursor(cursor) if cursor else None
+
+        try:
+            with get_db_session(standalone=True) as session:
+                query = session.query(AuditEvent)
+
+                if action:
+                    query = query.filter(AuditEvent.action == action)
+                if resource_type:
+                    query = query.filter(AuditEvent.resource_type == resource_type)
+                if user_id is not None:
+                    query = query.filter(AuditEvent.user_id == str(user_id))
+                if since:
+                    query = query.filter(AuditEvent.timestamp >= datetime.fromisoformat(since))
+                if until:
+                    query = query.filter(AuditEvent.timestamp <= datetime.fromisoformat(until))
+                if position:
+                    timestamp, event_id = position
+                    query = query.filter(
+                        or_(
+                            AuditEvent.timestamp < timestamp,
+                            and_(AuditEvent.timestamp == timestamp, AuditEvent.id < event_id),
+                        )
+                    )
+
+                events = query.order_by(AuditEvent.timestamp.desc(), AuditEvent.id.desc()).limit(limit).all()
+
+                next_cursor = None
+                if len(events) == limit and events:
+                    next_cursor = _encode_cursor(events[-1].timestamp, events[-1].id)
+
+                return {"data": [event.to_dict() for event in events], "next_cursor": next_cursor}
+        except SQLAlchemyError as e:
+            print(f"Database error querying audit events: {e}")
+            return {"data": [], "next_cursor": None}
@@ -0,0 +1,109 @@
+"""
+Change feed service using SQLAlchemy ORM.
+Reads the change_events table filled on every flush (see src/database/change_log.py).
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.database.base import get_db_session
+from src.database.models import ChangeEvent, ChangeFeedState
+
+# Days of change_events kept by prune() (clients offline for longer must resync)
+DEFAULT_RETENTION_DAYS = 30
+
+# change_feed_state holds a single row
+STATE_ID = 1
+
+
+class ChangeServiceDB:
+    """Service for incremental sync with PostgreSQL database."""
+
+    @staticmethod
+    def _pruned_through(session: Session) -> int:
+        state = session.get(ChangeFeedState, STATE_ID)
+        return state.pruned_through if state else 0
+
+    @staticmethod
+    def get_changes(since: int, limit: int = 100, session: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Get the changes recorded after a sequence number.
+
+        Args:
+            since: Last sequence number the client has seen (0 = from the beginning)
+            limit: Maximum number of changes
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            Dict: data (changes in seq order), has_more, latest (highest seq) and
+                  reset (True if changes after 'since' were pruned and a full resync is needed);
+                  on database errors, 'error' with the message and latest=None
+        """
+        try:
+            with get_db_session(session) as session:
+                # Range read on the primary key; one extra row tells whether there is more
+                events = (
+                    session.query(ChangeEvent).filter(ChangeEvent.seq > since).order_by(ChangeEvent.seq).limit(limit + 1).all()
+                )
+                latest = session.query(func.max(ChangeEvent.seq)).scalar()
+
+                # Only rows actually removed by retention force a resync; seq gaps
+                # (e.g. rolled-back inserts on PostgreSQL) do not
+                reset = since < ChangeServiceDB._pruned_through(session)
+                return {
+                    "data": [] if reset else [event.to_dict() for event in events[:limit]],
+                    "has_more": not reset and len(events) > limit,
+                    "latest": latest or 0,
+                    "reset": reset,
+                }
+        except SQLAlchemyError as e:
+            print(f"Database error getting changes since {since}: {e}")
+            return {"data": [], "has_more": False, "latest": None, "reset": False, "error": str(e)}
+
+    @staticmethod
+    def prune(retention_days: Optional[int] = None, session: Optional[Session] = None) -> int:
+        """
+        Delete change_events older than the retention period and raise the low-water mark.
+        The newest event is always kept, so seq never restarts and 'latest' stays known.
+
+        Args:
+            retention_days: Days to keep (defaults to CHANGE_LOG_RETENTION_DAYS or 30)
+            session: Optional session to use
+
+        Returns:
+            int: Number of events deleted (0 on database errors)
+        """
+        if retention_days is None:
+            retention_days = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+        try:
+            with get_db_session(session) as session:
+                latest = session.query(func.max(ChangeEvent.seq)).scalar()
+                through = (
+                    session.query(func.max(ChangeEvent.seq))
+                    .filter(ChangeEvent.timestamp < cutoff, ChangeEvent.seq < latest)
+                    .scalar()
+                    if latest
+                    else None
+                )
+                if through is None:
+                    return 0
+
+                deleted = session.execute(delete(ChangeEvent).where(ChangeEvent.seq <= through)).rowcount
+                state = session.get(ChangeFeedState, STATE_ID)
+                if state is None:
+                    state = ChangeFeedState(id=STATE_ID, pruned_through=0)
+                    session.add(state)
+                state.pruned_through = max(state.pruned_through, through)
+                state.pruned_at = datetime.utcnow()
+                session.flush()
+                return deleted
+        except SQLAlchemyError as e:
+            print(f"Database error pruning changes: {e}")
+            return 0
@@ -0,0 +1,74 @@
+"""
+Export service using SQLAlchemy Core.
+Streams whole tables from the database cursor in batches for the columnar exports.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.database.base import get_db_session
+from src.database.models import ChangeEvent, Hospital, Market, Municipality, Province, School
+
+ENTITY_MODELS = {
+    "provinces": Province,
+    "municipalities": Municipality,
+    "schools": School,
+    "markets": Market,
+    "hospitals": Hospital,
+}
+
+
+class ExportServiceDB:
+    """Service for bulk exports with PostgreSQL database."""
+
+    @staticmethod
+    def get_version(entity: str, session: Optional[Session] = None) -> int:
+        """
+        Get the current data version.
+
+        The latest change feed sequence: it moves on every committed write of any
+        tracked entity (a primary-key lookup, cheap enough for every export request).
+
+        Args:
+            entity: Entity name (kept for interface parity with the JSON service)
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            int: Current version
+        """
+        with get_db_session(session) as session:
+            return session.query(func.max(ChangeEvent.seq)).scalar() or 0
+
+    @staticmethod
+    def iter_batches(
+        entity: str, batch_size: int = 10000, session: Optional[Session] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream every row of an entity in batches, straight from the cursor.
+
+        Rows are plain column mappings (no ORM objects); non-province entities also
+        carry provincia_nome. Database errors propagate so a partial file is never served.
+
+        Args:
+            entity: Entity name
+            batch_size: Rows fetched per round trip (server-side cursor on PostgreSQL)
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Yields:
+            List[Dict]: Batch of rows
+        """
+        model = ENTITY_MODELS[entity]
+        columns = list(model.__table__.c)
+        if model is Province:
+            statement = select(*columns)
+        else:
+            statement = select(*columns, Province.nome.label("provincia_nome")).join(
+                Province, model.provincia_id == Province.id
+            )
+        statement = statement.order_by(model.id).execution_options(yield_per=batch_size)
+
+        with get_db_session(session) as session:
+            for partition in session.execute(statement).mappings().partitions():
+                yield [dict(row) for row in partition]
@@ -6,24 +6,31 @@ Provides database-backed operations for hospitals.
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from src.database.base import get_db_session
 from src.database.models import Hospital
+from src.services.db.municipality_service_db import MunicipalityServiceDB
+from src.utils.geo import nearby_in_database
+from src.utils.pagination import SearchHelper
 
 
 class HospitalServiceDB:
     """Service for managing hospitals with PostgreSQL database."""
 
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
+    def get_all(session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all hospitals from database.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             List[Dict]: List of all hospitals with their data
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 hospitals = session.query(Hospital).order_by(Hospital.nome).all()
                 return [hospital.to_dict() for hospital in hospitals]
         except SQLAlchemyError as e:
@@ -31,18 +38,19 @@ class HospitalServiceDB:
             return []
 
     @staticmethod
-    def get_by_id(hospital_id: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(hospital_id: int, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific hospital by ID.
 
         Args:
             hospital_id: The ID of the hospital to retrieve
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Hospital data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 hospital = session.query(Hospital).filter(Hospital.id == hospital_id).first()
                 return hospital.to_dict() if hospital else None
         except SQLAlchemyError as e:
@@ -50,18 +58,19 @@ class HospitalServiceDB:
             return None
 
     @staticmethod
-    def get_by_province(province_id: int) -> List[Dict[str, Any]]:
+    def get_by_province(province_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all hospitals for a specific province.
 
         Args:
             province_id: ID of the province
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of hospitals in the province
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 hospitals = session.query(Hospital).filter(Hospital.provincia_id == province_id).order_by(Hospital.nome).all()
                 return [hospital.to_dict() for hospital in hospitals]
         except SQLAlchemyError as e:
@@ -69,44 +78,115 @@ class HospitalServiceDB:
             return []
 
     @staticmethod
-    def get_by_municipality(municipio_nome: str) -> List[Dict[str, Any]]:
+    def get_by_municipality(municipality_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all hospitals for a specific municipality.
 
         Args:
-            municipio_nome: Name of the municipality
+            municipality_id: ID of the municipality
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of hospitals in the municipality
         """
         try:
-            with get_db_session() as session:
-                hospitals = session.query(Hospital).filter(Hospital.municipio == municipio_nome).order_by(Hospital.nome).all()
+            with get_db_session(session) as session:
+                hospitals = (
+                    session.query(Hospital).filter(Hospital.municipio_id == municipality_id).order_by(Hospital.nome).all()
+                )
                 return [hospital.to_dict() for hospital in hospitals]
         except SQLAlchemyError as e:
-            print(f"Database error getting hospitals for municipality '{municipio_nome}': {e}")
+            print(f"Database error getting hospitals for municipality {municipality_id}: {e}")
+            return []
+
+    @staticmethod
+    def autocomplete(
+        prefix: str, limit: int = 10, provincia_id: Optional[int] = None, session: Optional[Session] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Suggest hospitals whose name starts with the prefix.
+
+        Args:
+            prefix: Typed prefix (accents are ignored on PostgreSQL with unaccent)
+            limit: Maximum number of suggestions
+            provincia_id: Restrict to one province (optional)
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Suggestions with id, nome and provincia_id
+        """
+        try:
+            with get_db_session(session) as session:
+                query = session.query(Hospital.id, Hospital.nome, Hospital.provincia_id)
+                if provincia_id is not None:
+                    query = query.filter(Hospital.provincia_id == provincia_id)
+                rows = SearchHelper.apply_prefix_search(query, Hospital.nome, prefix).limit(limit).all()
+                return [{"id": row.id, "nome": row.nome, "provincia_id": row.provincia_id} for row in rows]
+        except SQLAlchemyError as e:
+            print(f"Database error autocompleting hospitals: {e}")
             return []
 
     @staticmethod
-    def create(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def get_nearby(
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        session: Optional[Session] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the hospitals nearest to a point (bounding-box range on the latitude/longitude index).
+
+        Args:
+            lat: Latitude of the point
+            lon: Longitude of the point
+            radius_km: Maximum distance in km (None = the 'limit' nearest)
+            limit: Maximum number of results
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Hospitals with distancia_km, nearest first
+        """
+        try:
+            with get_db_session(session) as session:
+                return nearby_in_database(session.query(Hospital), Hospital, lat, lon, radius_km, limit)
+        except SQLAlchemyError as e:
+            print(f"Database error getting hospitals near ({lat}, {lon}): {e}")
+            return []
+
+    @staticmethod
+    def create(data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Create a new hospital.
 
         Args:
-            data: Hospital data (nome, provincia_id, municipio, tipo, endereco, especialidades)
+            data: Hospital data (nome, provincia_id, municipio_id or municipio, tipo, endereco, especialidades)
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Created hospital data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
+                municipio = data.get("municipio")
+                if data.get("municipio_id") is not None:
+                    # Municipality must exist and belong to the province; the name follows the id
+                    municipio = MunicipalityServiceDB.get_name_in_province(
+                        data["municipio_id"], data["provincia_id"], session=session
+                    )
+                    if municipio is None:
+                        return None
+
                 hospital = Hospital(
                     nome=data["nome"],
                     provincia_id=data["provincia_id"],
-                    municipio=data.get("municipio"),
+                    municipio_id=data.get("municipio_id"),
+                    municipio=municipio,
                     tipo=data.get("tipo"),
                     endereco=data.get("endereco"),
                     especialidades=data.get("especialidades"),
+                    latitude=data.get("latitude"),
+                    longitude=data.get("longitude"),
                 )
                 session.add(hospital)
                 session.flush()
@@ -117,37 +197,43 @@ class HospitalServiceDB:
             return None
 
     @staticmethod
-    def update(hospital_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(hospital_id: int, data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Update an existing hospital.
 
         Args:
             hospital_id: ID of the hospital to update
             data: Updated hospital data
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Updated hospital data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 hospital = session.query(Hospital).filter(Hospital.id == hospital_id).first()
 
                 if not hospital:
                     return None
 
-                # Update fields if provided
-                if "nome" in data:
-                    hospital.nome = data["nome"]
-                if "provincia_id" in data:
-                    hospital.provincia_id = data["provincia_id"]
-                if "municipio" in data:
+                # Check the province/municipality first: a rejected update must not leave other fields changed
+                if "provincia_id" in data or "municipio_id" in data:
+                    provincia_id = data.get("provincia_id", hospital.provincia_id)
+                    municipio_id = data.get("municipio_id", hospital.municipio_id)
+                    if municipio_id is not None:
+                        municipio = MunicipalityServiceDB.get_name_in_province(municipio_id, provincia_id, session=session)
+                        if municipio is None:
+                            return None
+                        hospital.municipio = municipio
+                    hospital.provincia_id = provincia_id
+                    hospital.municipio_id = municipio_id
+                elif "municipio" in data:
                     hospital.municipio = data["municipio"]
-                if "tipo" in data:
-                    hospital.tipo = data["tipo"]
-                if "endereco" in data:
-                    hospital.endereco = data["endereco"]
-                if "especialidades" in data:
-                    hospital.especialidades = data["especialidades"]
+
+                # Update fields if provided
+                for field in ("nome", "tipo", "endereco", "especialidades", "latitude", "longitude"):
+                    if field in data:
+                        setattr(hospital, field, data[field])
 
                 session.flush()
                 result = hospital.to_dict()
@@ -157,18 +243,19 @@ class HospitalServiceDB:
             return None
 
     @staticmethod
-    def delete(hospital_id: int) -> bool:
+    def delete(hospital_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a hospital by ID.
 
         Args:
             hospital_id: ID of the hospital to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 hospital = session.query(Hospital).filter(Hospital.id == hospital_id).first()
 
                 if not hospital:
@@ -181,15 +268,18 @@ class HospitalServiceDB:
             return False
 
     @staticmethod
-    def count() -> int:
+    def count(session: Optional[Session] = None) -> int:
         """
         Get total count of hospitals.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             int: Total number of hospitals
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 return session.query(Hospital).count()
         except SQLAlchemyError as e:
             print(f"Database error counting hospitals: {e}")
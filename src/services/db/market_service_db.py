@@ -6,24 +6,31 @@ Provides database-backed operations for markets.
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from src.database.base import get_db_session
 from src.database.models import Market
+from src.services.db.municipality_service_db import MunicipalityServiceDB
+from src.utils.geo import nearby_in_database
+from src.utils.pagination import SearchHelper
 
 
 class MarketServiceDB:
     """Service for managing markets with PostgreSQL database."""
 
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
+    def get_all(session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all markets from database.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             List[Dict]: List of all markets with their data
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 markets = session.query(Market).order_by(Market.nome).all()
                 return [market.to_dict() for market in markets]
         except SQLAlchemyError as e:
@@ -31,18 +38,19 @@ class MarketServiceDB:
             return []
 
     @staticmethod
-    def get_by_id(market_id: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(market_id: int, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific market by ID.
 
         Args:
             market_id: The ID of the market to retrieve
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Market data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 market = session.query(Market).filter(Market.id == market_id).first()
                 return market.to_dict() if market else None
         except SQLAlchemyError as e:
@@ -50,18 +58,19 @@ class MarketServiceDB:
             return None
 
     @staticmethod
-    def get_by_province(province_id: int) -> List[Dict[str, Any]]:
+    def get_by_province(province_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all markets for a specific province.
 
         Args:
             province_id: ID of the province
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of markets in the province
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 markets = session.query(Market).filter(Market.provincia_id == province_id).order_by(Market.nome).all()
                 return [market.to_dict() for market in markets]
         except SQLAlchemyError as e:
@@ -69,43 +78,112 @@ class MarketServiceDB:
             return []
 
     @staticmethod
-    def get_by_municipality(municipio_nome: str) -> List[Dict[str, Any]]:
+    def get_by_municipality(municipality_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all markets for a specific municipality.
 
         Args:
-            municipio_nome: Name of the municipality
+            municipality_id: ID of the municipality
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of markets in the municipality
         """
         try:
-            with get_db_session() as session:
-                markets = session.query(Market).filter(Market.municipio == municipio_nome).order_by(Market.nome).all()
+            with get_db_session(session) as session:
+                markets = session.query(Market).filter(Market.municipio_id == municipality_id).order_by(Market.nome).all()
                 return [market.to_dict() for market in markets]
         except SQLAlchemyError as e:
-            print(f"Database error getting markets for municipality '{municipio_nome}': {e}")
+            print(f"Database error getting markets for municipality {municipality_id}: {e}")
+            return []
+
+    @staticmethod
+    def autocomplete(
+        prefix: str, limit: int = 10, provincia_id: Optional[int] = None, session: Optional[Session] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Suggest markets whose name starts with the prefix.
+
+        Args:
+            prefix: Typed prefix (accents are ignored on PostgreSQL with unaccent)
+            limit: Maximum number of suggestions
+            provincia_id: Restrict to one province (optional)
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Suggestions with id, nome and provincia_id
+        """
+        try:
+            with get_db_session(session) as session:
+                query = session.query(Market.id, Market.nome, Market.provincia_id)
+                if provincia_id is not None:
+                    query = query.filter(Market.provincia_id == provincia_id)
+                rows = SearchHelper.apply_prefix_search(query, Market.nome, prefix).limit(limit).all()
+                return [{"id": row.id, "nome": row.nome, "provincia_id": row.provincia_id} for row in rows]
+        except SQLAlchemyError as e:
+            print(f"Database error autocompleting markets: {e}")
+            return []
+
+    @staticmethod
+    def get_nearby(
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        session: Optional[Session] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the markets nearest to a point (bounding-box range on the latitude/longitude index).
+
+        Args:
+            lat: Latitude of the point
+            lon: Longitude of the point
+            radius_km: Maximum distance in km (None = the 'limit' nearest)
+            limit: Maximum number of results
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Markets with distancia_km, nearest first
+        """
+        try:
+            with get_db_session(session) as session:
+                return nearby_in_database(session.query(Market), Market, lat, lon, radius_km, limit)
+        except SQLAlchemyError as e:
+            print(f"Database error getting markets near ({lat}, {lon}): {e}")
             return []
 
     @staticmethod
-    def create(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def create(data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Create a new market.
 
         Args:
-            data: Market data (nome, provincia_id, municipio, tipo, endereco)
+            data: Market data (nome, provincia_id, municipio_id or municipio, tipo, endereco)
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Created market data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
+                municipio = data.get("municipio")
+                if data.get("municipio_id") is not None:
+                    # Municipality must exist and belong to the province; the name follows the id
+                    municipio = MunicipalityServiceDB.get_name_in_province(
+                        data["municipio_id"], data["provincia_id"], session=session
+                    )
+                    if municipio is None:
+                        return None
+
                 market = Market(
                     nome=data["nome"],
                     provincia_id=data["provincia_id"],
-                    municipio=data.get("municipio"),
+                    municipio_id=data.get("municipio_id"),
+                    municipio=municipio,
                     tipo=data.get("tipo"),
                     endereco=data.get("endereco"),
+                    latitude=data.get("latitude"),
+                    longitude=data.get("longitude"),
                 )
                 session.add(market)
                 session.flush()
@@ -116,35 +194,43 @@ class MarketServiceDB:
             return None
 
     @staticmethod
-    def update(market_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(market_id: int, data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Update an existing market.
 
         Args:
             market_id: ID of the market to update
             data: Updated market data
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Updated market data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 market = session.query(Market).filter(Market.id == market_id).first()
 
                 if not market:
                     return None
 
-                # Update fields if provided
-                if "nome" in data:
-                    market.nome = data["nome"]
-                if "provincia_id" in data:
-                    market.provincia_id = data["provincia_id"]
-                if "municipio" in data:
+                # Check the province/municipality first: a rejected update must not leave other fields changed
+                if "provincia_id" in data or "municipio_id" in data:
+                    provincia_id = data.get("provincia_id", market.provincia_id)
+                    municipio_id = data.get("municipio_id", market.municipio_id)
+                    if municipio_id is not None:
+                        municipio = MunicipalityServiceDB.get_name_in_province(municipio_id, provincia_id, session=session)
+                        if municipio is None:
+                            return None
+                        market.municipio = municipio
+                    market.provincia_id = provincia_id
+                    market.municipio_id = municipio_id
+                elif "municipio" in data:
                     market.municipio = data["municipio"]
-                if "tipo" in data:
-                    market.tipo = data["tipo"]
-                if "endereco" in data:
-                    market.endereco = data["endereco"]
+
+                # Update fields if provided
+                for field in ("nome", "tipo", "endereco", "latitude", "longitude"):
+                    if field in data:
+                        setattr(market, field, data[field])
 
                 session.flush()
                 result = market.to_dict()
@@ -154,18 +240,19 @@ class MarketServiceDB:
             return None
 
     @staticmethod
-    def delete(market_id: int) -> bool:
+    def delete(market_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a market by ID.
 
         Args:
             market_id: ID of the market to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 market = session.query(Market).filter(Market.id == market_id).first()
 
                 if not market:
@@ -178,15 +265,18 @@ class MarketServiceDB:
             return False
 
     @staticmethod
-    def count() -> int:
+    def count(session: Optional[Session] = None) -> int:
         """
         Get total count of markets.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             int: Total number of markets
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 return session.query(Market).count()
         except SQLAlchemyError as e:
             print(f"Database error counting markets: {e}")
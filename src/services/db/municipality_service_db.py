@@ -10,21 +10,25 @@ from sqlalchemy.orm import Session
 
 from src.database.base import get_db_session
 from src.database.models import Hospital, Market, Municipality, School
+from src.utils.pagination import SearchHelper
 
 
 class MunicipalityServiceDB:
     """Service for managing municipalities with PostgreSQL database."""
 
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
+    def get_all(session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all municipalities from database.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             List[Dict]: List of all municipalities with their data
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 municipalities = session.query(Municipality).order_by(Municipality.nome).all()
                 return [municipality.to_dict() for municipality in municipalities]
         except SQLAlchemyError as e:
@@ -32,18 +36,19 @@ class MunicipalityServiceDB:
             return []
 
     @staticmethod
-    def get_by_id(municipality_id: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(municipality_id: int, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific municipality by ID.
 
         Args:
             municipality_id: The ID of the municipality to retrieve
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Municipality data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 municipality = session.query(Municipality).filter(Municipality.id == municipality_id).first()
                 return municipality.to_dict() if municipality else None
         except SQLAlchemyError as e:
@@ -51,18 +56,19 @@ class MunicipalityServiceDB:
             return None
 
     @staticmethod
-    def get_by_province(province_id: int) -> List[Dict[str, Any]]:
+    def get_by_province(province_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all municipalities for a specific province.
 
         Args:
             province_id: ID of the province
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of municipalities in the province
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 municipalities = (
                     session.query(Municipality)
                     .filter(Municipality.provincia_id == province_id)
@@ -75,18 +81,46 @@ class MunicipalityServiceDB:
             return []
 
     @staticmethod
-    def create(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def autocomplete(
+        prefix: str, limit: int = 10, provincia_id: Optional[int] = None, session: Optional[Session] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Suggest municipalities whose name starts with the prefix.
+
+        Args:
+            prefix: Typed prefix (accents are ignored on PostgreSQL with unaccent)
+            limit: Maximum number of suggestions
+            provincia_id: Restrict to one province (optional)
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Suggestions with id, nome and provincia_id
+        """
+        try:
+            with get_db_session(session) as session:
+                query = session.query(Municipality.id, Municipality.nome, Municipality.provincia_id)
+                if provincia_id is not None:
+                    query = query.filter(Municipality.provincia_id == provincia_id)
+                rows = SearchHelper.apply_prefix_search(query, Municipality.nome, prefix).limit(limit).all()
+                return [{"id": row.id, "nome": row.nome, "provincia_id": row.provincia_id} for row in rows]
+        except SQLAlchemyError as e:
+            print(f"Database error autocompleting municipalities: {e}")
+            return []
+
+    @staticmethod
+    def create(data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Create a new municipality.
 
         Args:
             data: Municipality data (nome, provincia_id, area_km2, populacao)
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Created municipality data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 municipality = Municipality(
                     nome=data["nome"],
                     provincia_id=data["provincia_id"],
@@ -102,19 +136,20 @@ class MunicipalityServiceDB:
             return None
 
     @staticmethod
-    def update(municipality_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(municipality_id: int, data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Update an existing municipality.
 
         Args:
             municipality_id: ID of the municipality to update
             data: Updated municipality data
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Updated municipality data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 municipality = session.query(Municipality).filter(Municipality.id == municipality_id).first()
 
                 if not municipality:
@@ -138,18 +173,19 @@ class MunicipalityServiceDB:
             return None
 
     @staticmethod
-    def delete(municipality_id: int) -> bool:
+    def delete(municipality_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a municipality by ID.
 
         Args:
             municipality_id: ID of the municipality to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 municipality = session.query(Municipality).filter(Municipality.id == municipality_id).first()
 
                 if not municipality:
@@ -162,45 +198,67 @@ class MunicipalityServiceDB:
             return False
 
     @staticmethod
-    def count() -> int:
+    def count(session: Optional[Session] = None) -> int:
         """
         Get total count of municipalities.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             int: Total number of municipalities
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 return session.query(Municipality).count()
         except SQLAlchemyError as e:
             print(f"Database error counting municipalities: {e}")
             return 0
 
     @staticmethod
-    def has_dependencies(municipality_id: int) -> Dict[str, int]:
+    def get_name_in_province(municipality_id: int, province_id: int, session: Optional[Session] = None) -> Optional[str]:
         """
-        Check if municipality has dependent entities (schools, markets, hospitals).
+        Get the name of a municipality, checking that it belongs to a province.
 
         Args:
             municipality_id: ID of the municipality
+            province_id: ID of the province it must belong to
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
-            Dict with counts of schools, markets, hospitals and total
+            str or None: Municipality name, or None if not found or in another province
         """
         try:
-            with get_db_session() as session:
-                # Get the municipality to check its nome
-                municipality = session.query(Municipality).filter(Municipality.id == municipality_id).first()
+            with get_db_session(session) as session:
+                return (
+                    session.query(Municipality.nome)
+                    .filter(Municipality.id == municipality_id, Municipality.provincia_id == province_id)
+                    .scalar()
+                )
+        except SQLAlchemyError as e:
+            print(f"Database error getting municipality {municipality_id}: {e}")
+            return None
 
-                if not municipality:
-                    return {"schools": 0, "markets": 0, "hospitals": 0, "total": 0}
+    @staticmethod
+    def has_dependencies(municipality_id: int, session: Optional[Session] = None) -> Dict[str, int]:
+        """
+        Check if municipality has dependent entities (schools, markets, hospitals).
+
+        Args:
+            municipality_id: ID of the municipality
+            session: Optional session to use (defaults to the request-scoped one)
 
-                # Count dependencies by municipio name
-                schools_count = session.query(School).filter(School.municipio == municipality.nome).count()
+        Returns:
+            Dict with counts of schools, markets, hospitals and total
+        """
+        try:
+            with get_db_session(session) as session:
+                # Count dependencies by municipio_id (index-only on the composite indexes)
+                schools_count = session.query(School.id).filter(School.municipio_id == municipality_id).count()
 
-                markets_count = session.query(Market).filter(Market.municipio == municipality.nome).count()
+                markets_count = session.query(Market.id).filter(Market.municipio_id == municipality_id).count()
 
-                hospitals_count = session.query(Hospital).filter(Hospital.municipio == municipality.nome).count()
+                hospitals_count = session.query(Hospital.id).filter(Hospital.municipio_id == municipality_id).count()
 
                 return {
                     "schools": schools_count,
@@ -3,7 +3,7 @@ Province service using SQLAlchemy ORM.
 Provides database-backed operations for provinces.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -17,15 +17,18 @@ class ProvinceServiceDB:
     """Service for managing provinces with PostgreSQL database."""
 
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
+    def get_all(session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all provinces from database.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             List[Dict]: List of all provinces with their data
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 provinces = session.query(Province).order_by(Province.nome).all()
                 return [province.to_dict() for province in provinces]
         except SQLAlchemyError as e:
@@ -34,7 +37,12 @@ class ProvinceServiceDB:
 
     @staticmethod
     def get_all_paginated(
-        page: int = 1, per_page: int = 20, sort_by: str = "nome", order: str = "asc", search: str = None
+        page: int = 1,
+        per_page: int = 20,
+        sort_by: str = "nome",
+        order: str = "asc",
+        search: str = None,
+        session: Optional[Session] = None,
     ) -> Dict[str, Any]:
         """
         Get paginated provinces with search and sort.
@@ -45,12 +53,13 @@ class ProvinceServiceDB:
             sort_by: Field to sort by
             order: 'asc' or 'desc'
             search: Search term for nome or capital
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict with paginated data and metadata
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 query = session.query(Province)
 
                 # Aplicar busca
@@ -78,18 +87,19 @@ class ProvinceServiceDB:
             }
 
     @staticmethod
-    def get_by_id(province_id: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(province_id: int, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific province by ID.
 
         Args:
             province_id: The ID of the province to retrieve
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Province data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 province = session.query(Province).filter(Province.id == province_id).first()
                 return province.to_dict() if province else None
         except SQLAlchemyError as e:
@@ -97,18 +107,19 @@ class ProvinceServiceDB:
             return None
 
     @staticmethod
-    def get_by_name(nome: str) -> Optional[Dict[str, Any]]:
+    def get_by_name(nome: str, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a province by name (case-insensitive).
 
         Args:
             nome: Name of the province
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Province data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 province = session.query(Province).filter(Province.nome.ilike(nome)).first()
                 return province.to_dict() if province else None
         except SQLAlchemyError as e:
@@ -116,18 +127,19 @@ class ProvinceServiceDB:
             return None
 
     @staticmethod
-    def create(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def create(data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Create a new province.
 
         Args:
             data: Province data (nome, capital, area_km2, populacao)
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Created province data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 province = Province(
                     nome=data["nome"],
                     capital=data.get("capital"),
@@ -143,19 +155,20 @@ class ProvinceServiceDB:
             return None
 
     @staticmethod
-    def update(province_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(province_id: int, data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Update an existing province.
 
         Args:
             province_id: ID of the province to update
             data: Updated province data
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Updated province data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 province = session.query(Province).filter(Province.id == province_id).first()
 
                 if not province:
@@ -179,18 +192,19 @@ class ProvinceServiceDB:
             return None
 
     @staticmethod
-    def delete(province_id: int) -> bool:
+    def delete(province_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a province by ID.
 
         Args:
             province_id: ID of the province to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 province = session.query(Province).filter(Province.id == province_id).first()
 
                 if not province:
@@ -203,67 +217,112 @@ class ProvinceServiceDB:
             return False
 
     @staticmethod
-    def count() -> int:
+    def count(session: Optional[Session] = None) -> int:
         """
         Get total count of provinces.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             int: Total number of provinces
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 return session.query(Province).count()
         except SQLAlchemyError as e:
             print(f"Database error counting provinces: {e}")
             return 0
 
     @staticmethod
-    def has_municipalities(province_id: int) -> int:
+    def has_municipalities(province_id: int, session: Optional[Session] = None) -> int:
         """
         Check how many municipalities belong to a province.
+        Locks the province row (FOR UPDATE) for the rest of the transaction.
 
         Args:
             province_id: ID of the province
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             int: Number of municipalities in the province
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
+                # Bloquear a província até ao fim da transação (evita inserir municípios entre a verificação e o delete)
+                session.query(Province.id).filter(Province.id == province_id).with_for_update().first()
                 return session.query(Municipality).filter(Municipality.provincia_id == province_id).count()
         except SQLAlchemyError as e:
             print(f"Database error checking municipalities for province {province_id}: {e}")
             return 0
 
     @staticmethod
-    def bulk_create(provinces_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_existing_ids(province_ids: Iterable[int], session: Optional[Session] = None) -> Set[int]:
+        """
+        Return which of the given province IDs exist (one query for the whole set).
+
+        Args:
+            province_ids: IDs to check
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            Set[int]: IDs that exist
+        """
+        try:
+            with get_db_session(session) as session:
+                rows = session.query(Province.id).filter(Province.id.in_(set(province_ids))).all()
+                return {row.id for row in rows}
+        except SQLAlchemyError as e:
+            print(f"Database error checking province ids: {e}")
+            return set()
+
+    @staticmethod
+    def bulk_create(
+        provinces_data: List[Dict[str, Any]], atomic: bool = False, session: Optional[Session] = None
+    ) -> Dict[str, Any]:
         """
         Create multiple provinces at once.
 
         Args:
             provinces_data: List of province data dictionaries
+            atomic: If True, any failure rolls back the whole batch; otherwise each
+                    row is written in its own savepoint and failures are reported per row
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
-            Dict with created count and any errors
+            Dict with created count and any errors ('index' is the position in provinces_data)
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
+                provinces = [
+                    Province(
+                        nome=data["nome"],
+                        capital=data.get("capital"),
+                        area_km2=data.get("area_km2"),
+                        populacao=data.get("populacao"),
+                    )
+                    for data in provinces_data
+                ]
+
+                if atomic:
+                    # One savepoint and a single flush for the whole batch
+                    try:
+                        with session.begin_nested():
+                            session.add_all(provinces)
+                    except SQLAlchemyError as e:
+                        return {"created": 0, "failed": len(provinces_data), "data": [], "errors": [{"error": str(e)}]}
+                    created = [province.to_dict() for province in provinces]
+                    return {"created": len(created), "failed": 0, "data": created, "errors": []}
+
                 created = []
                 errors = []
-
-                for data in provinces_data:
+                for index, province in enumerate(provinces):
                     try:
-                        province = Province(
-                            nome=data["nome"],
-                            capital=data.get("capital"),
-                            area_km2=data.get("area_km2"),
-                            populacao=data.get("populacao"),
-                        )
-                        session.add(province)
-                        session.flush()
+                        with session.begin_nested():
+                            session.add(province)
                         created.append(province.to_dict())
-                    except Exception as e:
-                        errors.append({"data": data, "error": str(e)})
+                    except SQLAlchemyError as e:
+                        errors.append({"index": index, "data": provinces_data[index], "error": str(e)})
 
                 return {"created": len(created), "failed": len(errors), "data": created, "errors": errors}
 
@@ -272,49 +331,54 @@ class ProvinceServiceDB:
             return {"created": 0, "failed": len(provinces_data), "data": [], "errors": [{"error": str(e)}]}
 
     @staticmethod
-    def bulk_update(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def bulk_update(updates: List[Dict[str, Any]], atomic: bool = False, session: Optional[Session] = None) -> Dict[str, Any]:
         """
         Update multiple provinces at once.
 
         Args:
             updates: List of dicts with 'id' and fields to update
+            atomic: If True, any failure rolls back the whole batch; otherwise each
+                    row is written in its own savepoint and failures are reported per row
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
-            Dict with updated count and any errors
+            Dict with updated count and any errors ('index' is the position in updates)
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
+                # One query loads every targeted province
+                ids = {update_data.get("id") for update_data in updates if update_data.get("id")}
+                provinces = {province.id: province for province in session.query(Province).filter(Province.id.in_(ids)).all()}
+
+                # Atomic mode: the whole batch is kept or discarded together
+                batch = session.begin_nested() if atomic else None
                 updated = []
                 errors = []
+                for index, update_data in enumerate(updates):
+                    province_id = update_data.get("id")
+                    if not province_id:
+                        errors.append({"index": index, "data": update_data, "error": "Missing id"})
+                        continue
 
-                for update_data in updates:
-                    try:
-                        province_id = update_data.get("id")
-                        if not province_id:
-                            errors.append({"data": update_data, "error": "Missing id"})
-                            continue
+                    province = provinces.get(province_id)
+                    if not province:
+                        errors.append({"index": index, "id": province_id, "error": "Not found"})
+                        continue
 
-                        province = session.query(Province).filter(Province.id == province_id).first()
-
-                        if not province:
-                            errors.append({"id": province_id, "error": "Not found"})
-                            continue
-
-                        # Update fields
-                        if "nome" in update_data:
-                            province.nome = update_data["nome"]
-                        if "capital" in update_data:
-                            province.capital = update_data["capital"]
-                        if "area_km2" in update_data:
-                            province.area_km2 = update_data["area_km2"]
-                        if "populacao" in update_data:
-                            province.populacao = update_data["populacao"]
-
-                        session.flush()
+                    try:
+                        with session.begin_nested():
+                            for field in ("nome", "capital", "area_km2", "populacao"):
+                                if field in update_data:
+                                    setattr(province, field, update_data[field])
                         updated.append(province.to_dict())
+                    except SQLAlchemyError as e:
+                        errors.append({"index": index, "data": update_data, "error": str(e)})
 
-                    except Exception as e:
-                        errors.append({"data": update_data, "error": str(e)})
+                if batch is not None:
+                    if errors:
+                        batch.rollback()
+                        return {"updated": 0, "failed": len(errors), "data": [], "errors": errors}
+                    batch.commit()
 
                 return {"updated": len(updated), "failed": len(errors), "data": updated, "errors": errors}
 
@@ -323,18 +387,19 @@ class ProvinceServiceDB:
             return {"updated": 0, "failed": len(updates), "data": [], "errors": [{"error": str(e)}]}
 
     @staticmethod
-    def bulk_delete(province_ids: List[int]) -> Dict[str, Any]:
+    def bulk_delete(province_ids: List[int], session: Optional[Session] = None) -> Dict[str, Any]:
         """
         Delete multiple provinces at once.
 
         Args:
             province_ids: List of province IDs to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict with deleted count and any errors
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 deleted = []
                 errors = []
 
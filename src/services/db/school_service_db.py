@@ -6,24 +6,31 @@ Provides database-backed operations for schools.
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from src.database.base import get_db_session
 from src.database.models import School
+from src.services.db.municipality_service_db import MunicipalityServiceDB
+from src.utils.geo import nearby_in_database
+from src.utils.pagination import SearchHelper
 
 
 class SchoolServiceDB:
     """Service for managing schools with PostgreSQL database."""
 
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
+    def get_all(session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all schools from database.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             List[Dict]: List of all schools with their data
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 schools = session.query(School).order_by(School.nome).all()
                 return [school.to_dict() for school in schools]
         except SQLAlchemyError as e:
@@ -31,18 +38,19 @@ class SchoolServiceDB:
             return []
 
     @staticmethod
-    def get_by_id(school_id: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(school_id: int, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific school by ID.
 
         Args:
             school_id: The ID of the school to retrieve
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: School data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 school = session.query(School).filter(School.id == school_id).first()
                 return school.to_dict() if school else None
         except SQLAlchemyError as e:
@@ -50,18 +58,19 @@ class SchoolServiceDB:
             return None
 
     @staticmethod
-    def get_by_province(province_id: int) -> List[Dict[str, Any]]:
+    def get_by_province(province_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all schools for a specific province.
 
         Args:
             province_id: ID of the province
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of schools in the province
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 schools = session.query(School).filter(School.provincia_id == province_id).order_by(School.nome).all()
                 return [school.to_dict() for school in schools]
         except SQLAlchemyError as e:
@@ -69,43 +78,112 @@ class SchoolServiceDB:
             return []
 
     @staticmethod
-    def get_by_municipality(municipio_nome: str) -> List[Dict[str, Any]]:
+    def get_by_municipality(municipality_id: int, session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all schools for a specific municipality.
 
         Args:
-            municipio_nome: Name of the municipality
+            municipality_id: ID of the municipality
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             List[Dict]: List of schools in the municipality
         """
         try:
-            with get_db_session() as session:
-                schools = session.query(School).filter(School.municipio == municipio_nome).order_by(School.nome).all()
+            with get_db_session(session) as session:
+                schools = session.query(School).filter(School.municipio_id == municipality_id).order_by(School.nome).all()
                 return [school.to_dict() for school in schools]
         except SQLAlchemyError as e:
-            print(f"Database error getting schools for municipality '{municipio_nome}': {e}")
+            print(f"Database error getting schools for municipality {municipality_id}: {e}")
+            return []
+
+    @staticmethod
+    def autocomplete(
+        prefix: str, limit: int = 10, provincia_id: Optional[int] = None, session: Optional[Session] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Suggest schools whose name starts with the prefix.
+
+        Args:
+            prefix: Typed prefix (accents are ignored on PostgreSQL with unaccent)
+            limit: Maximum number of suggestions
+            provincia_id: Restrict to one province (optional)
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Suggestions with id, nome and provincia_id
+        """
+        try:
+            with get_db_session(session) as session:
+                query = session.query(School.id, School.nome, School.provincia_id)
+                if provincia_id is not None:
+                    query = query.filter(School.provincia_id == provincia_id)
+                rows = SearchHelper.apply_prefix_search(query, School.nome, prefix).limit(limit).all()
+                return [{"id": row.id, "nome": row.nome, "provincia_id": row.provincia_id} for row in rows]
+        except SQLAlchemyError as e:
+            print(f"Database error autocompleting schools: {e}")
+            return []
+
+    @staticmethod
+    def get_nearby(
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        session: Optional[Session] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the schools nearest to a point (bounding-box range on the latitude/longitude index).
+
+        Args:
+            lat: Latitude of the point
+            lon: Longitude of the point
+            radius_km: Maximum distance in km (None = the 'limit' nearest)
+            limit: Maximum number of results
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Schools with distancia_km, nearest first
+        """
+        try:
+            with get_db_session(session) as session:
+                return nearby_in_database(session.query(School), School, lat, lon, radius_km, limit)
+        except SQLAlchemyError as e:
+            print(f"Database error getting schools near ({lat}, {lon}): {e}")
             return []
 
     @staticmethod
-    def create(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def create(data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Create a new school.
 
         Args:
-            data: School data (nome, provincia_id, municipio, tipo, nivel)
+            data: School data (nome, provincia_id, municipio_id or municipio, tipo, nivel)
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Created school data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
+                municipio = data.get("municipio")
+                if data.get("municipio_id") is not None:
+                    # Municipality must exist and belong to the province; the name follows the id
+                    municipio = MunicipalityServiceDB.get_name_in_province(
+                        data["municipio_id"], data["provincia_id"], session=session
+                    )
+                    if municipio is None:
+                        return None
+
                 school = School(
                     nome=data["nome"],
                     provincia_id=data["provincia_id"],
-                    municipio=data.get("municipio"),
+                    municipio_id=data.get("municipio_id"),
+                    municipio=municipio,
                     tipo=data.get("tipo"),
                     nivel=data.get("nivel"),
+                    latitude=data.get("latitude"),
+                    longitude=data.get("longitude"),
                 )
                 session.add(school)
                 session.flush()
@@ -116,35 +194,43 @@ class SchoolServiceDB:
             return None
 
     @staticmethod
-    def update(school_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(school_id: int, data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Update an existing school.
 
         Args:
             school_id: ID of the school to update
             data: Updated school data
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Updated school data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 school = session.query(School).filter(School.id == school_id).first()
 
                 if not school:
                     return None
 
-                # Update fields if provided
-                if "nome" in data:
-                    school.nome = data["nome"]
-                if "provincia_id" in data:
-                    school.provincia_id = data["provincia_id"]
-                if "municipio" in data:
+                # Check the province/municipality first: a rejected update must not leave other fields changed
+                if "provincia_id" in data or "municipio_id" in data:
+                    provincia_id = data.get("provincia_id", school.provincia_id)
+                    municipio_id = data.get("municipio_id", school.municipio_id)
+                    if municipio_id is not None:
+                        municipio = MunicipalityServiceDB.get_name_in_province(municipio_id, provincia_id, session=session)
+                        if municipio is None:
+                            return None
+                        school.municipio = municipio
+                    school.provincia_id = provincia_id
+                    school.municipio_id = municipio_id
+                elif "municipio" in data:
                     school.municipio = data["municipio"]
-                if "tipo" in data:
-                    school.tipo = data["tipo"]
-                if "nivel" in data:
-                    school.nivel = data["nivel"]
+
+                # Update fields if provided
+                for field in ("nome", "tipo", "nivel", "latitude", "longitude"):
+                    if field in data:
+                        setattr(school, field, data[field])
 
                 session.flush()
                 result = school.to_dict()
@@ -154,18 +240,19 @@ class SchoolServiceDB:
             return None
 
     @staticmethod
-    def delete(school_id: int) -> bool:
+    def delete(school_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a school by ID.
 
         Args:
             school_id: ID of the school to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 school = session.query(School).filter(School.id == school_id).first()
 
                 if not school:
@@ -178,15 +265,18 @@ class SchoolServiceDB:
             return False
 
     @staticmethod
-    def count() -> int:
+    def count(session: Optional[Session] = None) -> int:
         """
         Get total count of schools.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             int: Total number of schools
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 return session.query(School).count()
         except SQLAlchemyError as e:
             print(f"Database error counting schools: {e}")
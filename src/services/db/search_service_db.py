@@ -0,0 +1,63 @@
+"""
+Search service using SQLAlchemy ORM.
+Searches text fields across all entities and ranks the results.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.database.base import get_db_session
+from src.database.models import Hospital, Market, Municipality, Province, School
+from src.utils.pagination import SearchHelper
+from src.utils.search_index import SEARCH_ENTITIES, SEARCH_FIELDS, score_record
+
+ENTITY_MODELS = {
+    "provinces": Province,
+    "municipalities": Municipality,
+    "schools": School,
+    "markets": Market,
+    "hospitals": Hospital,
+}
+
+
+class SearchServiceDB:
+    """Service for cross-entity text search with PostgreSQL database."""
+
+    @staticmethod
+    def search(
+        query: str, entities: Optional[List[str]] = None, limit: int = 20, session: Optional[Session] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search all requested entities and rank the hits together.
+
+        Args:
+            query: Search text
+            entities: Entities to search (default: all)
+            limit: Maximum number of results
+            session: Optional session to use (defaults to the request-scoped one)
+
+        Returns:
+            List[Dict]: Results with 'type', 'id', 'nome', 'score' and 'data'
+        """
+        results = []
+        try:
+            with get_db_session(session) as session:
+                for entity in entities or SEARCH_ENTITIES:
+                    model = ENTITY_MODELS[entity]
+                    db_query = SearchHelper.apply_text_search(
+                        session.query(model), model, query, list(SEARCH_FIELDS[entity]), rank=True
+                    )
+                    for row in db_query.limit(limit).all():
+                        record = row.to_dict()
+                        results.append((score_record(entity, record, query), entity, record))
+        except SQLAlchemyError as e:
+            print(f"Database error searching: {e}")
+            return []
+
+        results.sort(key=lambda item: (-item[0], (item[2].get("nome") or "").lower(), item[1]))
+        return [
+            {"type": entity, "id": record["id"], "nome": record.get("nome"), "score": score, "data": record}
+            for score, entity, record in results[:limit]
+        ]
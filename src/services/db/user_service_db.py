@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from src.database.base import get_db_session
 from src.database.models import User, UserRole
@@ -16,15 +17,18 @@ class UserServiceDB:
     """Service for managing users with PostgreSQL database."""
 
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
+    def get_all(session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Get all users from database.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             List[Dict]: List of all users with their data
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 users = session.query(User).order_by(User.username).all()
                 return [user.to_dict() for user in users]
         except SQLAlchemyError as e:
@@ -32,18 +36,19 @@ class UserServiceDB:
             return []
 
     @staticmethod
-    def get_by_id(user_id: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(user_id: int, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific user by ID.
 
         Args:
             user_id: The ID of the user to retrieve
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: User data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 user = session.query(User).filter(User.id == user_id).first()
                 return user.to_dict() if user else None
         except SQLAlchemyError as e:
@@ -51,18 +56,19 @@ class UserServiceDB:
             return None
 
     @staticmethod
-    def get_by_username(username: str) -> Optional[Dict[str, Any]]:
+    def get_by_username(username: str, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a user by username.
 
         Args:
             username: Username to search for
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: User data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 user = session.query(User).filter(User.username == username).first()
                 return user.to_dict() if user else None
         except SQLAlchemyError as e:
@@ -70,18 +76,19 @@ class UserServiceDB:
             return None
 
     @staticmethod
-    def get_by_email(email: str) -> Optional[Dict[str, Any]]:
+    def get_by_email(email: str, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Get a user by email.
 
         Args:
             email: Email to search for
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: User data if found, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 user = session.query(User).filter(User.email == email).first()
                 return user.to_dict() if user else None
         except SQLAlchemyError as e:
@@ -89,18 +96,19 @@ class UserServiceDB:
             return None
 
     @staticmethod
-    def create(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def create(data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Create a new user.
 
         Args:
             data: User data (username, email, password_hash, role)
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Created user data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 # Convert role string to enum if needed
                 role = data.get("role", "user")
                 if isinstance(role, str):
@@ -122,19 +130,20 @@ class UserServiceDB:
             return None
 
     @staticmethod
-    def update(user_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(user_id: int, data: Dict[str, Any], session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
         """
         Update an existing user.
 
         Args:
             user_id: ID of the user to update
             data: Updated user data
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             Dict or None: Updated user data if successful, None otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 user = session.query(User).filter(User.id == user_id).first()
 
                 if not user:
@@ -161,18 +170,19 @@ class UserServiceDB:
             return None
 
     @staticmethod
-    def delete(user_id: int) -> bool:
+    def delete(user_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a user by ID.
 
         Args:
             user_id: ID of the user to delete
+            session: Optional session to use (defaults to the request-scoped one)
 
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 user = session.query(User).filter(User.id == user_id).first()
 
                 if not user:
@@ -185,15 +195,18 @@ class UserServiceDB:
             return False
 
     @staticmethod
-    def count() -> int:
+    def count(session: Optional[Session] = None) -> int:
         """
         Get total count of users.
 
+        Args:
+            session: Optional session to use (defaults to the request-scoped one)
+
         Returns:
             int: Total number of users
         """
         try:
-            with get_db_session() as session:
+            with get_db_session(session) as session:
                 return session.query(User).count()
         except SQLAlchemyError as e:
             print(f"Database error counting users: {e}")
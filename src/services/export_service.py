@@ -0,0 +1,40 @@
+"""
+Serviço de exportação das entidades completas.
+Lê as listas em memória (modo JSON) em lotes, para gerar arquivos colunares.
+"""
+
+from src.utils.search_index import load_entity
+from src.utils.signals import get_version
+
+
+class ExportService:
+    """Serviço para exportação em massa das entidades."""
+
+    @staticmethod
+    def get_version(entity):
+        """
+        Retorna a versão atual dos dados de uma entidade (muda a cada escrita ou recarga).
+
+        Args:
+            entity (str): Nome da entidade (ex: 'schools')
+
+        Returns:
+            int: Versão atual
+        """
+        return get_version(entity)
+
+    @staticmethod
+    def iter_batches(entity, batch_size=10000):
+        """
+        Percorre todos os registros de uma entidade em lotes.
+
+        Args:
+            entity (str): Nome da entidade
+            batch_size (int): Registros por lote
+
+        Yields:
+            list: Lote de registros
+        """
+        records = load_entity(entity)
+        for start in range(0, len(records), batch_size):
+            yield records[start : start + batch_size]
@@ -4,7 +4,10 @@ Responsável por buscar e manipular dados de hospitais.
 """
 
 from src.models.hospital import HOSPITALS
+from src.utils.autocomplete import autocomplete_index
+from src.utils.geo import geo_index
 from src.utils.persistence import persist_data
+from src.utils.signals import notify_change
 
 
 class HospitalService:
@@ -60,6 +63,37 @@ class HospitalService:
         municipality_id = int(municipality_id)
         return [h for h in HOSPITALS if h.get("municipio_id") == municipality_id]
 
+    @staticmethod
+    def autocomplete(prefix, limit=10, provincia_id=None):
+        """
+        Sugere hospitais cujo nome começa pelo prefixo (sem acentos/maiúsculas).
+
+        Args:
+            prefix (str): Prefixo digitado
+            limit (int): Número máximo de sugestões
+            provincia_id (int): Restringir a uma província (opcional)
+
+        Returns:
+            list: Sugestões com id, nome e provincia_id
+        """
+        return autocomplete_index.complete("hospitals", prefix, limit=limit, provincia_id=provincia_id)
+
+    @staticmethod
+    def get_nearby(lat, lon, radius_km=None, limit=10):
+        """
+        Retorna os hospitais mais próximos de um ponto (índice em grelha).
+
+        Args:
+            lat (float): Latitude do ponto
+            lon (float): Longitude do ponto
+            radius_km (float): Raio máximo em km (None = os 'limit' mais próximos)
+            limit (int): Número máximo de resultados
+
+        Returns:
+            list: Hospitais com 'distancia_km', do mais próximo ao mais distante
+        """
+        return geo_index.nearby("hospitals", lat, lon, radius_km=radius_km, limit=limit)
+
     @staticmethod
     def create(data):
         """
@@ -101,9 +135,12 @@ class HospitalService:
             "municipio_id": data["municipio_id"],
             "municipio": municipality["nome"],
             "endereco": data["endereco"],
+            "latitude": data.get("latitude"),
+            "longitude": data.get("longitude"),
         }
 
         HOSPITALS.append(new_hospital)
+        notify_change("hospitals", "create", new_hospital)
         return new_hospital
 
     @staticmethod
@@ -125,17 +162,9 @@ class HospitalService:
         hospital_id = int(hospital_id)
         for hospital in HOSPITALS:
             if hospital["id"] == hospital_id:
-                # Atualizar campos simples
-                if "nome" in data:
-                    hospital["nome"] = data["nome"]
-                if "tipo" in data:
-                    hospital["tipo"] = data["tipo"]
-                if "categoria" in data:
-                    hospital["categoria"] = data["categoria"]
-                if "endereco" in data:
-                    hospital["endereco"] = data["endereco"]
-
-                # Atualizar província/município
+                # Validar província/município antes de alterar o registro: um pedido
+                # recusado não pode deixar campos novos (nem coordenadas) para trás
+                location = {}
                 if "provincia_id" in data or "municipio_id" in data:
                     provincia_id = data.get("provincia_id", hospital["provincia_id"])
                     municipio_id = data.get("municipio_id", hospital["municipio_id"])
@@ -151,11 +180,20 @@ class HospitalService:
                     if municipality["provincia_id"] != provincia_id:
                         return None
 
-                    hospital["provincia_id"] = provincia_id
-                    hospital["provincia_nome"] = province["nome"]
-                    hospital["municipio_id"] = municipio_id
-                    hospital["municipio"] = municipality["nome"]
+                    location = {
+                        "provincia_id": provincia_id,
+                        "provincia_nome": province["nome"],
+                        "municipio_id": municipio_id,
+                        "municipio": municipality["nome"],
+                    }
+
+                # Atualizar campos simples (coordenadas validadas em conjunto pelo schema; None remove)
+                for field in ("nome", "tipo", "categoria", "endereco", "latitude", "longitude"):
+                    if field in data:
+                        hospital[field] = data[field]
+                hospital.update(location)
 
+                notify_change("hospitals", "update", hospital)
                 return hospital
         return None
 
@@ -174,6 +212,7 @@ class HospitalService:
         hospital_id = int(hospital_id)
         for i, hospital in enumerate(HOSPITALS):
             if hospital["id"] == hospital_id:
-                HOSPITALS.pop(i)
+                removed = HOSPITALS.pop(i)
+                notify_change("hospitals", "delete", removed)
                 return True
         return False
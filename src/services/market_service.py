@@ -4,7 +4,10 @@ Responsável por buscar e manipular dados de mercados.
 """
 
 from src.models.market import MARKETS
+from src.utils.autocomplete import autocomplete_index
+from src.utils.geo import geo_index
 from src.utils.persistence import persist_data
+from src.utils.signals import notify_change
 
 
 class MarketService:
@@ -60,6 +63,37 @@ class MarketService:
         municipality_id = int(municipality_id)
         return [m for m in MARKETS if m.get("municipio_id") == municipality_id]
 
+    @staticmethod
+    def autocomplete(prefix, limit=10, provincia_id=None):
+        """
+        Sugere mercados cujo nome começa pelo prefixo (sem acentos/maiúsculas).
+
+        Args:
+            prefix (str): Prefixo digitado
+            limit (int): Número máximo de sugestões
+            provincia_id (int): Restringir a uma província (opcional)
+
+        Returns:
+            list: Sugestões com id, nome e provincia_id
+        """
+        return autocomplete_index.complete("markets", prefix, limit=limit, provincia_id=provincia_id)
+
+    @staticmethod
+    def get_nearby(lat, lon, radius_km=None, limit=10):
+        """
+        Retorna os mercados mais próximos de um ponto (índice em grelha).
+
+        Args:
+            lat (float): Latitude do ponto
+            lon (float): Longitude do ponto
+            radius_km (float): Raio máximo em km (None = os 'limit' mais próximos)
+            limit (int): Número máximo de resultados
+
+        Returns:
+            list: Mercados com 'distancia_km', do mais próximo ao mais distante
+        """
+        return geo_index.nearby("markets", lat, lon, radius_km=radius_km, limit=limit)
+
     @staticmethod
     def create(data):
         """
@@ -100,9 +134,12 @@ class MarketService:
             "municipio_id": data["municipio_id"],
             "municipio": municipality["nome"],
             "especialidade": data["especialidade"],
+            "latitude": data.get("latitude"),
+            "longitude": data.get("longitude"),
         }
 
         MARKETS.append(new_market)
+        notify_change("markets", "create", new_market)
         return new_market
 
     @staticmethod
@@ -124,15 +161,9 @@ class MarketService:
         market_id = int(market_id)
         for market in MARKETS:
             if market["id"] == market_id:
-                # Atualizar campos simples
-                if "nome" in data:
-                    market["nome"] = data["nome"]
-                if "tipo" in data:
-                    market["tipo"] = data["tipo"]
-                if "especialidade" in data:
-                    market["especialidade"] = data["especialidade"]
-
-                # Atualizar província/município
+                # Validar província/município antes de alterar o registro: um pedido
+                # recusado não pode deixar campos novos (nem coordenadas) para trás
+                location = {}
                 if "provincia_id" in data or "municipio_id" in data:
                     provincia_id = data.get("provincia_id", market["provincia_id"])
                     municipio_id = data.get("municipio_id", market["municipio_id"])
@@ -148,11 +179,20 @@ class MarketService:
                     if municipality["provincia_id"] != provincia_id:
                         return None
 
-                    market["provincia_id"] = provincia_id
-                    market["provincia_nome"] = province["nome"]
-                    market["municipio_id"] = municipio_id
-                    market["municipio"] = municipality["nome"]
+                    location = {
+                        "provincia_id": provincia_id,
+                        "provincia_nome": province["nome"],
+                        "municipio_id": municipio_id,
+                        "municipio": municipality["nome"],
+                    }
+
+                # Atualizar campos simples (coordenadas validadas em conjunto pelo schema; None remove)
+                for field in ("nome", "tipo", "especialidade", "latitude", "longitude"):
+                    if field in data:
+                        market[field] = data[field]
+                market.update(location)
 
+                notify_change("markets", "update", market)
                 return market
         return None
 
@@ -171,6 +211,7 @@ class MarketService:
         market_id = int(market_id)
         for i, market in enumerate(MARKETS):
             if market["id"] == market_id:
-                MARKETS.pop(i)
+                removed = MARKETS.pop(i)
+                notify_change("markets", "delete", removed)
                 return True
         return False
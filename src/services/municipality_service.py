@@ -4,7 +4,9 @@ Responsável por buscar e manipular dados de municípios.
 """
 
 from src.models.municipality import MUNICIPALITIES
+from src.utils.autocomplete import autocomplete_index
 from src.utils.persistence import persist_data
+from src.utils.signals import notify_change
 
 
 class MunicipalityService:
@@ -46,6 +48,21 @@ class MunicipalityService:
         province_id = int(province_id)
         return [m for m in MUNICIPALITIES if m["provincia_id"] == province_id]
 
+    @staticmethod
+    def autocomplete(prefix, limit=10, provincia_id=None):
+        """
+        Sugere municípios cujo nome começa pelo prefixo (sem acentos/maiúsculas).
+
+        Args:
+            prefix (str): Prefixo digitado
+            limit (int): Número máximo de sugestões
+            provincia_id (int): Restringir a uma província (opcional)
+
+        Returns:
+            list: Sugestões com id, nome e provincia_id
+        """
+        return autocomplete_index.complete("municipalities", prefix, limit=limit, provincia_id=provincia_id)
+
     @staticmethod
     @persist_data
     def create(data):
@@ -76,6 +93,7 @@ class MunicipalityService:
         }
 
         MUNICIPALITIES.append(new_municipality)
+        notify_change("municipalities", "create", new_municipality)
         return new_municipality
 
     @staticmethod
@@ -108,6 +126,7 @@ class MunicipalityService:
                     municipality["provincia_id"] = data["provincia_id"]
                     municipality["provincia_nome"] = province["nome"]
 
+                notify_change("municipalities", "update", municipality)
                 return municipality
         return None
 
@@ -126,7 +145,8 @@ class MunicipalityService:
         municipality_id = int(municipality_id)
         for i, municipality in enumerate(MUNICIPALITIES):
             if municipality["id"] == municipality_id:
-                MUNICIPALITIES.pop(i)
+                removed = MUNICIPALITIES.pop(i)
+                notify_change("municipalities", "delete", removed)
                 return True
         return False
 
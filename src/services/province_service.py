@@ -4,7 +4,10 @@ Responsável por buscar e manipular dados de províncias.
 """
 
 from src.models.province import PROVINCES
+from src.utils.pagination import PaginationHelper
 from src.utils.persistence import persist_data
+from src.utils.query_engine import query_engine
+from src.utils.signals import notify_change
 
 
 class ProvinceService:
@@ -15,6 +18,26 @@ class ProvinceService:
         """Retorna todas as províncias."""
         return PROVINCES
 
+    @staticmethod
+    def get_all_paginated(page=1, per_page=20, sort_by="nome", order="asc", search=None):
+        """
+        Retorna províncias paginadas com busca e ordenação (mesma semântica do modo DB).
+
+        Args:
+            page (int): Número da página (1-indexed)
+            per_page (int): Itens por página
+            sort_by (str): Campo para ordenar
+            order (str): 'asc' ou 'desc'
+            search (str): Termo de busca em nome ou capital
+
+        Returns:
+            dict: Dados paginados e metadados
+        """
+        provinces = query_engine.query(
+            "provinces", search=search, search_fields=["nome", "capital"], sort_by=sort_by, order=order
+        )
+        return PaginationHelper.paginate_list(provinces, page, per_page)
+
     @staticmethod
     def get_by_id(province_id):
         """
@@ -56,6 +79,7 @@ class ProvinceService:
         }
 
         PROVINCES.append(new_province)
+        notify_change("provinces", "create", new_province)
         return new_province
 
     @staticmethod
@@ -83,6 +107,7 @@ class ProvinceService:
                     province["area_km2"] = data["area_km2"]
                 if "populacao" in data:
                     province["populacao"] = data["populacao"]
+                notify_change("provinces", "update", province)
                 return province
         return None
 
@@ -101,7 +126,8 @@ class ProvinceService:
         province_id = int(province_id)
         for i, province in enumerate(PROVINCES):
             if province["id"] == province_id:
-                PROVINCES.pop(i)
+                removed = PROVINCES.pop(i)
+                notify_change("provinces", "delete", removed)
                 return True
         return False
 
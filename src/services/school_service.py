@@ -4,7 +4,10 @@ Responsável por buscar e manipular dados de escolas.
 """
 
 from src.models.school import SCHOOLS
+from src.utils.autocomplete import autocomplete_index
+from src.utils.geo import geo_index
 from src.utils.persistence import persist_data
+from src.utils.signals import notify_change
 
 
 class SchoolService:
@@ -60,6 +63,37 @@ class SchoolService:
         municipality_id = int(municipality_id)
         return [s for s in SCHOOLS if s.get("municipio_id") == municipality_id]
 
+    @staticmethod
+    def autocomplete(prefix, limit=10, provincia_id=None):
+        """
+        Sugere escolas cujo nome começa pelo prefixo (sem acentos/maiúsculas).
+
+        Args:
+            prefix (str): Prefixo digitado
+            limit (int): Número máximo de sugestões
+            provincia_id (int): Restringir a uma província (opcional)
+
+        Returns:
+            list: Sugestões com id, nome e provincia_id
+        """
+        return autocomplete_index.complete("schools", prefix, limit=limit, provincia_id=provincia_id)
+
+    @staticmethod
+    def get_nearby(lat, lon, radius_km=None, limit=10):
+        """
+        Retorna as escolas mais próximas de um ponto (índice em grelha).
+
+        Args:
+            lat (float): Latitude do ponto
+            lon (float): Longitude do ponto
+            radius_km (float): Raio máximo em km (None = as 'limit' mais próximas)
+            limit (int): Número máximo de resultados
+
+        Returns:
+            list: Escolas com 'distancia_km', da mais próxima à mais distante
+        """
+        return geo_index.nearby("schools", lat, lon, radius_km=radius_km, limit=limit)
+
     @staticmethod
     def create(data):
         """
@@ -100,9 +134,12 @@ class SchoolService:
             "municipio_id": data["municipio_id"],
             "municipio": municipality["nome"],
             "endereco": data["endereco"],
+            "latitude": data.get("latitude"),
+            "longitude": data.get("longitude"),
         }
 
         SCHOOLS.append(new_school)
+        notify_change("schools", "create", new_school)
         return new_school
 
     @staticmethod
@@ -124,15 +161,9 @@ class SchoolService:
         school_id = int(school_id)
         for school in SCHOOLS:
             if school["id"] == school_id:
-                # Atualizar campos simples
-                if "nome" in data:
-                    school["nome"] = data["nome"]
-                if "tipo" in data:
-                    school["tipo"] = data["tipo"]
-                if "endereco" in data:
-                    school["endereco"] = data["endereco"]
-
-                # Atualizar província/município (validar relacionamento)
+                # Validar província/município antes de alterar o registro: um pedido
+                # recusado não pode deixar campos novos (nem coordenadas) para trás
+                location = {}
                 if "provincia_id" in data or "municipio_id" in data:
                     provincia_id = data.get("provincia_id", school["provincia_id"])
                     municipio_id = data.get("municipio_id", school["municipio_id"])
@@ -151,11 +182,20 @@ class SchoolService:
                     if municipality["provincia_id"] != provincia_id:
                         return None
 
-                    school["provincia_id"] = provincia_id
-                    school["provincia_nome"] = province["nome"]
-                    school["municipio_id"] = municipio_id
-                    school["municipio"] = municipality["nome"]
+                    location = {
+                        "provincia_id": provincia_id,
+                        "provincia_nome": province["nome"],
+                        "municipio_id": municipio_id,
+                        "municipio": municipality["nome"],
+                    }
+
+                # Atualizar campos simples (coordenadas validadas em conjunto pelo schema; None remove)
+                for field in ("nome", "tipo", "endereco", "latitude", "longitude"):
+                    if field in data:
+                        school[field] = data[field]
+                school.update(location)
 
+                notify_change("schools", "update", school)
                 return school
         return None
 
@@ -174,6 +214,7 @@ class SchoolService:
         school_id = int(school_id)
         for i, school in enumerate(SCHOOLS):
             if school["id"] == school_id:
-                SCHOOLS.pop(i)
+                removed = SCHOOLS.pop(i)
+                notify_change("schools", "delete", removed)
                 return True
         return False
@@ -0,0 +1,25 @@
+"""
+Serviço de busca textual entre entidades.
+Usa o índice invertido em memória (modo JSON).
+"""
+
+from src.utils.search_index import search_index
+
+
+class SearchService:
+    """Serviço para busca unificada em províncias, municípios, escolas, mercados e hospitais."""
+
+    @staticmethod
+    def search(query, entities=None, limit=20):
+        """
+        Busca registros por texto, ignorando acentos e maiúsculas.
+
+        Args:
+            query (str): Texto da busca
+            entities (list): Entidades onde buscar (padrão: todas)
+            limit (int): Número máximo de resultados
+
+        Returns:
+            list: Resultados ordenados por relevância
+        """
+        return search_index.search(query, entities=entities, limit=limit)
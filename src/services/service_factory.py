@@ -5,25 +5,26 @@ This factory provides a unified interface to access services,
 allowing seamless transition from JSON to PostgreSQL database.
 """
 
-import os
 from typing import Any
 
 
 class ServiceFactory:
     """
     Factory class to provide appropriate service implementation
-    based on USE_DATABASE environment variable.
+    based on the STORAGE_BACKEND (or legacy USE_DATABASE) environment variable.
     """
 
     @staticmethod
     def _use_database() -> bool:
         """
-        Check if database should be used.
+        Check if database-backed services should be used.
 
         Returns:
-            bool: True if USE_DATABASE=True, False otherwise
+            bool: True for STORAGE_BACKEND=postgres/sqlite (or USE_DATABASE=True), False for JSON
         """
-        return os.getenv("USE_DATABASE", "False").lower() == "true"
+        from src.database.base import uses_database
+
+        return uses_database()
 
     @staticmethod
     def get_province_service() -> Any:
@@ -110,6 +111,57 @@ class ServiceFactory:
 
             return HospitalService
 
+    @staticmethod
+    def get_search_service() -> Any:
+        """
+        Get cross-entity Search service (DB or JSON).
+
+        Returns:
+            SearchService: Either SearchServiceDB or SearchService
+        """
+        if ServiceFactory._use_database():
+            from src.services.db.search_service_db import SearchServiceDB
+
+            return SearchServiceDB
+        else:
+            from src.services.search_service import SearchService
+
+            return SearchService
+
+    @staticmethod
+    def get_change_service() -> Any:
+        """
+        Get change feed service (DB or JSON).
+
+        Returns:
+            ChangeService: Either ChangeServiceDB or ChangeService
+        """
+        if ServiceFactory._use_database():
+            from src.services.db.change_service_db import ChangeServiceDB
+
+            return ChangeServiceDB
+        else:
+            from src.services.change_service import ChangeService
+
+            return ChangeService
+
+    @staticmethod
+    def get_export_service() -> Any:
+        """
+        Get bulk export service (DB or JSON).
+
+        Returns:
+            ExportService: Either ExportServiceDB or ExportService
+        """
+        if ServiceFactory._use_database():
+            from src.services.db.export_service_db import ExportServiceDB
+
+            return ExportServiceDB
+        else:
+            from src.services.export_service import ExportService
+
+            return ExportService
+
     @staticmethod
     def get_user_service() -> Any:
         """
@@ -3,8 +3,6 @@ Recursos Swagger para Províncias.
 Documentação dos endpoints existentes em /provinces.
 """
 
-import os
-
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required
 from flask_restx import Resource
@@ -48,9 +46,8 @@ class ProvinceListResource(Resource):
         ProvinceService = ServiceFactory.get_province_service()
 
         use_pagination = request.args.get("paginate", "true").lower() == "true"
-        use_database = os.getenv("USE_DATABASE", "False").lower() == "true"
 
-        if use_pagination and use_database and hasattr(ProvinceService, "get_all_paginated"):
+        if use_pagination and hasattr(ProvinceService, "get_all_paginated"):
             page, per_page = PaginationHelper.get_pagination_params()
             sort_by, order = SearchHelper.get_sort_params()
             search = SearchHelper.get_search_query()
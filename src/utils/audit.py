@@ -2,14 +2,167 @@
 Sistema de auditoria para registrar ações importantes na API.
 """
 
-import json
-import os
+import atexit
+import queue
+import threading
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
 
 from flask import request
-from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from src.utils.audit_store import AuditLogStore, normalize_timestamp
+from src.utils.decorators import get_auth_context
+
+
+class AuditWriter:
+    """Thread em background que esvazia a fila de auditoria em lotes"""
+
+    _STOP = object()
+
+    def __init__(self, sink, queue_size=10000, policy="block", enqueue_timeout=0.05, batch_size=500, flush_interval=0.5):
+        """
+        Args:
+            sink: Destino com write_batch(), sync() e close()
+            queue_size (int): Capacidade máxima da fila em memória
+            policy (str): 'block' (back-pressure até enqueue_timeout) ou 'drop'
+            enqueue_timeout (float): Espera máxima por espaço na fila (policy='block')
+            batch_size (int): Máximo de eventos por escrita
+            flush_interval (float): Espera máxima (segundos) por novos eventos
+        """
+        self.sink = sink
+        self.policy = policy
+        self.enqueue_timeout = enqueue_timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+
+    def start(self):
+        """Inicia a thread de escrita"""
+        self._thread.start()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def enqueue(self, entry):
+        """
+        Coloca um evento na fila sem tocar no disco.
+
+        Args:
+            entry (dict): Evento de auditoria
+
+        Returns:
+            bool: True se enfileirado, False se descartado (fila cheia)
+        """
+        try:
+            if self.policy == "drop":
+                self._queue.put_nowait(entry)
+            else:
+                self._queue.put(entry, timeout=self.enqueue_timeout)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=5.0):
+        """
+        Espera até que todos os eventos enfileirados até agora estejam gravados.
+
+        Args:
+            timeout (float): Espera máxima em segundos
+
+        Returns:
+            bool: True se a fila foi esvaziada a tempo
+        """
+        if not self.running:
+            return False
+
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Esvazia a fila, sincroniza o destino e encerra a thread"""
+        if not self.running:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Nenhum evento novo: aproveitar para sincronizar o pendente
+                self._sync()
+                continue
+
+            batch, markers, stopping = self._drain(item)
+            try:
+                self.sink.write_batch(batch)
+            except Exception as e:
+                print(f"Erro ao gravar logs de auditoria: {e}")
+
+            if markers:
+                self._sync()
+                for marker in markers:
+                    marker.set()
+
+        self._sync()
+        self.sink.close()
+
+    def _drain(self, item):
+        """Junta ao item recebido o que já estiver na fila, até batch_size eventos"""
+        batch, markers = [], []
+        while True:
+            if item is self._STOP:
+                return batch, markers, True
+            if isinstance(item, threading.Event):
+                markers.append(item)
+            else:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size:
+                return batch, markers, False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, markers, False
+
+    def _sync(self):
+        try:
+            self.sink.sync()
+        except Exception as e:
+            print(f"Erro ao sincronizar logs de auditoria: {e}")
+
+
+class AuditDatabaseSink:
+    """Destino de logs de auditoria na tabela audit_events (PostgreSQL)"""
+
+    def write_batch(self, entries):
+        """Insere um lote de eventos (COPY / INSERT multi-linha)"""
+        from src.services.db.audit_service_db import AuditServiceDB
+
+        AuditServiceDB.insert_batch(entries)
+
+    def sync(self):
+        """Nada a fazer: cada lote é confirmado na sua própria transação"""
+
+    def close(self):
+        """Nada a fazer: conexões pertencem ao pool do database"""
+
+    def query(self, **filters):
+        """Consulta eventos com SQL indexado (mesmos filtros do arquivo)"""
+        from src.services.db.audit_service_db import AuditServiceDB
+
+        return AuditServiceDB.query(**filters)
 
 
 class AuditLogger:
@@ -18,15 +171,84 @@ class AuditLogger:
     LOG_DIR = Path(__file__).parent.parent.parent / "logs"
     AUDIT_FILE = LOG_DIR / "audit.log"
 
+    # Destino (arquivo segmentado ou database) e writer assíncrono (criados por init_audit)
+    _sink = None
+    _writer = None
+
     @classmethod
-    def ensure_log_dir(cls):
-        """Garante que o diretório de logs existe"""
-        cls.LOG_DIR.mkdir(exist_ok=True)
+    def configure(cls, app):
+        """
+        Configura o logger a partir da aplicação e inicia o writer em background.
+
+        Args:
+            app (Flask): Instância da aplicação Flask
+        """
+        cls.shutdown()
+
+        cls.LOG_DIR = Path(app.config.get("AUDIT_LOG_DIR") or cls.LOG_DIR)
+        cls.AUDIT_FILE = cls.LOG_DIR / "audit.log"
+
+        backend = app.config.get("AUDIT_BACKEND", "file")
+        if backend == "database":
+            from src.database import base
+
+            if base.engine is None:
+                print("✗ AUDIT_BACKEND=database requer database ativo - usando arquivo")
+                backend = "file"
+
+        if backend == "database":
+            cls._sink = AuditDatabaseSink()
+        else:
+            cls._sink = AuditLogStore(
+                cls.LOG_DIR,
+                rotate_bytes=app.config.get("AUDIT_ROTATE_BYTES", 10 * 1024 * 1024),
+                rotate_seconds=app.config.get("AUDIT_ROTATE_SECONDS", 86400),
+                max_segments=app.config.get("AUDIT_MAX_SEGMENTS", 30),
+                fsync_interval=app.config.get("AUDIT_FSYNC_INTERVAL", 1.0),
+                fsync_bytes=app.config.get("AUDIT_FSYNC_BYTES", 1024 * 1024),
+            )
+
+        if not app.config.get("AUDIT_ASYNC", True):
+            return
+
+        cls._writer = AuditWriter(
+            cls._sink,
+            queue_size=app.config.get("AUDIT_QUEUE_SIZE", 10000),
+            policy=app.config.get("AUDIT_QUEUE_POLICY", "block"),
+            enqueue_timeout=app.config.get("AUDIT_ENQUEUE_TIMEOUT", 0.05),
+            batch_size=app.config.get("AUDIT_BATCH_SIZE", 500),
+            flush_interval=app.config.get("AUDIT_FLUSH_INTERVAL", 0.5),
+        )
+        cls._writer.start()
+
+    @classmethod
+    def get_sink(cls):
+        """Retorna o destino dos logs (arquivo com defaults se não configurado)"""
+        if cls._sink is None:
+            cls._sink = AuditLogStore(cls.LOG_DIR)
+        return cls._sink
+
+    @classmethod
+    def flush(cls, timeout=5.0):
+        """Espera que os eventos enfileirados sejam gravados"""
+        if cls._writer is not None:
+            cls._writer.flush(timeout)
+
+    @classmethod
+    def shutdown(cls):
+        """Esvazia a fila e encerra o writer (chamado no encerramento do processo)"""
+        if cls._writer is not None:
+            cls._writer.stop()
+            cls._writer = None
+        if cls._sink is not None:
+            cls._sink.close()
 
     @classmethod
     def log_action(cls, action, resource_type, resource_id=None, details=None, user_id=None, user_email=None):
         """
         Registra uma ação no log de auditoria.
+        O evento é enfileirado e gravado em lote pelo writer em background;
+        sem writer ativo, é gravado de forma síncrona.
 
         Args:
             action (str): Tipo de ação (CREATE, UPDATE, DELETE, LOGIN, etc.)
@@ -36,8 +258,6 @@ class AuditLogger:
             user_id: ID do usuário que executou a ação
             user_email: Email do usuário
         """
-        cls.ensure_log_dir()
-
         log_entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "action": action,
@@ -50,12 +270,48 @@ class AuditLogger:
             "details": details,
         }
 
+        if cls._writer is not None and cls._writer.running:
+            cls._writer.enqueue(log_entry)
+            return
+
         try:
-            with open(cls.AUDIT_FILE, "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            cls.get_sink().write_batch([log_entry])
         except Exception as e:
             print(f"Erro ao gravar log de auditoria: {e}")
 
+    @classmethod
+    def query_logs(cls, limit=100, action=None, resource_type=None, user_id=None, since=None, until=None, cursor=None):
+        """
+        Consulta logs de auditoria, dos mais recentes para os mais antigos.
+
+        Args:
+            limit (int): Número máximo de logs a retornar
+            action (str): Filtrar por tipo de ação
+            resource_type (str): Filtrar por tipo de recurso
+            user_id: Filtrar por ID do usuário
+            since (str): Timestamp ISO mínimo (inclusive)
+            until (str): Timestamp ISO máximo (inclusive)
+            cursor (str): Cursor devolvido pela página anterior
+
+        Returns:
+            dict: {'data': [...], 'next_cursor': str ou None}
+
+        Raises:
+            ValueError: Se since, until ou cursor forem inválidos
+        """
+        # Garantir que eventos ainda na fila apareçam na consulta
+        cls.flush()
+
+        return cls.get_sink().query(
+            limit=limit,
+            action=action,
+            resource_type=resource_type,
+            user_id=user_id,
+            since=normalize_timestamp(since),
+            until=normalize_timestamp(until, end_of_day=True),
+            cursor=cursor,
+        )
+
     @classmethod
     def get_logs(cls, limit=100, action=None, resource_type=None, user_id=None):
         """
@@ -68,36 +324,28 @@ class AuditLogger:
             user_id: Filtrar por ID do usuário
 
         Returns:
-            list: Lista de logs de auditoria
+            list: Lista de logs de auditoria (mais recentes primeiro)
         """
-        if not cls.AUDIT_FILE.exists():
-            return []
-
-        logs = []
         try:
-            with open(cls.AUDIT_FILE, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-
-                        # Aplicar filtros
-                        if action and log.get("action") != action:
-                            continue
-                        if resource_type and log.get("resource_type") != resource_type:
-                            continue
-                        if user_id and log.get("user_id") != user_id:
-                            continue
-
-                        logs.append(log)
-
-                        if len(logs) >= limit:
-                            break
-                    except json.JSONDecodeError:
-                        continue
+            return cls.query_logs(limit=limit, action=action, resource_type=resource_type, user_id=user_id)["data"]
         except Exception as e:
             print(f"Erro ao ler logs de auditoria: {e}")
+            return []
 
-        return list(reversed(logs))  # Mais recentes primeiro
+
+def init_audit(app):
+    """
+    Inicializa a auditoria assíncrona na aplicação Flask.
+
+    Args:
+        app (Flask): Instância da aplicação Flask
+    """
+    AuditLogger.configure(app)
+    atexit.register(AuditLogger.shutdown)
+
+    mode = "assíncrono" if AuditLogger._writer is not None else "síncrono"
+    backend = "database" if isinstance(AuditLogger._sink, AuditDatabaseSink) else "arquivo"
+    print(f"✓ Audit log inicializado ({backend}, {mode})")
 
 
 def audit_log(action, resource_type):
@@ -117,14 +365,10 @@ def audit_log(action, resource_type):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            # Obter informações do usuário autenticado
-            try:
-                user_id = get_jwt_identity()
-                claims = get_jwt()
-                user_email = claims.get("email")
-            except:
-                user_id = None
-                user_email = None
+            # Obter informações do usuário autenticado (contexto calculado uma vez por requisição)
+            auth_context = get_auth_context()
+            user_id = auth_context["user_id"]
+            user_email = auth_context["email"]
 
             # Executar a função original
             result = fn(*args, **kwargs)
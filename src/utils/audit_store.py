@@ -0,0 +1,463 @@
+"""
+Armazenamento de logs de auditoria com rotação e índices por segmento.
+
+O log ativo é `audit.log`; ao atingir o tamanho ou a idade máxima é selado como
+`audit-<seq>.log`, acompanhado de um índice `audit-<seq>.log.idx.json` com as
+ações, tipos de recurso, usuários e intervalo de tempo presentes no segmento.
+As consultas leem os segmentos do mais recente para o mais antigo, de trás para
+frente, e saltam segmentos cujo índice não pode conter resultados.
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+ACTIVE_FILE = "audit.log"
+SEGMENT_PATTERN = re.compile(r"^audit-(\d{6})\.log$")
+INDEX_SUFFIX = ".idx.json"
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _new_index():
+    """Cria um índice vazio de segmento"""
+    return {"count": 0, "min_ts": None, "max_ts": None, "actions": {}, "resource_types": {}, "user_ids": {}}
+
+
+def _index_entry(index, entry):
+    """
+    Atualiza o índice de um segmento com um evento.
+
+    Args:
+        index (dict): Índice do segmento
+        entry (dict): Evento de auditoria
+    """
+    timestamp = entry.get("timestamp")
+    index["count"] += 1
+    if timestamp:
+        if index["min_ts"] is None or timestamp < index["min_ts"]:
+            index["min_ts"] = timestamp
+        if index["max_ts"] is None or timestamp > index["max_ts"]:
+            index["max_ts"] = timestamp
+
+    for field, key in (("actions", "action"), ("resource_types", "resource_type"), ("user_ids", "user_id")):
+        value = entry.get(key)
+        if value is not None:
+            value = str(value)
+            index[field][value] = index[field].get(value, 0) + 1
+
+
+def normalize_timestamp(value, end_of_day=False):
+    """
+    Normaliza um timestamp ISO 8601 para o formato gravado nos logs (UTC, sem fuso).
+
+    Args:
+        value (str): Data/hora ISO (ex: '2025-11-23', '2025-11-23T10:58:26' ou '2025-11-23T11:58:26+01:00')
+        end_of_day (bool): Uma data sem hora vale o fim do dia (limite 'until' inclusivo)
+
+    Returns:
+        str ou None: Timestamp normalizado
+
+    Raises:
+        ValueError: Se o formato for inválido
+    """
+    if not value:
+        return None
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment.isoformat()
+    return datetime.combine(day, datetime.max.time() if end_of_day else datetime.min.time()).isoformat()
+
+
+def encode_cursor(seq, offset):
+    """Codifica a posição (segmento, offset) num cursor opaco"""
+    return base64.urlsafe_b64encode(f"{seq}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica um cursor de paginação.
+
+    Returns:
+        tuple: (seq, offset)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seq, offset = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return int(seq), int(offset)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
+def _read_reverse(path, end=None):
+    """
+    Lê as linhas de um arquivo de trás para frente.
+
+    Args:
+        path (Path): Arquivo a ler
+        end (int): Offset (exclusivo) a partir do qual ler para trás
+
+    Yields:
+        tuple: (offset_inicio_linha, bytes_da_linha)
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell() if end is None else min(end, f.tell())
+        remainder = b""
+
+        while pos > 0:
+            size = min(READ_CHUNK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            parts = (f.read(size) + remainder).split(b"\n")
+
+            # A primeira parte pode estar incompleta: guardar para o próximo bloco
+            remainder = parts[0]
+            offset = pos + len(remainder) + 1
+            lines = []
+            for part in parts[1:]:
+                lines.append((offset, part))
+                offset += len(part) + 1
+
+            for line_offset, line in reversed(lines):
+                if line.strip():
+                    yield line_offset, line
+
+        if remainder.strip():
+            yield 0, remainder
+
+
+def _read_logs(path, end=None):
+    """
+    Eventos de um segmento, de trás para frente (linhas inválidas são ignoradas).
+
+    Yields:
+        tuple: (offset_inicio_linha, evento)
+    """
+    try:
+        for offset, line in _read_reverse(path, end):
+            try:
+                yield offset, json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    except FileNotFoundError:
+        # Segmento removido pela retenção ou rodado durante a leitura
+        return
+
+
+def _log_matches(log, filters):
+    """Verifica os filtros exatos (ação, tipo de recurso e usuário) de um evento"""
+    if filters["action"] and log.get("action") != filters["action"]:
+        return False
+    if filters["resource_type"] and log.get("resource_type") != filters["resource_type"]:
+        return False
+    return not filters["user_id"] or str(log.get("user_id")) == filters["user_id"]
+
+
+class AuditLogStore:
+    """Log de auditoria segmentado, com rotação, índices e consulta newest-first"""
+
+    def __init__(
+        self,
+        log_dir,
+        rotate_bytes=10 * 1024 * 1024,
+        rotate_seconds=86400,
+        max_segments=30,
+        fsync_interval=1.0,
+        fsync_bytes=1024 * 1024,
+    ):
+        """
+        Args:
+            log_dir (Path): Diretório dos logs
+            rotate_bytes (int): Tamanho máximo do segmento ativo
+            rotate_seconds (int): Idade máxima do segmento ativo (0 desativa)
+            max_segments (int): Segmentos selados mantidos (0 mantém todos)
+            fsync_interval (float): Segundos máximos entre fsyncs
+            fsync_bytes (int): Bytes escritos que forçam um fsync
+        """
+        self.log_dir = Path(log_dir)
+        self.active_path = self.log_dir / ACTIVE_FILE
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.max_segments = max_segments
+        self.fsync_interval = fsync_interval
+        self.fsync_bytes = fsync_bytes
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced_bytes = 0
+        self._last_fsync = time.monotonic()
+        self._loaded = False
+        self._sealed = []  # seqs selados, do mais antigo ao mais recente
+        self._indexes = {}  # seq -> índice (cache dos sidecars)
+        self._active_index = _new_index()
+        self._active_size = 0
+        self._active_started = None
+
+    # ------------------------------------------------------------------ #
+    # Estado
+    # ------------------------------------------------------------------ #
+
+    def _segment_path(self, seq):
+        return self.log_dir / f"audit-{seq:06d}.log"
+
+    def _index_path(self, seq):
+        return self.log_dir / f"audit-{seq:06d}.log{INDEX_SUFFIX}"
+
+    @property
+    def _active_seq(self):
+        return (self._sealed[-1] + 1) if self._sealed else 1
+
+    def _load(self):
+        """Descobre os segmentos existentes e indexa o segmento ativo (uma vez)"""
+        if self._loaded:
+            return
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._sealed = sorted(
+            int(match.group(1)) for match in (SEGMENT_PATTERN.match(p.name) for p in self.log_dir.iterdir()) if match
+        )
+
+        if self.active_path.exists():
+            for _, line in _read_reverse(self.active_path):
+                try:
+                    _index_entry(self._active_index, json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+            self._active_size = self.active_path.stat().st_size
+            if self._active_index["min_ts"]:
+                started = datetime.fromisoformat(self._active_index["min_ts"]).replace(tzinfo=timezone.utc)
+                self._active_started = started.timestamp()
+
+        self._loaded = True
+
+    def _segment_index(self, seq):
+        """
+        Retorna o índice de um segmento selado (lendo ou reconstruindo o sidecar).
+
+        Args:
+            seq (int): Número do segmento
+
+        Returns:
+            dict: Índice do segmento
+        """
+        index = self._indexes.get(seq)
+        if index is not None:
+            return index
+
+        index_path = self._index_path(seq)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Segmento sem sidecar (ex: criado por versão anterior): reconstruir
+            index = _new_index()
+            for _, line in _read_reverse(self._segment_path(seq)):
+                try:
+                    _index_entry(index, json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+            self._write_index(seq, index)
+
+        self._indexes[seq] = index
+        return index
+
+    def _write_index(self, seq, index):
+        tmp_path = self._index_path(seq).with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path(seq))
+
+    # ------------------------------------------------------------------ #
+    # Escrita
+    # ------------------------------------------------------------------ #
+
+    def _should_rotate(self):
+        if not self._active_index["count"]:
+            return False
+        if self.rotate_bytes and self._active_size >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds and self._active_started and time.time() - self._active_started >= self.rotate_seconds)
+
+    def _rotate(self):
+        """Sela o segmento ativo, grava o seu índice e aplica a retenção"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+        seq = self._active_seq
+        os.replace(self.active_path, self._segment_path(seq))
+        self._write_index(seq, self._active_index)
+        self._indexes[seq] = self._active_index
+        self._sealed.append(seq)
+
+        self._active_index = _new_index()
+        self._active_size = 0
+        self._active_started = None
+        self._unsynced_bytes = 0
+
+        while self.max_segments and len(self._sealed) > self.max_segments:
+            oldest = self._sealed.pop(0)
+            self._indexes.pop(oldest, None)
+            for path in (self._segment_path(oldest), self._index_path(oldest)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def write_batch(self, entries):
+        """
+        Grava um lote de eventos com uma única escrita, rodando o segmento se necessário.
+
+        Args:
+            entries (list): Lista de dicts de eventos
+        """
+        if not entries:
+            return
+
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+
+        with self._lock:
+            self._load()
+            if self._should_rotate():
+                self._rotate()
+
+            if self._file is None:
+                self._file = open(self.active_path, "ab")
+            self._file.write(data)
+            self._file.flush()
+
+            for entry in entries:
+                _index_entry(self._active_index, entry)
+            self._active_size += len(data)
+            if self._active_started is None:
+                self._active_started = time.time()
+
+            self._unsynced_bytes += len(data)
+            if self._unsynced_bytes >= self.fsync_bytes or time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is not None and self._unsynced_bytes:
+            os.fsync(self._file.fileno())
+        self._unsynced_bytes = 0
+        self._last_fsync = time.monotonic()
+
+    def sync(self):
+        """Força a gravação em disco (fsync) dos dados pendentes"""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        """Sincroniza e fecha o segmento ativo"""
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------ #
+    # Consulta
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _index_may_match(index, action, resource_type, user_id, since, until):
+        """Verifica pelo índice se o segmento pode conter resultados"""
+        if not index["count"]:
+            return False
+        if action and action not in index["actions"]:
+            return False
+        if resource_type and resource_type not in index["resource_types"]:
+            return False
+        if user_id and str(user_id) not in index["user_ids"]:
+            return False
+        if since and index["max_ts"] and index["max_ts"] < since:
+            return False
+        if until and index["min_ts"] and index["min_ts"] > until:
+            return False
+        return True
+
+    def query(self, limit=100, action=None, resource_type=None, user_id=None, since=None, until=None, cursor=None):
+        """
+        Consulta eventos do mais recente para o mais antigo.
+
+        Args:
+            limit (int): Número máximo de eventos
+            action (str): Filtrar por tipo de ação
+            resource_type (str): Filtrar por tipo de recurso
+            user_id: Filtrar por ID do usuário
+            since (str): Timestamp ISO mínimo (inclusive)
+            until (str): Timestamp ISO máximo (inclusive)
+            cursor (str): Cursor devolvido pela página anterior
+
+        Returns:
+            dict: {'data': [...], 'next_cursor': str ou None}
+        """
+        with self._lock:
+            self._load()
+            active_seq = self._active_seq
+            segments = [(active_seq, self.active_path, dict(self._active_index))]
+            for seq in reversed(self._sealed):
+                segments.append((seq, self._segment_path(seq), None))
+
+        start_seq, start_offset = decode_cursor(cursor) if cursor else (None, None)
+        filters = {
+            "action": action,
+            "resource_type": resource_type,
+            "user_id": str(user_id) if user_id is not None else None,
+            "since": since,
+            "until": until,
+        }
+
+        logs = []
+        for seq, offset, log in self._iter_matches(segments, start_seq, start_offset, filters):
+            logs.append(log)
+            if len(logs) >= limit:
+                return {"data": logs, "next_cursor": encode_cursor(seq, offset)}
+        return {"data": logs, "next_cursor": None}
+
+    def _candidate_segments(self, segments, start_seq, filters):
+        """Segmentos a partir do cursor cujo índice pode conter resultados"""
+        for seq, path, index in segments:
+            if start_seq is not None and seq > start_seq:
+                continue
+            if index is None:
+                index = self._segment_index(seq)
+            since = filters["since"]
+            if since and index["max_ts"] and index["max_ts"] < since:
+                # Segmento inteiro anterior a 'since': os mais antigos também são
+                return
+            if self._index_may_match(index, **filters):
+                yield seq, path
+
+    def _iter_matches(self, segments, start_seq, start_offset, filters):
+        """
+        Eventos que satisfazem os filtros, do mais recente para o mais antigo.
+
+        Yields:
+            tuple: (seq, offset, evento)
+        """
+        since, until = filters["since"], filters["until"]
+        for seq, path in self._candidate_segments(segments, start_seq, filters):
+            end = start_offset if seq == start_seq else None
+            for offset, log in _read_logs(path, end):
+                timestamp = log.get("timestamp") or ""
+                # O timestamp é tirado antes de enfileirar: pedidos concorrentes podem ficar
+                # ligeiramente fora de ordem no arquivo, por isso só se para por segmento
+                if since and timestamp < since:
+                    continue
+                if not (until and timestamp > until) and _log_matches(log, filters):
+                    yield seq, offset, log
@@ -0,0 +1,122 @@
+"""
+Índice de autocompletar por prefixo (modo JSON).
+Mantém, por entidade, um array ordenado de nomes normalizados (sem acentos).
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+from src.utils.search_index import fold, load_entity
+from src.utils.signals import entities_reloaded, entity_changed
+
+AUTOCOMPLETE_ENTITIES = ["municipalities", "schools", "markets", "hospitals"]
+
+
+class AutocompleteIndex:
+    """Arrays ordenados de (nome normalizado, id) com busca binária por prefixo."""
+
+    def __init__(self, loader=load_entity):
+        """
+        Args:
+            loader: Função que retorna a lista de registros de uma entidade
+        """
+        self._loader = loader
+        self._lock = threading.Lock()
+        # entidade → [(nome normalizado, id)] ordenado
+        self._keys: Dict[str, list] = {}
+        # entidade → {id: (nome normalizado, sugestão)}
+        self._entries: Dict[str, dict] = {}
+
+    @staticmethod
+    def _suggestion(record: dict) -> dict:
+        return {"id": record["id"], "nome": record.get("nome"), "provincia_id": record.get("provincia_id")}
+
+    def _ensure_built(self, entity: str):
+        if entity in self._keys:
+            return
+        entries = {}
+        for record in self._loader(entity):
+            entries[record["id"]] = (fold(record.get("nome")), self._suggestion(record))
+        self._entries[entity] = entries
+        self._keys[entity] = sorted((key, record_id) for record_id, (key, _) in entries.items())
+
+    def update(self, entity: str, operation: str, record: dict):
+        """
+        Aplica uma alteração ao índice (se a entidade já estiver indexada).
+
+        Args:
+            entity: Nome da entidade
+            operation: 'create', 'update' ou 'delete'
+            record: Registro afetado
+        """
+        with self._lock:
+            if entity not in self._keys:
+                return
+            keys, entries = self._keys[entity], self._entries[entity]
+
+            previous = entries.pop(record["id"], None)
+            if previous is not None:
+                position = bisect_left(keys, (previous[0], record["id"]))
+                if position < len(keys) and keys[position] == (previous[0], record["id"]):
+                    del keys[position]
+
+            if operation != "delete":
+                key = fold(record.get("nome"))
+                entries[record["id"]] = (key, self._suggestion(record))
+                insort(keys, (key, record["id"]))
+
+    def reset(self):
+        """Descarta os índices; serão reconstruídos no próximo uso."""
+        with self._lock:
+            self._keys.clear()
+            self._entries.clear()
+
+    def complete(self, entity: str, prefix: str, limit: int = 10, provincia_id: Optional[int] = None) -> List[dict]:
+        """
+        Retorna os nomes que começam pelo prefixo, em ordem alfabética.
+
+        Args:
+            entity: Nome da entidade
+            prefix: Prefixo digitado (acentos e maiúsculas são ignorados)
+            limit: Número máximo de sugestões
+            provincia_id: Restringir a uma província (opcional)
+
+        Returns:
+            list: Sugestões com 'id', 'nome' e 'provincia_id'
+        """
+        folded = fold(prefix)
+        if not folded:
+            return []
+
+        with self._lock:
+            self._ensure_built(entity)
+            keys, entries = self._keys[entity], self._entries[entity]
+
+            suggestions = []
+            position = bisect_left(keys, (folded,))
+            while position < len(keys) and len(suggestions) < limit:
+                key, record_id = keys[position]
+                if not key.startswith(folded):
+                    break
+                suggestion = entries[record_id][1]
+                if provincia_id is None or suggestion["provincia_id"] == provincia_id:
+                    suggestions.append(dict(suggestion))
+                position += 1
+
+        return suggestions
+
+
+# Índice global do modo JSON
+autocomplete_index = AutocompleteIndex()
+
+
+@entity_changed.connect
+def _on_entity_changed(sender, operation=None, record=None, **kwargs):
+    if sender in AUTOCOMPLETE_ENTITIES:
+        autocomplete_index.update(sender, operation, record)
+
+
+@entities_reloaded.connect
+def _on_entities_reloaded(sender, **kwargs):
+    autocomplete_index.reset()
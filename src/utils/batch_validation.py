@@ -0,0 +1,147 @@
+"""
+Validação em lote dos payloads das bulk operations.
+
+A lista inteira é validada numa única chamada schema.load(many=True): os
+validadores @validates de cada campo são resolvidos uma vez por lote (não uma
+vez por linha) e todos os erros são recolhidos, indexados pela posição no
+payload. As chaves estrangeiras são verificadas com uma única consulta por
+campo (conjunto de valores distintos) em vez de uma por linha.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import request
+from marshmallow import Schema, ValidationError
+
+# atomic: qualquer erro rejeita o lote inteiro; partial: grava as linhas válidas
+BATCH_MODES = ("atomic", "partial")
+DEFAULT_BATCH_MODE = "atomic"
+
+# Campo → função que recebe os valores distintos e retorna os que existem
+ReferenceLookup = Callable[[Set[int]], Iterable[int]]
+
+
+@dataclass
+class BatchValidation:
+    """Resultado da validação de um lote."""
+
+    # (índice no payload, dados validados)
+    valid: List[Tuple[int, dict]] = field(default_factory=list)
+    # índice no payload → {campo: [mensagens]}
+    errors: Dict[int, dict] = field(default_factory=dict)
+
+    @property
+    def rows(self) -> List[dict]:
+        """Dados validados, pela ordem do payload."""
+        return [row for _, row in self.valid]
+
+    @property
+    def error_list(self) -> List[dict]:
+        """Erros no formato da resposta: [{"index": i, "errors": {...}}]."""
+        return [{"index": index, "errors": self.errors[index]} for index in sorted(self.errors)]
+
+    def payload_errors(self, errors: List[dict]) -> List[dict]:
+        """
+        Converte o 'index' dos erros do service (posição em rows) na posição do payload.
+
+        Args:
+            errors: Erros retornados por bulk_create/bulk_update
+
+        Returns:
+            list: Os mesmos erros, indexados pelo payload
+        """
+        return [{**error, "index": self.valid[error["index"]][0]} if "index" in error else error for error in errors]
+
+
+def _add_errors(errors: Dict[int, dict], index: int, messages):
+    """Junta mensagens de erro às já existentes para a linha."""
+    if not isinstance(messages, dict):
+        messages = {"_schema": messages if isinstance(messages, list) else [messages]}
+    row_errors = errors.setdefault(index, {})
+    for name, field_messages in messages.items():
+        row_errors.setdefault(name, []).extend(field_messages if isinstance(field_messages, list) else [field_messages])
+
+
+def _split_keys(items: list, key: str, errors: Dict[int, dict]) -> Tuple[list, Dict[int, int]]:
+    """Retira o campo identificador de cada item; itens sem identificador válido ficam com erro."""
+    rows, keys = [], {}
+    for index, item in enumerate(items):
+        if isinstance(item, dict):
+            item = dict(item)
+            value = item.pop(key, None)
+            if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                keys[index] = value
+            else:
+                _add_errors(errors, index, {key: [f"Campo obrigatório: {key} (inteiro positivo)"]})
+        rows.append(item)
+    return rows, keys
+
+
+def _check_references(candidates: List[Tuple[int, dict]], references: Dict[str, ReferenceLookup], errors: Dict[int, dict]):
+    """Verifica as chaves estrangeiras com uma consulta por campo para o lote inteiro."""
+    for name, lookup in references.items():
+        values = {row[name] for _, row in candidates if row.get(name) is not None}
+        if not values:
+            continue
+        existing = set(lookup(values))
+        for index, row in candidates:
+            value = row.get(name)
+            if value is not None and value not in existing:
+                _add_errors(errors, index, {name: [f"Registro não encontrado: {name}={value}"]})
+
+
+def validate_batch(
+    schema: Schema,
+    items: list,
+    partial: bool = False,
+    key: Optional[str] = None,
+    references: Optional[Dict[str, ReferenceLookup]] = None,
+) -> BatchValidation:
+    """
+    Valida uma lista de registros numa só passagem.
+
+    Args:
+        schema: Instância do schema (reutilizada entre pedidos)
+        items: Registros do payload
+        partial: Permitir campos em falta (atualizações)
+        key: Campo identificador obrigatório em cada item (ex: 'id' nas atualizações);
+             é retirado antes do schema e devolvido nos dados validados
+        references: Campo → função que retorna, dos valores indicados, os que existem
+                    (uma consulta por campo para o lote inteiro)
+
+    Returns:
+        BatchValidation: Linhas válidas e erros por índice
+    """
+    errors: Dict[int, dict] = {}
+    rows, keys = _split_keys(items, key, errors) if key is not None else (items, {})
+
+    try:
+        loaded = schema.load(rows, many=True, partial=partial)
+    except ValidationError as err:
+        # Com many=True, valid_data acompanha o payload posição a posição
+        loaded = err.valid_data
+        for index, messages in err.messages.items():
+            _add_errors(errors, index, messages)
+
+    candidates = [(index, row) for index, row in enumerate(loaded) if index not in errors]
+    if key is not None:
+        for index, row in candidates:
+            row[key] = keys[index]
+
+    _check_references(candidates, references or {}, errors)
+
+    return BatchValidation(valid=[(index, row) for index, row in candidates if index not in errors], errors=errors)
+
+
+def get_batch_mode() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Lê o modo do lote (?mode=atomic|partial; padrão: atomic).
+
+    Returns:
+        tuple: (modo, None) ou (None, mensagem de erro)
+    """
+    mode = request.args.get("mode", DEFAULT_BATCH_MODE, type=str)
+    if mode not in BATCH_MODES:
+        return None, f"Modo inválido: {mode}. Use: {', '.join(BATCH_MODES)}"
+    return mode, None
@@ -0,0 +1,377 @@
+"""
+Geocodificação reversa: coordenada → província e município (GET /geo/locate).
+
+Os limites (polígonos simplificados) são lidos uma vez de um arquivo binário
+compacto gerado por scripts/build_boundaries.py. As caixas envolventes vão para
+uma R-tree estática (Sort-Tile-Recursive): cada consulta desce apenas pelos
+nós cuja caixa contém o ponto e só testa point-in-polygon nos poucos candidatos.
+"""
+
+import math
+import os
+import struct
+import threading
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BOUNDARIES_PATH = Path(__file__).parent.parent.parent / "data" / "boundaries.bin"
+
+# Formato do arquivo (little-endian):
+#   cabeçalho: magic (4 bytes), nº de limites (uint32)
+#   limite:    tipo (uint8: 0 província, 1 município), id (uint32), provincia_id (int32, -1 = nenhum),
+#              nome (uint16 + UTF-8), nº de polígonos (uint16)
+#   polígono:  nº de anéis (uint16; o primeiro é o exterior, os outros buracos)
+#   anel:      nº de pontos (uint32) + pontos (lon, lat) em float32
+BOUNDARIES_MAGIC = b"AGB1"
+KINDS = ("province", "municipality")
+
+STR_NODE_CAPACITY = 8
+
+# (lon_min, lat_min, lon_max, lat_max)
+BBox = Tuple[float, float, float, float]
+Ring = Sequence[Tuple[float, float]]
+
+
+@dataclass
+class Boundary:
+    """Limite de uma província ou município."""
+
+    kind: str
+    id: int
+    nome: str
+    provincia_id: Optional[int]
+    # polígonos → anéis → pontos (lon, lat)
+    polygons: List[List[List[Tuple[float, float]]]]
+    bbox: BBox = field(init=False)
+
+    def __post_init__(self):
+        points = [point for polygon in self.polygons for point in polygon[0]]
+        lons = [lon for lon, _ in points]
+        lats = [lat for _, lat in points]
+        self.bbox = (min(lons), min(lats), max(lons), max(lats))
+
+    def contains(self, lon: float, lat: float) -> bool:
+        """Indica se o ponto está dentro de algum dos polígonos (e fora dos seus buracos)."""
+        for polygon in self.polygons:
+            if ring_contains(polygon[0], lon, lat) and not any(ring_contains(hole, lon, lat) for hole in polygon[1:]):
+                return True
+        return False
+
+
+def ring_contains(ring: Ring, lon: float, lat: float) -> bool:
+    """
+    Teste point-in-polygon por lançamento de raio (regra par-ímpar).
+
+    Args:
+        ring: Pontos (lon, lat) do anel (fechado ou não)
+        lon, lat: Ponto a testar
+
+    Returns:
+        bool: True se o ponto está dentro do anel
+    """
+    inside = False
+    x_prev, y_prev = ring[-1]
+    for x, y in ring:
+        if (y > lat) != (y_prev > lat) and lon < (x_prev - x) * (lat - y) / (y_prev - y) + x:
+            inside = not inside
+        x_prev, y_prev = x, y
+    return inside
+
+
+def simplify_ring(ring: Ring, tolerance: float) -> List[Tuple[float, float]]:
+    """
+    Simplifica um anel fechado (Douglas-Peucker), mantendo pelo menos um triângulo.
+
+    Args:
+        ring: Pontos (lon, lat); o último pode repetir o primeiro
+        tolerance: Desvio máximo em graus
+
+    Returns:
+        list: Anel simplificado (fechado)
+    """
+    points = [tuple(point[:2]) for point in ring]
+    if points[0] == points[-1]:
+        points = points[:-1]
+    if len(points) <= 3 or tolerance <= 0:
+        return points + [points[0]]
+
+    # O anel é dividido no ponto mais distante do primeiro, para haver dois segmentos abertos
+    first = points[0]
+    split = max(range(len(points)), key=lambda i: (points[i][0] - first[0]) ** 2 + (points[i][1] - first[1]) ** 2)
+    keep = [False] * (len(points) + 1)
+    keep[0] = keep[split] = keep[-1] = True
+    closed = points + [first]
+
+    # Pilha em vez de recursão: anéis com dezenas de milhares de pontos
+    stack = [(0, split), (split, len(points))]
+    while stack:
+        start, end = stack.pop()
+        (x1, y1), (x2, y2) = closed[start], closed[end]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        farthest, max_distance = None, tolerance
+        for i in range(start + 1, end):
+            x, y = closed[i]
+            if length == 0:
+                distance = math.hypot(x - x1, y - y1)
+            else:
+                distance = abs(dy * x - dx * y + x2 * y1 - y2 * x1) / length
+            if distance > max_distance:
+                farthest, max_distance = i, distance
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((start, farthest))
+            stack.append((farthest, end))
+
+    simplified = [point for point, kept in zip(closed, keep) if kept]
+    if len(simplified) < 4:
+        return closed
+    return simplified
+
+
+def write_boundaries(boundaries: Sequence[Boundary], path: Path):
+    """
+    Grava os limites no formato binário compacto.
+
+    Args:
+        boundaries: Limites a gravar
+        path: Arquivo de destino
+    """
+    chunks = [BOUNDARIES_MAGIC, struct.pack("<I", len(boundaries))]
+    for boundary in boundaries:
+        name = boundary.nome.encode("utf-8")
+        provincia_id = boundary.provincia_id if boundary.provincia_id is not None else -1
+        chunks.append(struct.pack("<BIiH", KINDS.index(boundary.kind), boundary.id, provincia_id, len(name)))
+        chunks.append(name)
+        chunks.append(struct.pack("<H", len(boundary.polygons)))
+        for polygon in boundary.polygons:
+            chunks.append(struct.pack("<H", len(polygon)))
+            for ring in polygon:
+                chunks.append(struct.pack("<I", len(ring)))
+                chunks.append(array("f", [value for point in ring for value in point]).tobytes())
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+def read_boundaries(path: Path) -> List[Boundary]:
+    """
+    Lê os limites do formato binário compacto.
+
+    Args:
+        path: Arquivo gerado por write_boundaries
+
+    Returns:
+        list: Limites
+
+    Raises:
+        ValueError: Se o arquivo não estiver no formato esperado
+    """
+    data = Path(path).read_bytes()
+    if data[:4] != BOUNDARIES_MAGIC:
+        raise ValueError(f"Arquivo de limites inválido: {path}")
+
+    (count,) = struct.unpack_from("<I", data, 4)
+    offset = 8
+    boundaries = []
+    for _ in range(count):
+        kind, boundary_id, provincia_id, name_length = struct.unpack_from("<BIiH", data, offset)
+        offset += struct.calcsize("<BIiH")
+        nome = data[offset : offset + name_length].decode("utf-8")
+        offset += name_length
+        (polygon_count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+
+        polygons = []
+        for _ in range(polygon_count):
+            (ring_count,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            rings = []
+            for _ in range(ring_count):
+                (point_count,) = struct.unpack_from("<I", data, offset)
+                offset += 4
+                values = array("f")
+                values.frombytes(data[offset : offset + point_count * 8])
+                offset += point_count * 8
+                rings.append(list(zip(values[0::2], values[1::2])))
+            polygons.append(rings)
+
+        boundaries.append(Boundary(KINDS[kind], boundary_id, nome, provincia_id if provincia_id >= 0 else None, polygons))
+    return boundaries
+
+
+class STRTree:
+    """R-tree estática carregada de uma vez pelo método Sort-Tile-Recursive."""
+
+    def __init__(self, items: Sequence[Tuple[BBox, object]], node_capacity: int = STR_NODE_CAPACITY):
+        """
+        Args:
+            items: Pares (caixa envolvente, objeto)
+            node_capacity: Entradas por nó
+        """
+        self._capacity = node_capacity
+        # Nó: (caixa, é folha, filhos) — nas folhas os filhos são os pares (caixa, objeto)
+        level = [(bbox, True, [(bbox, item)]) for bbox, item in items]
+        level = self._pack(level) if level else []
+        while len(level) > 1:
+            level = self._pack(level)
+        self._root = level[0] if level else None
+
+    def _pack(self, nodes: list) -> list:
+        # Ordena por x, corta em faixas verticais e, em cada faixa, agrupa por y
+        capacity = self._capacity
+        node_count = math.ceil(len(nodes) / capacity)
+        slice_count = math.ceil(math.sqrt(node_count))
+        slice_size = slice_count * capacity
+
+        by_x = sorted(nodes, key=lambda node: node[0][0] + node[0][2])
+        packed = []
+        for start in range(0, len(by_x), slice_size):
+            strip = sorted(by_x[start : start + slice_size], key=lambda node: node[0][1] + node[0][3])
+            for group_start in range(0, len(strip), capacity):
+                group = strip[group_start : group_start + capacity]
+                bbox = (
+                    min(node[0][0] for node in group),
+                    min(node[0][1] for node in group),
+                    max(node[0][2] for node in group),
+                    max(node[0][3] for node in group),
+                )
+                if all(node[1] and len(node[2]) == 1 for node in group):
+                    # Primeiro nível: as folhas guardam diretamente os pares (caixa, objeto)
+                    packed.append((bbox, True, [node[2][0] for node in group]))
+                else:
+                    packed.append((bbox, False, group))
+        return packed
+
+    def query_point(self, x: float, y: float) -> Iterator[object]:
+        """
+        Objetos cuja caixa envolvente contém o ponto.
+
+        Args:
+            x, y: Ponto (lon, lat)
+
+        Yields:
+            object: Objetos candidatos
+        """
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            bbox, is_leaf, children = stack.pop()
+            if not (bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]):
+                continue
+            if is_leaf:
+                for child_bbox, item in children:
+                    if child_bbox[0] <= x <= child_bbox[2] and child_bbox[1] <= y <= child_bbox[3]:
+                        yield item
+            else:
+                stack.extend(children)
+
+
+class BoundaryIndex:
+    """Índice dos limites de províncias e municípios."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trees = {}
+        self._provinces = {}
+        self._counts = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._trees)
+
+    def load(self, boundaries: Sequence[Boundary]):
+        """
+        Constrói o índice (substitui o anterior).
+
+        Args:
+            boundaries: Limites de províncias e municípios
+        """
+        trees, counts = {}, {}
+        for kind in KINDS:
+            items = [(boundary.bbox, boundary) for boundary in boundaries if boundary.kind == kind]
+            trees[kind] = STRTree(items)
+            counts[kind] = len(items)
+        provinces = {boundary.id: boundary for boundary in boundaries if boundary.kind == "province"}
+        with self._lock:
+            self._trees, self._provinces, self._counts = trees, provinces, counts
+
+    def load_file(self, path: Optional[Path] = None) -> bool:
+        """
+        Carrega os limites do arquivo binário (padrão: BOUNDARIES_PATH ou data/boundaries.bin).
+
+        Returns:
+            bool: True se o arquivo existia e foi carregado
+        """
+        path = Path(path or os.getenv("BOUNDARIES_PATH", str(DEFAULT_BOUNDARIES_PATH)))
+        if not path.exists():
+            return False
+        self.load(read_boundaries(path))
+        return True
+
+    def _find(self, kind: str, lon: float, lat: float) -> Optional[Boundary]:
+        tree = self._trees.get(kind)
+        if tree is None:
+            return None
+        # Menor caixa primeiro: em fronteiras simplificadas que se sobrepõem, vence o limite mais preciso
+        candidates = sorted(tree.query_point(lon, lat), key=lambda b: (b.bbox[2] - b.bbox[0]) * (b.bbox[3] - b.bbox[1]))
+        return next((boundary for boundary in candidates if boundary.contains(lon, lat)), None)
+
+    def locate(self, lat: float, lon: float) -> Optional[dict]:
+        """
+        Província e município que contêm o ponto.
+
+        Args:
+            lat, lon: Coordenadas (graus)
+
+        Returns:
+            dict ou None: provincia_id, provincia_nome, municipio_id e municipio
+                          (município None se o ponto só cair num limite de província)
+        """
+        municipality = self._find("municipality", lon, lat)
+        province = None
+        if municipality is not None and municipality.provincia_id is not None:
+            province = self._provinces.get(municipality.provincia_id)
+        if province is None:
+            province = self._find("province", lon, lat)
+        if municipality is None and province is None:
+            return None
+
+        provincia_id = province.id if province is not None else municipality.provincia_id
+        return {
+            "provincia_id": provincia_id,
+            "provincia_nome": province.nome if province is not None else None,
+            "municipio_id": municipality.id if municipality is not None else None,
+            "municipio": municipality.nome if municipality is not None else None,
+        }
+
+    def get_stats(self) -> dict:
+        """Número de limites carregados por tipo."""
+        return dict(self._counts)
+
+
+# Índice global
+boundary_index = BoundaryIndex()
+
+
+def init_boundaries(app):
+    """
+    Carrega os limites geográficos no arranque (se o arquivo existir).
+
+    Args:
+        app: Instância Flask
+    """
+    try:
+        if boundary_index.load_file():
+            stats = boundary_index.get_stats()
+            print(f"✓ Limites geográficos carregados ({stats['province']} províncias, {stats['municipality']} municípios)")
+    except (OSError, ValueError, struct.error) as e:
+        print(f"⚠ Erro ao carregar limites geográficos: {e}")
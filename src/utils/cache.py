@@ -52,7 +52,9 @@ def cache_key_from_request(*args, **kwargs):
     from flask import request
 
     # Incluir path, query params e se está usando database
-    use_db = os.getenv("USE_DATABASE", "False").lower() == "true"
+    from src.database.base import uses_database
+
+    use_db = uses_database()
     db_suffix = "_db" if use_db else "_json"
 
     # Criar chave a partir da URL e query string
@@ -63,6 +65,8 @@ def cache_key_from_request(*args, **kwargs):
 def cached_route(timeout: int = 300):
     """
     Decorator para cachear responses de routes.
+    Guarda os bytes já comprimidos de cada codificação negociada,
+    evitando recomprimir a mesma resposta a cada requisição.
 
     Args:
         timeout: Tempo em segundos (padrão: 5 minutos)
@@ -76,19 +80,27 @@ def cached_route(timeout: int = 300):
     def decorator(f: Callable) -> Callable:
         @functools.wraps(f)
         def decorated_function(*args, **kwargs):
-            # Gerar chave de cache
-            cache_key = cache_key_from_request()
+            from flask import Response, make_response
+
+            from src.utils.compression import apply_encoding, negotiate_encoding
+
+            # Cada codificação (br, gzip, identity) é uma representação própria
+            encoding = negotiate_encoding()
+            cache_key = f"{cache_key_from_request()}|{encoding or 'identity'}"
 
             # Tentar pegar do cache
             cached_response = cache.get(cache_key)
             if cached_response is not None:
-                return cached_response
+                return Response(cached_response["body"], status=cached_response["status"], headers=cached_response["headers"])
 
-            # Executar função
-            response = f(*args, **kwargs)
+            # Executar função e comprimir uma única vez por preenchimento do cache
+            response = apply_encoding(make_response(f(*args, **kwargs)), encoding)
 
-            # Salvar no cache
-            cache.set(cache_key, response, timeout=timeout)
+            # Salvar no cache apenas respostas de sucesso
+            if response.status_code == 200:
+                headers = [(k, v) for k, v in response.headers.items() if k != "Content-Length"]
+                entry = {"body": response.get_data(), "status": response.status_code, "headers": headers}
+                cache.set(cache_key, entry, timeout=timeout)
 
             return response
 
@@ -115,7 +127,9 @@ def cache_service_result(timeout: int = 300, key_prefix: str = ""):
         @functools.wraps(f)
         def decorated_function(*args, **kwargs):
             # Gerar chave baseada em função, args e kwargs
-            use_db = os.getenv("USE_DATABASE", "False").lower() == "true"
+            from src.database.base import uses_database
+
+            use_db = uses_database()
             db_suffix = "_db" if use_db else "_json"
 
             args_str = "_".join(str(arg) for arg in args)
@@ -233,7 +247,9 @@ class CacheManager:
         print("🔥 Aquecendo cache...")
 
         # Verificar se deve usar database
-        use_db = os.getenv("USE_DATABASE", "False").lower() == "true"
+        from src.database.base import uses_database
+
+        use_db = uses_database()
 
         if use_db:
             from src.services.db.province_service_db import ProvinceServiceDB
@@ -0,0 +1,159 @@
+"""
+Registro ordenado de alterações (modo JSON).
+Cada escrita nos serviços JSON recebe um número de sequência crescente e fica
+num buffer circular em memória e num diário append-only (changes.jsonl),
+de onde GET /changes serve apenas o que mudou desde a última sincronização.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.utils.signals import entity_changed, notify_recorded
+
+DEFAULT_JOURNAL_PATH = Path(__file__).parent.parent.parent / "data" / "changes.jsonl"
+DEFAULT_CAPACITY = 10000
+
+
+class ChangeFeed:
+    """Buffer circular de alterações com diário persistido."""
+
+    def __init__(self, journal_path: Optional[Path] = None, capacity: Optional[int] = None):
+        """
+        Args:
+            journal_path: Arquivo do diário (padrão: CHANGE_LOG_PATH ou data/changes.jsonl)
+            capacity: Alterações mantidas em memória (padrão: CHANGE_LOG_SIZE ou 10000)
+        """
+        self._journal_path = journal_path
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._entries: Optional[deque] = None
+        self._seq = 0
+        self._journal_lines = 0
+
+    @property
+    def journal_path(self) -> Path:
+        return Path(self._journal_path or os.getenv("CHANGE_LOG_PATH", str(DEFAULT_JOURNAL_PATH)))
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity or int(os.getenv("CHANGE_LOG_SIZE", DEFAULT_CAPACITY))
+
+    def _load(self):
+        # Chamado com o lock: recupera as últimas alterações e a sequência do diário
+        self._entries = deque(maxlen=self.capacity)
+        self._journal_lines = 0
+        path = self.journal_path
+        if not path.exists():
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Linha incompleta (ex: interrupção durante a escrita)
+                self._entries.append(entry)
+                self._seq = max(self._seq, entry["seq"])
+                self._journal_lines += 1
+
+    def _ensure_loaded(self):
+        if self._entries is None:
+            self._load()
+
+    def _append_journal(self, entry: dict):
+        path = self.journal_path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._journal_lines += 1
+
+            # Compactar: manter no arquivo apenas o que ainda está em memória
+            if self._journal_lines > 2 * self.capacity:
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for kept in self._entries:
+                        f.write(json.dumps(kept, ensure_ascii=False) + "\n")
+                os.replace(tmp_path, path)
+                self._journal_lines = len(self._entries)
+        except OSError as e:
+            print(f"Erro ao gravar diário de alterações: {e}")
+
+    def record(self, entity: str, operation: str, record: dict) -> dict:
+        """
+        Regista uma alteração.
+
+        Args:
+            entity: Nome da entidade (ex: 'schools')
+            operation: 'create', 'update' ou 'delete'
+            record: Registro afetado (estado final, ou o removido)
+
+        Returns:
+            dict: Entrada registada (com 'seq')
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._seq += 1
+            entry = {
+                "seq": self._seq,
+                "entity": entity,
+                "id": record.get("id"),
+                "operation": operation,
+                # Remoções são tombstones: só o id
+                "record": None if operation == "delete" else dict(record),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            self._entries.append(entry)
+            self._append_journal(entry)
+            return entry
+
+    def changes_since(self, since: int, limit: int) -> Tuple[List[dict], bool, int]:
+        """
+        Retorna as alterações com sequência maior que 'since'.
+
+        Args:
+            since: Última sequência já conhecida pelo cliente (0 = desde o início)
+            limit: Número máximo de alterações
+
+        Returns:
+            tuple: (alterações, reset, última sequência); reset=True quando alterações
+                   posteriores a 'since' já saíram do buffer e o cliente deve ressincronizar
+        """
+        with self._lock:
+            self._ensure_loaded()
+            latest = self._seq
+            if not self._entries or since >= latest:
+                return [], False, latest
+
+            oldest = self._entries[0]["seq"]
+            if since < oldest - 1:
+                return [], True, latest
+
+            # Sequências normalmente contíguas: a posição de 'since' é calculada, sem busca
+            start = max(since - oldest + 1, 0)
+            if start >= len(self._entries) or self._entries[start]["seq"] != since + 1:
+                # Lacunas (ex: linhas corrompidas no diário): procurar a posição
+                start = next((i for i, entry in enumerate(self._entries) if entry["seq"] > since), len(self._entries))
+            end = min(start + limit, len(self._entries))
+            return list(islice(self._entries, start, end)), False, latest
+
+    def reset(self):
+        """Esquece o estado em memória (o diário é relido no próximo acesso)."""
+        with self._lock:
+            self._entries = None
+            self._seq = 0
+
+
+# Registro global do modo JSON
+change_feed = ChangeFeed()
+
+
+@entity_changed.connect
+def _on_entity_changed(entity, operation, record, **kwargs):
+    notify_recorded(change_feed.record(entity, operation, record))
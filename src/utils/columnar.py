@@ -0,0 +1,257 @@
+"""
+Exportação colunar das entidades (Parquet e Arrow IPC).
+
+Cada entidade tem um esquema fixo, com tipos numéricos corretos e colunas
+categóricas (tipo, provincia_nome, municipio, ...) codificadas em dicionário.
+Os arquivos são escritos lote a lote a partir do cursor da base de dados (ou
+das listas em memória) e guardados em cache até a versão da entidade mudar.
+"""
+
+import hashlib
+import io
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Response, jsonify, request
+
+from src.utils.metrics import registry
+from src.utils.signals import entities_reloaded
+
+# pyarrow é opcional: sem ele a exportação colunar responde 501
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende do ambiente
+    pa = None
+    pq = None
+
+# formato → (mimetype, extensão)
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+EXPORT_BATCH_SIZE = 10000
+
+# Colunas por entidade: (nome, tipo) com tipo 'int32', 'int64', 'float64', 'string' ou
+# 'category' (texto repetido, codificado em dicionário). Campos ausentes num registro ficam nulos.
+EXPORT_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "provinces": [
+        ("id", "int32"),
+        ("nome", "string"),
+        ("capital", "string"),
+        ("area_km2", "float64"),
+        ("populacao", "int64"),
+    ],
+    "municipalities": [
+        ("id", "int32"),
+        ("nome", "string"),
+        ("provincia_id", "int32"),
+        ("provincia_nome", "category"),
+        ("area_km2", "float64"),
+        ("populacao", "int64"),
+    ],
+    "schools": [
+        ("id", "int32"),
+        ("nome", "string"),
+        ("tipo", "category"),
+        ("nivel", "category"),
+        ("provincia_id", "int32"),
+        ("provincia_nome", "category"),
+        ("municipio_id", "int32"),
+        ("municipio", "category"),
+        ("endereco", "string"),
+        ("latitude", "float64"),
+        ("longitude", "float64"),
+    ],
+    "markets": [
+        ("id", "int32"),
+        ("nome", "string"),
+        ("tipo", "category"),
+        ("especialidade", "category"),
+        ("provincia_id", "int32"),
+        ("provincia_nome", "category"),
+        ("municipio_id", "int32"),
+        ("municipio", "category"),
+        ("endereco", "string"),
+        ("latitude", "float64"),
+        ("longitude", "float64"),
+    ],
+    "hospitals": [
+        ("id", "int32"),
+        ("nome", "string"),
+        ("tipo", "category"),
+        ("categoria", "category"),
+        ("provincia_id", "int32"),
+        ("provincia_nome", "category"),
+        ("municipio_id", "int32"),
+        ("municipio", "category"),
+        ("endereco", "string"),
+        ("especialidades", "string"),
+        ("latitude", "float64"),
+        ("longitude", "float64"),
+    ],
+}
+
+EXPORT_BUILDS = registry.counter("export_builds_total", "Arquivos colunares gerados")
+EXPORT_CACHE_HITS = registry.counter("export_cache_hits_total", "Exportações servidas da cache")
+EXPORT_BUILD_SECONDS = registry.histogram("export_build_seconds", "Tempo de geração dos arquivos colunares")
+
+
+def is_available() -> bool:
+    """Indica se o pyarrow está instalado."""
+    return pa is not None
+
+
+def _arrow_type(kind: str):
+    if kind == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    return {"int32": pa.int32(), "int64": pa.int64(), "float64": pa.float64(), "string": pa.string()}[kind]
+
+
+def export_schema(entity: str):
+    """
+    Retorna o esquema Arrow de uma entidade.
+
+    Args:
+        entity: Nome da entidade
+
+    Returns:
+        pyarrow.Schema: Esquema da exportação
+    """
+    return pa.schema([pa.field(name, _arrow_type(kind)) for name, kind in EXPORT_COLUMNS[entity]])
+
+
+def _record_batch(schema, rows: List[dict]):
+    # Uma lista por coluna (sem passar por DataFrame); a conversão e a
+    # codificação em dicionário são feitas pelo pyarrow em código nativo
+    arrays = [pa.array([row.get(field.name) for row in rows], type=field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_export(entity: str, export_format: str, batches: Iterable[List[dict]]) -> bytes:
+    """
+    Escreve um arquivo colunar lote a lote.
+
+    Args:
+        entity: Nome da entidade
+        export_format: 'parquet' ou 'arrow'
+        batches: Lotes de registros (ver ExportService.iter_batches)
+
+    Returns:
+        bytes: Conteúdo do arquivo (comprimido internamente com zstd)
+    """
+    schema = export_schema(entity)
+    sink = io.BytesIO()
+
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+    with writer:
+        for rows in batches:
+            if rows:
+                writer.write_batch(_record_batch(schema, rows))
+
+    return sink.getvalue()
+
+
+class ExportCache:
+    """Último arquivo gerado por entidade e formato, válido enquanto a versão não mudar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (entidade, formato) → (versão, bytes, hash do conteúdo)
+        self._entries: Dict[Tuple[str, str], Tuple[int, bytes, str]] = {}
+        # Um lock por chave: pedidos simultâneos esperam pela mesma geração
+        self._build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def get_or_build(self, entity: str, export_format: str, version: int, build: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """
+        Retorna o arquivo da versão pedida, gerando-o se necessário.
+
+        Args:
+            entity: Nome da entidade
+            export_format: 'parquet' ou 'arrow'
+            version: Versão atual dos dados da entidade
+            build: Função que gera o arquivo
+
+        Returns:
+            tuple: (conteúdo do arquivo, hash do conteúdo)
+        """
+        key = (entity, export_format)
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                EXPORT_CACHE_HITS.inc(entity=entity, format=export_format)
+                return cached[1], cached[2]
+
+            start = time.perf_counter()
+            data = build()
+            EXPORT_BUILD_SECONDS.observe(time.perf_counter() - start, entity=entity, format=export_format)
+            EXPORT_BUILDS.inc(entity=entity, format=export_format)
+
+            digest = hashlib.sha256(data).hexdigest()[:32]
+            with self._lock:
+                self._entries[key] = (version, data, digest)
+            return data, digest
+
+    def clear(self, entity: Optional[str] = None):
+        """Descarta os arquivos em cache (de uma entidade ou de todas)."""
+        with self._lock:
+            for key in [key for key in self._entries if entity is None or key[0] == entity]:
+                del self._entries[key]
+
+
+# Cache global
+export_cache = ExportCache()
+
+
+def export_response(entity: str):
+    """
+    Resposta de GET /<entidade>/export?format=parquet|arrow.
+
+    Args:
+        entity: Nome da entidade
+
+    Returns:
+        Response: Arquivo colunar (com ETag do conteúdo), ou erro JSON
+    """
+    from src.services.service_factory import ServiceFactory
+
+    export_format = request.args.get("format", "parquet", type=str).lower()
+    if export_format not in EXPORT_FORMATS:
+        return (
+            jsonify({"success": False, "message": f"Formato inválido. Use: {', '.join(EXPORT_FORMATS)}"}),
+            400,
+        )
+    if not is_available():
+        return jsonify({"success": False, "message": "Exportação colunar indisponível (pyarrow não instalado)"}), 501
+
+    ExportService = ServiceFactory.get_export_service()
+    version = ExportService.get_version(entity)
+    data, digest = export_cache.get_or_build(
+        entity,
+        export_format,
+        version,
+        lambda: write_export(entity, export_format, ExportService.iter_batches(entity, batch_size=EXPORT_BATCH_SIZE)),
+    )
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("If-None-Match", ""):
+        return Response(status=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{entity}.{extension}"'
+    return Response(data, mimetype=mimetype, headers=headers)
+
+
+@entities_reloaded.connect
+def _on_entities_reloaded(sender, **kwargs):
+    export_cache.clear()
@@ -0,0 +1,149 @@
+"""
+Compressão de respostas HTTP (gzip e brotli).
+Negocia a codificação com base no header Accept-Encoding.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+from flask import current_app, request
+
+# Brotli é opcional: se não estiver instalado, apenas gzip é oferecido
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Configuração da compressão
+compression_config = {
+    "COMPRESSION_ENABLED": os.getenv("COMPRESSION_ENABLED", "True").lower() == "true",
+    "COMPRESSION_MIN_SIZE": int(os.getenv("COMPRESSION_MIN_SIZE", 1024)),  # bytes
+    "COMPRESSION_GZIP_LEVEL": int(os.getenv("COMPRESSION_GZIP_LEVEL", 6)),
+    "COMPRESSION_BROTLI_QUALITY": int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5)),
+    "COMPRESSION_MIMETYPES": ["application/json", "text/html", "text/plain", "text/css", "application/javascript"],
+}
+
+
+def init_compression(app):
+    """
+    Inicializa a compressão de respostas na aplicação Flask.
+
+    Args:
+        app: Instância Flask
+    """
+    for key, value in compression_config.items():
+        app.config.setdefault(key, value)
+
+    app.after_request(compress_response)
+
+    encodings = ", ".join(supported_encodings())
+    print(f"✓ Compressão de respostas inicializada ({encodings})")
+
+
+def supported_encodings() -> list:
+    """
+    Retorna as codificações suportadas, por ordem de preferência.
+
+    Returns:
+        list: Ex: ['br', 'gzip']
+    """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding() -> Optional[str]:
+    """
+    Escolhe a melhor codificação aceite pelo cliente da requisição atual.
+
+    Returns:
+        str ou None: 'br', 'gzip' ou None (sem compressão)
+    """
+    if not current_app.config.get("COMPRESSION_ENABLED", True):
+        return None
+
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in supported_encodings():
+        quality = accepted[encoding]
+        # Em caso de empate vence a primeira (mais eficiente)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Comprime bytes com a codificação indicada.
+
+    Args:
+        data: Conteúdo original
+        encoding: 'br' ou 'gzip'
+
+    Returns:
+        bytes: Conteúdo comprimido
+    """
+    config = current_app.config
+    if encoding == "br":
+        return brotli.compress(data, quality=config.get("COMPRESSION_BROTLI_QUALITY", 5))
+    return gzip.compress(data, compresslevel=config.get("COMPRESSION_GZIP_LEVEL", 6), mtime=0)
+
+
+def is_compressible(response) -> bool:
+    """
+    Verifica se a resposta pode ser comprimida (tipo, tamanho e estado).
+
+    Args:
+        response: Objeto de resposta Flask
+
+    Returns:
+        bool: True se a resposta deve ser comprimida
+    """
+    config = current_app.config
+
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code >= 300 or response.status_code == 204:
+        return False
+    if "Content-Encoding" in response.headers:
+        return False
+    if response.mimetype not in config.get("COMPRESSION_MIMETYPES", []):
+        return False
+
+    return response.calculate_content_length() >= config.get("COMPRESSION_MIN_SIZE", 1024)
+
+
+def apply_encoding(response, encoding: Optional[str]):
+    """
+    Comprime o corpo da resposta com a codificação escolhida (se aplicável).
+
+    Args:
+        response: Objeto de resposta Flask
+        encoding: Codificação negociada ou None
+
+    Returns:
+        response: Resposta (comprimida ou não)
+    """
+    if response.mimetype in current_app.config.get("COMPRESSION_MIMETYPES", []):
+        response.vary.add("Accept-Encoding")
+
+    if not encoding or not is_compressible(response):
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+
+    return response
+
+
+def compress_response(response):
+    """
+    Hook after_request que comprime respostas elegíveis.
+
+    Args:
+        response: Objeto de resposta Flask
+
+    Returns:
+        response: Resposta com Content-Encoding quando comprimida
+    """
+    return apply_encoding(response, negotiate_encoding())
@@ -4,10 +4,39 @@ Decoradores customizados para autorização e controle de acesso.
 
 from functools import wraps
 
-from flask import jsonify
+from flask import current_app, g, jsonify
 from flask_jwt_extended import get_jwt
 
 
+def get_auth_context():
+    """
+    Retorna o contexto de autenticação da requisição atual.
+    Identity e claims são extraídas do JWT uma única vez e reutilizadas
+    pelos decorators de autorização e pela auditoria.
+
+    Returns:
+        dict: {'user_id', 'email', 'role', 'claims'} (valores None sem JWT verificado)
+    """
+    context = g.get("auth_context")
+    if context is not None:
+        return context
+
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        # JWT ainda não verificado nesta requisição: não guardar
+        return {"user_id": None, "email": None, "role": None, "claims": {}}
+
+    context = {
+        "user_id": claims.get(current_app.config.get("JWT_IDENTITY_CLAIM", "sub")),
+        "email": claims.get("email"),
+        "role": claims.get("role"),
+        "claims": claims,
+    }
+    g.auth_context = context
+    return context
+
+
 def role_required(allowed_roles):
     """
     Decorator para verificar se o usuário tem uma das roles permitidas.
@@ -26,8 +55,7 @@ def role_required(allowed_roles):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            claims = get_jwt()
-            user_role = claims.get("role")
+            user_role = get_auth_context()["role"]
 
             if user_role not in allowed_roles:
                 return jsonify({"success": False, "message": "Acesso negado. Permissões insuficientes"}), 403
@@ -54,8 +82,7 @@ def admin_required():
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            claims = get_jwt()
-            user_role = claims.get("role")
+            user_role = get_auth_context()["role"]
 
             if user_role != "admin":
                 return (
@@ -85,8 +112,7 @@ def editor_or_admin_required():
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            claims = get_jwt()
-            user_role = claims.get("role")
+            user_role = get_auth_context()["role"]
 
             if user_role not in ["admin", "editor"]:
                 return (
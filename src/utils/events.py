@@ -0,0 +1,194 @@
+"""
+Difusão de notificações de alteração para clientes SSE (GET /events).
+
+Cada alteração registada no feed (sinal change_recorded) é publicada a todos os
+clientes ligados. Num único processo a difusão é feita em memória; com Redis
+(USE_REDIS=True) as notificações passam por pub/sub, para chegarem aos clientes
+ligados a qualquer worker.
+"""
+
+import json
+import os
+import queue
+import threading
+from typing import Iterable, Optional
+
+from src.utils.metrics import registry
+from src.utils.signals import change_recorded
+
+REDIS_CHANNEL = "angodata:changes"
+
+SSE_CLIENTS = registry.gauge("sse_clients", "Clientes ligados ao GET /events")
+SSE_EVENTS = registry.counter("sse_events_published_total", "Notificações de alteração difundidas")
+SSE_OVERFLOWS = registry.counter(
+    "sse_client_overflows_total", "Clientes lentos cujo buffer encheu (retomam a partir do feed de alterações)"
+)
+
+
+def to_notification(entry: dict) -> dict:
+    """
+    Converte uma entrada do feed na notificação enviada aos clientes.
+
+    Args:
+        entry: Entrada do feed de alterações
+
+    Returns:
+        dict: entity, id, op e version (a sequência no feed)
+    """
+    return {"entity": entry["entity"], "id": entry["id"], "op": entry["operation"], "version": entry["seq"]}
+
+
+class Subscription:
+    """Ligação de um cliente: buffer limitado de notificações pendentes."""
+
+    def __init__(self, entities: Optional[Iterable[str]] = None, buffer_size: int = 256):
+        """
+        Args:
+            entities: Entidades de interesse (None = todas)
+            buffer_size: Notificações pendentes antes de o cliente ser considerado atrasado
+        """
+        self.entities = set(entities) if entities else None
+        self.queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        # Versões de outras entidades: não são enviadas, mas avançam a posição do cliente
+        # no feed sem que o intervalo pareça uma notificação perdida
+        self.skipped: set = set()
+        # Buffer cheio: as notificações seguintes são descartadas até o cliente
+        # recuperar as que perdeu a partir do feed de alterações
+        self.overflowed = False
+
+    def offer(self, notification: dict):
+        """Entrega uma notificação sem nunca bloquear quem publica."""
+        if self.entities is not None and notification["entity"] not in self.entities:
+            self.skipped.add(notification["version"])
+            return
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(notification)
+        except queue.Full:
+            self.overflowed = True
+            SSE_OVERFLOWS.inc()
+
+    def get(self, timeout: float) -> Optional[dict]:
+        """
+        Espera pela próxima notificação.
+
+        Args:
+            timeout: Segundos de espera
+
+        Returns:
+            dict ou None: Notificação, ou None se o tempo esgotou
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroadcaster:
+    """Difusor de notificações para as ligações SSE deste processo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, entities: Optional[Iterable[str]] = None, buffer_size: int = 256) -> Subscription:
+        """
+        Regista um novo cliente.
+
+        Args:
+            entities: Entidades de interesse (None = todas)
+            buffer_size: Tamanho do buffer do cliente
+
+        Returns:
+            Subscription: Ligação do cliente
+        """
+        self._ensure_listener()
+        subscription = Subscription(entities, buffer_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        SSE_CLIENTS.set(self.client_count)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove um cliente (ligação encerrada)."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+        SSE_CLIENTS.set(self.client_count)
+
+    def deliver(self, notification: dict):
+        """Entrega uma notificação aos clientes deste processo."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.offer(notification)
+
+    def publish(self, notification: dict):
+        """
+        Publica uma notificação a todos os clientes (de todos os workers, com Redis).
+
+        Args:
+            notification: Notificação (ver to_notification)
+        """
+        SSE_EVENTS.inc()
+        client = self._redis_client()
+        if client is not None:
+            try:
+                # O listener de cada worker (incluindo este) entrega aos seus clientes
+                client.publish(REDIS_CHANNEL, json.dumps(notification))
+                return
+            except Exception as e:
+                print(f"Erro ao publicar notificação no Redis: {e}")
+        self.deliver(notification)
+
+    def _redis_client(self):
+        if os.getenv("USE_REDIS", "False").lower() != "true":
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        return self._redis
+
+    def _ensure_listener(self):
+        # Uma thread por processo, criada com o primeiro cliente (depois de um eventual fork)
+        if self._listener is not None and self._listener.is_alive():
+            return
+        client = self._redis_client()
+        if client is None:
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, args=(client,), name="sse-redis", daemon=True)
+            self._listener.start()
+
+    def _listen(self, client):
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(REDIS_CHANNEL)
+            for message in pubsub.listen():
+                try:
+                    self.deliver(json.loads(message["data"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        except Exception as e:
+            # Os clientes recuperam via Last-Event-ID ao religar; a thread é recriada no próximo subscribe
+            print(f"Listener Redis de eventos encerrado: {e}")
+        finally:
+            pubsub.close()
+
+
+# Difusor global
+broadcaster = EventBroadcaster()
+
+
+@change_recorded.connect
+def _on_change_recorded(entity, entry, **kwargs):
+    broadcaster.publish(to_notification(entry))
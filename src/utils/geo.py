@@ -0,0 +1,343 @@
+"""
+Consultas geográficas (instalações mais próximas).
+
+Distâncias pela fórmula de haversine. No modo JSON, um índice em grelha
+(células de GEO_CELL_DEGREES graus), mantido a cada escrita, limita o cálculo
+às células próximas do ponto; no modo database, a mesma caixa envolvente é
+aplicada como intervalo sobre o índice (latitude, longitude).
+"""
+
+import heapq
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from flask import request
+
+from src.utils.search_index import load_entity
+from src.utils.signals import entities_reloaded, entity_changed
+
+# Entidades com coordenadas
+GEO_ENTITIES = ["schools", "markets", "hospitals"]
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Meia circunferência: nenhum ponto está mais longe do que isto
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+GEO_CELL_DEGREES = 0.25
+DEFAULT_NEARBY_LIMIT = 10
+MAX_NEARBY_LIMIT = 100
+MAX_NEARBY_RADIUS_KM = 2000
+
+# k-mais-próximos no modo database: raio inicial, multiplicado até haver resultados suficientes
+KNN_INITIAL_RADIUS_KM = 10
+KNN_RADIUS_GROWTH = 4
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Distância entre dois pontos sobre a superfície da Terra.
+
+    Args:
+        lat1, lon1: Primeiro ponto (graus)
+        lat2, lon2: Segundo ponto (graus)
+
+    Returns:
+        float: Distância em km
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Caixa (em graus) que contém o círculo de raio radius_km em torno do ponto.
+
+    Perto dos polos a caixa abrange todas as longitudes; a linha de data
+    não é tratada (a caixa é cortada em ±180).
+
+    Returns:
+        tuple: (lat_min, lat_max, lon_min, lon_max)
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    cos_lat = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+    if cos_lat <= 1e-9:
+        return lat_min, lat_max, -180.0, 180.0
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat)
+    return lat_min, lat_max, max(lon - dlon, -180.0), min(lon + dlon, 180.0)
+
+
+def with_distance(record: dict, distance_km: float) -> dict:
+    """Cópia do registro com 'distancia_km'."""
+    return dict(record, distancia_km=round(distance_km, 3))
+
+
+def get_nearby_params():
+    """
+    Lê e valida os parâmetros de GET /<entidade>/nearby.
+
+    Returns:
+        tuple: (dict com lat, lon, radius_km e limit, None) ou (None, mensagem de erro)
+    """
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    radius_km = request.args.get("radius_km", type=float)
+    limit = request.args.get("limit", DEFAULT_NEARBY_LIMIT, type=int)
+
+    if lat is None or lon is None:
+        return None, "Parâmetros 'lat' e 'lon' são obrigatórios"
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        return None, "Coordenadas inválidas: lat entre -90 e 90, lon entre -180 e 180"
+    if radius_km is not None and not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+        return None, f"Parâmetro 'radius_km' deve estar entre 0 e {MAX_NEARBY_RADIUS_KM}"
+
+    limit = min(max(limit, 1), MAX_NEARBY_LIMIT)
+    return {"lat": lat, "lon": lon, "radius_km": radius_km, "limit": limit}, None
+
+
+def nearby_in_database(query, model, lat: float, lon: float, radius_km: Optional[float], limit: int) -> List[dict]:
+    """
+    Instalações mais próximas via intervalo sobre o índice (latitude, longitude).
+
+    Com radius_km: uma única leitura da caixa envolvente. Sem raio (k mais próximos):
+    a caixa cresce até conter 'limit' instalações dentro do círculo inscrito.
+
+    Args:
+        query: Consulta base (ex: session.query(Hospital))
+        model: Modelo com colunas latitude e longitude
+        lat, lon: Ponto de referência
+        radius_km: Raio máximo (None = sem limite)
+        limit: Número máximo de resultados
+
+    Returns:
+        list: Registros (to_dict) com 'distancia_km', do mais próximo ao mais distante
+    """
+    radius = radius_km if radius_km is not None else KNN_INITIAL_RADIUS_KM
+    while True:
+        lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius)
+        rows = query.filter(model.latitude.between(lat_min, lat_max), model.longitude.between(lon_min, lon_max)).all()
+
+        # Cantos da caixa ficam fora do círculo: só conta o que está dentro do raio
+        hits = []
+        for row in rows:
+            distance = haversine_km(lat, lon, row.latitude, row.longitude)
+            if distance <= radius:
+                hits.append((distance, row.id, row))
+
+        if radius_km is not None or len(hits) >= limit or radius >= MAX_DISTANCE_KM:
+            break
+        radius = min(radius * KNN_RADIUS_GROWTH, MAX_DISTANCE_KM)
+
+    return [with_distance(row.to_dict(), distance) for distance, _, row in heapq.nsmallest(limit, hits)]
+
+
+class GeoIndex:
+    """Índice em grelha das instalações com coordenadas (modo JSON)."""
+
+    def __init__(self, loader=load_entity, cell_degrees: float = GEO_CELL_DEGREES):
+        """
+        Args:
+            loader: Função que retorna a lista de registros de uma entidade
+            cell_degrees: Lado de cada célula em graus
+        """
+        self._loader = loader
+        self._cell_degrees = cell_degrees
+        self._lock = threading.RLock()
+        # entidade → {célula: {id: (lat, lon, registro)}}
+        self._cells: Dict[str, Dict[Tuple[int, int], Dict]] = {}
+        # entidade → {id: célula}
+        self._positions: Dict[str, Dict] = {}
+        # entidade → (linha mín, linha máx, coluna mín, coluna máx) das células já ocupadas
+        self._extent: Dict[str, List[int]] = {}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self._cell_degrees), math.floor(lon / self._cell_degrees)
+
+    def _ensure_built(self, entity: str):
+        if entity in self._cells:
+            return
+        self._cells[entity] = {}
+        self._positions[entity] = {}
+        for record in self._loader(entity):
+            self._add(entity, record)
+
+    def _add(self, entity: str, record: dict):
+        lat, lon = record.get("latitude"), record.get("longitude")
+        if lat is None or lon is None:
+            return
+        cell = self._cell(lat, lon)
+        self._cells[entity].setdefault(cell, {})[record["id"]] = (lat, lon, record)
+        self._positions[entity][record["id"]] = cell
+
+        extent = self._extent.get(entity)
+        if extent is None:
+            self._extent[entity] = [cell[0], cell[0], cell[1], cell[1]]
+        else:
+            extent[0], extent[1] = min(extent[0], cell[0]), max(extent[1], cell[0])
+            extent[2], extent[3] = min(extent[2], cell[1]), max(extent[3], cell[1])
+
+    def _remove(self, entity: str, record_id):
+        cell = self._positions[entity].pop(record_id, None)
+        if cell is None:
+            return
+        members = self._cells[entity][cell]
+        members.pop(record_id, None)
+        if not members:
+            del self._cells[entity][cell]
+
+    def update(self, entity: str, operation: str, record: dict):
+        """
+        Aplica uma alteração ao índice (se a entidade já estiver indexada).
+
+        Args:
+            entity: Nome da entidade
+            operation: 'create', 'update' ou 'delete'
+            record: Registro afetado
+        """
+        if entity not in GEO_ENTITIES:
+            return
+        with self._lock:
+            if entity not in self._cells:
+                return
+            self._remove(entity, record["id"])
+            if operation != "delete":
+                self._add(entity, record)
+
+    def reset(self):
+        """Descarta o índice; será reconstruído na próxima consulta."""
+        with self._lock:
+            self._cells.clear()
+            self._positions.clear()
+            self._extent.clear()
+
+    def _ring(self, center: Tuple[int, int], ring: int):
+        # Células à distância (Chebyshev) 'ring' da célula central
+        row, col = center
+        if ring == 0:
+            yield center
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, col - ring
+            yield r, col + ring
+
+    def _ring_min_distance_km(self, lat: float, ring: int) -> float:
+        # Limite inferior da distância do ponto (algures na célula central) a qualquer
+        # ponto do anel 'ring' ou além: pelo menos ring - 1 células completas
+        reach = max(ring - 1, 0) * self._cell_degrees
+        cos_lat = math.cos(math.radians(min(abs(lat) + reach, 90.0)))
+        return reach * KM_PER_DEGREE * max(cos_lat, 0.0)
+
+    def _within_radius(self, cells: dict, lat: float, lon: float, radius_km: float, limit: int) -> list:
+        # Só as células da caixa envolvente do círculo podem ter resultados
+        lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+        row_min, col_min = self._cell(lat_min, lon_min)
+        row_max, col_max = self._cell(lat_max, lon_max)
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(cells):
+            # Caixa maior do que a grelha ocupada: percorrer só as células existentes
+            candidates = (members for (r, c), members in cells.items() if row_min <= r <= row_max and col_min <= c <= col_max)
+        else:
+            candidates = (
+                cells[(r, c)] for r in range(row_min, row_max + 1) for c in range(col_min, col_max + 1) if (r, c) in cells
+            )
+
+        hits = []
+        for members in candidates:
+            for record_id, (p_lat, p_lon, record) in members.items():
+                distance = haversine_km(lat, lon, p_lat, p_lon)
+                if distance <= radius_km:
+                    hits.append((distance, record_id, record))
+        return heapq.nsmallest(limit, hits)
+
+    def _nearest(self, entity: str, cells: dict, lat: float, lon: float, limit: int) -> list:
+        # Anéis de células a partir do ponto, até à célula ocupada mais distante
+        center = self._cell(lat, lon)
+        extent = self._extent[entity]
+        last_ring = max(
+            abs(center[0] - extent[0]),
+            abs(center[0] - extent[1]),
+            abs(center[1] - extent[2]),
+            abs(center[1] - extent[3]),
+        )
+
+        # Max-heap (distância negada) com os 'limit' mais próximos
+        hits = []
+        for ring in range(last_ring + 1):
+            # Resultados suficientes e mais perto do que qualquer célula por visitar
+            if len(hits) >= limit and -hits[0][0] <= self._ring_min_distance_km(lat, ring):
+                break
+            for cell in self._ring(center, ring):
+                for record_id, (p_lat, p_lon, record) in cells.get(cell, {}).items():
+                    item = (-haversine_km(lat, lon, p_lat, p_lon), -record_id, record)
+                    if len(hits) < limit:
+                        heapq.heappush(hits, item)
+                    elif item > hits[0]:
+                        heapq.heapreplace(hits, item)
+        return sorted((-distance, -record_id, record) for distance, record_id, record in hits)
+
+    def nearby(
+        self, entity: str, lat: float, lon: float, radius_km: Optional[float] = None, limit: int = DEFAULT_NEARBY_LIMIT
+    ) -> List[dict]:
+        """
+        Instalações mais próximas de um ponto.
+
+        Com radius_km, percorre só as células da caixa envolvente; sem raio (k mais próximos),
+        percorre anéis de células a partir do ponto até que nenhuma célula por visitar
+        possa conter algo mais perto do que o k-ésimo resultado.
+
+        Args:
+            entity: 'schools', 'markets' ou 'hospitals'
+            lat, lon: Ponto de referência
+            radius_km: Raio máximo (None = sem limite)
+            limit: Número máximo de resultados
+
+        Returns:
+            list: Registros com 'distancia_km', do mais próximo ao mais distante
+        """
+        with self._lock:
+            self._ensure_built(entity)
+            cells = self._cells[entity]
+            if not cells:
+                return []
+
+            if radius_km is not None:
+                nearest = self._within_radius(cells, lat, lon, radius_km, limit)
+            else:
+                nearest = self._nearest(entity, cells, lat, lon, limit)
+
+        return [with_distance(record, distance) for distance, _, record in nearest]
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do índice.
+
+        Returns:
+            dict: Por entidade, número de instalações e de células ocupadas
+        """
+        with self._lock:
+            return {
+                entity: {"facilities": len(self._positions[entity]), "cells": len(cells)}
+                for entity, cells in self._cells.items()
+            }
+
+
+# Índice global do modo JSON
+geo_index = GeoIndex()
+
+
+@entity_changed.connect
+def _on_entity_changed(sender, operation=None, record=None, **kwargs):
+    geo_index.update(sender, operation, record)
+
+
+@entities_reloaded.connect
+def _on_entities_reloaded(sender, **kwargs):
+    geo_index.reset()
@@ -0,0 +1,121 @@
+"""
+Cache de verificação de tokens JWT.
+Evita repetir a decodificação base64 e a verificação HMAC para tokens reutilizados.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from flask import current_app
+from flask_jwt_extended import JWTManager
+
+
+class TokenVerificationCache:
+    """LRU limitado de tokens já verificados para as suas claims."""
+
+    def __init__(self, max_size: int = 1024, max_ttl: int = 300):
+        """
+        Args:
+            max_size: Número máximo de tokens guardados (0 desativa o cache)
+            max_ttl: Tempo máximo (segundos) que uma entrada fica em cache
+        """
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, encoded_token: str) -> Optional[dict]:
+        """
+        Retorna as claims de um token verificado, se ainda válidas.
+
+        Args:
+            encoded_token: Token JWT codificado
+
+        Returns:
+            dict ou None: Cópia das claims do token ou None se ausente/expirado
+        """
+        with self._lock:
+            entry = self._entries.get(encoded_token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[encoded_token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(encoded_token)
+            self.hits += 1
+        # Cópia profunda: quem altera as claims (ou listas dentro delas) não afeta os pedidos seguintes
+        return copy.deepcopy(claims)
+
+    def set(self, encoded_token: str, claims: dict):
+        """
+        Guarda as claims de um token verificado.
+        A entrada nunca sobrevive à expiração (exp) do próprio token.
+
+        Args:
+            encoded_token: Token JWT codificado
+            claims: Claims decodificadas e verificadas
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.max_ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, claims["exp"])
+        # Guardar uma cópia: o dict recebido continua nas mãos de quem o decodificou
+        claims = copy.deepcopy(claims)
+
+        with self._lock:
+            self._entries[encoded_token] = (claims, expires_at)
+            self._entries.move_to_end(encoded_token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            dict: Tamanho, hits e misses
+        """
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager que reutiliza verificações recentes de tokens idênticos."""
+
+    def init_app(self, app, add_context_processor: bool = False):
+        super().init_app(app, add_context_processor=add_context_processor)
+        app.config.setdefault("JWT_VERIFY_CACHE_SIZE", 1024)
+        app.config.setdefault("JWT_VERIFY_CACHE_TTL", 300)
+        app.extensions["jwt_verify_cache"] = TokenVerificationCache(
+            max_size=app.config["JWT_VERIFY_CACHE_SIZE"], max_ttl=app.config["JWT_VERIFY_CACHE_TTL"]
+        )
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        # Tokens com CSRF ou decodificação de expirados seguem o caminho normal
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        verify_cache = current_app.extensions["jwt_verify_cache"]
+        claims = verify_cache.get(encoded_token)
+        if claims is not None:
+            return claims
+
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        verify_cache.set(encoded_token, claims)
+        return claims
@@ -0,0 +1,215 @@
+"""
+Métricas da aplicação no formato de texto do Prometheus.
+Registro simples em memória (contadores, gauges e histogramas) sem dependências externas.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _labels_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: Tuple) -> str:
+    if not key:
+        return ""
+    escaped = (name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for name, value in key)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, Tuple, float]]:
+        for key, value in list(self._values.items()):
+            yield self.name, key, value
+
+
+class Counter(_Metric):
+    """Contador monotónico."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        Incrementa o contador.
+
+        Args:
+            amount: Valor a somar
+            **labels: Labels da série
+        """
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Retorna o valor atual da série."""
+        return self._values.get(_labels_key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Valor instantâneo (pode subir e descer)."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        """
+        Define o valor da série.
+
+        Args:
+            value: Novo valor
+            **labels: Labels da série
+        """
+        with self._lock:
+            self._values[_labels_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        """Soma ao valor da série."""
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        """Subtrai do valor da série."""
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        """Retorna o valor atual da série."""
+        return self._values.get(_labels_key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Distribuição de observações em buckets cumulativos."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # labels → ([contagem por bucket], soma, total)
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        """
+        Regista uma observação.
+
+        Args:
+            value: Valor observado (ex: segundos)
+            **labels: Labels da série
+        """
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def get_count(self, **labels) -> int:
+        """Retorna o número de observações da série."""
+        series = self._series.get(_labels_key(labels))
+        return series[2] if series else 0
+
+    def samples(self):
+        for key, (counts, total, count) in list(self._series.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", key + (("le", _format_value(bound)),), bucket_count
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+
+class _CallbackGauge(_Metric):
+    """Gauge cujos valores são lidos no momento da coleta."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], List[Tuple[Dict, float]]]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self):
+        try:
+            values = self.callback()
+        except Exception:
+            return
+        for labels, value in values:
+            yield self.name, _labels_key(labels), value
+
+
+class MetricsRegistry:
+    """Registro de métricas (cada nome é criado uma única vez)."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        """Retorna (criando se necessário) um contador."""
+        return self._get_or_create(name, lambda: Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        """Retorna (criando se necessário) um gauge."""
+        return self._get_or_create(name, lambda: Gauge(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Retorna (criando se necessário) um histograma."""
+        return self._get_or_create(name, lambda: Histogram(name, documentation, buckets))
+
+    def gauge_callback(self, name: str, documentation: str, callback: Callable[[], List[Tuple[Dict, float]]]):
+        """
+        Regista (ou substitui) um gauge calculado na coleta.
+
+        Args:
+            name: Nome da métrica
+            documentation: Descrição
+            callback: Função que retorna [(labels, valor), ...]
+        """
+        with self._lock:
+            self._metrics[name] = _CallbackGauge(name, documentation, callback)
+
+    def render(self) -> str:
+        """
+        Gera o texto de exposição do Prometheus.
+
+        Returns:
+            str: Métricas no formato text/plain 0.0.4
+        """
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, key, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Registro global
+registry = MetricsRegistry()
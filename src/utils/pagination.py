@@ -5,9 +5,12 @@ Helpers para paginação e busca avançada.
 from typing import Any, Dict, List, Optional, Tuple
 
 from flask import request
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Query
 
+from src.utils.search_index import fold
+
 
 class PaginationHelper:
     """Helper para paginação de resultados."""
@@ -113,6 +116,9 @@ class PaginationHelper:
 class SearchHelper:
     """Helper para busca avançada e filtros."""
 
+    DEFAULT_AUTOCOMPLETE_LIMIT = 10
+    MAX_AUTOCOMPLETE_LIMIT = 50
+
     @staticmethod
     def get_sort_params() -> Tuple[Optional[str], str]:
         """
@@ -168,16 +174,53 @@ class SearchHelper:
         """
         return request.args.get("search", None, type=str)
 
+    # Suporte a busca por trigramas (unaccent + pg_trgm), verificado uma vez por engine
+    _trigram_support: Dict[str, bool] = {}
+
     @staticmethod
-    def apply_text_search(query: Query, model: Any, search_term: str, search_fields: List[str]) -> Query:
+    def has_trigram_support(session: Any) -> bool:
+        """
+        Verifica se o banco suporta busca indexada por trigramas.
+        Requer PostgreSQL com pg_trgm e a função f_unaccent (criada pela migração).
+
+        Args:
+            session: Sessão SQLAlchemy
+
+        Returns:
+            bool: True se a busca indexada pode ser usada
+        """
+        bind = session.get_bind()
+        key = str(bind.url)
+        if key not in SearchHelper._trigram_support:
+            supported = False
+            if bind.dialect.name == "postgresql":
+                try:
+                    supported = bool(
+                        session.execute(
+                            text(
+                                "SELECT to_regprocedure('f_unaccent(text)') IS NOT NULL "
+                                "AND EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+                            )
+                        ).scalar()
+                    )
+                except SQLAlchemyError:
+                    supported = False
+            SearchHelper._trigram_support[key] = supported
+        return SearchHelper._trigram_support[key]
+
+    @staticmethod
+    def apply_text_search(query: Query, model: Any, search_term: str, search_fields: List[str], rank: bool = False) -> Query:
         """
         Aplica busca de texto em múltiplos campos.
+        No PostgreSQL com pg_trgm usa os índices de trigramas (sem acentos);
+        caso contrário usa ILIKE.
 
         Args:
             query: Query SQLAlchemy
             model: Model class
             search_term: Termo para buscar
             search_fields: Lista de campos onde buscar
+            rank: Ordenar por similaridade (apenas com trigramas)
 
         Returns:
             Query com filtro de busca aplicado
@@ -185,20 +228,70 @@ class SearchHelper:
         if not search_term:
             return query
 
+        fields = [getattr(model, name) for name in search_fields if hasattr(model, name)]
+        if not fields:
+            return query
+
+        if SearchHelper.has_trigram_support(query.session):
+            # Mesma expressão dos índices: lower(f_unaccent(coluna))
+            folded = fold(search_term)
+            pattern = "%" + folded.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            expressions = [func.lower(func.f_unaccent(field)) for field in fields]
+
+            query = query.filter(or_(*[expression.like(pattern, escape="\\") for expression in expressions]))
+            if rank:
+                similarities = [func.coalesce(func.similarity(expression, folded), 0) for expression in expressions]
+                best = similarities[0] if len(similarities) == 1 else func.greatest(*similarities)
+                query = query.order_by(best.desc())
+            return query
+
         # Criar condições OR para cada campo
-        conditions = []
         search_pattern = f"%{search_term}%"
+        # Usar ilike para case-insensitive search
+        conditions = [field.ilike(search_pattern) for field in fields]
 
-        for field_name in search_fields:
-            if hasattr(model, field_name):
-                field = getattr(model, field_name)
-                # Usar ilike para case-insensitive search
-                conditions.append(field.ilike(search_pattern))
+        return query.filter(or_(*conditions))
+
+    @staticmethod
+    def get_autocomplete_params() -> Tuple[str, int, Optional[int]]:
+        """
+        Extrai parâmetros de autocompletar da query string.
 
-        if conditions:
-            return query.filter(or_(*conditions))
+        Returns:
+            Tuple[str, int, int]: (prefix, limit, provincia_id) - limit entre 1 e MAX_AUTOCOMPLETE_LIMIT
+        """
+        prefix = request.args.get("prefix", "", type=str).strip()
+        limit = request.args.get("limit", SearchHelper.DEFAULT_AUTOCOMPLETE_LIMIT, type=int)
+        provincia_id = request.args.get("provincia_id", None, type=int)
 
-        return query
+        limit = min(max(limit, 1), SearchHelper.MAX_AUTOCOMPLETE_LIMIT)
+
+        return prefix, limit, provincia_id
+
+    @staticmethod
+    def apply_prefix_search(query: Query, field: Any, prefix: str) -> Query:
+        """
+        Filtra e ordena por nomes que começam pelo prefixo.
+        No PostgreSQL com f_unaccent usa o índice text_pattern_ops (sem acentos);
+        caso contrário compara com lower().
+
+        Args:
+            query: Query SQLAlchemy
+            field: Coluna do model (ex: Municipality.nome)
+            prefix: Prefixo digitado
+
+        Returns:
+            Query com filtro e ordenação aplicados
+        """
+        if SearchHelper.has_trigram_support(query.session):
+            expression = func.lower(func.f_unaccent(field))
+            value = fold(prefix)
+        else:
+            expression = func.lower(field)
+            value = prefix.lower()
+
+        pattern = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return query.filter(expression.like(pattern, escape="\\")).order_by(expression, field)
 
     @staticmethod
     def apply_filters(query: Query, model: Any, filters: Dict[str, Any]) -> Query:
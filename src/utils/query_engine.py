@@ -0,0 +1,156 @@
+"""
+Motor de consulta sobre as listas em memória (modo JSON).
+Reproduz a semântica do SearchHelper (filtros, intervalos, ordenação e busca)
+usando permutações de ordenação e índices de igualdade pré-calculados.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.search_index import fold, load_entity
+from src.utils.signals import get_version
+
+
+def _sort_key(record: dict, field: str):
+    # NULLs por último em ordem crescente (e primeiro na decrescente), como no PostgreSQL.
+    # Texto ordena sem acentos nem maiúsculas ('Úcua' entre 'Caxito' e 'Zaire'),
+    # com o valor original como desempate
+    value = record.get(field)
+    if value is None:
+        return (True, 0, 0, record.get("id"))
+    folded = fold(value) if isinstance(value, str) else value
+    return (False, folded, value, record.get("id"))
+
+
+class QueryEngine:
+    """Consultas com filtros e ordenação sobre as entidades JSON."""
+
+    def __init__(self, loader=load_entity):
+        """
+        Args:
+            loader: Função que retorna a lista de registros de uma entidade
+        """
+        self._loader = loader
+        self._lock = threading.Lock()
+        # (entidade, campo) → (versão, posições ordenadas)
+        self._sort_cache: Dict[Tuple[str, str], Tuple[int, List[int]]] = {}
+        # (entidade, campo) → (versão, {valor: {posições}})
+        self._equality_cache: Dict[Tuple[str, str], Tuple[int, Dict[Any, set]]] = {}
+        # entidade → (versão, campos conhecidos)
+        self._fields_cache: Dict[str, Tuple[int, set]] = {}
+
+    def _fields(self, entity: str, items: list, version: int) -> set:
+        cached = self._fields_cache.get(entity)
+        if cached is None or cached[0] != version:
+            fields = set()
+            for record in items:
+                fields.update(record)
+            cached = (version, fields)
+            self._fields_cache[entity] = cached
+        return cached[1]
+
+    def _permutation(self, entity: str, field: str, items: list, version: int) -> List[int]:
+        cached = self._sort_cache.get((entity, field))
+        if cached is None or cached[0] != version:
+            order = sorted(range(len(items)), key=lambda i: _sort_key(items[i], field))
+            cached = (version, order)
+            self._sort_cache[(entity, field)] = cached
+        return cached[1]
+
+    def _equality_index(self, entity: str, field: str, items: list, version: int) -> Dict[Any, set]:
+        cached = self._equality_cache.get((entity, field))
+        if cached is None or cached[0] != version:
+            index: Dict[Any, set] = {}
+            for position, record in enumerate(items):
+                value = record.get(field)
+                if value is not None:
+                    index.setdefault(value, set()).add(position)
+            cached = (version, index)
+            self._equality_cache[(entity, field)] = cached
+        return cached[1]
+
+    def query(
+        self,
+        entity: str,
+        filters: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        order: str = "asc",
+    ) -> List[dict]:
+        """
+        Consulta uma entidade com a mesma semântica do SearchHelper.
+
+        Campos desconhecidos são ignorados; valores None não filtram;
+        a busca é uma correspondência parcial sem acentos/maiúsculas em qualquer dos campos.
+
+        Args:
+            entity: Nome da entidade (ex: 'provinces')
+            filters: Igualdades {campo: valor}
+            ranges: Intervalos inclusivos {campo: (mínimo, máximo)}
+            search: Termo de busca
+            search_fields: Campos onde buscar
+            sort_by: Campo para ordenar
+            order: 'asc' ou 'desc'
+
+        Returns:
+            list: Registros que satisfazem a consulta, na ordem pedida
+        """
+        items = self._loader(entity)
+
+        with self._lock:
+            version = get_version(entity)
+            fields = self._fields(entity, items, version)
+
+            # Filtros de igualdade via índice (interseção de posições)
+            positions: Optional[set] = None
+            for field, value in (filters or {}).items():
+                if field not in fields or value is None:
+                    continue
+                matches = self._equality_index(entity, field, items, version).get(value, set())
+                positions = set(matches) if positions is None else positions & matches
+
+            if sort_by in fields:
+                ordered = self._permutation(entity, sort_by, items, version)
+                if order == "desc":
+                    ordered = ordered[::-1]
+            else:
+                ordered = range(len(items))
+
+        if positions is not None:
+            ordered = [i for i in ordered if i in positions]
+
+        # Intervalos (inclusivos); valores ausentes nunca satisfazem a condição
+        active_ranges = [
+            (field, low, high)
+            for field, (low, high) in (ranges or {}).items()
+            if field in fields and (low is not None or high is not None)
+        ]
+        searchable = [field for field in (search_fields or []) if field in fields]
+        needle = fold(search) if search and searchable else None
+
+        results = []
+        for position in ordered:
+            record = items[position]
+            if not all(_in_range(record.get(field), low, high) for field, low, high in active_ranges):
+                continue
+            if needle is not None and not any(needle in fold(record.get(field)) for field in searchable):
+                continue
+            results.append(record)
+
+        return results
+
+
+def _in_range(value, low, high) -> bool:
+    if value is None:
+        return False
+    if low is not None and value < low:
+        return False
+    if high is not None and value > high:
+        return False
+    return True
+
+
+# Motor global do modo JSON
+query_engine = QueryEngine()
@@ -0,0 +1,413 @@
+"""
+Rate limiting partilhado entre workers (GCRA), com pré-alocação local de tokens.
+
+Cada limite ("5 per minute") é um balde GCRA guardado no Redis (USE_REDIS=True),
+comum a todos os workers; sem Redis fica em memória, por processo. Para que a
+maioria dos pedidos não vá ao Redis, cada worker reserva pequenos lotes de tokens
+de uma vez e consome-os localmente. Os tokens reservados já foram descontados do
+balde partilhado, por isso a pré-alocação nunca permite ultrapassar o limite;
+tokens não usados expiram ao fim de RATE_LIMIT_LEASE_SECONDS. Só as chaves
+"quentes" (com outra ida ao backend dentro dessa janela) reservam um lote; as
+restantes pedem um token de cada vez, para que clientes abaixo do limite não
+percam orçamento em reservas que expiram.
+
+Os pedidos autenticados contam pela identidade do JWT; os restantes pelo IP.
+Os limites são declarados uma vez por rota (@limiter.limit) e verificados num
+único hook before_request.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Sequence, Tuple
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from src.utils.metrics import registry
+
+# Limites aplicados às rotas sem declaração própria (cada rota tem o seu balde)
+DEFAULT_LIMITS = ("200 per day", "50 per hour")
+
+# Tokens reservados por ida ao backend (no máximo 10% do limite) e validade da reserva
+DEFAULT_LEASE_SIZE = 10
+DEFAULT_LEASE_SECONDS = 5
+MAX_LOCAL_LEASES = 10000
+
+REDIS_KEY_PREFIX = "angodata:ratelimit:"
+
+RATE_LIMIT_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_RE = re.compile(r"^\s*(\d+)\s*(?:per|/)\s*(second|minute|hour|day)s?\s*$", re.IGNORECASE)
+
+RATE_LIMIT_CHECK_SECONDS = registry.histogram(
+    "rate_limit_check_seconds",
+    "Tempo gasto pelo rate limiter por pedido",
+    buckets=(0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1),
+)
+RATE_LIMIT_LOCAL_HITS = registry.counter("rate_limit_local_hits_total", "Pedidos servidos por tokens reservados localmente")
+RATE_LIMIT_BACKEND_CALLS = registry.counter("rate_limit_backend_calls_total", "Reservas de tokens pedidas ao backend")
+RATE_LIMIT_BACKEND_ERRORS = registry.counter(
+    "rate_limit_backend_errors_total", "Falhas do backend de rate limit (pedido aceite)"
+)
+RATE_LIMIT_REJECTED = registry.counter("rate_limit_rejected_total", "Pedidos recusados pelo rate limit (429)")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Limite de 'amount' pedidos por 'period' segundos."""
+
+    amount: int
+    period: int
+    text: str
+
+    @classmethod
+    def parse(cls, text: str) -> "RateLimit":
+        """
+        Lê um limite no formato "5 per minute" ou "50/hour".
+
+        Raises:
+            ValueError: Se o formato for inválido
+        """
+        match = _LIMIT_RE.match(text)
+        if not match or int(match.group(1)) <= 0:
+            raise ValueError(f"Limite inválido: {text!r} (use ex: '5 per minute')")
+        return cls(int(match.group(1)), RATE_LIMIT_PERIODS[match.group(2).lower()], text.strip())
+
+    @property
+    def emission_interval(self) -> float:
+        """Segundos entre tokens (T no GCRA)."""
+        return self.period / self.amount
+
+    def lease_size(self, max_lease: int) -> int:
+        """Tokens reservados por ida ao backend: nunca mais de 10% do limite."""
+        return max(1, min(max_lease, self.amount // 10))
+
+
+def gcra_acquire(tat: float, now: float, limit: RateLimit, requested: int) -> Tuple[float, int, float]:
+    """
+    Reserva até 'requested' tokens de um balde GCRA.
+
+    O estado é o TAT (theoretical arrival time). São aceites rajadas até
+    'amount' pedidos; depois, um token a cada emission_interval.
+
+    Args:
+        tat: TAT atual (0 para um balde novo)
+        now: Instante atual (segundos)
+        limit: Limite do balde
+        requested: Tokens pretendidos
+
+    Returns:
+        tuple: (novo TAT, tokens concedidos, segundos até haver um token se nenhum foi concedido)
+    """
+    interval = limit.emission_interval
+    base = max(tat, now)
+    available = math.floor((now + limit.period - base) / interval + 1e-9)
+    granted = min(requested, max(0, available))
+    if granted == 0:
+        return tat, 0, base + interval - limit.period - now
+    return base + granted * interval, granted, 0.0
+
+
+def gcra_release(tat: float, limit: RateLimit, tokens: int) -> float:
+    """
+    Devolve 'tokens' a um balde GCRA (recua o TAT).
+
+    Returns:
+        float: Novo TAT (um TAT no passado equivale a um balde cheio)
+    """
+    return tat - tokens * limit.emission_interval
+
+
+class MemoryBackend:
+    """Baldes GCRA em memória (um processo; usado sem Redis)."""
+
+    name = "memory"
+
+    def __init__(self, clock: Callable[[], float] = time.time, max_keys: int = 100000):
+        self._clock = clock
+        self._max_keys = max_keys
+        self._tats = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: RateLimit, requested: int) -> Tuple[int, float]:
+        """
+        Reserva tokens.
+
+        Returns:
+            tuple: (tokens concedidos, segundos de espera se nenhum foi concedido)
+        """
+        with self._lock:
+            now = self._clock()
+            tat, granted, retry_after = gcra_acquire(self._tats.get(key, 0.0), now, limit, requested)
+            if granted:
+                if len(self._tats) >= self._max_keys:
+                    # Baldes com TAT no passado estão cheios: equivalem a não existir
+                    self._tats = {k: v for k, v in self._tats.items() if v > now}
+                self._tats[key] = tat
+            return granted, retry_after
+
+    def release(self, key: str, limit: RateLimit, tokens: int):
+        """Devolve tokens consumidos a um balde."""
+        with self._lock:
+            if key in self._tats:
+                self._tats[key] = gcra_release(self._tats[key], limit, tokens)
+
+
+class RedisBackend:
+    """Baldes GCRA no Redis, partilhados por todos os workers (um script Lua atómico por reserva)."""
+
+    name = "redis"
+
+    # Mesmo cálculo de gcra_acquire; o relógio é o do Redis, comum a todos os workers
+    SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+local base = math.max(tat, now)
+local available = math.floor((now + period - base) / interval + 1e-9)
+local granted = math.min(requested, math.max(0, available))
+if granted == 0 then
+  return {0, tostring(base + interval - period - now)}
+end
+local new_tat = base + granted * interval
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {granted, '0'}
+"""
+
+    # Mesmo cálculo de gcra_release; um TAT no passado (balde cheio) é removido
+    RELEASE_SCRIPT = """
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat then
+  return 0
+end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local new_tat = tat - tonumber(ARGV[1]) * tonumber(ARGV[2])
+if new_tat <= now then
+  redis.call('DEL', KEYS[1])
+else
+  redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+end
+return 1
+"""
+
+    def __init__(self, client):
+        self._script = client.register_script(self.SCRIPT)
+        self._release_script = client.register_script(self.RELEASE_SCRIPT)
+
+    def acquire(self, key: str, limit: RateLimit, requested: int) -> Tuple[int, float]:
+        """
+        Reserva tokens.
+
+        Returns:
+            tuple: (tokens concedidos, segundos de espera se nenhum foi concedido)
+        """
+        granted, retry_after = self._script(
+            keys=[REDIS_KEY_PREFIX + key], args=[limit.emission_interval, limit.period, requested]
+        )
+        return int(granted), float(retry_after)
+
+    def release(self, key: str, limit: RateLimit, tokens: int):
+        """Devolve tokens consumidos a um balde."""
+        self._release_script(keys=[REDIS_KEY_PREFIX + key], args=[tokens, limit.emission_interval])
+
+
+class LocalLeases:
+    """
+    Tokens já reservados no backend e ainda não usados por este worker.
+
+    Cada ida ao backend abre uma janela de lease_seconds (mesmo sem tokens de
+    sobra); uma chave com a janela aberta é "quente" e passa a reservar lotes.
+    """
+
+    def __init__(self, lease_seconds: float, max_entries: int = MAX_LOCAL_LEASES, clock: Callable[[], float] = time.time):
+        self._lease_seconds = lease_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> bool:
+        """Consome um token reservado, se houver (e a reserva não tiver expirado)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            if entry[1] <= self._clock():
+                del self._entries[key]
+                return False
+            if entry[0] <= 0:
+                return False
+            entry[0] -= 1
+            return True
+
+    def is_hot(self, key: str) -> bool:
+        """Se houve uma ida ao backend para a chave dentro da janela da reserva."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > self._clock()
+
+    def store(self, key: str, tokens: int):
+        """Guarda tokens reservados para os próximos pedidos (e abre a janela da chave)."""
+        with self._lock:
+            self._entries[key] = [tokens, self._clock() + self._lease_seconds]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class RateLimiter:
+    """Rate limiter com limites por rota, chave por identidade JWT ou IP e reservas locais."""
+
+    def __init__(self, default_limits: Sequence[str] = DEFAULT_LIMITS):
+        self.default_limits = tuple(RateLimit.parse(text) for text in default_limits)
+        self.backend = None
+        self.leases = None
+        self.lease_size = DEFAULT_LEASE_SIZE
+        self._exempt_blueprints = set()
+
+    def init_app(self, app, backend=None):
+        """
+        Ativa o rate limit em todas as rotas (hook before_request).
+
+        Args:
+            app: Instância Flask
+            backend: Backend dos baldes (padrão: Redis se USE_REDIS=True, senão memória)
+        """
+        if backend is None:
+            if os.getenv("USE_REDIS", "False").lower() == "true":
+                import redis
+
+                client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"), socket_timeout=0.5)
+                backend = RedisBackend(client)
+            else:
+                backend = MemoryBackend()
+
+        self.backend = backend
+        self.lease_size = int(os.getenv("RATE_LIMIT_LEASE_SIZE", DEFAULT_LEASE_SIZE))
+        self.leases = LocalLeases(float(os.getenv("RATE_LIMIT_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)))
+        app.limiter = self
+        app.before_request(self._check_request)
+
+    def limit(self, *limits: str):
+        """
+        Declara os limites de uma rota (substituem os limites padrão).
+        Deve ficar logo abaixo de @<blueprint>.route.
+
+        Exemplo:
+            @auth_bp.route("/login", methods=["POST"])
+            @limiter.limit("5 per minute")
+            def login():
+                ...
+        """
+        parsed = tuple(RateLimit.parse(text) for text in limits)
+
+        def decorator(fn):
+            fn._rate_limits = parsed
+            return fn
+
+        return decorator
+
+    def exempt(self, target):
+        """
+        Isenta do rate limit um Blueprint ou uma função de rota.
+
+        Args:
+            target: Blueprint ou função
+        """
+        if hasattr(target, "register_blueprint"):
+            self._exempt_blueprints.add(target.name)
+        else:
+            target._rate_limits = ()
+        return target
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        """
+        Consome um token do balde 'key' (primeiro dos reservados localmente).
+
+        Returns:
+            tuple: (aceite, segundos de espera se recusado)
+        """
+        if self.leases.take(key):
+            RATE_LIMIT_LOCAL_HITS.inc()
+            return True, 0.0
+
+        # Chave fria: um só token, para não deixar expirar uma reserva que não será usada
+        requested = limit.lease_size(self.lease_size) if self.leases.is_hot(key) else 1
+        RATE_LIMIT_BACKEND_CALLS.inc(backend=self.backend.name)
+        try:
+            granted, retry_after = self.backend.acquire(key, limit, requested)
+        except Exception as e:
+            # Backend indisponível: não bloquear a API
+            RATE_LIMIT_BACKEND_ERRORS.inc(backend=self.backend.name)
+            print(f"Erro no backend de rate limit: {e}")
+            return True, 0.0
+
+        if granted == 0:
+            return False, retry_after
+        self.leases.store(key, granted - 1)
+        return True, 0.0
+
+    def refund(self, key: str, limit: RateLimit):
+        """Devolve ao backend um token consumido por hit() (pedido recusado por outro limite)."""
+        try:
+            self.backend.release(key, limit, 1)
+        except Exception as e:
+            RATE_LIMIT_BACKEND_ERRORS.inc(backend=self.backend.name)
+            print(f"Erro no backend de rate limit: {e}")
+
+    @staticmethod
+    def client_key() -> str:
+        """Identidade do JWT (se o pedido trouxer um token válido) ou endereço IP."""
+        if request.headers.get("Authorization", "").startswith("Bearer "):
+            try:
+                verify_jwt_in_request(optional=True)
+                identity = get_jwt_identity()
+                if identity is not None:
+                    return f"user:{identity}"
+            except Exception:
+                # Token inválido ou expirado: a rota responde; aqui conta pelo IP
+                pass
+        return f"ip:{request.remote_addr}"
+
+    def _check_request(self):
+        if not current_app.config.get("RATELIMIT_ENABLED", True) or request.endpoint is None:
+            return None
+        if request.blueprint in self._exempt_blueprints:
+            return None
+        view = current_app.view_functions.get(request.endpoint)
+        limits = getattr(view, "_rate_limits", self.default_limits)
+        if not limits:
+            return None
+
+        start = time.perf_counter()
+        try:
+            client = self.client_key()
+            keys = [f"{request.endpoint}:{limit.amount}/{limit.period}:{client}" for limit in limits]
+            for position, (key, limit) in enumerate(zip(keys, limits)):
+                allowed, retry_after = self.hit(key, limit)
+                if not allowed:
+                    # O pedido não é servido: os limites anteriores não o contam
+                    for taken_key, taken_limit in zip(keys[:position], limits[:position]):
+                        self.refund(taken_key, taken_limit)
+                    RATE_LIMIT_REJECTED.inc(endpoint=request.endpoint)
+                    response = jsonify(
+                        {"success": False, "message": f"Limite de requisições excedido ({limit.text}), tente mais tarde"}
+                    )
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                    return response
+            return None
+        finally:
+            RATE_LIMIT_CHECK_SECONDS.observe(time.perf_counter() - start)
+
+
+# Instância global (ativada em create_app)
+limiter = RateLimiter()
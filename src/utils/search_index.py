@@ -0,0 +1,260 @@
+"""
+Índice invertido em memória para busca textual no modo JSON.
+Normaliza acentos (Úcua → ucua) e indexa prefixos de cada palavra.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+from src.utils.signals import entities_reloaded, entity_changed
+
+# Campos indexados por entidade e respetivo peso na pontuação
+SEARCH_FIELDS = {
+    "provinces": {"nome": 3.0, "capital": 2.0},
+    "municipalities": {"nome": 3.0},
+    "schools": {"nome": 3.0, "municipio": 1.5, "endereco": 1.0},
+    "markets": {"nome": 3.0, "municipio": 1.5, "endereco": 1.0, "especialidade": 1.0, "especialidades": 1.0},
+    "hospitals": {"nome": 3.0, "municipio": 1.5, "endereco": 1.0, "especialidades": 1.0},
+}
+
+SEARCH_ENTITIES = list(SEARCH_FIELDS)
+
+# Prefixos mais longos que isto não são indexados (a palavra completa é verificada na pontuação)
+MAX_PREFIX_LENGTH = 20
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold(text) -> str:
+    """
+    Normaliza texto para comparação: remove acentos e ignora maiúsculas.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        str: Texto normalizado (ex: 'Chongorói' → 'chongoroi')
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text) -> List[str]:
+    """
+    Divide texto normalizado em palavras.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        list: Palavras normalizadas
+    """
+    return _TOKEN_RE.findall(fold(text))
+
+
+def _score(entity: str, fields: dict, record: dict, terms: List[str], folded_query: str) -> float:
+    """Pontua um registro: palavra exata vale o dobro de um prefixo, ponderado pelo campo."""
+    score = 0.0
+    weights = SEARCH_FIELDS[entity]
+    for term in terms:
+        best = 0.0
+        for field, tokens in fields.items():
+            weight = weights[field]
+            if term in tokens:
+                best = max(best, weight * 2)
+            elif any(token.startswith(term) for token in tokens):
+                best = max(best, weight)
+        score += best
+
+    # Bónus quando o nome inteiro coincide ou começa pela consulta
+    nome = fold(record.get("nome"))
+    if nome == folded_query:
+        score += 10
+    elif nome.startswith(folded_query):
+        score += 3
+    return score
+
+
+def score_record(entity: str, record: dict, query: str) -> float:
+    """
+    Pontua a relevância de um registro para uma consulta (mesmo critério do índice).
+
+    Args:
+        entity: Nome da entidade
+        record: Registro a pontuar
+        query: Texto da busca
+
+    Returns:
+        float: Pontuação (0 se nenhuma palavra coincidir)
+    """
+    terms = tokenize(query)
+    fields = {field: tokenize(record.get(field)) for field in SEARCH_FIELDS[entity] if record.get(field)}
+    return _score(entity, fields, record, terms, " ".join(terms))
+
+
+def load_entity(entity: str) -> list:
+    """Retorna a lista em memória de uma entidade."""
+    from src.models.hospital import HOSPITALS
+    from src.models.market import MARKETS
+    from src.models.municipality import MUNICIPALITIES
+    from src.models.province import PROVINCES
+    from src.models.school import SCHOOLS
+
+    return {
+        "provinces": PROVINCES,
+        "municipalities": MUNICIPALITIES,
+        "schools": SCHOOLS,
+        "markets": MARKETS,
+        "hospitals": HOSPITALS,
+    }[entity]
+
+
+class SearchIndex:
+    """Índice invertido de prefixos sobre as entidades JSON."""
+
+    def __init__(self, loader=load_entity):
+        """
+        Args:
+            loader: Função que retorna a lista de registros de uma entidade
+        """
+        self._loader = loader
+        self._lock = threading.RLock()
+        # prefixo → conjunto de (entidade, id)
+        self._postings: Dict[str, set] = {}
+        # (entidade, id) → (registro, {campo: [palavras]})
+        self._docs: Dict[tuple, tuple] = {}
+        self._built = set()
+
+    def _ensure_built(self, entity: str):
+        if entity in self._built:
+            return
+        for record in self._loader(entity):
+            self._add(entity, record)
+        self._built.add(entity)
+
+    def _add(self, entity: str, record: dict):
+        key = (entity, record["id"])
+        fields = {}
+        for field in SEARCH_FIELDS[entity]:
+            tokens = tokenize(record.get(field))
+            if tokens:
+                fields[field] = tokens
+            for token in tokens:
+                for size in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                    self._postings.setdefault(token[:size], set()).add(key)
+        self._docs[key] = (record, fields)
+
+    def _remove(self, entity: str, record_id):
+        key = (entity, record_id)
+        entry = self._docs.pop(key, None)
+        if entry is None:
+            return
+        for tokens in entry[1].values():
+            for token in tokens:
+                for size in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                    postings = self._postings.get(token[:size])
+                    if postings is not None:
+                        postings.discard(key)
+                        if not postings:
+                            del self._postings[token[:size]]
+
+    def update(self, entity: str, operation: str, record: dict):
+        """
+        Aplica uma alteração ao índice (se a entidade já estiver indexada).
+
+        Args:
+            entity: Nome da entidade
+            operation: 'create', 'update' ou 'delete'
+            record: Registro afetado
+        """
+        if entity not in SEARCH_FIELDS:
+            return
+        with self._lock:
+            if entity not in self._built:
+                return
+            self._remove(entity, record["id"])
+            if operation != "delete":
+                self._add(entity, record)
+
+    def reset(self):
+        """Descarta o índice; será reconstruído na próxima busca."""
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._built.clear()
+
+    def search(self, query: str, entities: Optional[List[str]] = None, limit: int = 20) -> List[dict]:
+        """
+        Busca registros que contenham todas as palavras (ou prefixos) da consulta.
+
+        Args:
+            query: Texto da busca (acentos e maiúsculas são ignorados)
+            entities: Entidades onde buscar (padrão: todas)
+            limit: Número máximo de resultados
+
+        Returns:
+            list: Resultados ordenados por relevância, com 'type', 'id', 'nome', 'score' e 'data'
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        entities = entities or SEARCH_ENTITIES
+        # Termos maiores que o prefixo indexado são procurados pelo prefixo e verificados na pontuação
+        lookups = sorted({term[:MAX_PREFIX_LENGTH] for term in terms}, key=len, reverse=True)
+        folded_query = " ".join(terms)
+
+        with self._lock:
+            for entity in entities:
+                self._ensure_built(entity)
+
+            candidates = None
+            for lookup in lookups:
+                postings = self._postings.get(lookup)
+                if not postings:
+                    return []
+                candidates = set(postings) if candidates is None else candidates & postings
+                if not candidates:
+                    return []
+
+            results = []
+            for entity, record_id in candidates:
+                if entity not in entities:
+                    continue
+                record, fields = self._docs[(entity, record_id)]
+                score = _score(entity, fields, record, terms, folded_query)
+                if score > 0:
+                    results.append((score, entity, record))
+
+        results.sort(key=lambda item: (-item[0], fold(item[2].get("nome")), item[1]))
+        return [
+            {"type": entity, "id": record["id"], "nome": record.get("nome"), "score": score, "data": record}
+            for score, entity, record in results[:limit]
+        ]
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do índice.
+
+        Returns:
+            dict: Entidades indexadas, número de documentos e de prefixos
+        """
+        return {"entities": sorted(self._built), "documents": len(self._docs), "prefixes": len(self._postings)}
+
+
+# Índice global do modo JSON
+search_index = SearchIndex()
+
+
+@entity_changed.connect
+def _on_entity_changed(sender, operation=None, record=None, **kwargs):
+    search_index.update(sender, operation, record)
+
+
+@entities_reloaded.connect
+def _on_entities_reloaded(sender, **kwargs):
+    search_index.reset()
@@ -4,10 +4,38 @@ Utilitários de segurança para sanitização e validação de entrada.
 
 import html
 import re
+import time
 from functools import wraps
 
 from flask import jsonify, request
 
+from src.utils.metrics import registry
+
+# Campos nunca alterados nem rejeitados (senhas podem conter '#', '--', '<', ...)
+EXEMPT_FIELDS = frozenset({"password", "current_password", "new_password"})
+
+# Limites do percurso do payload (nº de valores visitados e profundidade)
+MAX_SCAN_NODES = 200000
+MAX_SCAN_DEPTH = 32
+
+# Caracteres de controle removidos (exceto \n, \r e \t), aplicados em C por str.translate
+CONTROL_CHARS = dict.fromkeys(c for c in range(32) if chr(c) not in "\n\r\t")
+
+# Métodos com corpo a verificar
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+INPUT_SCAN_SECONDS = registry.histogram(
+    "input_scan_seconds",
+    "Tempo de verificação e sanitização do payload por pedido",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1),
+)
+INPUT_SCAN_STRINGS = registry.counter("input_scan_strings_total", "Strings verificadas nos payloads")
+INPUT_SCAN_REJECTED = registry.counter("input_scan_rejected_total", "Payloads rejeitados pela verificação de segurança")
+
+
+class PayloadTooLarge(ValueError):
+    """Payload acima dos limites de percurso (MAX_SCAN_NODES / MAX_SCAN_DEPTH)."""
+
 
 class SecurityValidator:
     """Validador de segurança para entrada de dados"""
@@ -15,7 +43,9 @@ class SecurityValidator:
     # Padrões suspeitos para SQL Injection
     SQL_INJECTION_PATTERNS = [
         r"(\bOR\b|\bAND\b).*=.*",
-        r"(--|#|/\*|\*/)",
+        # Comentário logo após fechar uma aspa (' --, "#) ou comentário de bloco;
+        # '#' e '--' soltos são comuns em nomes ("Escola Primária #12", "Hospital -- Ala B")
+        r"(['\"`]\s*(--|#)|/\*|\*/)",
         r"(\bUNION\b.*\bSELECT\b)",
         r"(\bDROP\b.*\bTABLE\b)",
         r"(\bINSERT\b.*\bINTO\b)",
@@ -34,6 +64,20 @@ class SecurityValidator:
         r"<object",
     ]
 
+    # Uma alternação pré-compilada por categoria, equivalente às listas acima: uma só
+    # passagem por string. O lookahead inicial descarta logo as posições que não podem
+    # começar nenhum padrão e os prefixos comuns estão fatorizados.
+    SQL_INJECTION_REGEX = re.compile(
+        r"(?=['\"`/*;oauid])(?:['\"`]\s*(?:--|#)|/\*|\*/"
+        r"|\b(?:(?:OR|AND)\b.*=|UNION\b.*\bSELECT\b|DROP\b.*\bTABLE\b|INSERT\b.*\bINTO\b"
+        r"|DELETE\b.*\bFROM\b|UPDATE\b.*\bSET\b)"
+        r"|;.*\b(?:DROP|DELETE|INSERT|UPDATE)\b)",
+        re.IGNORECASE,
+    )
+    XSS_REGEX = re.compile(
+        r"(?=[<jo])(?:<(?:script[^>]*>.*?</script>|iframe|embed|object)|javascript:|on\w+\s*=)", re.IGNORECASE
+    )
+
     @classmethod
     def sanitize_string(cls, value):
         """
@@ -48,13 +92,8 @@ class SecurityValidator:
         if not isinstance(value, str):
             return value
 
-        # Escape HTML
-        sanitized = html.escape(value)
-
-        # Remover caracteres de controle
-        sanitized = "".join(char for char in sanitized if ord(char) >= 32 or char in "\n\r\t")
-
-        return sanitized
+        # Escape HTML e remoção dos caracteres de controle
+        return html.escape(value).translate(CONTROL_CHARS)
 
     @classmethod
     def check_sql_injection(cls, value):
@@ -70,13 +109,7 @@ class SecurityValidator:
         if not isinstance(value, str):
             return False
 
-        value_upper = value.upper()
-
-        for pattern in cls.SQL_INJECTION_PATTERNS:
-            if re.search(pattern, value_upper, re.IGNORECASE):
-                return True
-
-        return False
+        return cls.SQL_INJECTION_REGEX.search(value) is not None
 
     @classmethod
     def check_xss(cls, value):
@@ -92,11 +125,63 @@ class SecurityValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.XSS_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
+        return cls.XSS_REGEX.search(value) is not None
+
+    @classmethod
+    def scan(cls, data, sanitize=False):
+        """
+        Valida um payload JSON numa só passagem iterativa.
+
+        Percorre dicionários e listas a qualquer profundidade (sem recursão) e
+        rejeita o primeiro valor suspeito. Por padrão os dados não são alterados
+        (o escape cabe a quem os apresenta como HTML); com sanitize=True devolve
+        uma cópia sanitizada. Os campos em EXEMPT_FIELDS não são verificados nem alterados.
 
-        return False
+        Args:
+            data: Payload (dict, list ou valor simples)
+            sanitize: Devolver uma cópia com as strings sanitizadas (sanitize_string)
+
+        Returns:
+            tuple: (dados, None, nº de strings) ou (None, mensagem de erro, nº de strings)
+
+        Raises:
+            PayloadTooLarge: Se o payload exceder MAX_SCAN_NODES ou MAX_SCAN_DEPTH
+        """
+        sql_search = cls.SQL_INJECTION_REGEX.search
+        xss_search = cls.XSS_REGEX.search
+        escape = html.escape
+
+        root = [data]
+        # (contentor de destino, chave/índice, valor, caminho, profundidade)
+        stack = [(root, 0, data, "", 0)]
+        nodes = strings = 0
+        while stack:
+            target, key, value, path, depth = stack.pop()
+            nodes += 1
+            if nodes > MAX_SCAN_NODES or depth > MAX_SCAN_DEPTH:
+                raise PayloadTooLarge("Payload demasiado grande ou aninhado")
+
+            if isinstance(value, str):
+                strings += 1
+                if sql_search(value):
+                    return None, f"Entrada suspeita detectada no campo '{path}': possível SQL Injection", strings
+                if xss_search(value):
+                    return None, f"Entrada suspeita detectada no campo '{path}': possível XSS", strings
+                if sanitize:
+                    target[key] = escape(value).translate(CONTROL_CHARS)
+            elif isinstance(value, dict):
+                copy = target[key] = dict(value) if sanitize else value
+                # Ordem inversa na pilha: os campos são visitados (e reportados) pela ordem do payload
+                stack.extend(
+                    (copy, name, copy[name], f"{path}.{name}" if path else name, depth + 1)
+                    for name in reversed(copy)
+                    if name not in EXEMPT_FIELDS
+                )
+            elif isinstance(value, list):
+                copy = target[key] = list(value) if sanitize else value
+                stack.extend((copy, index, copy[index], f"{path}[{index}]", depth + 1) for index in reversed(range(len(copy))))
+
+        return root[0], None, strings
 
     @classmethod
     def sanitize_dict(cls, data):
@@ -164,10 +249,46 @@ class SecurityValidator:
         return True, None
 
 
+def _scan_request_json(sanitize=False):
+    """
+    Verifica o corpo JSON do pedido atual.
+
+    Args:
+        sanitize: Substituir o corpo pela versão sanitizada (ver sanitize_input)
+
+    Returns:
+        Resposta de erro (400/413) ou None se o payload for aceite
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        # Corpo vazio ou JSON inválido: a rota trata
+        return None
+
+    start = time.perf_counter()
+    try:
+        sanitized, error, strings = SecurityValidator.scan(data, sanitize=sanitize)
+    except PayloadTooLarge as e:
+        INPUT_SCAN_REJECTED.inc(reason="too_large")
+        return jsonify({"success": False, "message": str(e)}), 413
+    finally:
+        INPUT_SCAN_SECONDS.observe(time.perf_counter() - start)
+
+    INPUT_SCAN_STRINGS.inc(strings)
+    if error:
+        INPUT_SCAN_REJECTED.inc(reason="suspicious")
+        return jsonify({"success": False, "message": error}), 400
+
+    if sanitize:
+        # Substituir dados originais pelos sanitizados
+        request._cached_json = (sanitized, sanitized)
+    return None
+
+
 def sanitize_input():
     """
-    Decorator para sanitizar automaticamente entrada de dados JSON.
-    Deve ser aplicado antes da validação com schemas.
+    Decorator para sanitizar automaticamente entrada de dados JSON (opt-in, por rota).
+    Deve ser aplicado antes da validação com schemas. Os valores ficam gravados
+    já escapados, por isso só convém a campos que são sempre apresentados como HTML.
 
     Exemplo:
         @app.route('/endpoint', methods=['POST'])
@@ -181,28 +302,32 @@ def sanitize_input():
         @wraps(fn)
         def wrapper(*args, **kwargs):
             if request.is_json:
-                try:
-                    data = request.get_json()
+                error_response = _scan_request_json(sanitize=True)
+                if error_response is not None:
+                    return error_response
 
-                    # Validar entrada
-                    is_valid, error = SecurityValidator.validate_input(data)
-                    if not is_valid:
-                        return jsonify({"success": False, "message": error}), 400
+            return fn(*args, **kwargs)
 
-                    # Sanitizar dados
-                    sanitized_data = SecurityValidator.sanitize_dict(data)
+        return wrapper
 
-                    # Substituir dados originais pelos sanitizados
-                    request._cached_json = (sanitized_data, sanitized_data)
+    return decorator
 
-                except Exception as e:
-                    return jsonify({"success": False, "message": f"Erro ao processar entrada: {str(e)}"}), 400
 
-            return fn(*args, **kwargs)
+def init_input_scan(app):
+    """
+    Verifica o corpo JSON de todas as escritas (POST, PUT, PATCH, DELETE) num
+    único hook before_request. Os dados não são alterados: o que é gravado é o
+    que o cliente enviou (e volta igual numa atualização posterior).
 
-        return wrapper
+    Args:
+        app: Instância Flask
+    """
 
-    return decorator
+    @app.before_request
+    def scan_write_payload():
+        if request.method in WRITE_METHODS and request.is_json:
+            return _scan_request_json()
+        return None
 
 
 def add_security_headers(response):
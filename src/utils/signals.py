@@ -0,0 +1,75 @@
+"""
+Sinais de alteração de dados.
+Permitem que índices e caches em memória acompanhem escritas nos serviços JSON.
+"""
+
+import itertools
+import threading
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Versões dos dados em memória: mudam a cada escrita (para invalidar derivados)
+_counter = itertools.count(1)
+_versions_lock = threading.Lock()
+_versions = {}
+_reload_version = 0
+
+# Enviado após cada criação, atualização ou remoção de um registro.
+# sender: nome da entidade ('provinces', 'municipalities', 'schools', 'markets', 'hospitals')
+entity_changed = _signals.signal("entity-changed")
+
+# Enviado quando as listas em memória são recarregadas de uma vez (ex: arranque da aplicação)
+entities_reloaded = _signals.signal("entities-reloaded")
+
+# Enviado quando uma alteração entra no feed de alterações (já com a sequência atribuída;
+# no modo database, só depois do commit). sender: nome da entidade; kwargs: entry
+change_recorded = _signals.signal("change-recorded")
+
+
+def notify_change(entity: str, operation: str, record: dict):
+    """
+    Notifica os assinantes de que um registro foi alterado.
+
+    Args:
+        entity: Nome da entidade (ex: 'municipalities')
+        operation: 'create', 'update' ou 'delete'
+        record: Registro afetado (no estado final, ou o removido)
+    """
+    with _versions_lock:
+        _versions[entity] = next(_counter)
+    entity_changed.send(entity, operation=operation, record=record)
+
+
+def notify_reload():
+    """Notifica os assinantes de que todos os dados em memória foram recarregados."""
+    global _reload_version
+    with _versions_lock:
+        _versions.clear()
+        _reload_version = next(_counter)
+    entities_reloaded.send("json")
+
+
+def get_version(entity: str) -> int:
+    """
+    Retorna a versão atual dos dados de uma entidade.
+    Qualquer escrita (ou recarga) produz um valor maior que o anterior.
+
+    Args:
+        entity: Nome da entidade
+
+    Returns:
+        int: Versão atual
+    """
+    return max(_versions.get(entity, 0), _reload_version)
+
+
+def notify_recorded(entry: dict):
+    """
+    Notifica os assinantes de que uma alteração foi registada no feed.
+
+    Args:
+        entry: Entrada do feed (seq, entity, id, operation, record, timestamp)
+    """
+    change_recorded.send(entry["entity"], entry=entry)
@@ -0,0 +1,278 @@
+"""
+Snapshot completo dos dados de referência (GET /snapshot).
+
+Um único bundle JSON com todas as entidades, identificado pelo hash do conteúdo
+e guardado já comprimido. É reconstruído numa thread em segundo plano quando a
+versão dos dados (a última sequência do feed de alterações) muda; os requests
+apenas servem bytes prontos.
+
+Cada bundle construído é também gravado em SNAPSHOT_DIR, por hash: o redirect
+de GET /snapshot e o pedido seguinte podem cair em workers diferentes, e o
+segundo serve o hash a partir do disco mesmo que nunca o tenha construído.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.utils.compression import brotli
+from src.utils.metrics import registry
+from src.utils.signals import change_recorded, entities_reloaded
+
+SNAPSHOT_ENTITIES = ["provinces", "municipalities", "schools", "markets", "hospitals"]
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).parent.parent.parent / "data" / "snapshots"
+
+# Arquivo de cada codificação de um bundle: <hash><sufixo>
+BODY_SUFFIXES = {"identity": ".json", "gzip": ".json.gz", "br": ".json.br"}
+_HASH_RE = re.compile(r"^[0-9a-f]{32}$")
+
+SNAPSHOT_BUILDS = registry.counter("snapshot_builds_total", "Snapshots completos reconstruídos")
+SNAPSHOT_BUILD_SECONDS = registry.histogram("snapshot_build_seconds", "Tempo de construção do snapshot")
+
+
+@dataclass
+class Snapshot:
+    """Bundle pronto a servir."""
+
+    content_hash: str
+    version: int
+    # codificação ('identity', 'gzip', 'br') → bytes
+    bodies: Dict[str, bytes] = field(default_factory=dict)
+
+
+def _default_version() -> int:
+    from src.services.service_factory import ServiceFactory
+
+    result = ServiceFactory.get_change_service().get_changes(0, limit=1)
+    if result.get("error"):
+        raise RuntimeError(f"Feed de alterações indisponível: {result['error']}")
+    return result["latest"]
+
+
+def _default_loader(entity: str) -> List[dict]:
+    from src.services.service_factory import ServiceFactory
+
+    getters = {
+        "provinces": ServiceFactory.get_province_service,
+        "municipalities": ServiceFactory.get_municipality_service,
+        "schools": ServiceFactory.get_school_service,
+        "markets": ServiceFactory.get_market_service,
+        "hospitals": ServiceFactory.get_hospital_service,
+    }
+    return getters[entity]().get_all()
+
+
+class SnapshotStore:
+    """Snapshots recentes e a thread que os mantém atualizados."""
+
+    def __init__(
+        self,
+        loader: Callable[[str], List[dict]] = _default_loader,
+        version_source: Callable[[], int] = _default_version,
+        keep: int = 2,
+        directory: Optional[Path] = None,
+    ):
+        """
+        Args:
+            loader: Função que retorna todos os registros de uma entidade
+            version_source: Função que retorna a versão atual dos dados
+            keep: Snapshots mantidos (URLs anteriores continuam válidas durante a troca)
+            directory: Diretório partilhado pelos workers (padrão: SNAPSHOT_DIR ou data/snapshots)
+        """
+        self._loader = loader
+        self._version_source = version_source
+        self._keep = keep
+        self._directory = directory
+        self._lock = threading.Lock()
+        # Construções em série (thread de fundo e chamadas diretas)
+        self._build_lock = threading.Lock()
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._order: List[str] = []
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._force = False
+
+    @property
+    def directory(self) -> Path:
+        return Path(self._directory or os.getenv("SNAPSHOT_DIR", str(DEFAULT_SNAPSHOT_DIR)))
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        """Snapshot mais recente (None antes da primeira construção)."""
+        with self._lock:
+            return self._snapshots[self._order[-1]] if self._order else None
+
+    def get(self, content_hash: str) -> Optional[Snapshot]:
+        """
+        Procura um snapshot pelo hash (em memória e depois no diretório partilhado).
+
+        Args:
+            content_hash: Hash do conteúdo (parte da URL)
+
+        Returns:
+            Snapshot ou None
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(content_hash)
+        if snapshot is None and _HASH_RE.match(content_hash):
+            snapshot = self._read(content_hash)
+        return snapshot
+
+    def _write(self, snapshot: Snapshot):
+        # Corpos primeiro e o .meta.json por último (e por rename): quem o vê encontra o bundle completo
+        directory = self.directory
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            files = {encoding: BODY_SUFFIXES[encoding] for encoding in snapshot.bodies}
+            files["meta"] = ".meta.json"
+            for name, suffix in files.items():
+                path = directory / f"{snapshot.content_hash}{suffix}"
+                data = json.dumps({"version": snapshot.version}).encode() if name == "meta" else snapshot.bodies[name]
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Erro ao gravar snapshot: {e}")
+
+    def ensure_shared(self, snapshot: Snapshot):
+        """
+        Garante que o snapshot está no diretório partilhado antes de redirecionar para ele
+        (outro worker, mais adiantado, pode já o ter removido ao trocar de versão).
+        """
+        if not (self.directory / f"{snapshot.content_hash}.meta.json").exists():
+            self._write(snapshot)
+
+    def _read(self, content_hash: str) -> Optional[Snapshot]:
+        directory = self.directory
+        try:
+            meta = json.loads((directory / f"{content_hash}.meta.json").read_bytes())
+            bodies = {
+                encoding: (directory / f"{content_hash}{suffix}").read_bytes()
+                for encoding, suffix in BODY_SUFFIXES.items()
+                if (directory / f"{content_hash}{suffix}").exists()
+            }
+        except (OSError, ValueError):
+            return None
+        if "identity" not in bodies:
+            return None
+        return Snapshot(content_hash, meta["version"], bodies)
+
+    def _remove(self, content_hash: str):
+        for suffix in (".meta.json", *BODY_SUFFIXES.values()):
+            try:
+                (self.directory / f"{content_hash}{suffix}").unlink()
+            except OSError:
+                pass
+
+    def build(self) -> Snapshot:
+        """
+        Constrói (ou reutiliza, se o conteúdo não mudou) o snapshot da versão atual.
+
+        Returns:
+            Snapshot: Snapshot atual
+        """
+        with self._build_lock:
+            return self._build()
+
+    def _build(self) -> Snapshot:
+        start = time.perf_counter()
+
+        # Versão lida antes dos dados: o snapshot pode conter alterações posteriores,
+        # nunca omitir as anteriores (reaplicá-las com /changes?since=version é idempotente)
+        version = self._version_source()
+        bundle = {"version": version, "entities": {entity: self._loader(entity) for entity in SNAPSHOT_ENTITIES}}
+        raw = json.dumps(bundle, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        content_hash = hashlib.sha256(raw).hexdigest()[:32]
+
+        with self._lock:
+            existing = self._snapshots.get(content_hash)
+            if existing is not None:
+                # Conteúdo já conhecido: volta a ser o atual, sem recomprimir
+                self._order.remove(content_hash)
+                self._order.append(content_hash)
+        if existing is not None:
+            SNAPSHOT_BUILD_SECONDS.observe(time.perf_counter() - start)
+            return existing
+
+        # Comprimido uma vez, no nível máximo: o custo fica fora dos requests
+        bodies = {"identity": raw, "gzip": gzip.compress(raw, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            bodies["br"] = brotli.compress(raw, quality=11)
+        snapshot = Snapshot(content_hash, version, bodies)
+        self._write(snapshot)
+
+        evicted = []
+        with self._lock:
+            self._snapshots[content_hash] = snapshot
+            self._order.append(content_hash)
+            while len(self._order) > self._keep:
+                evicted.append(self._order.pop(0))
+                self._snapshots.pop(evicted[-1], None)
+        for old_hash in evicted:
+            self._remove(old_hash)
+        SNAPSHOT_BUILDS.inc()
+        SNAPSHOT_BUILD_SECONDS.observe(time.perf_counter() - start)
+        return snapshot
+
+    def request_rebuild(self, force: bool = False):
+        """
+        Pede uma reconstrução (executada pela thread em segundo plano).
+
+        Args:
+            force: Reconstruir mesmo sem mudança de versão (ex: dados recarregados do disco)
+        """
+        if force:
+            self._force = True
+        self._wake.set()
+
+    def ensure_started(self):
+        """Inicia a thread de reconstrução neste processo (uma vez por processo, também após fork)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._wake.set()
+            self._thread = threading.Thread(target=self._run, name="snapshot-builder", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        poll_interval = float(os.getenv("SNAPSHOT_POLL_SECONDS", 30))
+        debounce = float(os.getenv("SNAPSHOT_DEBOUNCE_SECONDS", 1))
+        while True:
+            # Acordada por alterações neste processo; o polling apanha as de outros workers
+            woken = self._wake.wait(timeout=poll_interval)
+            self._wake.clear()
+            try:
+                current = self.current
+                if woken and current is not None:
+                    # Agrupar rajadas de escritas numa única reconstrução
+                    self._wake.wait(timeout=debounce)
+                    self._wake.clear()
+                force, self._force = self._force, False
+                if force or current is None or self._version_source() != current.version:
+                    self.build()
+            except Exception as e:
+                print(f"Erro ao construir snapshot: {e}")
+
+
+# Store global
+snapshot_store = SnapshotStore()
+
+
+@change_recorded.connect
+def _on_change_recorded(entity, **kwargs):
+    snapshot_store.request_rebuild()
+
+
+@entities_reloaded.connect
+def _on_entities_reloaded(sender, **kwargs):
+    snapshot_store.request_rebuild(force=True)
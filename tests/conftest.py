@@ -4,12 +4,23 @@ Configuração do Pytest.
 
 import os
 import sys
+import tempfile
 
 import pytest
+from flask_jwt_extended import create_access_token
 
 # Adicionar diretório raiz ao path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+# Logs de auditoria dos testes vão para um diretório temporário
+os.environ.setdefault("AUDIT_LOG_DIR", tempfile.mkdtemp(prefix="angodata_audit_"))
+
+# Diário do feed de alterações (modo JSON) também fora de data/
+os.environ.setdefault("CHANGE_LOG_PATH", os.path.join(tempfile.mkdtemp(prefix="angodata_changes_"), "changes.jsonl"))
+
+# Bundles do snapshot partilhados entre workers
+os.environ.setdefault("SNAPSHOT_DIR", tempfile.mkdtemp(prefix="angodata_snapshots_"))
+
 
 @pytest.fixture(scope="session")
 def app():
@@ -63,6 +74,32 @@ def editor_headers(client):
     return {}
 
 
+@pytest.fixture(scope="function")
+def admin_headers(app):
+    """Token de administrador emitido diretamente (sem passar pelo login)."""
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"email": "admin@angodata.ao", "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="function")
+def sqlite_backend(tmp_path, monkeypatch):
+    """Inicializa o backend SQLite (STORAGE_BACKEND=sqlite) num arquivo temporário."""
+    from src.database import base
+
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "angodata.db"))
+    monkeypatch.setattr(base, "engine", None)
+    monkeypatch.setattr(base, "SessionLocal", None)
+    monkeypatch.setattr(base, "replica_router", None)
+
+    engine = base.init_database()
+    yield engine
+
+    base.SessionLocal.remove()
+    engine.dispose()
+
+
 @pytest.fixture(scope="session")
 def db_app():
     """Create application with database for integration tests."""
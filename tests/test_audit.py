@@ -0,0 +1,261 @@
+"""
+Testes para o sistema de auditoria.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.services.db.audit_service_db import AuditServiceDB, _copy_value
+from src.utils.audit import AuditDatabaseSink, AuditLogger, AuditWriter
+from src.utils.audit_store import AuditLogStore, normalize_timestamp
+
+
+class TestAuditWriter:
+    """Testes para a escrita assíncrona em lotes."""
+
+    def test_batches_are_written_and_drained_on_stop(self, tmp_path):
+        """Deve gravar todos os eventos enfileirados ao encerrar."""
+        sink = AuditLogStore(tmp_path, fsync_interval=60)
+        writer = AuditWriter(sink, queue_size=100, batch_size=10, flush_interval=0.01)
+        writer.start()
+
+        for i in range(25):
+            assert writer.enqueue({"action": "CREATE", "resource_id": i}) is True
+        writer.stop()
+
+        lines = (tmp_path / "audit.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 25
+
+    def test_drop_policy_when_queue_full(self, tmp_path):
+        """Com policy='drop' deve descartar eventos quando a fila está cheia."""
+        writer = AuditWriter(AuditLogStore(tmp_path), queue_size=1, policy="drop")
+
+        assert writer.enqueue({"action": "A"}) is True
+        assert writer.enqueue({"action": "B"}) is False
+        assert writer.dropped == 1
+
+
+class TestAuditLogStore:
+    """Testes para rotação, índices e consultas."""
+
+    def _fill(self, store, count):
+        store.write_batch(
+            [
+                {
+                    "timestamp": f"2025-11-23T10:00:{i:02d}",
+                    "action": "DELETE" if i % 5 == 0 else "CREATE",
+                    "resource_type": "province",
+                    "resource_id": i,
+                    "user_id": str(i % 3),
+                }
+                for i in range(count)
+            ]
+        )
+
+    def test_returns_newest_matches_first(self, tmp_path):
+        """Deve devolver as correspondências mais recentes, não as mais antigas."""
+        store = AuditLogStore(tmp_path)
+        self._fill(store, 50)
+
+        result = store.query(limit=3, action="DELETE")
+
+        assert [log["resource_id"] for log in result["data"]] == [45, 40, 35]
+
+    def test_cursor_pagination_across_rotated_segments(self, tmp_path):
+        """A paginação por cursor deve atravessar segmentos rodados sem repetir eventos."""
+        store = AuditLogStore(tmp_path, rotate_bytes=1024)
+        for i in range(60):
+            store.write_batch(
+                [{"timestamp": f"2025-11-23T10:{i:02d}:00", "action": "CREATE", "resource_type": "school", "resource_id": i}]
+            )
+
+        assert list(tmp_path.glob("audit-*.log.idx.json"))
+
+        seen, cursor = [], None
+        while True:
+            page = store.query(limit=7, cursor=cursor)
+            seen.extend(log["resource_id"] for log in page["data"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == list(range(59, -1, -1))
+
+    def test_time_window_and_index_filters(self, tmp_path):
+        """Deve respeitar since/until e filtros indexados."""
+        store = AuditLogStore(tmp_path)
+        self._fill(store, 50)
+
+        result = store.query(limit=100, user_id=1, since="2025-11-23T10:00:10", until="2025-11-23T10:00:20")
+
+        assert [log["resource_id"] for log in result["data"]] == [19, 16, 13, 10]
+        assert store.query(action="UNKNOWN")["data"] == []
+
+    def test_since_com_eventos_fora_de_ordem(self, tmp_path):
+        """Um evento anterior a 'since' no meio do arquivo não corta os seguintes."""
+        store = AuditLogStore(tmp_path)
+        store.write_batch(
+            [
+                {"timestamp": timestamp, "action": "CREATE", "resource_type": "school", "resource_id": i}
+                for i, timestamp in enumerate(
+                    ["2025-11-23T10:00:01", "2025-11-23T10:00:06", "2025-11-23T10:00:04", "2025-11-23T10:00:05"]
+                )
+            ]
+        )
+
+        result = store.query(limit=100, since="2025-11-23T10:00:05")
+
+        assert [log["resource_id"] for log in result["data"]] == [3, 1]
+
+    def test_filtros_com_fuso_horario_convertidos_para_utc(self, tmp_path):
+        """Timestamps com fuso são convertidos para UTC antes de comparar."""
+        store = AuditLogStore(tmp_path)
+        self._fill(store, 50)
+
+        assert normalize_timestamp("2025-11-23T11:00:10+01:00") == "2025-11-23T10:00:10"
+        result = store.query(limit=100, since=normalize_timestamp("2025-11-23T11:00:45+01:00"))
+
+        assert [log["resource_id"] for log in result["data"]] == [49, 48, 47, 46, 45]
+
+    def test_until_so_com_data_inclui_o_dia_inteiro(self, tmp_path):
+        """Um 'until' só com a data inclui os eventos desse dia."""
+        store = AuditLogStore(tmp_path)
+        self._fill(store, 50)
+
+        assert len(store.query(limit=100, until=normalize_timestamp("2025-11-23", end_of_day=True))["data"]) == 50
+        assert store.query(limit=100, until=normalize_timestamp("2025-11-22", end_of_day=True))["data"] == []
+        assert len(store.query(limit=100, since=normalize_timestamp("2025-11-23"))["data"]) == 50
+
+
+class TestAuditLogger:
+    """Testes de integração com a aplicação."""
+
+    def test_logged_action_is_visible_after_flush(self, app):
+        """Eventos enfileirados devem aparecer em get_logs."""
+        with app.test_request_context("/"):
+            AuditLogger.log_action("TEST_ACTION", "province", resource_id=42)
+
+        logs = AuditLogger.get_logs(limit=10, action="TEST_ACTION")
+
+        assert any(log["resource_id"] == 42 for log in logs)
+
+
+class TestAuditServiceDB:
+    """Testes do armazenamento de auditoria no database (aqui em SQLite)."""
+
+    def _events(self, count):
+        return [
+            {
+                "timestamp": f"2025-11-23T10:00:{i // 2:02d}",
+                "action": "DELETE" if i % 4 == 0 else "CREATE",
+                "resource_type": "school",
+                "resource_id": i,
+                "user_id": i % 2,
+                "details": {"nome": f"Escola {i}"},
+            }
+            for i in range(count)
+        ]
+
+    def test_insert_batch_e_filtros(self, sqlite_backend):
+        """O lote é inserido e os filtros são aplicados em SQL"""
+        assert AuditServiceDB.insert_batch(self._events(20)) == 20
+        assert AuditServiceDB.insert_batch([]) == 0
+
+        result = AuditServiceDB.query(limit=100, action="DELETE", user_id=0)
+        assert [log["resource_id"] for log in result["data"]] == ["16", "12", "8", "4", "0"]
+        assert result["data"][0]["details"] == {"nome": "Escola 16"}
+        assert result["data"][0]["user_id"] == "0"
+
+        window = AuditServiceDB.query(since="2025-11-23T10:00:02", until="2025-11-23T10:00:03")
+        assert [log["resource_id"] for log in window["data"]] == ["7", "6", "5", "4"]
+
+    def test_cursor_com_timestamps_repetidos(self, sqlite_backend):
+        """O cursor (timestamp, id) percorre eventos com o mesmo timestamp sem repetir nem saltar"""
+        AuditServiceDB.insert_batch(self._events(15))
+
+        seen, cursor = [], None
+        while True:
+            page = AuditServiceDB.query(limit=4, cursor=cursor)
+            seen.extend(log["resource_id"] for log in page["data"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == [str(i) for i in range(14, -1, -1)]
+        with pytest.raises(ValueError):
+            AuditServiceDB.query(cursor="invalido")
+
+    def test_sink_do_database(self, sqlite_backend):
+        """AuditDatabaseSink grava e consulta através do service"""
+        sink = AuditDatabaseSink()
+        sink.write_batch(self._events(3))
+        sink.sync()
+
+        assert [log["resource_id"] for log in sink.query(limit=10)["data"]] == ["2", "1", "0"]
+
+    def test_copy_value(self):
+        """Valores codificados para COPY (formato texto)"""
+        assert _copy_value(None) == "\\N"
+        assert _copy_value("a\tb\nc\rd\\e") == "a\\tb\\nc\\rd\\\\e"
+        assert _copy_value(datetime(2025, 11, 23, 10, 0)) == "2025-11-23T10:00:00"
+        assert _copy_value({"nome": "Tômbwa\tSul"}) == '{"nome": "Tômbwa\\\\tSul"}'
+
+
+class TestAuditPartitions:
+    """Testes da criação das partições mensais."""
+
+    class FakeSession:
+        """Sessão mínima: cada CREATE corre num savepoint e pode falhar."""
+
+        def __init__(self, error=None):
+            self.error = error
+            self.statements = []
+
+        def begin_nested(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, statement):
+            self.statements.append(str(statement))
+            if self.error is not None:
+                raise self.error
+
+    class DuplicateTable(Exception):
+        pgcode = "42P07"
+
+    @pytest.fixture(autouse=True)
+    def partitioned(self, monkeypatch):
+        monkeypatch.setattr(AuditServiceDB, "_partitioned", True)
+        monkeypatch.setattr(AuditServiceDB, "_partitions", set())
+
+    def test_corrida_na_criacao_e_tolerada(self):
+        """Partição criada em simultâneo por outro processo não falha o lote"""
+        session = self.FakeSession(IntegrityError("CREATE", {}, self.DuplicateTable()))
+        months = AuditServiceDB.ensure_partitions(session, [datetime(2025, 12, 5), datetime(2026, 1, 2)])
+
+        assert months == {(2025, 12), (2026, 1)}
+        assert "FROM ('2025-12-01') TO ('2026-01-01')" in session.statements[0]
+
+    def test_outros_erros_propagam(self):
+        """Erros que não são de partição duplicada não são engolidos"""
+        session = self.FakeSession(IntegrityError("CREATE", {}, Exception("outro")))
+        with pytest.raises(IntegrityError):
+            AuditServiceDB.ensure_partitions(session, [datetime(2025, 12, 5)])
+
+    def test_mes_memorizado_apenas_apos_commit(self, sqlite_backend, monkeypatch):
+        """Se a transação do lote falha, o mês criado nela não fica marcado como existente"""
+        monkeypatch.setattr(AuditServiceDB, "ensure_partitions", staticmethod(lambda session, timestamps: {(2025, 11)}))
+
+        invalid = [{"timestamp": "2025-11-23T10:00:00", "action": None, "resource_type": "school"}]
+        assert AuditServiceDB.insert_batch(invalid) == 0
+        assert AuditServiceDB._partitions == set()
+
+        assert AuditServiceDB.insert_batch(TestAuditServiceDB()._events(1)) == 1
+        assert AuditServiceDB._partitions == {(2025, 11)}
@@ -0,0 +1,74 @@
+"""
+Testes para o cache de verificação de JWT e o contexto de autenticação.
+"""
+
+import time
+
+from flask_jwt_extended import create_access_token
+
+from src.utils.jwt_cache import TokenVerificationCache
+
+
+class TestTokenVerificationCache:
+    """Testes unitários para o LRU de tokens verificados."""
+
+    def test_evicts_least_recently_used(self):
+        """Deve remover a entrada menos usada quando cheio."""
+        verify_cache = TokenVerificationCache(max_size=2)
+        verify_cache.set("a", {"sub": "1"})
+        verify_cache.set("b", {"sub": "2"})
+        verify_cache.get("a")
+        verify_cache.set("c", {"sub": "3"})
+
+        assert verify_cache.get("a") == {"sub": "1"}
+        assert verify_cache.get("b") is None
+        assert verify_cache.get("c") == {"sub": "3"}
+
+    def test_entry_capped_at_token_expiry(self):
+        """Não deve servir claims depois do exp do token."""
+        verify_cache = TokenVerificationCache(max_size=10, max_ttl=300)
+        verify_cache.set("expired", {"sub": "1", "exp": time.time() - 1})
+
+        assert verify_cache.get("expired") is None
+
+    def test_stores_and_returns_copies(self):
+        """Alterar as claims guardadas ou devolvidas não deve afetar o cache."""
+        verify_cache = TokenVerificationCache(max_size=10)
+        claims = {"sub": "1", "role": "user", "scopes": ["read"]}
+        verify_cache.set("token", claims)
+        claims["role"] = "admin"
+
+        served = verify_cache.get("token")
+        served["scopes"].append("write")
+        served["sub"] = "2"
+
+        assert verify_cache.get("token") == {"sub": "1", "role": "user", "scopes": ["read"]}
+
+
+class TestCachedAuthorization:
+    """Testes de integração com rotas protegidas."""
+
+    def test_reused_token_hits_cache(self, app, client):
+        """Tokens reutilizados devem ser servidos a partir do cache."""
+        with app.app_context():
+            token = create_access_token(identity="1", additional_claims={"email": "admin@angodata.ao", "role": "admin"})
+
+        verify_cache = app.extensions["jwt_verify_cache"]
+        hits_before = verify_cache.hits
+        headers = {"Authorization": f"Bearer {token}"}
+
+        first = client.get("/auth/audit/logs?limit=1", headers=headers)
+        second = client.get("/auth/audit/logs?limit=1", headers=headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert verify_cache.hits > hits_before
+
+    def test_role_check_uses_claims(self, app, client):
+        """Deve negar acesso a roles sem permissão."""
+        with app.app_context():
+            token = create_access_token(identity="3", additional_claims={"role": "user"})
+
+        response = client.get("/auth/audit/logs", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 403
@@ -0,0 +1,131 @@
+"""
+Testes para a validação em lote das bulk operations.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database import base
+from src.schemas import ProvinceSchema
+from src.services.db.province_service_db import ProvinceServiceDB
+from src.utils.batch_validation import validate_batch
+
+
+def province(nome, **overrides):
+    """Província válida (com campos sobrepostos)."""
+    return {"nome": nome, "capital": f"Capital {nome}", "area_km2": 1000.0, "populacao": 5000, **overrides}
+
+
+class TestValidateBatch:
+    """Testes da validação numa só passagem."""
+
+    def test_erros_por_indice(self):
+        """Todos os erros são recolhidos, com a posição no payload"""
+        items = [province("A"), province("", area_km2=-1), "texto", province("B", populacao="muitos")]
+        result = validate_batch(ProvinceSchema(), items)
+
+        assert [index for index, _ in result.valid] == [0]
+        assert set(result.errors) == {1, 2, 3}
+        assert set(result.errors[1]) == {"nome", "area_km2"}
+        assert "_schema" in result.errors[2]
+        assert [error["index"] for error in result.error_list] == [1, 2, 3]
+
+    def test_chave_e_referencias(self):
+        """Atualizações exigem 'id' e os ids são verificados numa só consulta"""
+        lookups = []
+
+        def existing(ids):
+            lookups.append(set(ids))
+            return ids & {1, 2}
+
+        items = [{"id": 1, "nome": "Novo"}, {"nome": "Sem id"}, {"id": 99, "capital": "X"}, {"id": 2, "area_km2": 0}]
+        result = validate_batch(ProvinceSchema(), items, partial=True, key="id", references={"id": existing})
+
+        assert result.rows == [{"id": 1, "nome": "Novo"}]
+        assert "id" in result.errors[1]
+        assert "Registro não encontrado" in result.errors[2]["id"][0]
+        assert "area_km2" in result.errors[3]
+        # Linhas já inválidas não entram na consulta
+        assert lookups == [{1, 99}]
+
+    def test_erros_do_service_no_indice_do_payload(self):
+        """O índice dos erros do service é convertido na posição do payload"""
+        result = validate_batch(ProvinceSchema(), [{}, province("A"), province("B")])
+        assert result.payload_errors([{"index": 1, "error": "x"}, {"error": "geral"}]) == [
+            {"index": 2, "error": "x"},
+            {"error": "geral"},
+        ]
+
+
+class TestBulkTransactions:
+    """Testes dos savepoints das bulk operations no SQLite."""
+
+    @pytest.mark.parametrize("atomic", [True, False])
+    def test_rollback_externo_desfaz_lote(self, sqlite_backend, atomic):
+        """Os savepoints não confirmam nada: o rollback da transação externa desfaz o lote"""
+        session = base.SessionLocal()
+        result = ProvinceServiceDB.bulk_create(
+            [province("Fantasma A"), province("Fantasma B")], atomic=atomic, session=session
+        )
+        assert result["created"] == 2
+        session.rollback()
+
+        with sqlite3.connect(sqlite_backend.url.database) as connection:
+            rows = connection.execute("SELECT nome FROM provinces WHERE nome LIKE 'Fantasma%'").fetchall()
+        assert rows == []
+
+
+class TestBulkEndpoints:
+    """Testes de POST/PUT /provinces/bulk nos modos atomic e partial."""
+
+    def test_atomic_rejeita_lote(self, client, admin_headers, sqlite_backend):
+        """Um erro de validação rejeita o lote inteiro"""
+        before = ProvinceServiceDB.count()
+        payload = {"provinces": [province("Nova A"), province("Nova B", area_km2=0)]}
+        response = client.post("/provinces/bulk", json=payload, headers=admin_headers)
+        data = response.get_json()
+
+        assert response.status_code == 422
+        assert data["errors"] == [{"index": 1, "errors": {"area_km2": ["Área deve ser um valor positivo"]}}]
+        assert ProvinceServiceDB.count() == before
+
+    def test_atomic_desfaz_erro_do_banco(self, client, admin_headers, sqlite_backend):
+        """Um nome repetido desfaz todas as criações do lote"""
+        before = ProvinceServiceDB.count()
+        existing = ProvinceServiceDB.get_all()[0]["nome"]
+        payload = {"provinces": [province("Nova A"), province(existing)]}
+        response = client.post("/provinces/bulk", json=payload, headers=admin_headers)
+
+        assert response.status_code == 400
+        assert ProvinceServiceDB.count() == before
+
+    def test_partial_grava_validas(self, client, admin_headers, sqlite_backend):
+        """Linhas válidas são gravadas; as restantes vêm em 'errors' com o índice"""
+        before = ProvinceServiceDB.count()
+        existing = ProvinceServiceDB.get_all()[0]["nome"]
+        payload = {"provinces": [province("", capital=""), province("Nova A"), province(existing), province("Nova B")]}
+        response = client.post("/provinces/bulk?mode=partial", json=payload, headers=admin_headers)
+        data = response.get_json()
+
+        assert response.status_code == 201
+        assert data["created"] == 2
+        assert [error["index"] for error in data["errors"]] == [0, 2]
+        assert ProvinceServiceDB.count() == before + 2
+
+    def test_atualizacao_partial(self, client, admin_headers, sqlite_backend):
+        """Ids inexistentes e campos inválidos não impedem as restantes atualizações"""
+        target = ProvinceServiceDB.get_all()[0]
+        updates = [{"id": target["id"], "capital": "Nova Capital"}, {"id": 999999, "nome": "X"}, {"populacao": -1}]
+        response = client.put("/provinces/bulk?mode=partial", json={"updates": updates}, headers=admin_headers)
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["updated"] == 1
+        assert [error["index"] for error in data["errors"]] == [1, 2]
+        assert ProvinceServiceDB.get_by_id(target["id"])["capital"] == "Nova Capital"
+
+    def test_modo_invalido(self, client, admin_headers, sqlite_backend):
+        """Modo desconhecido retorna 400"""
+        response = client.post("/provinces/bulk?mode=tudo", json={"provinces": [province("A")]}, headers=admin_headers)
+        assert response.status_code == 400
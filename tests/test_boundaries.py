@@ -0,0 +1,185 @@
+"""
+Testes para a geocodificação reversa (GET /geo/locate).
+"""
+
+import random
+
+import pytest
+
+from src.routes import geo
+from src.utils.boundaries import (
+    Boundary,
+    BoundaryIndex,
+    STRTree,
+    read_boundaries,
+    ring_contains,
+    simplify_ring,
+    write_boundaries,
+)
+
+
+def square(lon_min, lat_min, size):
+    """Anel quadrado (fechado) com o canto inferior esquerdo em (lon_min, lat_min)."""
+    lon_max, lat_max = lon_min + size, lat_min + size
+    return [(lon_min, lat_min), (lon_max, lat_min), (lon_max, lat_max), (lon_min, lat_max), (lon_min, lat_min)]
+
+
+def grid_boundaries():
+    """Duas províncias lado a lado, cada uma dividida em quatro municípios; um deles com um buraco."""
+    boundaries = [
+        Boundary("province", 1, "Província A", 1, [[square(12.0, -10.0, 2.0)]]),
+        Boundary("province", 2, "Província B", 2, [[square(14.0, -10.0, 2.0)]]),
+    ]
+    municipality_id = 1
+    for province_id, lon_start in ((1, 12.0), (2, 14.0)):
+        for lon in (lon_start, lon_start + 1.0):
+            for lat in (-10.0, -9.0):
+                rings = [square(lon, lat, 1.0)]
+                if municipality_id == 1:
+                    rings.append(square(12.4, -9.6, 0.2))
+                boundaries.append(
+                    Boundary("municipality", municipality_id, f"Município {municipality_id}", province_id, [rings])
+                )
+                municipality_id += 1
+    return boundaries
+
+
+class TestGeometry:
+    """Testes das funções geométricas."""
+
+    def test_ponto_no_poligono(self):
+        """Pontos dentro, fora e num polígono côncavo"""
+        assert ring_contains(square(0, 0, 1), 0.5, 0.5)
+        assert not ring_contains(square(0, 0, 1), 1.5, 0.5)
+
+        # Forma em "U": o ponto no meio da abertura está fora
+        shape = [(0, 0), (3, 0), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)]
+        assert not ring_contains(shape, 1.5, 2)
+        assert ring_contains(shape, 0.5, 2)
+
+    def test_buraco(self):
+        """Pontos num buraco não pertencem ao limite"""
+        boundary = grid_boundaries()[2]
+        assert boundary.contains(12.2, -9.8)
+        assert not boundary.contains(12.5, -9.5)
+
+    def test_simplificacao(self):
+        """Pontos colineares são removidos e o anel continua fechado"""
+        ring = [(0, 0), (0.5, 0.0001), (1, 0), (1, 1), (0.5, 1.0001), (0, 1), (0, 0)]
+        simplified = simplify_ring(ring, 0.01)
+        assert simplified == [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
+        assert simplify_ring(ring, 0) == ring
+
+
+class TestSTRTree:
+    """Testes da R-tree estática."""
+
+    def test_igual_a_forca_bruta(self):
+        """Os candidatos coincidem com o teste de todas as caixas"""
+        rng = random.Random(7)
+        boxes = []
+        for i in range(500):
+            lon, lat = rng.uniform(11, 24), rng.uniform(-18, -4)
+            boxes.append(((lon, lat, lon + rng.uniform(0.1, 2), lat + rng.uniform(0.1, 2)), i))
+        tree = STRTree(boxes)
+
+        for _ in range(200):
+            x, y = rng.uniform(11, 26), rng.uniform(-18, -2)
+            expected = {i for (x1, y1, x2, y2), i in boxes if x1 <= x <= x2 and y1 <= y <= y2}
+            assert set(tree.query_point(x, y)) == expected
+
+    def test_arvore_vazia(self):
+        """Sem itens, nenhuma consulta encontra nada"""
+        assert list(STRTree([]).query_point(0, 0)) == []
+
+
+class TestBoundaryIndex:
+    """Testes do índice e do formato binário."""
+
+    @pytest.fixture
+    def index(self):
+        index = BoundaryIndex()
+        index.load(grid_boundaries())
+        return index
+
+    def test_localiza(self, index):
+        """Município e província pelo ponto"""
+        assert index.locate(-8.5, 14.5) == {
+            "provincia_id": 2,
+            "provincia_nome": "Província B",
+            "municipio_id": 6,
+            "municipio": "Município 6",
+        }
+
+    def test_buraco_cai_na_provincia(self, index):
+        """No buraco do município só a província é encontrada"""
+        location = index.locate(-9.5, 12.5)
+        assert location["provincia_id"] == 1
+        assert location["municipio_id"] is None
+
+    def test_fora_dos_limites(self, index):
+        """Fora de todos os polígonos não há resultado"""
+        assert index.locate(0, 0) is None
+
+    def test_arquivo_binario(self, tmp_path):
+        """Gravar e ler preserva nomes, ids e geometria (em float32)"""
+        path = tmp_path / "boundaries.bin"
+        original = grid_boundaries()
+        write_boundaries(original, path)
+        loaded = read_boundaries(path)
+
+        assert [(b.kind, b.id, b.nome, b.provincia_id) for b in loaded] == [
+            (b.kind, b.id, b.nome, b.provincia_id) for b in original
+        ]
+        assert loaded[2].polygons[0][1][0] == pytest.approx(original[2].polygons[0][1][0])
+
+        index = BoundaryIndex()
+        assert index.load_file(path)
+        assert index.get_stats() == {"province": 2, "municipality": 8}
+
+    def test_arquivo_invalido(self, tmp_path):
+        """Arquivo sem o cabeçalho esperado é rejeitado"""
+        path = tmp_path / "boundaries.bin"
+        path.write_bytes(b"nada")
+        with pytest.raises(ValueError):
+            read_boundaries(path)
+
+    def test_arquivo_inexistente(self, tmp_path):
+        """Sem arquivo o índice continua vazio"""
+        index = BoundaryIndex()
+        assert not index.load_file(tmp_path / "inexistente.bin")
+        assert not index.is_loaded
+
+
+class TestLocateEndpoint:
+    """Testes do endpoint GET /geo/locate."""
+
+    @pytest.fixture
+    def loaded_index(self, monkeypatch):
+        index = BoundaryIndex()
+        index.load(grid_boundaries())
+        monkeypatch.setattr(geo, "boundary_index", index)
+        return index
+
+    def test_localiza(self, client, loaded_index):
+        """Coordenada dentro de um município"""
+        response = client.get("/geo/locate?lat=-9.5&lon=13.5")
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["data"]["municipio_id"] == 3
+        assert data["data"]["provincia_nome"] == "Província A"
+
+    def test_fora_dos_limites(self, client, loaded_index):
+        """Coordenada fora de todos os limites retorna 404"""
+        assert client.get("/geo/locate?lat=10&lon=10").status_code == 404
+
+    def test_sem_limites(self, client, monkeypatch):
+        """Sem arquivo de limites carregado retorna 503"""
+        monkeypatch.setattr(geo, "boundary_index", BoundaryIndex())
+        assert client.get("/geo/locate?lat=-9.5&lon=13.5").status_code == 503
+
+    @pytest.mark.parametrize("query", ["lat=-8.8", "lat=abc&lon=13", "lat=-95&lon=13", "lat=1&lon=200"])
+    def test_parametros_invalidos(self, client, query):
+        """Coordenadas ausentes ou fora dos limites retornam 400"""
+        assert client.get(f"/geo/locate?{query}").status_code == 400
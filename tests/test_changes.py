@@ -0,0 +1,251 @@
+"""
+Testes para o feed de alterações (GET /changes).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.base import Base
+from src.database.change_log import track_changes
+from src.database.models import ChangeEvent
+from src.services.db.change_service_db import ChangeServiceDB
+from src.services.db.province_service_db import ProvinceServiceDB
+from src.services.service_factory import ServiceFactory
+from src.utils.change_feed import ChangeFeed
+from src.utils.signals import notify_change
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Registro de alterações com diário temporário e buffer pequeno."""
+    return ChangeFeed(journal_path=tmp_path / "changes.jsonl", capacity=3)
+
+
+class TestChangeFeed:
+    """Testes do registro de alterações do modo JSON."""
+
+    def test_sequencia_e_paginacao(self, feed):
+        """Alterações recebem sequências crescentes e são paginadas a partir de 'since'"""
+        feed.record("schools", "create", {"id": 1, "nome": "A"})
+        feed.record("schools", "update", {"id": 1, "nome": "B"})
+
+        entries, reset, latest = feed.changes_since(0, 1)
+        assert [e["seq"] for e in entries] == [1] and not reset and latest == 2
+
+        entries, _, _ = feed.changes_since(1, 10)
+        assert entries[0]["record"] == {"id": 1, "nome": "B"}
+
+    def test_remocao_e_tombstone(self, feed):
+        """Remoções guardam só o id"""
+        entry = feed.record("markets", "delete", {"id": 7, "nome": "Mercado"})
+        assert entry["id"] == 7 and entry["record"] is None
+
+    def test_reset_quando_alteracoes_sairam_do_buffer(self, feed):
+        """Cliente muito atrasado recebe reset"""
+        for i in range(5):
+            feed.record("schools", "update", {"id": i})
+
+        assert feed.changes_since(1, 10)[1] is True
+        entries, reset, _ = feed.changes_since(2, 10)
+        assert not reset and [e["seq"] for e in entries] == [3, 4, 5]
+
+    def test_diario_recupera_estado(self, feed, tmp_path):
+        """Um novo registro continua a sequência a partir do diário"""
+        for i in range(4):
+            feed.record("schools", "update", {"id": i})
+
+        reopened = ChangeFeed(journal_path=tmp_path / "changes.jsonl", capacity=3)
+        assert reopened.record("schools", "create", {"id": 9})["seq"] == 5
+        assert [e["seq"] for e in reopened.changes_since(2, 10)[0]] == [3, 4, 5]
+
+    def test_diario_compactado(self, feed, tmp_path):
+        """O diário não cresce além de duas vezes a capacidade"""
+        for i in range(20):
+            feed.record("schools", "update", {"id": i})
+
+        lines = (tmp_path / "changes.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) <= 6
+
+
+class TestChangesEndpoint:
+    """Testes do endpoint GET /changes (modo JSON)."""
+
+    def test_retorna_alteracoes_desde_since(self, client):
+        """Apenas as alterações posteriores a 'since' são retornadas"""
+        latest = client.get("/changes?since=0&limit=1").get_json()["latest"]
+
+        notify_change("provinces", "update", {"id": 1, "nome": "Luanda"})
+        notify_change("provinces", "delete", {"id": 99, "nome": "Removida"})
+
+        data = client.get(f"/changes?since={latest}").get_json()
+        assert data["success"] is True
+        assert [(c["operation"], c["id"]) for c in data["data"]] == [("update", 1), ("delete", 99)]
+        assert data["next_since"] == data["latest"] == latest + 2
+        assert data["has_more"] is False
+
+    def test_since_invalido(self, client):
+        """'since' negativo retorna 400"""
+        assert client.get("/changes?since=-1").status_code == 400
+
+
+class TestChangeLogDB:
+    """Testes da captura de alterações no modo database."""
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(autoflush=False, bind=engine)
+        track_changes(factory)
+        with factory() as session:
+            yield session
+
+    def test_mutacoes_registadas_na_transacao(self, session):
+        """Criação, atualização e remoção geram entradas em ordem"""
+        province = ProvinceServiceDB.create({"nome": "Bengo", "capital": "Caxito"}, session=session)
+        session.flush()
+        ProvinceServiceDB.update(province["id"], {"capital": "Caxito (nova)"}, session=session)
+        session.flush()
+        ProvinceServiceDB.delete(province["id"], session=session)
+        session.commit()
+
+        result = ChangeServiceDB.get_changes(0, session=session)
+        assert [(c["operation"], c["entity"], c["id"]) for c in result["data"]] == [
+            ("create", "provinces", province["id"]),
+            ("update", "provinces", province["id"]),
+            ("delete", "provinces", province["id"]),
+        ]
+        assert result["data"][1]["record"]["capital"] == "Caxito (nova)"
+        assert result["data"][2]["record"] is None
+        assert result["latest"] == 3 and not result["has_more"]
+
+    def test_rollback_descarta_alteracoes(self, session):
+        """Alterações desfeitas não aparecem no feed"""
+        ProvinceServiceDB.create({"nome": "Bengo", "capital": "Caxito"}, session=session)
+        session.flush()
+        session.rollback()
+
+        assert ChangeServiceDB.get_changes(0, session=session)["data"] == []
+
+    def test_notifica_apenas_apos_commit(self, session):
+        """change_recorded só é enviado depois do commit, já com a sequência"""
+        from src.utils.signals import change_recorded
+
+        received = []
+
+        def listener(entity, entry, **kwargs):
+            received.append(entry)
+
+        change_recorded.connect(listener)
+        try:
+            ProvinceServiceDB.create({"nome": "Bengo", "capital": "Caxito"}, session=session)
+            session.flush()
+            assert received == []
+
+            session.commit()
+            assert [(e["seq"], e["operation"]) for e in received] == [(1, "create")]
+        finally:
+            change_recorded.disconnect(listener)
+
+    @pytest.fixture
+    def received(self):
+        from src.utils.signals import change_recorded
+
+        entries = []
+
+        def listener(entity, entry, **kwargs):
+            entries.append(entry)
+
+        change_recorded.connect(listener)
+        yield entries
+        change_recorded.disconnect(listener)
+
+    def test_savepoint_desfeito_mantem_anteriores(self, session, received):
+        """Um savepoint desfeito descarta só as suas entradas; as restantes saem no commit"""
+        ProvinceServiceDB.create({"nome": "Bengo", "capital": "Caxito"}, session=session)
+        session.flush()
+        with session.begin_nested():
+            ProvinceServiceDB.create({"nome": "Cuanza Norte", "capital": "Ndalatando"}, session=session)
+        assert received == []
+
+        savepoint = session.begin_nested()
+        ProvinceServiceDB.create({"nome": "Fantasma", "capital": "Nenhuma"}, session=session)
+        session.flush()
+        savepoint.rollback()
+        assert received == []
+
+        session.commit()
+        assert [e["record"]["nome"] for e in received] == ["Bengo", "Cuanza Norte"]
+
+    def test_rollback_externo_nao_publica(self, session, received):
+        """Savepoints libertados não publicam; o rollback da transação externa descarta tudo"""
+        result = ProvinceServiceDB.bulk_create(
+            [{"nome": "Fantasma A", "capital": "X"}, {"nome": "Fantasma B", "capital": "Y"}], session=session
+        )
+        assert result["created"] == 2
+        with session.begin_nested():
+            ProvinceServiceDB.create({"nome": "Fantasma C", "capital": "Z"}, session=session)
+        session.rollback()
+        assert received == []
+
+        session.commit()
+        assert received == []
+
+    def test_since_zero_com_lacunas_na_sequencia(self, session):
+        """Sem remoções, since=0 devolve tudo mesmo que a sequência não comece em 1"""
+        session.add(ChangeEvent(seq=5, entity="provinces", entity_id=1, operation="create", record={"id": 1}))
+        session.commit()
+
+        result = ChangeServiceDB.get_changes(0, session=session)
+        assert result["reset"] is False
+        assert [c["seq"] for c in result["data"]] == [5]
+
+    def test_retencao_remove_antigas_e_marca_limite(self, session):
+        """A retenção remove as alterações antigas (nunca a última) e só força resync a quem ficou atrás"""
+        old = datetime.utcnow() - timedelta(days=40)
+        for seq, timestamp in ((1, old), (2, old), (3, datetime.utcnow())):
+            session.add(
+                ChangeEvent(seq=seq, entity="provinces", entity_id=seq, operation="create", record={}, timestamp=timestamp)
+            )
+        session.commit()
+
+        assert ChangeServiceDB.prune(retention_days=30, session=session) == 2
+        session.commit()
+
+        assert ChangeServiceDB.get_changes(0, session=session)["reset"] is True
+        assert ChangeServiceDB.get_changes(1, session=session)["reset"] is True
+        result = ChangeServiceDB.get_changes(2, session=session)
+        assert result["reset"] is False
+        assert [c["seq"] for c in result["data"]] == [3]
+        assert result["latest"] == 3
+
+        # Todas antigas: a última fica, para a sequência continuar
+        assert ChangeServiceDB.prune(retention_days=0, session=session) == 0
+        assert ChangeServiceDB.get_changes(2, session=session)["latest"] == 3
+
+    def test_erro_do_banco(self):
+        """Falha na leitura retorna um erro, não uma posição inventada"""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        with sessionmaker(bind=engine)() as session:
+            result = ChangeServiceDB.get_changes(7, session=session)
+        assert result["error"]
+        assert result["latest"] is None
+
+
+class TestChangesUnavailable:
+    """Testes de GET /changes com o feed indisponível."""
+
+    def test_retorna_503(self, client, monkeypatch):
+        """Erro do service vira 503"""
+
+        class BrokenChangeService:
+            @staticmethod
+            def get_changes(since, limit=100):
+                return {"data": [], "has_more": False, "latest": None, "reset": False, "error": "falha"}
+
+        monkeypatch.setattr(ServiceFactory, "get_change_service", staticmethod(lambda: BrokenChangeService))
+        assert client.get("/changes?since=3").status_code == 503
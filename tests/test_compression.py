@@ -0,0 +1,100 @@
+"""
+Testes para a compressão de respostas.
+"""
+
+import gzip
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from src.utils.cache import cache, cache_key_from_request, cached_route
+from src.utils.compression import init_compression
+
+
+class TestCompression:
+    """Testes para negociação de Accept-Encoding."""
+
+    def test_large_response_is_gzipped(self, client):
+        """Deve comprimir respostas grandes quando o cliente aceita gzip."""
+        response = client.get("/municipalities/all", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+        data = json.loads(gzip.decompress(response.data))
+        assert data["success"] is True
+        assert data["total"] > 0
+
+    def test_no_compression_without_accept_encoding(self, client):
+        """Não deve comprimir se o cliente não aceitar compressão."""
+        response = client.get("/municipalities/all", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["success"] is True
+
+    def test_small_response_not_compressed(self, client):
+        """Não deve comprimir respostas abaixo do limite mínimo."""
+        response = client.get("/provinces/1", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert "Content-Encoding" not in response.headers
+
+    def test_cached_route_serves_each_representation(self, client):
+        """Rotas cacheadas devem servir a representação correta por codificação."""
+        query = "/provinces/all?paginate=false"
+        compressed = client.get(query, headers={"Accept-Encoding": "gzip"})
+        compressed_again = client.get(query, headers={"Accept-Encoding": "gzip"})
+        plain = client.get(query, headers={"Accept-Encoding": "identity"})
+
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed_again.data == compressed.data
+        assert "Content-Encoding" not in plain.headers
+        assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+
+
+class TestCachedRoute:
+    """Testes do cached_route com um cache real (SimpleCache)."""
+
+    @pytest.fixture
+    def cached_app(self):
+        app = Flask(__name__)
+        app.config.update(CACHE_TYPE="SimpleCache", COMPRESSION_MIN_SIZE=100)
+        cache.init_app(app)
+        init_compression(app)
+        app.calls = 0
+
+        @app.route("/lista")
+        @cached_route(timeout=60)
+        def lista():
+            app.calls += 1
+            return jsonify({"data": [{"id": i, "nome": f"Item {i}"} for i in range(50)]})
+
+        return app
+
+    def _entry(self, app, encoding):
+        with app.test_request_context("/lista"):
+            return cache.get(f"{cache_key_from_request()}|{encoding}")
+
+    def test_guarda_e_serve_cada_codificacao(self, cached_app):
+        """Cada codificação é comprimida uma vez, guardada à parte e servida do cache."""
+        client = cached_app.test_client()
+        compressed = client.get("/lista", headers={"Accept-Encoding": "gzip"})
+        compressed_again = client.get("/lista", headers={"Accept-Encoding": "gzip"})
+
+        assert cached_app.calls == 1
+        assert compressed_again.headers["Content-Encoding"] == "gzip"
+        assert compressed_again.data == compressed.data
+        assert self._entry(cached_app, "gzip")["body"] == compressed.data
+        assert self._entry(cached_app, "identity") is None
+
+        plain = client.get("/lista", headers={"Accept-Encoding": "identity"})
+        plain_again = client.get("/lista", headers={"Accept-Encoding": "identity"})
+
+        assert cached_app.calls == 2
+        assert "Content-Encoding" not in plain_again.headers
+        assert "Accept-Encoding" in plain_again.headers["Vary"]
+        assert self._entry(cached_app, "identity")["body"] == plain.data
+        assert json.loads(gzip.decompress(compressed_again.data)) == plain_again.get_json()
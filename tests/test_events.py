@@ -0,0 +1,152 @@
+"""
+Testes para o canal de notificações em tempo real (GET /events).
+"""
+
+import json
+
+import pytest
+
+from src.services.change_service import ChangeService
+from src.utils.change_feed import change_feed
+from src.utils.events import EventBroadcaster, Subscription, broadcaster, to_notification
+from src.utils.signals import notify_change
+
+
+def read_events(iterator, count):
+    """Lê os próximos 'count' blocos SSE do stream."""
+    return [next(iterator) for _ in range(count)]
+
+
+def parse(chunk):
+    """Converte um bloco SSE em dict (id, event, data)."""
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+@pytest.fixture
+def open_stream(client, monkeypatch):
+    """Abre ligações SSE sem buffer e fecha-as no fim do teste."""
+    monkeypatch.setenv("SSE_HEARTBEAT_SECONDS", "0.05")
+    responses = []
+
+    def _open(url="/events", headers=None):
+        response = client.get(url, headers=headers or {}, buffered=False)
+        responses.append(response)
+        iterator = (chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk for chunk in response.response)
+        return response, iterator
+
+    yield _open
+
+    for response in responses:
+        response.close()
+
+
+class TestSubscription:
+    """Testes do buffer por cliente."""
+
+    def test_buffer_limitado(self):
+        """Buffer cheio marca o cliente como atrasado sem bloquear quem publica"""
+        subscription = Subscription(buffer_size=2)
+        for version in range(1, 5):
+            subscription.offer({"entity": "schools", "id": 1, "op": "update", "version": version})
+
+        assert subscription.overflowed is True
+        assert subscription.queue.qsize() == 2
+
+    def test_filtra_entidades(self):
+        """Só as entidades pedidas são entregues"""
+        subscription = Subscription(entities=["hospitals"])
+        subscription.offer({"entity": "schools", "id": 1, "op": "update", "version": 1})
+        assert subscription.get(timeout=0) is None
+
+    def test_difusao_local(self):
+        """Sem Redis, a publicação chega aos clientes do processo"""
+        local = EventBroadcaster()
+        subscription = local.subscribe()
+        local.publish({"entity": "markets", "id": 3, "op": "delete", "version": 10})
+
+        assert subscription.get(timeout=0)["version"] == 10
+        local.unsubscribe(subscription)
+        assert local.client_count == 0
+
+
+class TestEventsEndpoint:
+    """Testes do endpoint SSE."""
+
+    def test_notifica_alteracoes(self, open_stream):
+        """Cada escrita gera um evento com id = versão no feed"""
+        response, events = open_stream()
+        assert response.mimetype == "text/event-stream"
+        assert next(events).startswith("retry:")
+
+        notify_change("schools", "update", {"id": 1, "nome": "Escola"})
+
+        event = parse(next(events))
+        assert event["event"] == "change"
+        assert event["data"]["entity"] == "schools" and event["data"]["op"] == "update"
+        assert int(event["id"]) == event["data"]["version"]
+
+    def test_heartbeat(self, open_stream):
+        """Sem alterações, o stream envia heartbeats"""
+        _, events = open_stream()
+        assert read_events(events, 2)[1] == ": heartbeat\n\n"
+
+    def test_retoma_com_last_event_id(self, client, open_stream):
+        """Notificações perdidas desde Last-Event-ID são reenviadas"""
+        latest = client.get("/changes?limit=1").get_json()["latest"]
+        notify_change("markets", "create", {"id": 50, "nome": "Mercado A"})
+        notify_change("markets", "delete", {"id": 50, "nome": "Mercado A"})
+
+        _, events = open_stream(headers={"Last-Event-ID": str(latest)})
+        replayed = [parse(chunk) for chunk in read_events(events, 3)[1:]]
+
+        assert [(e["data"]["op"], int(e["id"])) for e in replayed] == [("create", latest + 1), ("delete", latest + 2)]
+
+    def test_desligar_remove_cliente(self, open_stream):
+        """Fechar a ligação liberta a assinatura"""
+        before = broadcaster.client_count
+        response, events = open_stream()
+        next(events)
+        assert broadcaster.client_count == before + 1
+
+        response.close()
+        assert broadcaster.client_count == before
+
+    def test_publicacao_fora_de_ordem(self, open_stream):
+        """Uma versão publicada antes da anterior não faz perder a anterior"""
+        _, events = open_stream()
+        assert read_events(events, 2)[1] == ": heartbeat\n\n"
+
+        # Dois escritores: a 6 é publicada antes da 5 (ambas já no feed)
+        fifth = change_feed.record("schools", "update", {"id": 5, "nome": "Escola 5"})
+        sixth = change_feed.record("schools", "update", {"id": 6, "nome": "Escola 6"})
+        broadcaster.publish(to_notification(sixth))
+        broadcaster.publish(to_notification(fifth))
+
+        received = [parse(chunk) for chunk in read_events(events, 3) if not chunk.startswith(":")]
+        assert [int(event["id"]) for event in received][:2] == [fifth["seq"], sixth["seq"]]
+
+    def test_outras_entidades_nao_releem_o_feed(self, open_stream, monkeypatch):
+        """Com filtro de tipos, as versões das outras entidades só avançam a posição"""
+        calls = []
+        get_changes = ChangeService.get_changes
+        monkeypatch.setattr(
+            ChangeService, "get_changes", lambda *args, **kwargs: calls.append(1) or get_changes(*args, **kwargs)
+        )
+
+        _, events = open_stream("/events?types=hospitals")
+        assert read_events(events, 2)[1] == ": heartbeat\n\n"
+        replays = len(calls)
+
+        notify_change("markets", "update", {"id": 1, "nome": "Mercado"})
+        notify_change("hospitals", "update", {"id": 2, "nome": "Hospital"})
+
+        event = parse(next(events))
+        assert event["data"]["entity"] == "hospitals"
+        assert len(calls) == replays
+
+    def test_tipos_invalidos(self, client):
+        """Tipo desconhecido retorna 400"""
+        assert client.get("/events?types=planetas").status_code == 400
@@ -0,0 +1,130 @@
+"""
+Testes para a exportação colunar (GET /<entidade>/export).
+"""
+
+import io
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.base import Base
+from src.database.change_log import track_changes
+from src.database.models import Province, School
+from src.services.db.export_service_db import ExportServiceDB
+from src.services.export_service import ExportService
+from src.utils import columnar
+from src.utils.search_index import load_entity
+from src.utils.signals import notify_change
+
+
+class TestExportService:
+    """Testes da leitura em lotes."""
+
+    def test_lotes_json(self):
+        """Os lotes cobrem todos os registros, pela ordem"""
+        batches = list(ExportService.iter_batches("municipalities", batch_size=100))
+        assert [len(batch) for batch in batches[:-1]] == [100] * (len(batches) - 1)
+        assert sum(len(batch) for batch in batches) == len(load_entity("municipalities"))
+
+    def test_versao_muda_com_escrita(self):
+        """Uma escrita muda a versão da entidade"""
+        before = ExportService.get_version("schools")
+        notify_change("schools", "update", {"id": 1})
+        assert ExportService.get_version("schools") > before
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(autoflush=False, bind=engine)
+        track_changes(factory)
+        with factory() as session:
+            yield session
+
+    def test_lotes_database(self, session):
+        """Linhas lidas do cursor em lotes, com o nome da província"""
+        session.add(Province(id=1, nome="Luanda"))
+        session.add_all([School(id=i, nome=f"Escola {i}", provincia_id=1, tipo="Pública") for i in range(1, 6)])
+        session.commit()
+
+        batches = list(ExportServiceDB.iter_batches("schools", batch_size=2, session=session))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0][0]["provincia_nome"] == "Luanda"
+        assert [row["id"] for batch in batches for row in batch] == [1, 2, 3, 4, 5]
+        assert ExportServiceDB.get_version("schools", session=session) == 6
+
+
+class TestColumnarExport:
+    """Testes dos arquivos colunares."""
+
+    @pytest.fixture(autouse=True)
+    def require_pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    def test_parquet_com_tipos(self, client):
+        """Parquet com inteiros, floats e colunas categóricas"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        response = client.get("/provinces/export?format=parquet")
+        assert response.status_code == 200
+        assert response.mimetype == "application/vnd.apache.parquet"
+        assert 'filename="provinces.parquet"' in response.headers["Content-Disposition"]
+
+        table = pq.read_table(io.BytesIO(response.data))
+        assert table.num_rows == len(load_entity("provinces"))
+        assert table.schema.field("id").type == pa.int32()
+        assert table.schema.field("area_km2").type == pa.float64()
+        assert table.schema.field("populacao").type == pa.int64()
+
+        schools = pq.read_table(io.BytesIO(client.get("/schools/export").data))
+        assert pa.types.is_dictionary(schools.schema.field("tipo").type)
+        assert pa.types.is_dictionary(schools.schema.field("provincia_nome").type)
+        # Campo inexistente nos dados JSON: coluna nula, esquema estável
+        assert schools.column("nivel").null_count == schools.num_rows
+
+    def test_arrow_varios_lotes(self):
+        """Stream Arrow com dicionários diferentes por lote"""
+        import pyarrow as pa
+
+        rows = [{"id": i, "nome": f"M{i}", "provincia_nome": f"P{i % 4}"} for i in range(10)]
+        data = columnar.write_export("municipalities", "arrow", (rows[i : i + 3] for i in range(0, 10, 3)))
+
+        table = pa.ipc.open_stream(data).read_all()
+        assert table.num_rows == 10
+        assert table.column("provincia_nome").to_pylist() == [row["provincia_nome"] for row in rows]
+
+    def test_cache_por_versao(self, client):
+        """O arquivo é reutilizado até a entidade mudar"""
+        first = client.get("/markets/export?format=arrow")
+        builds = columnar.EXPORT_BUILDS.get(entity="markets", format="arrow")
+
+        assert client.get("/markets/export?format=arrow").data == first.data
+        assert columnar.EXPORT_BUILDS.get(entity="markets", format="arrow") == builds
+
+        notify_change("markets", "update", {"id": 1})
+        client.get("/markets/export?format=arrow")
+        assert columnar.EXPORT_BUILDS.get(entity="markets", format="arrow") == builds + 1
+
+    def test_not_modified(self, client):
+        """If-None-Match com o ETag atual retorna 304"""
+        etag = client.get("/hospitals/export").headers["ETag"]
+        response = client.get("/hospitals/export", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+
+class TestExportErrors:
+    """Testes das respostas de erro."""
+
+    def test_formato_invalido(self, client):
+        """Formato desconhecido retorna 400"""
+        response = client.get("/schools/export?format=csv")
+        assert response.status_code == 400
+
+    def test_sem_pyarrow(self, client, monkeypatch):
+        """Sem pyarrow instalado retorna 501"""
+        monkeypatch.setattr(columnar, "pa", None)
+        response = client.get("/schools/export")
+        assert response.status_code == 501
@@ -0,0 +1,178 @@
+"""
+Testes para as consultas geográficas (GET /<instalação>/nearby).
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.base import Base
+from src.database.models import Hospital, Province
+from src.models.hospital import HOSPITALS
+from src.schemas import HospitalSchema
+from src.services.db.hospital_service_db import HospitalServiceDB
+from src.services.hospital_service import HospitalService
+from src.utils.geo import GeoIndex, bounding_box, haversine_km
+from src.utils.signals import notify_change
+
+# Pontos aleatórios (determinísticos) sobre Angola
+_rng = random.Random(42)
+POINTS = [
+    {"id": i, "nome": f"Hospital {i}", "latitude": _rng.uniform(-18, -4.5), "longitude": _rng.uniform(11.7, 24)}
+    for i in range(1, 501)
+]
+QUERIES = [(-8.8383, 13.2344), (-12.5763, 13.4055), (-14.9, 17.9), (-4.0, 30.0)]
+
+
+def brute_force(lat, lon, radius_km=None, limit=10, points=POINTS):
+    """Resposta de referência: distância a todos os pontos."""
+    hits = sorted((haversine_km(lat, lon, p["latitude"], p["longitude"]), p["id"]) for p in points)
+    if radius_km is not None:
+        hits = [hit for hit in hits if hit[0] <= radius_km]
+    return [record_id for _, record_id in hits[:limit]]
+
+
+class TestGeoFunctions:
+    """Testes das funções de distância."""
+
+    def test_haversine(self):
+        """Distância conhecida: 1 grau de latitude ≈ 111.2 km"""
+        assert haversine_km(0, 0, 1, 0) == pytest.approx(111.19, abs=0.01)
+        assert haversine_km(-8.8, 13.2, -8.8, 13.2) == 0
+
+    def test_caixa_contem_circulo(self):
+        """Todos os pontos dentro do raio estão dentro da caixa"""
+        lat_min, lat_max, lon_min, lon_max = bounding_box(-8.8, 13.2, 150)
+        for p in POINTS:
+            if haversine_km(-8.8, 13.2, p["latitude"], p["longitude"]) <= 150:
+                assert lat_min <= p["latitude"] <= lat_max and lon_min <= p["longitude"] <= lon_max
+
+
+class TestGeoIndex:
+    """Testes do índice em grelha."""
+
+    @pytest.fixture
+    def index(self):
+        return GeoIndex(loader=lambda entity: POINTS)
+
+    @pytest.mark.parametrize("lat,lon", QUERIES)
+    def test_raio_igual_a_forca_bruta(self, index, lat, lon):
+        """Resultados dentro do raio coincidem com o cálculo exaustivo"""
+        results = index.nearby("hospitals", lat, lon, radius_km=200, limit=100)
+        assert [r["id"] for r in results] == brute_force(lat, lon, radius_km=200, limit=100)
+        assert all(r["distancia_km"] <= 200 for r in results)
+
+    @pytest.mark.parametrize("lat,lon", QUERIES)
+    def test_k_mais_proximos(self, index, lat, lon):
+        """Sem raio, retorna os k mais próximos (também longe de todos os pontos)"""
+        for limit in (1, 7, 50):
+            results = index.nearby("hospitals", lat, lon, limit=limit)
+            assert [r["id"] for r in results] == brute_force(lat, lon, limit=limit)
+
+    def test_mantido_nas_escritas(self, index):
+        """Criações, mudanças de posição e remoções refletem-se no índice"""
+        index.nearby("hospitals", 0, 0)
+        index.update("hospitals", "create", {"id": 999, "nome": "Novo", "latitude": -8.8383, "longitude": 13.2344})
+        assert index.nearby("hospitals", -8.8383, 13.2344, limit=1)[0]["id"] == 999
+
+        index.update("hospitals", "update", {"id": 999, "nome": "Novo", "latitude": -16.0, "longitude": 20.0})
+        assert index.nearby("hospitals", -8.8383, 13.2344, limit=1)[0]["id"] != 999
+        assert index.nearby("hospitals", -16.0, 20.0, limit=1)[0]["id"] == 999
+
+        index.update("hospitals", "delete", {"id": 999})
+        assert all(r["id"] != 999 for r in index.nearby("hospitals", -16.0, 20.0, limit=5))
+
+    def test_registros_sem_coordenadas(self):
+        """Registros sem latitude/longitude não entram no índice"""
+        index = GeoIndex(loader=lambda entity: [{"id": 1, "nome": "Sem coordenadas"}])
+        assert index.nearby("hospitals", -8.8, 13.2) == []
+
+
+class TestGeoDatabase:
+    """Testes da consulta por caixa envolvente no modo database."""
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add(Province(id=1, nome="Luanda"))
+            session.add_all(
+                Hospital(id=p["id"], nome=p["nome"], provincia_id=1, latitude=p["latitude"], longitude=p["longitude"])
+                for p in POINTS
+            )
+            session.add(Hospital(id=1000, nome="Sem coordenadas", provincia_id=1))
+            session.commit()
+            yield session
+
+    @pytest.mark.parametrize("lat,lon", QUERIES)
+    def test_igual_a_forca_bruta(self, session, lat, lon):
+        """Raio e k mais próximos coincidem com o cálculo exaustivo"""
+        within = HospitalServiceDB.get_nearby(lat, lon, radius_km=200, limit=100, session=session)
+        assert [r["id"] for r in within] == brute_force(lat, lon, radius_km=200, limit=100)
+
+        nearest = HospitalServiceDB.get_nearby(lat, lon, limit=7, session=session)
+        assert [r["id"] for r in nearest] == brute_force(lat, lon, limit=7)
+        assert nearest[0]["distancia_km"] <= nearest[-1]["distancia_km"]
+
+
+class TestNearbyEndpoint:
+    """Testes do endpoint GET /hospitals/nearby."""
+
+    @pytest.fixture
+    def located_hospital(self):
+        """Hospital com coordenadas (apenas em memória)."""
+        record = {
+            "id": 9001,
+            "nome": "Hospital Teste",
+            "provincia_id": 1,
+            "municipio_id": 1,
+            "latitude": -8.8383,
+            "longitude": 13.2344,
+        }
+        HOSPITALS.append(record)
+        notify_change("hospitals", "create", record)
+        yield record
+        HOSPITALS.remove(record)
+        notify_change("hospitals", "delete", record)
+
+    def test_mais_proximo(self, client, located_hospital):
+        """O hospital com coordenadas é encontrado, com a distância"""
+        response = client.get("/hospitals/nearby?lat=-8.84&lon=13.23&radius_km=5")
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["data"][0]["id"] == located_hospital["id"]
+        assert data["data"][0]["distancia_km"] < 1
+
+    def test_fora_do_raio(self, client, located_hospital):
+        """Nada dentro de um raio pequeno longe do hospital"""
+        response = client.get("/hospitals/nearby?lat=-14.9&lon=17.9&radius_km=10")
+        assert response.get_json()["total"] == 0
+
+    def test_atualizacao_recusada_nao_altera_registro(self, located_hospital):
+        """Um município inválido recusa a atualização sem mexer no registro nem no índice"""
+        before = dict(located_hospital)
+        result = HospitalService.update(
+            located_hospital["id"], {"nome": "Movido", "latitude": -14.9, "longitude": 17.9, "municipio_id": 999999}
+        )
+
+        assert result is None
+        assert HospitalService.get_by_id(located_hospital["id"]) == before
+        assert [h["id"] for h in HospitalService.get_nearby(-8.84, 13.23, radius_km=5)] == [located_hospital["id"]]
+        assert HospitalService.get_nearby(-14.9, 17.9, radius_km=10) == []
+
+    @pytest.mark.parametrize(
+        "query", ["lat=-8.8", "lat=abc&lon=13", "lat=-95&lon=13", "lat=-8.8&lon=13&radius_km=0", "lat=1&lon=1&radius_km=5000"]
+    )
+    def test_parametros_invalidos(self, client, query):
+        """Coordenadas ausentes ou fora dos limites retornam 400"""
+        assert client.get(f"/hospitals/nearby?{query}").status_code == 400
+
+    def test_schema_exige_par_de_coordenadas(self):
+        """Latitude sem longitude é rejeitada"""
+        errors = HospitalSchema().validate({"latitude": -8.8}, partial=True)
+        assert "latitude" in errors
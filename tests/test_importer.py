@@ -0,0 +1,139 @@
+"""
+Testes para o importador JSON → banco de dados.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.database.base import Base
+from src.database.importer import import_all, iter_json_array
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Diretório com arquivos JSON mínimos."""
+    files = {
+        "provinces": [{"id": 1, "nome": "Luanda", "capital": "Luanda"}, {"id": 2, "nome": "Bengo", "capital": "Caxito"}],
+        "municipalities": [{"id": 9, "nome": "Maianga", "provincia_id": 1, "provincia_nome": "Luanda"}],
+        "schools": [{"id": 1, "nome": "Escola [A]", "provincia_id": 1, "municipio_id": 9, "municipio": "Maianga"}],
+        "users": [
+            {
+                "id": 1,
+                "username": "Admin",
+                "email": "admin@angodata.ao",
+                "password_hash": "x",
+                "role": "admin",
+                "created_at": "2025-11-21T19:19:57.147253",
+            }
+        ],
+    }
+    for name, records in files.items():
+        (tmp_path / f"{name}.json").write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite com o schema criado."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestIterJsonArray:
+    """Testes da leitura em streaming."""
+
+    def test_le_elementos_em_blocos_pequenos(self, tmp_path):
+        """Elementos que atravessam vários blocos são lidos inteiros"""
+        records = [{"id": i, "nome": f"Nome, {i} ]}}", "tags": [1, {"a": "["}]} for i in range(50)]
+        path = tmp_path / "items.json"
+        path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+        assert list(iter_json_array(path, chunk_size=7)) == records
+
+    def test_array_vazio(self, tmp_path):
+        """Array vazio não produz elementos"""
+        path = tmp_path / "empty.json"
+        path.write_text("  [ ]\n", encoding="utf-8")
+        assert list(iter_json_array(path)) == []
+
+    def test_rejeita_arquivo_truncado(self, tmp_path):
+        """Arquivo truncado é um erro"""
+        path = tmp_path / "broken.json"
+        path.write_text('[{"id": 1}, {"id": 2', encoding="utf-8")
+        with pytest.raises(ValueError):
+            list(iter_json_array(path, chunk_size=4))
+
+
+class TestImportAll:
+    """Testes da importação."""
+
+    def test_importa_na_ordem_das_chaves(self, engine, data_dir):
+        """Todas as tabelas são importadas e os campos extra ignorados"""
+        results = {result.table: result.rows for result in import_all(engine, data_dir, batch_size=1)}
+
+        assert results == {"provinces": 2, "users": 1, "municipalities": 1, "schools": 1}
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT municipio_id FROM schools WHERE id = 1")).scalar() == 9
+
+    def test_reimportar_e_idempotente(self, engine, data_dir):
+        """Reimportar atualiza pelo id sem duplicar"""
+        import_all(engine, data_dir)
+
+        provinces = json.loads((data_dir / "provinces.json").read_text(encoding="utf-8"))
+        provinces[1]["capital"] = "Caxito (nova)"
+        (data_dir / "provinces.json").write_text(json.dumps(provinces), encoding="utf-8")
+        import_all(engine, data_dir)
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM provinces")).scalar() == 2
+            assert connection.execute(text("SELECT capital FROM provinces WHERE id = 2")).scalar() == "Caxito (nova)"
+            assert connection.execute(text("SELECT COUNT(*) FROM users")).scalar() == 1
+
+    def test_filtra_tabelas(self, engine, data_dir):
+        """Apenas as tabelas pedidas são importadas"""
+        results = import_all(engine, data_dir, tables=["provinces"])
+        assert [result.table for result in results] == ["provinces"]
+
+    def test_reset_no_feed_de_alteracoes(self, engine, data_dir):
+        """Cada tabela do feed importada regista um reset; users não entra no feed"""
+        import_all(engine, data_dir)
+
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT entity, entity_id, operation FROM change_events ORDER BY seq")).all()
+        assert sorted(rows) == [(name, 0, "reset") for name in ("municipalities", "provinces", "schools")]
+
+
+class TestImportVersions:
+    """Testes das versões derivadas do feed depois de uma importação (modo database)."""
+
+    def test_importacao_avanca_versoes(self, client, sqlite_backend, tmp_path):
+        """/changes, /export e /snapshot acompanham uma importação"""
+        pytest.importorskip("pyarrow")
+        from src.database.importer import import_table
+        from src.database.models import School
+        from src.services.db.export_service_db import ExportServiceDB
+        from src.services.db.school_service_db import SchoolServiceDB
+        from src.utils.snapshot import snapshot_store
+
+        school = SchoolServiceDB.get_all()[0]
+        latest = client.get("/changes?limit=1").get_json()["latest"]
+        export_version = ExportServiceDB.get_version("schools")
+        etag = client.get("/schools/export?format=arrow").headers["ETag"]
+        snapshot = snapshot_store.build()
+
+        path = tmp_path / "schools.json"
+        path.write_text(json.dumps([{**school, "nome": "Escola Importada"}]), encoding="utf-8")
+        import_table(sqlite_backend, "schools", School, path)
+
+        changes = client.get(f"/changes?since={latest}").get_json()["data"]
+        assert [(c["entity"], c["id"], c["operation"], c["record"]) for c in changes] == [("schools", 0, "reset", None)]
+        assert ExportServiceDB.get_version("schools") > export_version
+        assert client.get("/schools/export?format=arrow").headers["ETag"] != etag
+
+        rebuilt = snapshot_store.build()
+        assert rebuilt.version > snapshot.version
+        assert client.get("/snapshot").headers["Location"].endswith(rebuilt.content_hash)
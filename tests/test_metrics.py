@@ -0,0 +1,90 @@
+"""
+Testes para as métricas e a instrumentação do pool de conexões.
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from src.database import pool
+from src.database.pool import CHECKOUT_WAIT, CHECKOUTS, IN_USE, InstrumentedQueuePool, instrument_engine
+from src.utils.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Testes para o formato de exposição."""
+
+    def test_render_prometheus_text(self):
+        """Deve gerar HELP/TYPE e séries com labels."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Total de requests").inc(role="a")
+        registry.histogram("latency_seconds", "Latência", buckets=(0.1, 1)).observe(0.5)
+
+        output = registry.render()
+
+        assert "# TYPE requests_total counter" in output
+        assert 'requests_total{role="a"} 1' in output
+        assert 'latency_seconds_bucket{le="0.1"} 0' in output
+        assert 'latency_seconds_bucket{le="1"} 1' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 1' in output
+        assert "latency_seconds_count 1" in output
+
+
+class TestPoolInstrumentation:
+    """Testes para as métricas do pool."""
+
+    def test_checkout_metrics(self, tmp_path):
+        """Deve contar checkouts, conexões em uso e tempo de espera."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0
+        )
+        instrument_engine(engine, role="test")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert IN_USE.get(role="test") == 1
+
+        assert IN_USE.get(role="test") == 0
+        assert CHECKOUTS.get(role="test") == 1
+        assert CHECKOUT_WAIT.get_count(role="test") == 1
+        engine.dispose()
+
+    def _timeouts_engine(self, tmp_path, monkeypatch, poolclass):
+        # Engine SQLite que se apresenta como PostgreSQL; os SET são registrados em vez de executados
+        calls = []
+        monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+        monkeypatch.setenv("DB_LOCK_TIMEOUT_MS", "1000")
+        monkeypatch.setattr(pool, "_apply_session_timeouts", lambda conn, statements: calls.append(("connect", statements)))
+        monkeypatch.setattr(pool, "_apply_transaction_timeouts", lambda conn, statements: calls.append(("begin", statements)))
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=poolclass)
+        monkeypatch.setattr(engine.dialect, "name", "postgresql")
+        instrument_engine(engine, role="timeouts")
+        return engine, calls
+
+    def test_timeouts_por_transacao_sem_pool(self, tmp_path, monkeypatch):
+        """Com NullPool (PgBouncer) os timeouts são SET LOCAL em cada transação."""
+        engine, calls = self._timeouts_engine(tmp_path, monkeypatch, NullPool)
+        for _ in range(2):
+            with engine.begin() as connection:
+                connection.execute(text("SELECT 1"))
+
+        statements = ["SET LOCAL statement_timeout = 5000", "SET LOCAL lock_timeout = 1000"]
+        assert calls == [("begin", statements), ("begin", statements)]
+        engine.dispose()
+
+    def test_timeouts_por_sessao_com_pool(self, tmp_path, monkeypatch):
+        """Com o pool local os timeouts são SET de sessão, uma vez por conexão."""
+        engine, calls = self._timeouts_engine(tmp_path, monkeypatch, InstrumentedQueuePool)
+        for _ in range(2):
+            with engine.begin() as connection:
+                connection.execute(text("SELECT 1"))
+
+        assert calls == [("connect", ["SET statement_timeout = 5000", "SET lock_timeout = 1000"])]
+        engine.dispose()
+
+    def test_metrics_endpoint(self, client):
+        """Deve expor as métricas em texto do Prometheus."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert "db_pool_checkout_wait_seconds" in response.get_data(as_text=True)
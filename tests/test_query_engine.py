@@ -0,0 +1,72 @@
+"""
+Testes para o motor de consulta do modo JSON.
+"""
+
+from src.utils.query_engine import QueryEngine
+
+RECORDS = [
+    {"id": 1, "nome": "Huíla", "capital": "Lubango", "populacao": 2497422, "area_km2": None},
+    {"id": 2, "nome": "Bengo", "capital": "Caxito", "populacao": 356641, "area_km2": 31371},
+    {"id": 3, "nome": "Benguela", "capital": "Benguela", "populacao": 2231385, "area_km2": 39826},
+]
+
+
+class TestQueryEngine:
+    """Testes para filtros, intervalos, busca e ordenação em memória."""
+
+    def setup_method(self):
+        self.engine = QueryEngine(loader=lambda entity: RECORDS)
+
+    def test_sorting_with_nulls_last(self):
+        """Deve ordenar pelo campo pedido com valores nulos no fim (asc) ou início (desc)."""
+        ascending = self.engine.query("provinces", sort_by="area_km2")
+        descending = self.engine.query("provinces", sort_by="area_km2", order="desc")
+
+        assert [r["id"] for r in ascending] == [2, 3, 1]
+        assert [r["id"] for r in descending] == [1, 3, 2]
+
+    def test_filters_and_ranges(self):
+        """Deve combinar igualdade e intervalos inclusivos, ignorando campos desconhecidos."""
+        results = self.engine.query(
+            "provinces",
+            filters={"capital": "Benguela", "inexistente": 1},
+            ranges={"populacao": (2231385, None)},
+        )
+
+        assert [r["id"] for r in results] == [3]
+
+    def test_search_ignores_accents(self):
+        """Deve buscar por trecho sem acentos em qualquer dos campos."""
+        results = self.engine.query("provinces", search="HUILA", search_fields=["nome", "capital"])
+        partial = self.engine.query("provinces", search="ngo", search_fields=["nome", "capital"], sort_by="nome")
+
+        assert [r["id"] for r in results] == [1]
+        assert [r["id"] for r in partial] == [2, 1]
+
+    def test_sorting_ignores_accents_and_case(self):
+        """Deve ordenar texto sem acentos nem maiúsculas, com o valor original como desempate."""
+        records = [
+            {"id": 1, "nome": "Zaire"},
+            {"id": 2, "nome": "Úcua"},
+            {"id": 3, "nome": "caxito"},
+            {"id": 4, "nome": "Ucua"},
+            {"id": 5, "nome": "Caxito"},
+        ]
+        engine = QueryEngine(loader=lambda entity: records)
+
+        assert [r["id"] for r in engine.query("provinces", sort_by="nome")] == [5, 3, 4, 2, 1]
+
+
+class TestProvincePaginationJSON:
+    """Testes para /provinces/all no modo JSON."""
+
+    def test_sort_and_search(self, client):
+        """Deve respeitar sort_by, order e search sem banco de dados."""
+        response = client.get("/provinces/all?sort_by=populacao&order=desc&search=an&per_page=100")
+
+        assert response.status_code == 200
+        data = response.get_json()["data"]
+        assert data
+        assert all("an" in (p["nome"] + p["capital"]).lower() for p in data)
+        populations = [p["populacao"] for p in data]
+        assert populations == sorted(populations, reverse=True)
@@ -0,0 +1,148 @@
+"""
+Testes de regressão dos planos de consulta (EXPLAIN) das consultas dos serviços.
+
+Executa cada consulta de serviço contra tabelas sintéticas grandes num SQLite
+local e falha se o plano recorrer a uma leitura sequencial da tabela ou a uma
+ordenação temporária em vez dos índices.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from src.database.base import Base
+from src.database.models import Hospital, Market, Municipality, Province, School
+from src.services.db.hospital_service_db import HospitalServiceDB
+from src.services.db.market_service_db import MarketServiceDB
+from src.services.db.municipality_service_db import MunicipalityServiceDB
+from src.services.db.province_service_db import ProvinceServiceDB
+from src.services.db.school_service_db import SchoolServiceDB
+
+PROVINCES = 20
+MUNICIPALITIES_PER_PROVINCE = 50
+FACILITIES = 20000
+
+TABLES = ("provinces", "municipalities", "schools", "markets", "hospitals")
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    """SQLite com dados sintéticos e estatísticas atualizadas."""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        engine,
+        tables=[model.__table__ for model in (Province, Municipality, School, Market, Hospital)],
+    )
+
+    municipalities = PROVINCES * MUNICIPALITIES_PER_PROVINCE
+    with engine.begin() as connection:
+        connection.execute(
+            Province.__table__.insert(),
+            [{"id": i, "nome": f"Província {i}", "capital": f"Capital {i}"} for i in range(1, PROVINCES + 1)],
+        )
+        connection.execute(
+            Municipality.__table__.insert(),
+            [{"id": i, "nome": f"Município {i}", "provincia_id": i % PROVINCES + 1} for i in range(1, municipalities + 1)],
+        )
+        for model in (School, Market, Hospital):
+            connection.execute(
+                model.__table__.insert(),
+                [
+                    {
+                        "id": i,
+                        "nome": f"{model.__name__} {i}",
+                        "provincia_id": i % PROVINCES + 1,
+                        "municipio_id": i % municipalities + 1,
+                        "municipio": f"Município {i % municipalities + 1}",
+                        "tipo": "municipal",
+                        "latitude": -18 + (i % 1009) * 0.0134,
+                        "longitude": 11.7 + (i % 997) * 0.0123,
+                    }
+                    for i in range(1, FACILITIES + 1)
+                ],
+            )
+        connection.exec_driver_sql("ANALYZE")
+
+    yield engine
+    engine.dispose()
+
+
+def capture_statements(engine, call):
+    """Executa a chamada de serviço e retorna as instruções SQL emitidas."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        with Session(engine) as session:
+            call(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return statements
+
+
+def plan_problems(engine, statement, parameters, full_scan_ok=False):
+    """
+    Retorna os passos do plano que leem uma tabela inteira ou ordenam em memória.
+
+    "SCAN tabela USING INDEX ..." também percorre a tabela toda (só evita a ordenação);
+    apenas listagens completas (full_scan_ok) podem fazê-lo.
+    """
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        full_scan = any(detail == f"SCAN {table}" or detail.startswith(f"SCAN {table} ") for table in TABLES)
+        if (full_scan and not full_scan_ok) or "TEMP B-TREE" in detail:
+            problems.append(detail)
+    return problems
+
+
+HOT_QUERIES = {
+    "provinces.get_all": lambda s: ProvinceServiceDB.get_all(session=s),
+    "provinces.get_by_id": lambda s: ProvinceServiceDB.get_by_id(3, session=s),
+    "provinces.has_municipalities": lambda s: ProvinceServiceDB.has_municipalities(3, session=s),
+    "municipalities.get_by_province": lambda s: MunicipalityServiceDB.get_by_province(3, session=s),
+    "municipalities.has_dependencies": lambda s: MunicipalityServiceDB.has_dependencies(7, session=s),
+    "schools.get_by_province": lambda s: SchoolServiceDB.get_by_province(3, session=s),
+    "schools.get_by_municipality": lambda s: SchoolServiceDB.get_by_municipality(7, session=s),
+    "markets.get_by_province": lambda s: MarketServiceDB.get_by_province(3, session=s),
+    "markets.get_by_municipality": lambda s: MarketServiceDB.get_by_municipality(7, session=s),
+    "hospitals.get_by_province": lambda s: HospitalServiceDB.get_by_province(3, session=s),
+    "hospitals.get_by_municipality": lambda s: HospitalServiceDB.get_by_municipality(7, session=s),
+    "hospitals.get_by_id": lambda s: HospitalServiceDB.get_by_id(42, session=s),
+    "hospitals.get_nearby": lambda s: HospitalServiceDB.get_nearby(-8.8, 13.2, radius_km=25, session=s),
+}
+
+# Listagens completas: percorrem a tabela, mas pela ordem do índice (sem ordenação temporária)
+FULL_LISTINGS = {"provinces.get_all"}
+
+
+class TestQueryPlans:
+    """Testes dos planos das consultas frequentes."""
+
+    @pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+    def test_consulta_usa_indices(self, engine, name):
+        """Consulta frequente não faz leitura sequencial nem ordenação temporária"""
+        statements = capture_statements(engine, HOT_QUERIES[name])
+        assert statements, f"{name} não executou nenhuma consulta"
+
+        for statement, parameters in statements:
+            problems = plan_problems(engine, statement, parameters, full_scan_ok=name in FULL_LISTINGS)
+            assert not problems, f"{name}: {problems}\n{statement}"
+
+    def test_detecta_leitura_sequencial(self, engine):
+        """A verificação acusa uma consulta sem índice"""
+        problems = plan_problems(engine, "SELECT * FROM schools WHERE tipo = ?", ("municipal",))
+        assert problems == ["SCAN schools"]
+
+    def test_detecta_percurso_completo_por_indice(self, engine):
+        """Percorrer a tabela toda pelo índice de ordenação também é acusado"""
+        problems = plan_problems(engine, "SELECT * FROM schools WHERE tipo = ? ORDER BY nome", ("municipal",))
+        assert problems and problems[0].startswith("SCAN schools USING INDEX")
@@ -0,0 +1,210 @@
+"""
+Testes para o rate limiter (GCRA com reservas locais de tokens).
+"""
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token
+
+from src.utils.rate_limit import LocalLeases, MemoryBackend, RateLimit, RateLimiter, gcra_acquire
+
+
+class FakeClock:
+    """Relógio controlado pelos testes."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBackend(MemoryBackend):
+    """Backend em memória que conta as reservas (como as idas ao Redis)."""
+
+    def __init__(self, clock):
+        super().__init__(clock=clock)
+        self.calls = 0
+
+    def acquire(self, key, limit, requested):
+        self.calls += 1
+        return super().acquire(key, limit, requested)
+
+
+def make_limiter(backend, clock, lease_size=10):
+    """Limiter sem app, com reservas locais no relógio dos testes."""
+    limiter = RateLimiter()
+    limiter.backend = backend
+    limiter.lease_size = lease_size
+    limiter.leases = LocalLeases(lease_seconds=5, clock=clock)
+    return limiter
+
+
+class TestGCRA:
+    """Testes do algoritmo GCRA."""
+
+    def test_parse(self):
+        """Formatos aceites e inválidos"""
+        assert RateLimit.parse("5 per minute") == RateLimit(5, 60, "5 per minute")
+        assert RateLimit.parse("50/hour").period == 3600
+        with pytest.raises(ValueError):
+            RateLimit.parse("muitos por minuto")
+
+    def test_rajada_e_reposicao(self):
+        """Aceita 'amount' pedidos de seguida e depois um a cada intervalo"""
+        limit = RateLimit.parse("6 per minute")
+        tat, now = 0.0, 1000.0
+        for _ in range(6):
+            tat, granted, _ = gcra_acquire(tat, now, limit, 1)
+            assert granted == 1
+
+        _, granted, retry_after = gcra_acquire(tat, now, limit, 1)
+        assert granted == 0
+        assert retry_after == pytest.approx(10)
+
+        _, granted, _ = gcra_acquire(tat, now + 10, limit, 1)
+        assert granted == 1
+
+    def test_reserva_parcial(self):
+        """Com menos tokens que os pedidos, concede os disponíveis"""
+        limit = RateLimit.parse("5 per minute")
+        tat, granted, _ = gcra_acquire(0.0, 1000.0, limit, 3)
+        assert granted == 3
+        _, granted, _ = gcra_acquire(tat, 1000.0, limit, 3)
+        assert granted == 2
+
+
+class TestLeases:
+    """Testes das reservas locais."""
+
+    def test_poucas_idas_ao_backend(self):
+        """Uma chave quente reserva lotes: 50 pedidos fazem 1 + 5 reservas de 10 tokens"""
+        clock = FakeClock()
+        backend = CountingBackend(clock)
+        limiter = make_limiter(backend, clock)
+        limit = RateLimit.parse("1000 per hour")
+
+        assert all(limiter.hit("k", limit)[0] for _ in range(50))
+        assert backend.calls == 6
+
+    def test_cliente_abaixo_do_limite(self):
+        """Um pedido por minuto com os limites padrão: nenhum token reservado se perde"""
+        clock = FakeClock()
+        limiter = make_limiter(MemoryBackend(clock=clock), clock)
+        limits = [RateLimit.parse(text) for text in ("200 per day", "50 per hour")]
+
+        accepted = 0
+        for _ in range(45):
+            accepted += all([limiter.hit(f"k:{limit.text}", limit)[0] for limit in limits])
+            clock.now += 60
+        assert accepted == 45
+
+    def test_workers_nao_excedem_limite(self):
+        """Dois workers com o mesmo backend aceitam, juntos, exatamente o limite"""
+        clock = FakeClock()
+        backend = MemoryBackend(clock=clock)
+        workers = [make_limiter(backend, clock), make_limiter(backend, clock)]
+        limit = RateLimit.parse("100 per minute")
+
+        accepted = sum(workers[i % 2].hit("k", limit)[0] for i in range(300))
+        assert accepted == 100
+
+    def test_devolve_token_quando_outro_limite_recusa(self):
+        """Recusado pelo segundo limite, o pedido não gasta o primeiro"""
+        clock = FakeClock()
+        backend = MemoryBackend(clock=clock)
+        limiter = make_limiter(backend, clock)
+        day, minute = RateLimit.parse("5 per day"), RateLimit.parse("1 per minute")
+
+        assert limiter.hit("dia", day)[0] and limiter.hit("minuto", minute)[0]
+        for _ in range(10):
+            assert limiter.hit("dia", day)[0]
+            assert not limiter.hit("minuto", minute)[0]
+            limiter.refund("dia", day)
+
+        clock.now += 60
+        assert sum(limiter.hit("dia", day)[0] for _ in range(10)) == 4
+
+    def test_reserva_expira(self):
+        """Tokens reservados e não usados deixam de valer"""
+        clock = FakeClock()
+        leases = LocalLeases(lease_seconds=5, clock=clock)
+        leases.store("k", 3)
+        assert leases.take("k")
+        clock.now += 6
+        assert not leases.take("k")
+
+
+class TestRateLimiterApp:
+    """Testes do hook numa aplicação Flask."""
+
+    @pytest.fixture
+    def limited_app(self):
+        app = Flask(__name__)
+        app.config["JWT_SECRET_KEY"] = "test-secret-key"
+        JWTManager(app)
+
+        limiter = RateLimiter(default_limits=("100 per minute",))
+        limiter.init_app(app, backend=MemoryBackend())
+
+        @app.route("/login", methods=["POST"])
+        @limiter.limit("3 per minute")
+        def login():
+            return jsonify({"success": True})
+
+        @app.route("/dupla")
+        @limiter.limit("3 per hour", "1 per minute")
+        def dupla():
+            return jsonify({"success": True})
+
+        @app.route("/data")
+        def data():
+            return jsonify({"success": True})
+
+        open_bp = Blueprint("open", __name__)
+
+        @open_bp.route("/open")
+        def open_route():
+            return jsonify({"success": True})
+
+        app.register_blueprint(open_bp)
+        limiter.exempt(open_bp)
+        return app
+
+    def test_limite_declarado_na_rota(self, limited_app):
+        """O limite da rota substitui o padrão; excedido retorna 429 com Retry-After"""
+        client = limited_app.test_client()
+        assert [client.post("/login").status_code for _ in range(4)] == [200, 200, 200, 429]
+
+        response = client.post("/login")
+        assert int(response.headers["Retry-After"]) >= 1
+        assert client.get("/data").status_code == 200
+
+    def test_recusa_devolve_limites_anteriores(self, limited_app):
+        """Recusado por '1 per minute', o pedido não conta para '3 per hour'"""
+        client = limited_app.test_client()
+        assert [client.get("/dupla").status_code for _ in range(4)] == [200, 429, 429, 429]
+
+        hour = RateLimit.parse("3 per hour")
+        assert limited_app.limiter.hit("dupla:3/3600:ip:127.0.0.1", hour)[0]
+        assert limited_app.limiter.hit("dupla:3/3600:ip:127.0.0.1", hour)[0]
+
+    def test_chave_por_identidade(self, limited_app):
+        """Cada identidade JWT tem o seu balde; o mesmo IP sem token tem outro"""
+        client = limited_app.test_client()
+        with limited_app.app_context():
+            tokens = [create_access_token(identity=str(user_id)) for user_id in (1, 2)]
+
+        for token in tokens:
+            headers = {"Authorization": f"Bearer {token}"}
+            assert [client.post("/login", headers=headers).status_code for _ in range(4)] == [200, 200, 200, 429]
+        assert client.post("/login").status_code == 200
+
+    def test_blueprint_isento(self, limited_app):
+        """Rotas de Blueprints isentos não são limitadas"""
+        client = limited_app.test_client()
+        assert all(client.get("/open").status_code == 200 for _ in range(150))
+
+    def test_login_declara_limite(self, app):
+        """POST /auth/login declara o seu limite uma única vez, na rota"""
+        assert app.view_functions["auth.login"]._rate_limits == (RateLimit.parse("5 per minute"),)
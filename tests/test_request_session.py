@@ -0,0 +1,122 @@
+"""
+Testes para a sessão de banco de dados por request (unit of work).
+"""
+
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import base
+from src.database.models import Municipality, Province
+from src.services.db.province_service_db import ProvinceServiceDB
+
+
+@pytest.fixture
+def db_app(monkeypatch):
+    """App mínima com SQLite em memória e sessão por request."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    base.Base.metadata.create_all(engine, tables=[Province.__table__, Municipality.__table__])
+    monkeypatch.setattr(base, "engine", engine)
+    monkeypatch.setattr(base, "SessionLocal", scoped_session(sessionmaker(autoflush=False, bind=engine)))
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+
+    app = Flask(__name__)
+    base.init_request_session(app)
+
+    @app.route("/provinces", methods=["POST"])
+    def create():
+        province = ProvinceServiceDB.create({"nome": "Bengo", "capital": "Caxito"})
+        ProvinceServiceDB.has_municipalities(province["id"])
+        return jsonify(province), 201
+
+    @app.route("/provinces/<int:province_id>", methods=["DELETE"])
+    def delete(province_id):
+        ProvinceServiceDB.delete(province_id)
+        return jsonify({"success": False}), 409
+
+    @app.route("/provinces", methods=["GET"])
+    def list_all():
+        return jsonify(ProvinceServiceDB.get_all() + [{"count": ProvinceServiceDB.count()}])
+
+    yield app, commits
+    engine.dispose()
+
+
+class TestRequestSession:
+    """Testes para o agrupamento de operações numa transação por request."""
+
+    def test_write_request_commits_once(self, db_app):
+        """Várias chamadas de serviço num request de escrita devem gerar um único COMMIT."""
+        app, commits = db_app
+        client = app.test_client()
+
+        response = client.post("/provinces")
+
+        assert response.status_code == 201
+        assert len(commits) == 1
+        assert ProvinceServiceDB.get_by_id(response.get_json()["id"])["nome"] == "Bengo"
+
+    def test_read_request_does_not_commit(self, db_app):
+        """Requests de leitura não devem fazer COMMIT."""
+        app, commits = db_app
+        client = app.test_client()
+
+        response = client.get("/provinces")
+
+        assert response.status_code == 200
+        assert commits == []
+
+    def test_error_response_rolls_back(self, db_app):
+        """Respostas de erro devem descartar as alterações do request."""
+        app, commits = db_app
+        client = app.test_client()
+        province_id = client.post("/provinces").get_json()["id"]
+
+        response = client.delete(f"/provinces/{province_id}")
+
+        assert response.status_code == 409
+        assert ProvinceServiceDB.get_by_id(province_id) is not None
+
+
+class TestReplicaRouting:
+    """Testes para o encaminhamento de leituras para réplicas."""
+
+    def test_round_robin_skips_failed_replica(self):
+        """Deve alternar entre réplicas e ignorar as marcadas como indisponíveis."""
+        from src.database.routing import ReplicaRouter
+
+        replicas = [create_engine("sqlite://"), create_engine("sqlite://")]
+        router = ReplicaRouter(replicas, retry_interval=60)
+
+        assert {router.pick(), router.pick()} == set(replicas)
+
+        router.mark_down(replicas[0])
+        assert [router.pick() for _ in range(3)] == [replicas[1]] * 3
+        assert router.get_stats() == {"replicas": 2, "down": 1}
+
+    def test_reads_follow_own_writes_to_primary(self, db_app, monkeypatch):
+        """Leituras vão para a réplica, exceto logo após uma escrita do mesmo cliente."""
+        from src.database.routing import ReplicaRouter, WriteStickiness
+
+        app, commits = db_app
+        replica = create_engine("sqlite://")
+        base.Base.metadata.create_all(replica, tables=[Province.__table__, Municipality.__table__])
+        monkeypatch.setattr(base, "replica_router", ReplicaRouter([replica]))
+        monkeypatch.setattr(base, "write_stickiness", WriteStickiness(window=60))
+        client = app.test_client()
+
+        assert client.get("/provinces").get_json() == [{"count": 0}]
+
+        client.post("/provinces")
+
+        data = client.get("/provinces").get_json()
+        assert data[-1] == {"count": 1}
+        assert data[0]["nome"] == "Bengo"
+
+        other_client = app.test_client()
+        response = other_client.get("/provinces", environ_base={"REMOTE_ADDR": "10.0.0.2"})
+        assert response.get_json() == [{"count": 0}]
@@ -0,0 +1,152 @@
+"""
+Testes para o índice de busca e o endpoint /search.
+"""
+
+from src.utils.search_index import SearchIndex, fold
+
+
+class TestSearchIndex:
+    """Testes para o índice invertido em memória."""
+
+    def test_fold_removes_accents(self):
+        """Deve remover acentos e ignorar maiúsculas."""
+        assert fold("Úcua") == "ucua"
+        assert fold("Chongorói") == "chongoroi"
+        assert fold("NHARÊA") == "nharea"
+
+    def test_index_follows_writes(self):
+        """Deve refletir criações, atualizações e remoções."""
+        data = {"municipalities": [{"id": 1, "nome": "Cazenga"}]}
+        index = SearchIndex(loader=lambda entity: data.get(entity, []))
+
+        assert [r["id"] for r in index.search("caz", entities=["municipalities"])] == [1]
+
+        index.update("municipalities", "create", {"id": 2, "nome": "Cazengo"})
+        assert {r["id"] for r in index.search("caz", entities=["municipalities"])} == {1, 2}
+
+        index.update("municipalities", "update", {"id": 2, "nome": "Cubal"})
+        assert [r["id"] for r in index.search("cubal", entities=["municipalities"])] == [2]
+        assert [r["id"] for r in index.search("caz", entities=["municipalities"])] == [1]
+
+        index.update("municipalities", "delete", {"id": 1, "nome": "Cazenga"})
+        assert index.search("caz", entities=["municipalities"]) == []
+
+
+class TestSearchEndpoint:
+    """Testes para GET /search."""
+
+    def test_accent_insensitive_search(self, client):
+        """Deve encontrar 'Úcua' ao buscar 'ucua'."""
+        response = client.get("/search?q=ucua&types=municipalities")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["success"] is True
+        assert data["data"][0]["nome"] == "Úcua"
+        assert data["data"][0]["type"] == "municipalities"
+
+    def test_search_across_types(self, client):
+        """Deve ordenar resultados de várias entidades por relevância."""
+        response = client.get("/search?q=luanda")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["data"][0]["type"] == "provinces"
+        assert data["data"][0]["nome"] == "Luanda"
+        scores = [item["score"] for item in data["data"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_search_requires_query(self, client):
+        """Deve rejeitar busca sem 'q'."""
+        response = client.get("/search")
+
+        assert response.status_code == 400
+
+    def test_search_rejects_invalid_types(self, client):
+        """Deve rejeitar tipos de entidade desconhecidos."""
+        response = client.get("/search?q=luanda&types=planets")
+
+        assert response.status_code == 400
+
+
+class TestSearchHelperFallback:
+    """Testes para a busca em banco sem pg_trgm."""
+
+    def test_sqlite_uses_ilike(self):
+        """Sem trigramas deve continuar a filtrar com ILIKE."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+
+        from src.database.base import Base
+        from src.database.models import Province
+        from src.utils.pagination import SearchHelper
+
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[Province.__table__])
+        with Session(engine) as session:
+            session.add_all([Province(nome="Luanda", capital="Luanda"), Province(nome="Huíla", capital="Lubango")])
+            session.commit()
+
+            query = SearchHelper.apply_text_search(session.query(Province), Province, "luban", ["nome", "capital"])
+
+            assert SearchHelper.has_trigram_support(session) is False
+            assert [p.nome for p in query.all()] == ["Huíla"]
+
+    def test_trigram_escapa_curingas(self, monkeypatch):
+        """O LIKE dos trigramas declara o caractere de escape, como na busca por prefixo."""
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.orm import Session
+
+        from src.database.models import Province
+        from src.utils.pagination import SearchHelper
+
+        monkeypatch.setattr(SearchHelper, "has_trigram_support", staticmethod(lambda session: True))
+        query = SearchHelper.apply_text_search(Session().query(Province), Province, "50%_off", ["nome"])
+        compiled = query.statement.compile(dialect=postgresql.dialect())
+
+        assert "ESCAPE" in str(compiled)
+        assert list(compiled.params.values()) == ["%50\\%\\_off%"]
+
+
+class TestAutocomplete:
+    """Testes para o autocompletar por prefixo."""
+
+    def test_index_follows_writes(self):
+        """Deve manter o array ordenado em criações, atualizações e remoções."""
+        from src.utils.autocomplete import AutocompleteIndex
+
+        data = {"municipalities": [{"id": 1, "nome": "Cazenga", "provincia_id": 1}]}
+        index = AutocompleteIndex(loader=lambda entity: data.get(entity, []))
+        assert [s["id"] for s in index.complete("municipalities", "caz")] == [1]
+
+        index.update("municipalities", "create", {"id": 2, "nome": "Cacuaco", "provincia_id": 1})
+        assert [s["nome"] for s in index.complete("municipalities", "ca")] == ["Cacuaco", "Cazenga"]
+
+        index.update("municipalities", "update", {"id": 2, "nome": "Viana", "provincia_id": 1})
+        assert [s["nome"] for s in index.complete("municipalities", "ca")] == ["Cazenga"]
+
+        index.update("municipalities", "delete", {"id": 1, "nome": "Cazenga", "provincia_id": 1})
+        assert index.complete("municipalities", "ca") == []
+
+    def test_autocomplete_endpoint(self, client):
+        """Deve sugerir nomes pelo prefixo, ignorando acentos."""
+        response = client.get("/municipalities/autocomplete?prefix=UC&limit=5")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert "Úcua" in [s["nome"] for s in data["data"]]
+        assert len(data["data"]) <= 5
+        assert set(data["data"][0]) == {"id", "nome", "provincia_id"}
+
+    def test_autocomplete_scoped_by_province(self, client):
+        """Deve restringir as sugestões à província indicada."""
+        response = client.get("/schools/autocomplete?prefix=escola&provincia_id=1&limit=50")
+
+        assert response.status_code == 200
+        assert all(s["provincia_id"] == 1 for s in response.get_json()["data"])
+
+    def test_autocomplete_requires_prefix(self, client):
+        """Deve rejeitar pedido sem prefixo."""
+        response = client.get("/hospitals/autocomplete")
+
+        assert response.status_code == 400
@@ -0,0 +1,153 @@
+"""
+Testes para a verificação e sanitização dos payloads de escrita.
+"""
+
+import random
+import re
+
+import pytest
+
+from src.utils import security
+from src.utils.security import INPUT_SCAN_REJECTED, PayloadTooLarge, SecurityValidator
+
+SAMPLES = [
+    "Hospital Geral de Luanda",
+    "Rua 5 de Outubro, nº 12",
+    "1 OR 1=1",
+    "nome' -- comentário",
+    "Escola # 3",
+    "union all select senha",
+    "drop da table",
+    "; delete tudo",
+    "Mercado do Roque Santeiro",
+    "<SCRIPT src=x>alert(1)</script>",
+    "javascript:alert(1)",
+    "img onerror = x",
+    "<iframe>",
+    "Ondjiva",
+    "ordem = 2 and valor",
+    "Escola Primária #12",
+    "Hospital -- Ala B",
+    "N'dalatando",
+    "x' OR '1'='1' --",
+    "admin'#",
+    'nome" -- fim',
+]
+
+# Combinações aleatórias (determinísticas) de fragmentos dos padrões
+_rng = random.Random(3)
+TOKENS = ["OR", "and", "=", "--", "#", "/*", "*/", "union", "Select", "drop", "table", ";", "insert", "into"]
+TOKENS += ["delete", "from", "update", "set", "x", " ", "é", "<script>", "</script>", "javascript:", "onload="]
+TOKENS += ["<iframe", "<embed", "<object", "\n", "ordem", "_", "<", "on", "'", '"', "`", "12"]
+FUZZ = ["".join(_rng.choice(TOKENS) for _ in range(_rng.randint(1, 6))) for _ in range(2000)]
+
+
+class TestPatterns:
+    """Testes das expressões pré-compiladas."""
+
+    def test_igual_aos_padroes_individuais(self):
+        """A alternação decide como o laço sobre cada padrão"""
+        for value in SAMPLES + FUZZ:
+            sql = any(re.search(p, value.upper(), re.IGNORECASE) for p in SecurityValidator.SQL_INJECTION_PATTERNS)
+            xss = any(re.search(p, value, re.IGNORECASE) for p in SecurityValidator.XSS_PATTERNS)
+            assert SecurityValidator.check_sql_injection(value) == sql, value
+            assert SecurityValidator.check_xss(value) == xss, value
+
+    def test_nomes_com_cardinal_travessao_e_apostrofo(self):
+        """'#', '--' e apóstrofos em nomes são aceites; comentários após uma aspa não"""
+        for value in ("Escola Primária #12", "Hospital -- Ala B", "N'dalatando", "Rua 4 de Fevereiro #3 -- Bloco A"):
+            assert not SecurityValidator.check_sql_injection(value), value
+        for value in ("nome' -- comentário", "admin'#", 'x" --', "a /* b */"):
+            assert SecurityValidator.check_sql_injection(value), value
+
+    def test_sanitize_string(self):
+        """Escape HTML e remoção de caracteres de controle (mantém \\n, \\r e \\t)"""
+        value = "a<b>\x00\x07c\n\td\r\x1f"
+        assert SecurityValidator.sanitize_string(value) == "a&lt;b&gt;c\n\td\r"
+
+
+class TestScan:
+    """Testes do percurso iterativo do payload."""
+
+    def test_nao_altera_dados(self):
+        """Por padrão o payload é apenas verificado, nunca reescrito"""
+        data = {"provinces": [{"nome": "N'dalatando & <Cuanza>", "tags": [["Escola #12"]]}]}
+        result, error, strings = SecurityValidator.scan(data)
+
+        assert error is None
+        assert strings == 2
+        assert result is data
+        assert data == {"provinces": [{"nome": "N'dalatando & <Cuanza>", "tags": [["Escola #12"]]}]}
+
+    def test_sanitiza_copia_aninhada(self):
+        """Com sanitize=True, strings em qualquer nível são sanitizadas, sem alterar o original"""
+        data = {"provinces": [{"nome": "A & B", "tags": [["x\x00"]]}], "total": 1}
+        sanitized, error, strings = SecurityValidator.scan(data, sanitize=True)
+
+        assert error is None
+        assert strings == 2
+        assert sanitized == {"provinces": [{"nome": "A &amp; B", "tags": [["x"]]}], "total": 1}
+        assert data["provinces"][0]["nome"] == "A & B"
+
+    def test_caminho_do_campo(self):
+        """O erro indica o caminho do primeiro valor suspeito, pela ordem do payload"""
+        data = {"provinces": [{"nome": "Luanda"}, {"nome": "<script>x</script>", "capital": "1 OR 1=1"}]}
+        _, error, _ = SecurityValidator.scan(data)
+        assert "provinces[1].nome" in error
+        assert "XSS" in error
+
+    def test_senhas_isentas(self):
+        """Campos de senha não são verificados nem alterados"""
+        sanitized, error, _ = SecurityValidator.scan({"email": "a@b.ao", "password": "p#ss<word>--"}, sanitize=True)
+        assert error is None
+        assert sanitized["password"] == "p#ss<word>--"
+
+    def test_limites(self, monkeypatch):
+        """Payloads acima dos limites são recusados"""
+        monkeypatch.setattr(security, "MAX_SCAN_NODES", 10)
+        with pytest.raises(PayloadTooLarge):
+            SecurityValidator.scan({"ids": list(range(20))})
+
+        deep = "x"
+        for _ in range(security.MAX_SCAN_DEPTH + 1):
+            deep = [deep]
+        monkeypatch.setattr(security, "MAX_SCAN_NODES", 1000)
+        with pytest.raises(PayloadTooLarge):
+            SecurityValidator.scan(deep)
+
+
+class TestInputScanHook:
+    """Testes do hook before_request nas escritas."""
+
+    def test_rejeita_escrita_suspeita(self, client):
+        """Payload suspeito é recusado antes da rota, com métrica"""
+        before = INPUT_SCAN_REJECTED.get(reason="suspicious")
+        response = client.post("/provinces", json={"nome": "<script>alert(1)</script>"})
+
+        assert response.status_code == 400
+        assert "XSS" in response.get_json()["message"]
+        assert INPUT_SCAN_REJECTED.get(reason="suspicious") == before + 1
+
+    def test_senha_nao_bloqueia_login(self, client):
+        """Senhas com caracteres especiais chegam ao login sem alteração"""
+        response = client.post("/auth/login", json={"email": "admin@angodata.ao", "password": "x#y--<z>"})
+        assert response.status_code == 401
+
+    def test_leituras_nao_verificadas(self, client):
+        """GET não passa pela verificação"""
+        assert client.get("/search?q=1 OR 1=1").status_code == 200
+
+    def test_ida_e_volta_com_apostrofo(self, client, admin_headers, sqlite_backend):
+        """Criar e depois atualizar com o registro lido grava exatamente o que foi enviado"""
+        payload = {"nome": "N'dalatando", "capital": "Hospital -- Ala B", "area_km2": 1000.0, "populacao": 5000}
+        created = client.post("/provinces", json=payload, headers=admin_headers)
+        assert created.status_code == 201
+        province = created.get_json()["data"]
+        assert (province["nome"], province["capital"]) == ("N'dalatando", "Hospital -- Ala B")
+
+        update = {"nome": province["nome"], "capital": "Escola Primária #12"}
+        response = client.put(f"/provinces/{province['id']}", json=update, headers=admin_headers)
+        assert response.status_code == 200
+
+        stored = client.get(f"/provinces/{province['id']}").get_json()["data"]
+        assert (stored["nome"], stored["capital"]) == ("N'dalatando", "Escola Primária #12")
@@ -0,0 +1,155 @@
+"""
+Testes para o snapshot completo (GET /snapshot).
+"""
+
+import gzip
+import json
+
+from src.routes import snapshot as snapshot_routes
+from src.utils.signals import notify_change
+from src.utils.snapshot import SNAPSHOT_ENTITIES, SnapshotStore, snapshot_store
+
+
+class TestSnapshotStore:
+    """Testes da construção dos snapshots."""
+
+    def make_store(self, data, version, keep=2):
+        return SnapshotStore(loader=lambda entity: data.get(entity, []), version_source=lambda: version[0], keep=keep)
+
+    def test_hash_determinista(self):
+        """O mesmo conteúdo gera o mesmo hash e não é reconstruído"""
+        data, version = {"provinces": [{"id": 1, "nome": "Luanda"}]}, [3]
+        store = self.make_store(data, version)
+
+        first = store.build()
+        assert store.build() is first
+        assert first.version == 3
+
+        bundle = json.loads(gzip.decompress(first.bodies["gzip"]))
+        assert bundle["version"] == 3
+        assert set(bundle["entities"]) == set(SNAPSHOT_ENTITIES)
+        assert bundle["entities"]["provinces"] == [{"id": 1, "nome": "Luanda"}]
+
+    def test_nova_versao_mantem_anteriores(self):
+        """Uma nova versão gera outro hash; só os últimos 'keep' continuam disponíveis"""
+        data, version = {"schools": []}, [1]
+        store = self.make_store(data, version, keep=2)
+        hashes = []
+        for v in (1, 2, 3):
+            version[0] = v
+            data["schools"] = [{"id": v}]
+            hashes.append(store.build().content_hash)
+
+        assert len(set(hashes)) == 3
+        assert store.current.content_hash == hashes[-1]
+        assert store.get(hashes[0]) is None
+        assert store.get(hashes[1]) is not None
+
+
+class TestSharedSnapshots:
+    """Testes da partilha dos bundles entre workers (um store por worker)."""
+
+    def make_stores(self, tmp_path):
+        data = {"provinces": [{"id": 1, "nome": "Luanda"}]}
+        return [
+            SnapshotStore(loader=lambda entity: data.get(entity, []), version_source=lambda: 7, directory=tmp_path)
+            for _ in range(2)
+        ]
+
+    def test_hash_servido_por_outro_store(self, tmp_path):
+        """Um store que nunca construiu o hash serve-o a partir do diretório partilhado"""
+        builder, other = self.make_stores(tmp_path)
+        snapshot = builder.build()
+
+        loaded = other.get(snapshot.content_hash)
+        assert loaded.version == 7
+        assert loaded.bodies == snapshot.bodies
+        assert other.get("../" + snapshot.content_hash) is None
+
+    def test_redirect_e_download_em_workers_diferentes(self, client, tmp_path, monkeypatch):
+        """O redirect vem de um worker e o download é atendido por outro"""
+        first, second = self.make_stores(tmp_path)
+        first.build()
+        # Sem threads de reconstrução: o segundo store nunca constrói nada
+        first.ensure_started = second.ensure_started = lambda: None
+
+        monkeypatch.setattr(snapshot_routes, "snapshot_store", first)
+        location = client.get("/snapshot").headers["Location"]
+
+        monkeypatch.setattr(snapshot_routes, "snapshot_store", second)
+        response = client.get(location, headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert json.loads(gzip.decompress(response.data))["version"] == 7
+
+    def test_versoes_removidas_do_disco(self, tmp_path):
+        """Só os últimos 'keep' bundles ficam no diretório"""
+        data, version = {"schools": []}, [1]
+        store = SnapshotStore(
+            loader=lambda entity: data.get(entity, []), version_source=lambda: version[0], directory=tmp_path
+        )
+        for v in (1, 2, 3):
+            version[0] = v
+            data["schools"] = [{"id": v}]
+            store.build()
+
+        assert len(list(tmp_path.glob("*.meta.json"))) == 2
+
+
+class TestSnapshotEndpoint:
+    """Testes dos endpoints do snapshot."""
+
+    def test_redireciona_para_hash(self, client):
+        """GET /snapshot redireciona para a URL versionada"""
+        snapshot = snapshot_store.build()
+        response = client.get("/snapshot")
+
+        assert response.status_code == 302
+        assert response.headers["Location"].endswith(f"/snapshot/{snapshot.content_hash}")
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_bundle_comprimido_e_imutavel(self, client):
+        """O bundle é servido já comprimido, com cache imutável"""
+        snapshot = snapshot_store.build()
+        response = client.get(f"/snapshot/{snapshot.content_hash}", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "immutable" in response.headers["Cache-Control"]
+        assert response.headers["ETag"] == f'"{snapshot.content_hash}"'
+
+        bundle = json.loads(gzip.decompress(response.data))
+        assert bundle["version"] == snapshot.version
+        assert len(bundle["entities"]["provinces"]) > 0
+
+    def test_sem_compressao(self, client):
+        """Clientes sem Accept-Encoding recebem o JSON original"""
+        snapshot = snapshot_store.build()
+        response = client.get(f"/snapshot/{snapshot.content_hash}", headers={"Accept-Encoding": "identity"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["version"] == snapshot.version
+
+    def test_not_modified(self, client):
+        """If-None-Match com o hash atual retorna 304"""
+        snapshot = snapshot_store.build()
+        response = client.get(f"/snapshot/{snapshot.content_hash}", headers={"If-None-Match": f'"{snapshot.content_hash}"'})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_hash_desconhecido(self, client):
+        """Hash inexistente retorna 404"""
+        response = client.get("/snapshot/0000")
+        assert response.status_code == 404
+
+    def test_alteracao_gera_novo_snapshot(self, client):
+        """Depois de uma alteração, o snapshot anterior continua disponível e /snapshot aponta para o novo"""
+        old = snapshot_store.build()
+        notify_change("provinces", "update", {"id": 1, "nome": "Luanda"})
+        new = snapshot_store.build()
+
+        assert new.content_hash != old.content_hash
+        assert new.version > old.version
+        assert client.get(f"/snapshot/{old.content_hash}").status_code == 200
+        assert client.get("/snapshot").headers["Location"].endswith(new.content_hash)
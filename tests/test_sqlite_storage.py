@@ -0,0 +1,134 @@
+"""
+Testes para o backend SQLite embutido (STORAGE_BACKEND=sqlite).
+"""
+
+import threading
+
+import pytest
+
+from src.database import base
+from src.models.province import PROVINCES
+from src.services.db.province_service_db import ProvinceServiceDB
+from src.services.service_factory import ServiceFactory
+
+
+class TestStorageBackend:
+    """Testes da seleção do backend."""
+
+    def test_storage_backend_sobrepoe_use_database(self, monkeypatch):
+        """STORAGE_BACKEND tem prioridade sobre USE_DATABASE"""
+        monkeypatch.setenv("USE_DATABASE", "True")
+        monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+        assert base.get_storage_backend() == "sqlite"
+        assert ServiceFactory._use_database() is True
+
+    def test_use_database_legado(self, monkeypatch):
+        """Sem STORAGE_BACKEND, USE_DATABASE decide entre postgres e json"""
+        monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+        monkeypatch.setenv("USE_DATABASE", "True")
+        assert base.get_storage_backend() == "postgres"
+        monkeypatch.setenv("USE_DATABASE", "False")
+        assert base.get_storage_backend() == "json"
+        assert ServiceFactory._use_database() is False
+
+
+class TestSQLiteStorage:
+    """Testes do banco SQLite embutido."""
+
+    def test_pragmas_aplicados(self, sqlite_backend):
+        """Cada conexão usa WAL e chaves estrangeiras"""
+        with sqlite_backend.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+
+    def test_populado_a_partir_dos_json(self, sqlite_backend):
+        """Banco vazio é populado com os dados JSON"""
+        assert ProvinceServiceDB.count() == len(PROVINCES)
+        assert ProvinceServiceDB.get_by_id(PROVINCES[0]["id"])["nome"] == PROVINCES[0]["nome"]
+
+    def test_nao_repopula(self, sqlite_backend):
+        """Uma segunda inicialização não duplica os dados"""
+        from src.database.sqlite_storage import create_and_seed
+
+        create_and_seed(sqlite_backend)
+        assert ProvinceServiceDB.count() == len(PROVINCES)
+
+    def test_pool_limitado(self, sqlite_backend):
+        """Conexões em uso simultâneo são distintas; devolvidas, servem outras threads"""
+        pool = sqlite_backend.pool
+        assert pool.size() == 8
+
+        with sqlite_backend.connect() as first, sqlite_backend.connect() as second:
+            held = {id(first.connection.dbapi_connection), id(second.connection.dbapi_connection)}
+            assert len(held) == 2
+            assert pool.checkedout() == 2
+
+        seen = []
+
+        def connection_in_thread():
+            with sqlite_backend.connect() as connection:
+                seen.append(id(connection.connection.dbapi_connection))
+
+        thread = threading.Thread(target=connection_in_thread)
+        thread.start()
+        thread.join()
+
+        assert seen[0] in held
+        assert pool.checkedout() == 0
+
+    def test_limite_de_conexoes(self, tmp_path, monkeypatch):
+        """Com todas as conexões em uso, um novo checkout espera e desiste após o timeout"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+        from src.database.sqlite_storage import configure_sqlite_engine, sqlite_engine_options
+
+        monkeypatch.setenv("SQLITE_POOL_SIZE", "1")
+        monkeypatch.setenv("SQLITE_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("SQLITE_POOL_TIMEOUT", "0.1")
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **sqlite_engine_options())
+        configure_sqlite_engine(engine)
+
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        engine.dispose()
+
+
+class TestFacilityMunicipality:
+    """Testes do município das instalações por chave estrangeira (modo database)."""
+
+    def test_get_by_municipality_por_id(self, sqlite_backend):
+        """Consulta por municipio_id retorna o mesmo que o modo JSON"""
+        from src.models.school import SCHOOLS
+        from src.services.db.school_service_db import SchoolServiceDB
+
+        expected = sorted(s["id"] for s in SCHOOLS if s.get("municipio_id") == 9)
+        assert sorted(s["id"] for s in SchoolServiceDB.get_by_municipality(9)) == expected
+        assert expected
+
+    def test_create_preenche_nome_do_municipio(self, sqlite_backend):
+        """O nome do município vem do municipio_id"""
+        from src.services.db.hospital_service_db import HospitalServiceDB
+
+        hospital = HospitalServiceDB.create({"nome": "Hospital Teste", "provincia_id": 1, "municipio_id": 9})
+        assert hospital["municipio_id"] == 9
+        assert hospital["municipio"] == "Maianga"
+
+    def test_municipio_de_outra_provincia(self, sqlite_backend):
+        """Município de outra província é rejeitado"""
+        from src.services.db.market_service_db import MarketServiceDB
+
+        assert MarketServiceDB.create({"nome": "Mercado Teste", "provincia_id": 2, "municipio_id": 9}) is None
+
+    def test_atualizacao_recusada_nao_grava_campos(self, sqlite_backend):
+        """Um município de outra província recusa a atualização inteira"""
+        from src.services.db.school_service_db import SchoolServiceDB
+
+        school = SchoolServiceDB.get_all()[0]
+        result = SchoolServiceDB.update(
+            school["id"], {"nome": "Escola Movida", "latitude": -14.9, "longitude": 17.9, "municipio_id": 9, "provincia_id": 2}
+        )
+
+        assert result is None
+        assert SchoolServiceDB.get_by_id(school["id"]) == school